@@ -1,3 +1,4 @@
+import numpy as np
 from cffdrs import (
     buildup_index,
     drought_code,
@@ -6,7 +7,7 @@ from cffdrs import (
     fire_weather_index,
     initial_spread_index,
 )
-from numba import vectorize
+from numba import jit, prange, vectorize
 
 vectorized_bui = vectorize(buildup_index)
 vectorized_dc = vectorize(drought_code)
@@ -14,3 +15,34 @@ vectorized_dmc = vectorize(duff_moisture_code)
 vectorized_ffmc = vectorize(fine_fuel_moisture_code)
 vectorized_isi = vectorize(initial_spread_index)
 vectorized_fwi = vectorize(fire_weather_index)
+
+_jit_ffmc = jit(fine_fuel_moisture_code)
+
+
+@jit(parallel=True)
+def time_stacked_ffmc(initial_ffmc, temp, rh, wind_speed, precip):
+    """Run the FFMC recursion along the time axis of stacked weather inputs, each step using the
+    previous step's FFMC, without materializing each intermediate FFMC grid between steps.
+
+    :param initial_ffmc: (rows, cols) FFMC before the first step
+    :param temp: (steps, rows, cols) temperature of each step
+    :param rh: (steps, rows, cols) relative humidity of each step
+    :param wind_speed: (steps, rows, cols) wind speed of each step
+    :param precip: (steps, rows, cols) precipitation of each step
+    :return: (steps, rows, cols) float64 FFMC of each step
+    """
+    steps, rows, cols = temp.shape
+    ffmc = np.empty((steps, rows, cols), dtype=np.float64)
+    for row in prange(rows):
+        for col in range(cols):
+            previous_ffmc = np.float64(initial_ffmc[row, col])
+            for step in range(steps):
+                previous_ffmc = _jit_ffmc(
+                    previous_ffmc,
+                    temp[step, row, col],
+                    rh[step, row, col],
+                    wind_speed[step, row, col],
+                    precip[step, row, col],
+                )
+                ffmc[step, row, col] = previous_ffmc
+    return ffmc
@@ -98,3 +98,18 @@ def test_vectorized_fwi_matches_reference(isi, bui):
     actual = fwi.vectorized_fwi(np.array([isi]), np.array([bui]))[0]
     expected = cffdrs.fire_weather_index(isi, bui)
     np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-9)
+
+
+@given(
+    ffmc=ffmc,
+    weather=st.lists(st.tuples(temp, rh, wind_speed, precip), min_size=1, max_size=6),
+)
+@settings(deadline=None, max_examples=200)
+def test_time_stacked_ffmc_matches_reference(ffmc, weather):
+    temps, rhs, wind_speeds, precips = (np.array(values).reshape(-1, 1, 1) for values in zip(*weather))
+    actual = fwi.time_stacked_ffmc(np.array([[ffmc]]), temps, rhs, wind_speeds, precips)[:, 0, 0]
+    expected = []
+    for step_temp, step_rh, step_wind_speed, step_precip in weather:
+        ffmc = cffdrs.fine_fuel_moisture_code(ffmc, step_temp, step_rh, step_wind_speed, step_precip)
+        expected.append(ffmc)
+    np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-9)
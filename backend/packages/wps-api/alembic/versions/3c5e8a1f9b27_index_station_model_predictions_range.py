@@ -0,0 +1,33 @@
+"""Index weather_station_model_predictions for range queries
+
+Revision ID: 3c5e8a1f9b27
+Revises: e4a9f2c7d1b6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3c5e8a1f9b27"
+down_revision = "e4a9f2c7d1b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Supports selecting the latest updated prediction per station and prediction timestamp
+    # (DISTINCT ON station_code, prediction_timestamp ORDER BY update_date DESC) over a date range.
+    op.create_index(
+        "ix_weather_station_model_predictions_station_timestamp_update",
+        "weather_station_model_predictions",
+        ["station_code", "prediction_timestamp", "update_date"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_weather_station_model_predictions_station_timestamp_update",
+        table_name="weather_station_model_predictions",
+    )
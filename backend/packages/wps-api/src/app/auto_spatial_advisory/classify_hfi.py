@@ -1,54 +1,41 @@
-"""Proof of concept, run classification on HFI GeoTiff"""
+"""Classify HFI rasters into advisory (4k-10k) and warning (> 10k) classes."""
 
-import os
 import numpy as np
 from osgeo import gdal
-from wps_shared import config
 
+# Lower bounds of the advisory (1) and warning (2) classes, anything below is classified as 0.
+HFI_CLASS_THRESHOLDS = np.array([4000, 10000])
 
-def classify_hfi(source_path, target_path):
+
+def classify_hfi_array(hfi: np.ndarray) -> np.ndarray:
+    """
+    Classify HFI values in a single pass: 0 = < 4k, 1 = 4k-10k, 2 = > 10k.
+
+    :param hfi: HFI values
+    :return: uint8 array of HFI classes
     """
-    Given a source path of some HFI GeoTIFF, classify the GeoTIFF and save it to a new GeoTIFF.
-    The output GeoTIFF will use 8 bit unsigned values.
+    classified = np.digitize(hfi, HFI_CLASS_THRESHOLDS).astype(np.uint8)
+    if np.issubdtype(hfi.dtype, np.floating):
+        # digitize puts nan past the last threshold, it isn't a high hfi value
+        classified[np.isnan(hfi)] = 0
+    return classified
 
-    NOTE: This could be done in memory!
+
+def create_classified_hfi_dataset(classified: np.ndarray, source: gdal.Dataset) -> gdal.Dataset:
     """
+    Create an in memory 8 bit unsigned dataset of classified HFI, on the same grid as the source HFI.
 
-    gdal.SetConfigOption("AWS_SECRET_ACCESS_KEY", config.get("OBJECT_STORE_SECRET"))
-    gdal.SetConfigOption("AWS_ACCESS_KEY_ID", config.get("OBJECT_STORE_USER_ID"))
-    gdal.SetConfigOption("AWS_S3_ENDPOINT", config.get("OBJECT_STORE_SERVER"))
-    gdal.SetConfigOption("AWS_VIRTUAL_HOSTING", "FALSE")
-
-    # Read the source data.
-    source_tiff = gdal.Open(source_path, gdal.GA_ReadOnly)
-    source_band = source_tiff.GetRasterBand(1)
-    source_data = source_band.ReadAsArray()
-    # Classify the data.
-    classified = np.where(source_data < 4000, 0, source_data)
-    classified = np.where((classified >= 4000) & (classified < 10000), 1, classified)
-    classified = np.where(classified >= 10000, 2, classified)
-
-    # Remove any existing target file.
-    if os.path.exists(target_path):
-        os.remove(target_path)
-    output_driver = gdal.GetDriverByName("GTiff")
-    # Create an object with the same dimensions as the input, but with 8 bit unsigned values.
-    target_tiff = output_driver.Create(target_path, xsize=source_band.XSize, ysize=source_band.YSize, bands=1, eType=gdal.GDT_Byte)
-    # Set the geotransform and projection to the same as the input.
-    target_tiff.SetGeoTransform(source_tiff.GetGeoTransform())
-    target_tiff.SetProjection(source_tiff.GetProjection())
-
-    # Write the classified data to the band.
-    target_band = target_tiff.GetRasterBand(1)
+    :param classified: classified HFI values
+    :param source: the HFI dataset the values were classified from
+    :return: MEM dataset with 0 as nodata
+    """
+    target = gdal.GetDriverByName("MEM").Create(
+        "", xsize=source.RasterXSize, ysize=source.RasterYSize, bands=1, eType=gdal.GDT_Byte
+    )
+    target.SetGeoTransform(source.GetGeoTransform())
+    target.SetProjection(source.GetProjection())
+    target_band = target.GetRasterBand(1)
     target_band.SetNoDataValue(0)
     target_band.WriteArray(classified)
+    return target
 
-    # Important to make sure data is flushed to disk!
-    target_tiff.FlushCache()
-
-    # Explicit delete to make sure underlying resources are cleared up!
-    del source_band
-    del source_tiff
-    del target_band
-    del target_tiff
-    del output_driver
@@ -1,43 +1,47 @@
-"""Takes a classified HFI image and calculates basic elevation statistics associated with advisory areas per fire zone."""
+"""Takes a classified HFI image and calculates TPI (elevation) statistics associated with advisory areas per fire zone."""
 
+import asyncio
 import logging
-import os
-import tempfile
 from dataclasses import dataclass
 from datetime import date, datetime
 from time import perf_counter
 from typing import Dict
 
 import numpy as np
+from geoalchemy2.shape import to_shape
 from osgeo import gdal, osr
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.sql import text
 from wps_shared import config
 from wps_shared.db.crud.auto_spatial_advisory import (
+    get_fire_zone_unit_shape_type_id,
+    get_fire_zone_units,
     get_run_parameters_id,
-    save_advisory_elevation_stats,
+    get_table_srid,
     save_advisory_elevation_tpi_stats,
 )
-from wps_shared.db.database import (
-    DB_READ_STRING,
-    get_async_read_session_scope,
-    get_async_write_session_scope,
-)
-from wps_shared.db.models.auto_spatial_advisory import AdvisoryElevationStats, AdvisoryTPIStats
-from wps_shared.geospatial.geospatial import raster_mul, warp_to_match_raster
+from wps_shared.db.database import get_async_read_session_scope, get_async_write_session_scope
+from wps_shared.db.models.auto_spatial_advisory import AdvisoryTPIStats, Shape
+from wps_shared.geospatial.geospatial import NAD83_BC_ALBERS, warp_to_match_raster
+from wps_shared.geospatial.raster_cache import get_raster_cache
+from wps_shared.geospatial.zone_index import get_zone_id_raster_path
 from wps_shared.run_type import RunType
-from wps_shared.utils.s3 import get_client
+from wps_shared.utils.s3 import set_s3_gdal_config
+from wps_shared.utils.s3_client import S3Client
 
-from app.auto_spatial_advisory.classify_hfi import classify_hfi
 from app.auto_spatial_advisory.hfi_filepath import (
     get_raster_tif_filename,
     get_snow_masked_hfi_filepath,
 )
-from app.auto_spatial_advisory.process_fuel_type_area import get_advisory_shape
 
 logger = logging.getLogger(__name__)
-DEM_GDAL_SOURCE = None
+
+# Number of TPI raster rows counted at a time.
+TPI_STATS_BLOCK_ROWS = 1024
+# TPI classes are 1 = valley bottom, 2 = mid slope, 3 = upper slope, 4 is the no data value of the TPI raster.
+TPI_CLASS_COUNT = 4
+# Classified HFI values are 0 = < 4k, 1 = 4k-10k, 2 = > 10k
+HFI_CLASS_COUNT = 3
 
 
 async def process_elevation_tpi(run_type: RunType, run_datetime: datetime, for_date: date):
@@ -73,189 +77,6 @@ async def process_elevation_tpi(run_type: RunType, run_datetime: datetime, for_d
     logger.info("%f delta count before and after processing elevation stats", delta)
 
 
-async def process_elevation(
-    source_path: str, run_type: RunType, run_datetime: datetime, for_date: date
-):
-    """Create new elevation statistics records for the given parameters.
-
-    :param run_type: The type of run to process. (is it a forecast or actual run?)
-    :param run_datetime: The date and time of the run to process. (when was the hfi file created?)
-    :param for_date: The date of the hfi to process. (when is the hfi for?)
-    """
-
-    logger.info(
-        "Processing elevation stats %s for run date: %s, for date: %s",
-        run_type,
-        run_datetime,
-        for_date,
-    )
-    perf_start = perf_counter()
-    await prepare_dem()
-
-    # Get the id from run_parameters associated with the provided runtype, for_date and for_datetime
-    async with get_async_read_session_scope() as session:
-        run_parameters_id = await get_run_parameters_id(session, run_type, run_datetime, for_date)
-
-        stmt = select(AdvisoryElevationStats).where(
-            AdvisoryElevationStats.run_parameters == run_parameters_id
-        )
-
-        exists = (await session.execute(stmt)).scalars().first() is not None
-        if not exists:
-            # The filename in our object store, prepended with "vsis3" - which tells GDAL to use
-            # it's S3 virtual file system driver to read the file.
-            # https://gdal.org/user/virtual_file_systems.html
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_filename = os.path.join(temp_dir, "classified.tif")
-                classify_hfi(source_path, temp_filename)
-                # thresholds: 1 = 4k-10k, 2 = >10k
-                thresholds = [1, 2]
-                for threshold in thresholds:
-                    await process_threshold(threshold, temp_filename, temp_dir, run_parameters_id)
-        else:
-            logger.info("Elevation stats already computed")
-
-    perf_end = perf_counter()
-    delta = perf_end - perf_start
-    logger.info("%f delta count before and after processing elevation stats", delta)
-    global DEM_GDAL_SOURCE
-    DEM_GDAL_SOURCE = None
-
-
-async def prepare_dem():
-    """
-    Fetches a dem from S3 storage, opens it with gdal and assigns it to a global variable
-    for use in other functions. This is a little clunky, but we only want to grab the dem from
-    object storage once because it is a slow process.
-    """
-    async with get_client() as (client, bucket):
-        dem = await client.get_object(Bucket=bucket, Key=f"dem/mosaics/{config.get('DEM_NAME')}")
-        mem_path = "/vsimem/dem.tif"
-        data = await dem["Body"].read()
-        gdal.FileFromMemBuffer(mem_path, data)
-        global DEM_GDAL_SOURCE
-        DEM_GDAL_SOURCE = gdal.Open(mem_path, gdal.GA_ReadOnly)
-        gdal.Unlink(mem_path)
-
-
-async def process_threshold(
-    threshold: int, source_path: str, temp_dir: str, run_parameters_id: int
-):
-    """
-    Step-by-step processing to extract elevation stats per advisory type per fire zone.
-
-    :param threshold: The current threshold being processed, 1 = 4k-10k, 2 = > 10k
-    :param source_path: A HFI tif that is classified with 0 = < 4k, 1 = 4k-10k, 2 = > 10k
-    :param temp_dir: A temporary location for storing intermediate files
-    :param run_parameters_id: The RunParameter object id associated with this run_type, for_date and run_datetime
-    """
-    threshold_mask_path = create_hfi_threshold_mask(threshold, source_path, temp_dir)
-    upsampled_threshold_mask_path = upsample_threshold_mask(
-        threshold, threshold_mask_path, temp_dir
-    )
-    masked_dem_path = apply_threshold_mask_to_dem(
-        threshold, upsampled_threshold_mask_path, temp_dir
-    )
-    await process_elevation_by_firezone(threshold, masked_dem_path, run_parameters_id)
-
-
-def create_hfi_threshold_mask(threshold: int, classified_hfi: str, temp_dir: str):
-    """
-    Creates a mask from a classified HFI tif wherein pixels that match the threshold are assigned a value of 1 and
-    all other pixels = 0.
-
-    :param threshold: The current threshold being processed, 1 = 4k-10k, 2 = > 10k
-    :param classified_hfi: The path to the classified HFI tif
-    :param temp_dir: A temporary location for storing intermediate files
-    """
-    target_path = os.path.join(temp_dir, f"hfi_mask_threshold_{threshold}.tif")
-    # Read the source data.
-    source_tiff = gdal.Open(classified_hfi, gdal.GA_ReadOnly)
-    source_band = source_tiff.GetRasterBand(1)
-    source_data = source_band.ReadAsArray()
-    # Classify the data according to the given threshold
-    classified = np.where(source_data == threshold, 1, 0)
-
-    # Remove any existing target file.
-    if os.path.exists(target_path):
-        os.remove(target_path)
-    output_driver = gdal.GetDriverByName("GTiff")
-    # Create an object with the same dimensions as the input, but with 8 bit unsigned values.
-    target_tiff = output_driver.Create(
-        target_path, xsize=source_band.XSize, ysize=source_band.YSize, bands=1, eType=gdal.GDT_Byte
-    )
-    # Set the geotransform and projection to the same as the input.
-    target_tiff.SetGeoTransform(source_tiff.GetGeoTransform())
-    target_tiff.SetProjection(source_tiff.GetProjection())
-
-    # Write the classified data to the band.
-    target_band = target_tiff.GetRasterBand(1)
-    target_band.SetNoDataValue(0)
-    target_band.WriteArray(classified)
-    target_tiff = None
-    return target_path
-
-
-def upsample_threshold_mask(threshold: int, source_path: str, temp_dir: str):
-    """
-    Increases the resolution of the masked HFI tif to match the DEM. This step is required in order to use raster
-    algebra to multiply the DEM by the output mask.
-
-    :param threshold: The current threshold being processed, 1 = 4k-10k, 2 = > 10k
-    :param source_path: The path to the mask tif that needs to be upsampled
-    :param temp_dir: A temporary location for storing intermediate files
-    """
-    upsampled_threshold_mask_path = os.path.join(
-        temp_dir, f"upsampled_threshold_{threshold}_mask.tif"
-    )
-    geo_transform = DEM_GDAL_SOURCE.GetGeoTransform()
-    x_res = geo_transform[1]
-    y_res = -geo_transform[5]
-    minx = geo_transform[0]
-    maxy = geo_transform[3]
-    maxx = minx + geo_transform[1] * DEM_GDAL_SOURCE.RasterXSize
-    miny = maxy + geo_transform[5] * DEM_GDAL_SOURCE.RasterYSize
-    extent = [minx, miny, maxx, maxy]
-    gdal.Warp(
-        upsampled_threshold_mask_path,
-        source_path,
-        outputBounds=extent,
-        xRes=x_res,
-        yRes=y_res,
-        resampleAlg=gdal.GRA_NearestNeighbour,
-    )
-    return upsampled_threshold_mask_path
-
-
-def apply_threshold_mask_to_dem(threshold: int, mask_path: str, temp_dir: str):
-    """
-    Multiplies the mask of HFI areas by the DEM. The resulting tif has elevation values at pixels where HFI exceeds the
-    specified threshold, all other pixels are 0.
-
-    :param threshold: The current threshold being processed, 1 = 4k-10k, 2 = > 10k
-    :param mask_path: The path to the mask tif
-    :param temp_dir: A temporary location for storing intermediate files
-    """
-    masked_dem_path = os.path.join(temp_dir, f"masked_dem_threshold_{threshold}.tif")
-    dem_band = DEM_GDAL_SOURCE.GetRasterBand(1)
-    dem_data = dem_band.ReadAsArray()
-    mask = gdal.Open(mask_path, gdal.GA_ReadOnly)
-    mask_data = mask.GetRasterBand(1).ReadAsArray()
-    masked_dem_data = np.multiply(dem_data, mask_data)
-    output_driver = gdal.GetDriverByName("GTiff")
-    masked_dem = output_driver.Create(
-        masked_dem_path, xsize=dem_band.XSize, ysize=dem_band.YSize, bands=1, eType=gdal.GDT_Int16
-    )
-    masked_dem.SetGeoTransform(DEM_GDAL_SOURCE.GetGeoTransform())
-    masked_dem.SetProjection(DEM_GDAL_SOURCE.GetProjection())
-    masked_dem_band = masked_dem.GetRasterBand(1)
-    masked_dem_band.SetNoDataValue(0)
-    masked_dem_band.WriteArray(masked_dem_data)
-    mask = None
-    masked_dem = None
-    return masked_dem_path
-
-
 @dataclass(frozen=True)
 class FireZoneTPIStats:
     """
@@ -270,197 +91,122 @@ class FireZoneTPIStats:
     pixel_size_metres: int
 
 
+def count_tpi_hfi_pixels_by_zone(
+    tpi_band: gdal.Band, hfi_band: gdal.Band, zone_band: gdal.Band, zone_count: int
+) -> np.ndarray:
+    """
+    Count the pixels of every combination of zone, TPI class and HFI class, reading the TPI, HFI and
+    zone id bands a block of rows at a time and counting each block with a single bincount over the
+    combined keys.
+
+    :param tpi_band: classified TPI band
+    :param hfi_band: classified HFI band, on the same grid as the TPI band
+    :param zone_band: zone id band on the same grid as the TPI band, 0 where a pixel is in no zone
+    :param zone_count: one more than the largest zone id
+    :return: pixel counts indexed by [zone id, TPI class, HFI class]
+    """
+    counts = np.zeros(zone_count * TPI_CLASS_COUNT * HFI_CLASS_COUNT, dtype=np.int64)
+    for yoff in range(0, tpi_band.YSize, TPI_STATS_BLOCK_ROWS):
+        rows = min(TPI_STATS_BLOCK_ROWS, tpi_band.YSize - yoff)
+        tpi = tpi_band.ReadAsArray(0, yoff, tpi_band.XSize, rows)
+        hfi = hfi_band.ReadAsArray(0, yoff, tpi_band.XSize, rows)
+        zones = zone_band.ReadAsArray(0, yoff, tpi_band.XSize, rows)
+        counted = (zones > 0) & (tpi >= 0) & (tpi < TPI_CLASS_COUNT) & (hfi >= 0) & (hfi < HFI_CLASS_COUNT)
+        keys = (
+            zones[counted].astype(np.int64) * TPI_CLASS_COUNT + tpi[counted]
+        ) * HFI_CLASS_COUNT + hfi[counted]
+        counts += np.bincount(keys, minlength=counts.size)
+    return counts.reshape(zone_count, TPI_CLASS_COUNT, HFI_CLASS_COUNT)
+
+
+def count_tpi_hfi_pixels(
+    tpi_source: gdal.Dataset, hfi_key: str, zone_id_raster_path: str, zone_count: int
+) -> np.ndarray:
+    """
+    Warp the classified HFI onto the TPI grid lazily, as a VRT, and count pixels by zone, TPI class and HFI class.
+
+    :return: pixel counts indexed by [zone id, TPI class, HFI class]
+    """
+    with (
+        gdal.Open(hfi_key, gdal.GA_ReadOnly) as hfi_source,
+        gdal.Open(zone_id_raster_path, gdal.GA_ReadOnly) as zone_source,
+    ):
+        warped_hfi = warp_to_match_raster(hfi_source, tpi_source, "", output_format="VRT")
+        try:
+            return count_tpi_hfi_pixels_by_zone(
+                tpi_source.GetRasterBand(1),
+                warped_hfi.GetRasterBand(1),
+                zone_source.GetRasterBand(1),
+                zone_count,
+            )
+        finally:
+            warped_hfi = None
+
+
+def get_fire_zone_tpi_stats(
+    counts: np.ndarray, shape_ids: list[int]
+) -> Dict[int, Dict[int, int]]:
+    """
+    Sum the TPI class pixel counts of every shape where HFI is advisory or warning level.
+
+    :param counts: pixel counts indexed by [zone id, TPI class, HFI class]
+    :param shape_ids: ids of the shapes to summarize, shapes without any pixels have zero counts
+    :return: {shape id: {TPI class: pixel count}}
+    """
+    high_hfi_counts = counts[:, :, 1:].sum(axis=2)
+    fire_zone_stats: Dict[int, Dict[int, int]] = {}
+    for shape_id in shape_ids:
+        zone_counts = high_hfi_counts[shape_id] if shape_id < len(high_hfi_counts) else None
+        fire_zone_stats[shape_id] = {
+            tpi_class: int(zone_counts[tpi_class]) if zone_counts is not None else 0
+            for tpi_class in range(1, TPI_CLASS_COUNT)
+        }
+    return fire_zone_stats
+
+
 async def process_tpi_by_firezone(run_type: RunType, run_datetime: datetime, for_date: date):
     """
     Given run parameters, lookup associated snow-masked HFI and static classified TPI geospatial data.
-    Cut out each fire zone shape from the above and intersect the TPI and HFI pixels, counting each pixel contributing to the TPI class.
-    Capture all fire zone stats keyed by its source_identifier.
+    Count the TPI pixels of every fire zone unit where HFI is above the advisory threshold, in one pass over
+    the TPI raster, the HFI raster warped onto the TPI grid and the persisted zone id raster of the TPI grid.
+    Fire zone units don't overlap, so every pixel belongs to at most one of them.
 
     :param run_type: forecast or actual
     :param run_datetime: datetime the sfms file was created
     :param for_date: date the computation is for
     :return: fire zone TPI status
     """
-
-    gdal.SetConfigOption("AWS_SECRET_ACCESS_KEY", config.get("OBJECT_STORE_SECRET"))
-    gdal.SetConfigOption("AWS_ACCESS_KEY_ID", config.get("OBJECT_STORE_USER_ID"))
-    gdal.SetConfigOption("AWS_S3_ENDPOINT", config.get("OBJECT_STORE_SERVER"))
-    gdal.SetConfigOption("AWS_VIRTUAL_HOSTING", "FALSE")
+    set_s3_gdal_config()
     bucket = config.get("OBJECT_STORE_BUCKET")
     dem_file = config.get("CLASSIFIED_TPI_DEM_NAME")
-    key = f"/vsis3/{bucket}/dem/tpi/{dem_file}"
     hfi_raster_filename = get_raster_tif_filename(for_date)
     hfi_raster_key = get_snow_masked_hfi_filepath(run_datetime, run_type, hfi_raster_filename)
     hfi_key = f"/vsis3/{bucket}/{hfi_raster_key}"
-    fire_zone_stats: Dict[int, Dict[int, int]] = {}
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # keep these large intermediate rasters on disk so the worker is not left
-        # holding a province-sized GDAL MEM dataset after processing completes.
-        warped_hfi_path = os.path.join(temp_dir, f"warp_{hfi_raster_filename}")
-        masked_tpi_path = os.path.join(temp_dir, "masked_hfi_tpi.tif")
-        pixel_size_metres = 0
-
-        with (
-            gdal.Open(key, gdal.GA_ReadOnly) as tpi_source,
-            gdal.Open(hfi_key, gdal.GA_ReadOnly) as hfi_source,
-        ):
-            pixel_size_metres = int(tpi_source.GetGeoTransform()[1])
-            resized_hfi_source = warp_to_match_raster(hfi_source, tpi_source, warped_hfi_path)
-            masked_tpi_source = None
-            try:
-                masked_tpi_source = raster_mul(
-                    tpi_source, resized_hfi_source, output_path=masked_tpi_path
-                )
-                masked_tpi_source.FlushCache()
-            finally:
-                masked_tpi_source = None
-                resized_hfi_source = None
-
-        async with get_async_write_session_scope() as session:
-            stmt = text("SELECT id, source_identifier FROM public.advisory_shapes;")
-            result = await session.execute(stmt)
-
-            with gdal.Open(masked_tpi_path, gdal.GA_ReadOnly) as hfi_masked_tpi:
-                hfi_masked_tpi_srs = hfi_masked_tpi.GetSpatialRef()
-
-                for row in result:
-                    output_path = os.path.join(temp_dir, f"firezone_{row[1]}.tif")
-                    cut_hfi_masked_tpi = None
-                    advisory_shape_geom = None
-                    zone_tpi_classes = None
-                    try:
-                        advisory_shape_geom = await get_advisory_shape(
-                            session, row[0], hfi_masked_tpi_srs
-                        )
-
-                        warp_options = gdal.WarpOptions(
-                            format="GTiff",
-                            cutlineWKT=advisory_shape_geom,
-                            cutlineSRS=advisory_shape_geom.GetSpatialReference(),
-                            cropToCutline=True,
-                        )
-                        cut_hfi_masked_tpi = gdal.Warp(
-                            output_path, hfi_masked_tpi, options=warp_options
-                        )
-                        zone_tpi_classes = cut_hfi_masked_tpi.GetRasterBand(1).ReadAsArray()
-                        tpi_classes, counts = np.unique(zone_tpi_classes, return_counts=True)
-                        tpi_class_freq_dist = dict(zip(tpi_classes, counts))
-
-                        # Drop TPI class 4, this is the no data value from the TPI raster
-                        tpi_class_freq_dist.pop(4, None)
-                        fire_zone_stats[row[0]] = tpi_class_freq_dist
-                    finally:
-                        zone_tpi_classes = None
-                        advisory_shape_geom = None
-                        cut_hfi_masked_tpi = None
 
+    async with get_async_read_session_scope() as session:
+        fire_zone_shape_type_id = await get_fire_zone_unit_shape_type_id(session)
+        zone_units = await get_fire_zone_units(session, fire_zone_shape_type_id)
+        zone_srs = osr.SpatialReference()
+        zone_srs.ImportFromEPSG(await get_table_srid(session, Shape) or NAD83_BC_ALBERS)
+        zone_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    zones = [(zone.id, to_shape(zone.geom).wkb) for zone in zone_units]
+    zone_count = max((zone_id for zone_id, _ in zones), default=0) + 1
+
+    async with S3Client() as s3_client:
+        tpi_path = await get_raster_cache().get_path(s3_client, f"dem/tpi/{dem_file}")
+        with gdal.Open(tpi_path, gdal.GA_ReadOnly) as tpi_source:
+            pixel_size_metres = int(tpi_source.GetGeoTransform()[1])
+            zone_id_raster_path = await get_zone_id_raster_path(
+                s3_client, tpi_source, zones, zone_srs
+            )
+            counts = await asyncio.to_thread(
+                count_tpi_hfi_pixels, tpi_source, hfi_key, zone_id_raster_path, zone_count
+            )
+
+    fire_zone_stats = get_fire_zone_tpi_stats(counts, [zone_id for zone_id, _ in zones])
     return FireZoneTPIStats(fire_zone_stats=fire_zone_stats, pixel_size_metres=pixel_size_metres)
 
 
-async def process_elevation_by_firezone(
-    threshold: int, masked_dem_path: str, run_parameters_id: int
-):
-    """
-    Given a tif that only contains elevations values at pixels where HFI exceeds the threshold, calculate statistics
-    and store them in the API database.
-
-    :param threshold: The current threshold being processed, 1 = 4k-10k, 2 = > 10k
-    :param mask_dem_path: The path to the dem that has had the upsampled hfi mask applied
-    :param run_parameters_id: The RunParameter object id associated with this run_type, for_date and run_datetime
-    """
-    async with get_async_write_session_scope() as session:
-        stmt = text("SELECT id, source_identifier FROM advisory_shapes;")
-        result = await session.execute(stmt)
-        rows = result.all()
-        for row in rows:
-            # using a temp dir here to prevent accumulation of large rasters as we run through this loop
-            with tempfile.TemporaryDirectory() as temp_dir:
-                firezone_elevation_threshold_path = intersect_raster_by_firezone(
-                    threshold, row[0], row[1], masked_dem_path, temp_dir
-                )
-                stats = get_elevation_stats(firezone_elevation_threshold_path)
-                await store_elevation_stats(session, threshold, row[0], stats, run_parameters_id)
-
-
-def intersect_raster_by_firezone(
-    threshold: int, advisory_shape_id: int, source_identifier: str, raster_path: str, temp_dir: str
-):
-    """
-    Given a raster and a fire zone id, use gdal.Warp to clip out a fire zone from which we can retrieve stats.
-
-    :param threshold: The current threshold being processed, 1 = 4k-10k, 2 = > 10k
-    :param advisory_shape_id: The id of the fire zone (aka advisory_shape object) to clip with
-    :param source_identifier: The source identifier of the fire zone.
-    :param raster_path: The path to the raster to be clipped.
-    :param temp_dir: A temporary location for storing intermediate files
-    """
-    output_path = os.path.join(temp_dir, f"firezone_{source_identifier}_threshold_{threshold}.tif")
-    warp_options = gdal.WarpOptions(
-        format="GTiff",
-        cutlineDSName=DB_READ_STRING,
-        cutlineSQL=f"SELECT geom FROM public.advisory_shapes WHERE id={advisory_shape_id}",
-        cropToCutline=True,
-    )
-    gdal.Warp(output_path, raster_path, options=warp_options)
-    return output_path
-
-
-def get_elevation_stats(source_path: str):
-    """
-    Extracts basic statistics from a raster.
-
-    :param source_path: The path to the raster of interest.
-    """
-    source = gdal.Open(source_path, gdal.GA_ReadOnly)
-    source_band = source.GetRasterBand(1)
-    source_data = source_band.ReadAsArray()
-    max_elevation = np.max(source_data)
-    if max_elevation == 0:
-        median = 0
-        minimum = 0
-        maximum = 0
-        quartile_25 = 0
-        quartile_75 = 0
-    else:
-        median = np.median(source_data[source_data != 0])
-        minimum = np.min(source_data[source_data != 0])
-        maximum = np.max(source_data[source_data != 0])
-        quartile_25 = np.percentile(source_data[source_data != 0], 25)
-        quartile_75 = np.percentile(source_data[source_data != 0], 75)
-    return {
-        "minimum": minimum,
-        "maximum": maximum,
-        "median": median,
-        "quartile_25": quartile_25,
-        "quartile_75": quartile_75,
-    }
-
-
-async def store_elevation_stats(
-    session: AsyncSession, threshold: int, shape_id: int, stats, run_parameters_id
-):
-    """
-    Writes elevation statistics to the API database.
-    TODO - We should probably save up a list of objects to add to the database and only call this function once
-    per threshold.
-
-    :param threshold: The current threshold being processed, 1 = 4k-10k, 2 = > 10k
-    :param shape_id: The advisory shape id.
-    :param run_parameters_id: The RunParameter object id associated with this run_type, for_date and run_datetime
-    """
-    advisory_elevation_stats = AdvisoryElevationStats(
-        advisory_shape_id=shape_id,
-        minimum=stats["minimum"],
-        maximum=stats["maximum"],
-        median=stats["median"],
-        quartile_25=stats["quartile_25"],
-        quartile_75=stats["quartile_75"],
-        run_parameters=run_parameters_id,
-        threshold=threshold,
-    )
-    await save_advisory_elevation_stats(session, advisory_elevation_stats)
-
-
 async def store_elevation_tpi_stats(
     session: AsyncSession, run_parameters_id: int, fire_zone_tpi_stats: FireZoneTPIStats
 ):
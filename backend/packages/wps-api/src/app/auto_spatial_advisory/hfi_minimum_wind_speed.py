@@ -24,9 +24,11 @@ from wps_shared.db.models.auto_spatial_advisory import (
     HfiClassificationThresholdEnum,
     Shape,
 )
-from wps_shared.geospatial.geospatial import prepare_wkt_geom_for_gdal, rasters_match
+from wps_shared.geospatial.geospatial import rasters_match
+from wps_shared.geospatial.zone_index import get_zone_index
 from wps_shared.run_type import RunType
 from wps_shared.utils.s3 import set_s3_gdal_config
+from wps_shared.utils.s3_client import S3Client
 from wps_shared.utils.time import convert_to_sfms_timezone
 from wps_shared.wps_logging import configure_logging
 
@@ -106,6 +108,8 @@ async def process_min_wind_speed_by_zone(
 
     source_srs = osr.SpatialReference()
     source_srs.ImportFromEPSG(srid)
+    source_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    zones = [(zone.id, to_shape(zone.geom).wkb) for zone in zone_units]
 
     wind_speed_key = get_wind_spd_s3_key(run_type, run_datetime, for_date)
     hfi_key = get_hfi_s3_key(run_type, run_datetime, for_date)
@@ -115,44 +119,27 @@ async def process_min_wind_speed_by_zone(
         if not rasters_match(wind_ds, hfi_ds):
             logger.error(f"{wind_speed_key} and {hfi_key} do not match.")
             return
-        for zone in zone_units:
-            zone_wkb = zone.geom
-            shapely_geom = to_shape(zone_wkb)
-            zone_wkt = shapely_geom.wkt
-            zone_geom = prepare_wkt_geom_for_gdal(zone_wkt, source_srs)
-
-            warp_options = gdal.WarpOptions(
-                cutlineWKT=zone_geom, cutlineSRS=zone_geom.GetSpatialReference(), cropToCutline=True
-            )
-
-            wind_path = "/vsimem/zone_wind.tif"
-            hfi_path = "/vsimem/zone_hfi.tif"
-            wind_intersected_ds = None
-            hfi_intersected_ds = None
-            try:
-                wind_intersected_ds = gdal.Warp(wind_path, wind_ds, options=warp_options)
-                wind_band = wind_intersected_ds.GetRasterBand(1)
-                wind_array_clip = wind_band.ReadAsArray()
-                wind_nodata = wind_band.GetNoDataValue()
-
-                hfi_intersected_ds = gdal.Warp(hfi_path, hfi_ds, options=warp_options)
-                hfi_array_clip = hfi_intersected_ds.GetRasterBand(1).ReadAsArray()
-
-                # Compute minimum wind speed for each HFI range
-                hfi_min_wind_speeds = get_minimum_wind_speed_for_hfi(
-                    wind_array_clip, hfi_array_clip, advisory_id_lut, wind_nodata
-                )
-
-                records_to_save = create_hfi_wind_speed_record(
-                    zone.id, hfi_min_wind_speeds, run_parameters_id
-                )
-
-                all_hfi_min_wind_speeds_to_save.extend(records_to_save)
-            finally:
-                wind_intersected_ds = None
-                hfi_intersected_ds = None
-                gdal.Unlink(wind_path)
-                gdal.Unlink(hfi_path)
+        async with S3Client() as s3_client:
+            zone_index = await get_zone_index(s3_client, hfi_ds, zones, source_srs)
+        wind_band = wind_ds.GetRasterBand(1)
+        wind_array = wind_band.ReadAsArray()
+        wind_nodata = wind_band.GetNoDataValue()
+        hfi_array = hfi_ds.GetRasterBand(1).ReadAsArray()
+
+    for zone in zone_units:
+        # Compute minimum wind speed for each HFI range
+        hfi_min_wind_speeds = get_minimum_wind_speed_for_hfi(
+            zone_index.values(wind_array, zone.id),
+            zone_index.values(hfi_array, zone.id),
+            advisory_id_lut,
+            wind_nodata,
+        )
+
+        records_to_save = create_hfi_wind_speed_record(
+            zone.id, hfi_min_wind_speeds, run_parameters_id
+        )
+
+        all_hfi_min_wind_speeds_to_save.extend(records_to_save)
 
     save_all_hfi_wind_speeds(session, all_hfi_min_wind_speeds_to_save)
 
@@ -21,7 +21,8 @@ from wps_shared.db.crud.auto_spatial_advisory import (
 from wps_shared.db.crud.fuel_layer import get_fuel_type_raster_by_year
 from wps_shared.db.database import get_async_write_session_scope
 from wps_shared.db.models.auto_spatial_advisory import AdvisoryHFIPercentConifer, Shape
-from wps_shared.geospatial.geospatial import prepare_wkt_geom_for_gdal, rasters_match
+from wps_shared.geospatial.geospatial import rasters_match
+from wps_shared.geospatial.zone_index import get_zone_index
 from wps_shared.run_type import RunType
 from wps_shared.utils.s3 import set_s3_gdal_config
 from wps_shared.utils.s3_client import S3Client
@@ -110,58 +111,39 @@ async def process_min_percent_conifer_by_zone(
 
     source_srs = osr.SpatialReference()
     source_srs.ImportFromEPSG(srid)
+    source_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    zones = [(zone.id, to_shape(zone.geom).wkb) for zone in zone_units]
 
     async with S3Client() as s3_client:
         pct_conifer_key = await get_percent_conifer_s3_key(for_date, s3_client)
-    if not pct_conifer_key:
-        return
+        if not pct_conifer_key:
+            return
+
+        hfi_key = get_hfi_s3_key(run_type, run_datetime, for_date)
 
-    hfi_key = get_hfi_s3_key(run_type, run_datetime, for_date)
+        with gdal.Open(pct_conifer_key) as conifer_ds, gdal.Open(hfi_key) as hfi_ds:
+            if not rasters_match(conifer_ds, hfi_ds):
+                logger.error(f"{pct_conifer_key} and {hfi_key} do not match.")
+                return
+            zone_index = await get_zone_index(s3_client, hfi_ds, zones, source_srs)
+            pct_conifer_array = conifer_ds.GetRasterBand(1).ReadAsArray()
+            hfi_array = hfi_ds.GetRasterBand(1).ReadAsArray()
 
     all_hfi_conifer_percent_to_save: list[AdvisoryHFIPercentConifer] = []
-    with gdal.Open(pct_conifer_key) as conifer_ds, gdal.Open(hfi_key) as hfi_ds:
-        if not rasters_match(conifer_ds, hfi_ds):
-            logger.error(f"{pct_conifer_key} and {hfi_key} do not match.")
-            return
-        for zone in zone_units:
-            zone_wkb = zone.geom
-            shapely_geom = to_shape(zone_wkb)
-            zone_wkt = shapely_geom.wkt
-            zone_geom = prepare_wkt_geom_for_gdal(zone_wkt, source_srs)
-
-            warp_options = gdal.WarpOptions(
-                cutlineWKT=zone_geom, cutlineSRS=zone_geom.GetSpatialReference(), cropToCutline=True
-            )
+    for zone in zone_units:
+        min_pct_conifer = get_minimum_percent_conifer_for_hfi(
+            zone_index.values(pct_conifer_array, zone.id), zone_index.values(hfi_array, zone.id)
+        )
 
-            conifer_path = "/vsimem/percent_conifer.tif"
-            hfi_path = "/vsimem/zone_hfi.tif"
-            conifer_intersected_ds = None
-            hfi_intersected_ds = None
-            try:
-                conifer_intersected_ds = gdal.Warp(conifer_path, conifer_ds, options=warp_options)
-                pct_conifer_clip = conifer_intersected_ds.GetRasterBand(1).ReadAsArray()
-
-                hfi_intersected_ds = gdal.Warp(hfi_path, hfi_ds, options=warp_options)
-                hfi_array_clip = hfi_intersected_ds.GetRasterBand(1).ReadAsArray()
-
-                min_pct_conifer = get_minimum_percent_conifer_for_hfi(
-                    pct_conifer_clip, hfi_array_clip
-                )
-
-                if min_pct_conifer:
-                    record = AdvisoryHFIPercentConifer(
-                        advisory_shape_id=zone.id,
-                        fuel_type=mixed_fuel_record.id,
-                        run_parameters=run_parameters_id,
-                        min_percent_conifer=int(min_pct_conifer),
-                        fuel_type_raster_id=fuel_type_raster_id,
-                    )
-                    all_hfi_conifer_percent_to_save.append(record)
-            finally:
-                conifer_intersected_ds = None
-                hfi_intersected_ds = None
-                gdal.Unlink(conifer_path)
-                gdal.Unlink(hfi_path)
+        if min_pct_conifer:
+            record = AdvisoryHFIPercentConifer(
+                advisory_shape_id=zone.id,
+                fuel_type=mixed_fuel_record.id,
+                run_parameters=run_parameters_id,
+                min_percent_conifer=int(min_pct_conifer),
+                fuel_type_raster_id=fuel_type_raster_id,
+            )
+            all_hfi_conifer_percent_to_save.append(record)
 
     await save_all_percent_conifer(session, all_hfi_conifer_percent_to_save)
 
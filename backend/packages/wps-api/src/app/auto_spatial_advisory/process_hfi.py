@@ -1,27 +1,29 @@
 """Code relating to processing HFI GeoTIFF files, and storing resultant data."""
 
+import asyncio
 import logging
 import os
 from datetime import date, datetime, timedelta
 from time import perf_counter
 import tempfile
+from typing import Optional
 from shapely import wkb, wkt
 from shapely.validation import make_valid
-from osgeo import ogr, osr
+from osgeo import gdal, ogr, osr
 from app.auto_spatial_advisory.common import get_hfi_s3_key
 from wps_shared.db.models.auto_spatial_advisory import ClassifiedHfi, HfiClassificationThreshold, RunTypeEnum
 from wps_shared.db.database import get_async_read_session_scope, get_async_write_session_scope
 from wps_shared.db.crud.auto_spatial_advisory import save_hfi, get_hfi_classification_threshold, HfiClassificationThresholdEnum, save_run_parameters, get_run_parameters_id
 from wps_shared.db.crud.snow import get_most_recent_processed_snow_by_date
-from wps_shared.db.models.snow import SnowSourceEnum
-from app.auto_spatial_advisory.classify_hfi import classify_hfi
+from wps_shared.db.models.snow import ProcessedSnow, SnowSourceEnum
+from app.auto_spatial_advisory.classify_hfi import classify_hfi_array, create_classified_hfi_dataset
 from wps_shared.run_type import RunType
-from app.auto_spatial_advisory.snow import apply_snow_mask
-from wps_shared.geospatial.geospatial import NAD83_BC_ALBERS
+from app.auto_spatial_advisory.snow import get_snow_covered_pixels
+from wps_shared.geospatial.geospatial import NAD83_BC_ALBERS, get_geotiff_bytes
 from app.auto_spatial_advisory.hfi_filepath import get_pmtiles_filename, get_pmtiles_filepath, get_snow_masked_hfi_filepath, get_raster_tif_filename
 from wps_shared.utils.polygonize import polygonize_in_memory
-from app.utils.pmtiles import tippecanoe_wrapper, write_geojson
-from wps_shared.utils.s3 import get_client
+from app.utils.pmtiles import write_pmtiles
+from wps_shared.utils.s3 import get_client, set_s3_gdal_config
 
 
 logger = logging.getLogger(__name__)
@@ -77,6 +79,22 @@ def create_model_object(
     )
 
 
+def classify_and_snow_mask_hfi(hfi_key: str, last_processed_snow: Optional[ProcessedSnow]) -> gdal.Dataset:
+    """
+    Classify the HFI raster and mask out snow covered pixels in memory, reading the HFI raster once.
+
+    :param hfi_key: path to the HFI raster
+    :param last_processed_snow: the snow coverage to mask with, None to skip snow masking
+    :return: MEM dataset of snow masked, classified HFI
+    """
+    set_s3_gdal_config()
+    with gdal.Open(hfi_key, gdal.GA_ReadOnly) as hfi_ds:
+        classified = classify_hfi_array(hfi_ds.GetRasterBand(1).ReadAsArray())
+        if last_processed_snow is not None:
+            classified[get_snow_covered_pixels(hfi_ds, last_processed_snow)] = 0
+        return create_classified_hfi_dataset(classified, hfi_ds)
+
+
 async def process_hfi(run_type: RunType, run_datetime: datetime, for_date: date):
     """Create a new hfi record for the given date.
 
@@ -100,16 +118,14 @@ async def process_hfi(run_type: RunType, run_datetime: datetime, for_date: date)
     logger.info(f"Key to HFI in object storage: {hfi_key}")
     async with get_client() as (client, bucket):
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_filename = os.path.join(temp_dir, "classified.tif")
-            classify_hfi(hfi_key, temp_filename)
             # If something has gone wrong with the collection of snow coverage data and it has not been collected
             # within 7 days of the SFMS run datetime, don't apply an old snow mask, work with the classified hfi data as is
             if last_processed_snow is None or last_processed_snow[0].for_date + timedelta(days=7) < run_datetime:
                 logger.info("No recently processed snow data found. Proceeding with non-masked hfi data.")
-                working_hfi_path = temp_filename
+                snow = None
             else:
-                # Create a snow coverage mask from previously downloaded snow data.
-                working_hfi_path = await apply_snow_mask(temp_filename, last_processed_snow[0], temp_dir)
+                snow = last_processed_snow[0]
+            classified_hfi = await asyncio.to_thread(classify_and_snow_mask_hfi, hfi_key, snow)
 
             raster_filename = get_raster_tif_filename(for_date)
             raster_key = get_snow_masked_hfi_filepath(run_datetime, run_type, raster_filename)
@@ -118,17 +134,14 @@ async def process_hfi(run_type: RunType, run_datetime: datetime, for_date: date)
                 Bucket=bucket,
                 Key=raster_key,
                 ACL=HFI_GEOSPATIAL_PERMISSIONS,  # We need these to be accessible to everyone
-                Body=open(working_hfi_path, "rb"),
+                Body=get_geotiff_bytes(classified_hfi),
             )
             logger.info("Done uploading %s", raster_key)
-            with polygonize_in_memory(working_hfi_path, "hfi", "hfi") as layer:
-                # We need a geojson file to pass to tippecanoe
-                temp_geojson = write_geojson(layer, temp_dir)
-
+            with polygonize_in_memory(classified_hfi, "hfi", "hfi") as layer:
                 pmtiles_filename = get_pmtiles_filename(for_date)
                 temp_pmtiles_filepath = os.path.join(temp_dir, pmtiles_filename)
                 logger.info(f"Writing pmtiles -- {pmtiles_filename}")
-                tippecanoe_wrapper(temp_geojson, temp_pmtiles_filepath, min_zoom=HFI_PMTILES_MIN_ZOOM, max_zoom=HFI_PMTILES_MAX_ZOOM)
+                write_pmtiles(layer, temp_pmtiles_filepath, min_zoom=HFI_PMTILES_MIN_ZOOM, max_zoom=HFI_PMTILES_MAX_ZOOM)
 
                 key = get_pmtiles_filepath(run_datetime, run_type, pmtiles_filename)
                 logger.info(f"Uploading file {pmtiles_filename} to {key}")
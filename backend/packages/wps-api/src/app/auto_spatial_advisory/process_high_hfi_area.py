@@ -1,22 +1,85 @@
 """Code relating to processing high HFI area per fire zone"""
 
+import asyncio
 import logging
 from datetime import date, datetime
-from sqlalchemy.future import select
 from time import perf_counter
-from sqlalchemy.ext.asyncio import AsyncSession
-from wps_shared.run_type import RunType
+
+import numpy as np
+from geoalchemy2.shape import to_shape
+from osgeo import gdal, osr
+from sqlalchemy.future import select
+from wps_shared import config
+from wps_shared.db.crud.auto_spatial_advisory import (
+    HfiClassificationThresholdEnum,
+    get_fire_zone_unit_shape_type_id,
+    get_fire_zone_units,
+    get_hfi_classification_threshold,
+    get_run_parameters_id,
+    get_table_srid,
+    save_high_hfi_areas,
+)
 from wps_shared.db.database import get_async_write_session_scope
-from wps_shared.db.models.auto_spatial_advisory import HighHfiArea
-from wps_shared.db.crud.auto_spatial_advisory import get_run_parameters_id, calculate_high_hfi_areas, save_high_hfi_area
+from wps_shared.db.models.auto_spatial_advisory import HighHfiArea, Shape
+from wps_shared.geospatial.geospatial import NAD83_BC_ALBERS, rasterize_zone_ids
+from wps_shared.run_type import RunType
+from wps_shared.utils.s3 import set_s3_gdal_config
 
+from app.auto_spatial_advisory.hfi_filepath import (
+    get_raster_tif_filename,
+    get_snow_masked_hfi_filepath,
+)
 
 logger = logging.getLogger(__name__)
 
+# Pixel values of the classified hfi raster, 1 = 4k-10k (advisory), 2 = > 10k (warning)
+HFI_ADVISORY_CLASS = 1
+HFI_WARNING_CLASS = 2
+
+
+def count_high_hfi_pixels_by_zone(classified_hfi: np.ndarray, zone_ids: np.ndarray) -> np.ndarray:
+    """
+    Counts advisory and warning pixels in every zone with a single bincount over both rasters.
+
+    :param classified_hfi: classified hfi values, on the same grid as zone_ids
+    :param zone_ids: zone id of every pixel, 0 where a pixel is in no zone
+    :return: pixel counts indexed by [zone id, hfi class]
+    """
+    in_zone_high_hfi = (
+        (zone_ids > 0) & (classified_hfi >= HFI_ADVISORY_CLASS) & (classified_hfi <= HFI_WARNING_CLASS)
+    )
+    zones = zone_ids[in_zone_high_hfi].astype(np.int64)
+    classes = classified_hfi[in_zone_high_hfi].astype(np.int64)
+    zone_count = int(zone_ids.max(initial=0)) + 1
+    class_count = HFI_WARNING_CLASS + 1
+    counts = np.bincount(zones * class_count + classes, minlength=zone_count * class_count)
+    return counts.reshape(zone_count, class_count)
+
 
-async def write_high_hfi_area(session: AsyncSession, row: any, run_parameters_id: int):
-    high_hfi_area = HighHfiArea(advisory_shape_id=row.shape_id, run_parameters=run_parameters_id, area=row.area, threshold=row.threshold)
-    await save_high_hfi_area(session, high_hfi_area)
+def calculate_high_hfi_areas(
+    classified_hfi_path: str, zones: list[tuple[int, bytes]], zone_srs: osr.SpatialReference
+) -> list[tuple[int, int, float]]:
+    """
+    Sums the area in each fire zone with 4000 <= HFI < 10000 (aka 'advisory_area') and HFI >= 10000 (aka 'warn_area'),
+    directly from the classified hfi raster and a zone id raster on the same grid.
+
+    :param classified_hfi_path: path to the snow masked, classified hfi raster
+    :param zones: (shape id, WKB geometry) pairs for every fire zone
+    :param zone_srs: spatial reference of the zone geometries
+    :return: (shape id, hfi class, area in square metres) for every zone and class with any area
+    """
+    with gdal.Open(classified_hfi_path, gdal.GA_ReadOnly) as classified_hfi_ds:
+        classified_hfi = classified_hfi_ds.GetRasterBand(1).ReadAsArray()
+        zone_ids = rasterize_zone_ids(classified_hfi_ds, zones, zone_srs)
+        geo_transform = classified_hfi_ds.GetGeoTransform()
+    pixel_area = abs(geo_transform[1] * geo_transform[5])
+
+    counts = count_high_hfi_pixels_by_zone(classified_hfi, zone_ids)
+    shape_ids, hfi_classes = np.nonzero(counts)
+    return [
+        (int(shape_id), int(hfi_class), float(counts[shape_id, hfi_class] * pixel_area))
+        for shape_id, hfi_class in zip(shape_ids, hfi_classes)
+    ]
 
 
 async def process_high_hfi_area(run_type: RunType, run_datetime: datetime, for_date: date):
@@ -37,12 +100,33 @@ async def process_high_hfi_area(run_type: RunType, run_datetime: datetime, for_d
         exists = (await session.execute(stmt)).scalars().first() is not None
 
         if not exists:
+            advisory = await get_hfi_classification_threshold(session, HfiClassificationThresholdEnum.ADVISORY)
+            warning = await get_hfi_classification_threshold(session, HfiClassificationThresholdEnum.WARNING)
+            threshold_ids = {HFI_ADVISORY_CLASS: advisory.id, HFI_WARNING_CLASS: warning.id}
+
+            fire_zone_shape_type_id = await get_fire_zone_unit_shape_type_id(session)
+            zone_units = await get_fire_zone_units(session, fire_zone_shape_type_id)
+            zones = [(zone.id, to_shape(zone.geom).wkb) for zone in zone_units]
+            zone_srs = osr.SpatialReference()
+            zone_srs.ImportFromEPSG(await get_table_srid(session, Shape) or NAD83_BC_ALBERS)
+            zone_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+
+            set_s3_gdal_config()
+            bucket = config.get("OBJECT_STORE_BUCKET")
+            raster_key = get_snow_masked_hfi_filepath(run_datetime, run_type, get_raster_tif_filename(for_date))
+            classified_hfi_path = f"/vsis3/{bucket}/{raster_key}"
+
             logger.info("Getting high HFI area per zone...")
-            high_hfi_areas = await calculate_high_hfi_areas(session, run_type, run_datetime, for_date)
+            high_hfi_areas = await asyncio.to_thread(calculate_high_hfi_areas, classified_hfi_path, zones, zone_srs)
 
             logger.info("Writing high HFI areas...")
-            for row in high_hfi_areas:
-                await write_high_hfi_area(session, row, run_parameters_id)
+            await save_high_hfi_areas(
+                session,
+                [
+                    HighHfiArea(advisory_shape_id=shape_id, run_parameters=run_parameters_id, area=area, threshold=threshold_ids[hfi_class])
+                    for shape_id, hfi_class, area in high_hfi_areas
+                ],
+            )
         else:
             logger.info("High hfi area already processed")
 
@@ -1,18 +1,44 @@
+import asyncio
 import logging
 from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
 
 from firebase_admin import exceptions as firebase_exceptions
 from firebase_admin import messaging
 from sqlalchemy.ext.asyncio import AsyncSession
 from wps_shared import config
 from wps_shared.db.crud.auto_spatial_advisory import ZoneAdvisoryStatus, get_zones_with_advisories
-from wps_shared.db.crud.fcm import get_device_tokens_for_zone, update_device_tokens_are_active
+from wps_shared.db.crud.fcm import get_device_tokens_for_zones, update_device_tokens_are_active
 from wps_shared.db.models.auto_spatial_advisory import RunTypeEnum
 from wps_shared.utils.time import get_vancouver_now
 
 logger = logging.getLogger(__name__)
 
 FCM_BATCH_SIZE = 500
+# Multicast batches are sent concurrently, with at most this many in flight,
+FCM_MAX_CONCURRENT_SENDS = int(config.get("FCM_MAX_CONCURRENT_SENDS", 4))
+# and at most this many started per second, to stay clear of the FCM send quota. 0 disables the limit.
+FCM_MAX_SENDS_PER_SECOND = float(config.get("FCM_MAX_SENDS_PER_SECOND", 10))
+
+# Sends a multicast message, e.g. messaging.send_each_for_multicast_async or a fake for testing.
+MulticastSender = Callable[[messaging.MulticastMessage], Awaitable[messaging.BatchResponse]]
+
+
+class SendRateLimiter:
+    """Spaces out the start of multicast sends, so that at most sends_per_second start every second."""
+
+    def __init__(self, sends_per_second: float):
+        self.interval = 1 / sends_per_second if sends_per_second > 0 else 0
+        self.next_send = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            delay = self.next_send - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_send = max(now, self.next_send) + self.interval
 
 
 def build_notification_content(zone_with_advisory: ZoneAdvisoryStatus, for_date: date):
@@ -58,7 +84,11 @@ def build_fcm_message(
 
 
 async def trigger_notifications(
-    session: AsyncSession, run_type: RunTypeEnum, run_datetime: datetime, for_date: date
+    session: AsyncSession,
+    run_type: RunTypeEnum,
+    run_datetime: datetime,
+    for_date: date,
+    send_multicast: Optional[MulticastSender] = None,
 ) -> None:
     if run_type == RunTypeEnum.actual:
         return
@@ -84,6 +114,7 @@ async def trigger_notifications(
     logger.info(
         f"{len(zones_with_advisories)} have warnings/advisories, checking for devices to notify"
     )
+    zones_to_notify = []
     for zone_with_advisory in zones_with_advisories:
         if not zone_with_advisory.placename_label:
             logger.error(
@@ -91,9 +122,18 @@ async def trigger_notifications(
                 zone_with_advisory.source_identifier,
             )
             continue
-        device_tokens = await get_device_tokens_for_zone(
-            session, zone_with_advisory.source_identifier
-        )
+        zones_to_notify.append(zone_with_advisory)
+    if not zones_to_notify:
+        return
+
+    # resolve the subscriptions for every zone in one query
+    tokens_by_zone = await get_device_tokens_for_zones(
+        session, [zone.source_identifier for zone in zones_to_notify]
+    )
+
+    batches = []
+    for zone_with_advisory in zones_to_notify:
+        device_tokens = tokens_by_zone.get(zone_with_advisory.source_identifier, [])
         if len(device_tokens) == 0:
             logger.info(f"No devices subscribed to {zone_with_advisory.placename_label}")
             continue
@@ -101,11 +141,23 @@ async def trigger_notifications(
             f"{len(device_tokens)} are subscribed to {zone_with_advisory.placename_label} about to notify"
         )
         for i in range(0, len(device_tokens), FCM_BATCH_SIZE):
-            batch = device_tokens[i : i + FCM_BATCH_SIZE]
-            message = build_fcm_message(for_date, zone_with_advisory, batch)
+            batches.append((zone_with_advisory, device_tokens[i : i + FCM_BATCH_SIZE]))
+    if not batches:
+        return
+
+    send = send_multicast or messaging.send_each_for_multicast_async
+    semaphore = asyncio.Semaphore(FCM_MAX_CONCURRENT_SENDS)
+    rate_limiter = SendRateLimiter(FCM_MAX_SENDS_PER_SECOND)
+
+    async def send_batch(
+        zone_with_advisory: ZoneAdvisoryStatus, batch: list[str]
+    ) -> Optional[messaging.BatchResponse]:
+        message = build_fcm_message(for_date, zone_with_advisory, batch)
+        async with semaphore:
+            await rate_limiter.wait()
             try:
                 logger.info(f"Notifiying {len(batch)} devices")
-                response = await messaging.send_each_for_multicast_async(message)
+                return await send(message)
             except firebase_exceptions.FirebaseError:
                 logger.exception(
                     "FCM send failed for zone=%s date=%s token_count=%d",
@@ -113,19 +165,30 @@ async def trigger_notifications(
                     for_date,
                     len(batch),
                 )
-                continue
-            await handle_fcm_response(
-                session, for_date, zone_with_advisory.placename_label, batch, response
-            )
+                return None
 
+    responses = await asyncio.gather(*(send_batch(zone, batch) for zone, batch in batches))
 
-async def handle_fcm_response(
-    session: AsyncSession,
+    permanently_failed = []
+    for (zone_with_advisory, batch), response in zip(batches, responses):
+        if response is None:
+            continue
+        permanently_failed.extend(
+            handle_fcm_response(for_date, zone_with_advisory.placename_label, batch, response)
+        )
+
+    # deactivate the invalid tokens from every batch in one update
+    if permanently_failed:
+        await update_device_tokens_are_active(session, permanently_failed, False)
+
+
+def handle_fcm_response(
     for_date: date,
     placename_label: str,
     device_tokens: list[str],
     response: messaging.BatchResponse,
-):
+) -> list[str]:
+    """Log the outcome of a multicast send, and return the tokens that should be deactivated."""
     logger.info(
         f"Received FCM response with successful notifications sent: {response.success_count}"
     )
@@ -149,5 +212,4 @@ async def handle_fcm_response(
             len(device_tokens),
         )
 
-    if permanently_failed:
-        await update_device_tokens_are_active(session, permanently_failed, False)
+    return permanently_failed
@@ -1,8 +1,14 @@
+import asyncio
 import logging
+from collections import defaultdict
 from datetime import datetime, time, timedelta, timezone
+from typing import Optional
 
+import numpy as np
 from aiohttp import ClientSession
+from cffdrs_vec.fbp import FUEL_TYPE_CODES, vectorized_primary_fire_behaviour_prediction
 from wps_wf1.wfwx_api import WfwxApi
+from app.fire_behaviour import cffdrs
 from app.fire_behaviour.prediction import (
     FireBehaviourPrediction,
     calculate_fire_behaviour_prediction,
@@ -11,7 +17,7 @@ from app.morecast_v2.forecasts import calculate_fwi_from_seed_indeterminates
 from sqlalchemy.ext.asyncio import AsyncSession
 from wps_shared.db.crud.fire_watch import (
     get_all_prescription_status,
-    get_fire_watch_weather_by_fire_watch_id_and_model_run,
+    get_fire_watch_weather_by_fire_watch_ids_and_model_run,
     get_fire_watches_missing_weather_for_run,
 )
 from wps_shared.db.crud.hfi_calc import get_fire_centre_station_codes
@@ -21,17 +27,22 @@ from wps_shared.db.crud.weather_models import (
 )
 from wps_shared.db.database import get_async_write_session_scope
 from wps_shared.db.models.fire_watch import FireWatch, FireWatchWeather
-from wps_shared.fuel_types import FUEL_TYPE_DEFAULTS
+from wps_shared.fuel_types import FUEL_TYPE_DEFAULTS, FuelTypeEnum, is_grass_fuel_type
 from wps_shared.schemas.morecast_v2 import WeatherDeterminate, WeatherIndeterminate
 from wps_shared.schemas.stations import WFWXWeatherStation
 from wps_shared.schemas.weather_models import ModelPredictionDetails
-from wps_shared.utils.time import assert_all_utc, get_utc_now
+from wps_shared.utils.time import assert_all_utc, get_julian_date, get_utc_now
 from wps_shared.weather_models import ModelEnum
 
 logger = logging.getLogger(__name__)
 
 FIREWATCH_WEATHER_MODEL = ModelEnum.ECMWF
 
+# Fire watches share weather stations, so actuals are requested for many stations at a time, with a
+# bounded number of requests to WF1 in flight.
+WF1_STATIONS_PER_REQUEST = 50
+MAX_CONCURRENT_WF1_REQUESTS = 4
+
 
 class MissingWeatherDataError(Exception):
     """
@@ -68,15 +79,15 @@ async def gather_fire_watch_inputs(
 def map_to_fire_watch_weather(
     fire_watch: FireWatch,
     prediction: WeatherIndeterminate,
-    fbp_result: FireBehaviourPrediction,
+    hfi: float,
     prediction_model_run_timestamp_id: int,
 ) -> FireWatchWeather:
     """
-    Map a WeatherIndeterminate and FBP result to a FireWatchWeather object.
+    Map a WeatherIndeterminate and head fire intensity to a FireWatchWeather object.
 
     :param fire_watch: The FireWatch object being processed.
     :param prediction: The WeatherIndeterminate object containing weather/FWI data.
-    :param fbp_result: The result of the Fire Behaviour Prediction (FBP) calculation.
+    :param hfi: The head fire intensity calculated for the prediction.
     :return: A FireWatchWeather object.
     """
     return FireWatchWeather(
@@ -92,7 +103,7 @@ def map_to_fire_watch_weather(
         bui=prediction.build_up_index,
         dc=prediction.drought_code,
         dmc=prediction.duff_moisture_code,
-        hfi=fbp_result.hfi,
+        hfi=hfi,
         created_at=get_utc_now(),
     )
 
@@ -266,6 +277,105 @@ def calculate_fbp(
     return fbp
 
 
+def _optional_values_to_array(values: list[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def calculate_hfi(
+    fire_watches: list[FireWatch],
+    station_data: list[WFWXWeatherStation],
+    predictions: list[WeatherIndeterminate],
+) -> np.ndarray:
+    """
+    Calculate head fire intensity for many prediction rows at once. The lists are aligned, row i is
+    prediction i for fire watch i at station i. Fuel types that cffdrs_vec can't calculate (C7B) fall back
+    to calculate_fbp one row at a time.
+
+    :return: Head fire intensity for every row, NaN where it could not be calculated.
+    """
+    hfi = np.full(len(predictions), np.nan)
+    fuel_type_codes = [
+        FUEL_TYPE_CODES.get(FuelTypeEnum(fire_watch.fuel_type).value) for fire_watch in fire_watches
+    ]
+
+    for idx, fuel_type_code in enumerate(fuel_type_codes):
+        if fuel_type_code is None:
+            fbp = calculate_fbp(fire_watches[idx], station_data[idx], predictions[idx])
+            if fbp is not None and fbp.hfi is not None:
+                hfi[idx] = fbp.hfi
+
+    rows = [idx for idx, fuel_type_code in enumerate(fuel_type_codes) if fuel_type_code is not None]
+    if not rows:
+        return hfi
+
+    # foliar moisture content only depends on the station and day of year, so calculate it the same way
+    # calculate_fbp does, once per station and day
+    fmc_by_station_day: dict[tuple[int, int], float] = {}
+    julian_dates = np.array(
+        [get_julian_date(predictions[idx].utc_timestamp) for idx in rows], dtype=np.float64
+    )
+    fmc = np.empty(len(rows))
+    for row, idx in enumerate(rows):
+        station = station_data[idx]
+        key = (station.code, int(julian_dates[row]))
+        if key not in fmc_by_station_day:
+            if station.lat is None or station.long is None or station.elevation is None:
+                fmc_by_station_day[key] = np.nan
+            else:
+                fmc_by_station_day[key] = cffdrs.foliar_moisture_content(
+                    station.lat, station.long, station.elevation, key[1]
+                )
+        fmc[row] = fmc_by_station_day[key]
+
+    ffmc = _optional_values_to_array([predictions[idx].fine_fuel_moisture_code for idx in rows])
+    bui = _optional_values_to_array([predictions[idx].build_up_index for idx in rows])
+    ws = _optional_values_to_array([predictions[idx].wind_speed for idx in rows])
+    isi = _optional_values_to_array([predictions[idx].initial_spread_index for idx in rows])
+    cc = _optional_values_to_array([fire_watches[idx].percent_grass_curing for idx in rows])
+    zeros = np.zeros(len(rows))
+
+    result = vectorized_primary_fire_behaviour_prediction(
+        np.array([fuel_type_codes[idx] for idx in rows], dtype=np.int64),
+        ffmc,
+        bui,
+        ws,
+        zeros,
+        zeros,
+        zeros,
+        _optional_values_to_array([fire_watches[idx].percent_conifer for idx in rows]),
+        _optional_values_to_array([fire_watches[idx].percent_dead_fir for idx in rows]),
+        cc,
+        np.full(len(rows), 0.35),
+        _optional_values_to_array(
+            [FUEL_TYPE_DEFAULTS[fire_watches[idx].fuel_type]["CBH"] for idx in rows]
+        ),
+        _optional_values_to_array(
+            [FUEL_TYPE_DEFAULTS[fire_watches[idx].fuel_type]["CFL"] for idx in rows]
+        ),
+        fmc,
+        isi,
+        _optional_values_to_array([station_data[idx].lat for idx in rows]),
+        _optional_values_to_array([station_data[idx].long for idx in rows]),
+        _optional_values_to_array([station_data[idx].elevation for idx in rows]),
+        julian_dates,
+        zeros,
+        zeros,
+        zeros,
+        np.ones(len(rows)),
+        zeros,
+        np.zeros(len(rows), dtype=np.int64),
+        np.ones(len(rows), dtype=np.int64),
+    )
+
+    # match calculate_fbp, which refuses to calculate without these inputs
+    missing_inputs = np.isnan(ffmc) | np.isnan(bui) | np.isnan(ws) | np.isnan(isi)
+    missing_inputs |= np.isnan(cc) & np.array(
+        [is_grass_fuel_type(fire_watches[idx].fuel_type) for idx in rows]
+    )
+    hfi[rows] = np.where(missing_inputs, np.nan, result.hfi)
+    return hfi
+
+
 def in_range(val: int | float, min_val: int | float, max_val: int | float):
     return min_val <= val <= max_val
 
@@ -340,30 +450,72 @@ async def get_actuals_and_forecasts(
 async def save_all_fire_watch_weather(
     session: AsyncSession, fire_watch_weather_records: list[FireWatchWeather]
 ):
+    """
+    Save FireWatchWeather records for any number of fire watches from the same model run. Existing
+    records for a fire watch and date are updated, everything else is inserted in bulk.
+    """
     logger.info("Writing Fire Watch Weather records")
 
-    # fetch all existing records for this fire_watch and model run
-    fire_watch_id = fire_watch_weather_records[0].fire_watch_id
+    # fetch all existing records for these fire watches and model run in one query
+    fire_watch_ids = list({record.fire_watch_id for record in fire_watch_weather_records})
     prediction_model_run_timestamp_id = fire_watch_weather_records[
         0
     ].prediction_model_run_timestamp_id
 
     existing_records = (
-        await get_fire_watch_weather_by_fire_watch_id_and_model_run(
-            session, fire_watch_id, prediction_model_run_timestamp_id
+        await get_fire_watch_weather_by_fire_watch_ids_and_model_run(
+            session, fire_watch_ids, prediction_model_run_timestamp_id
         )
         or []
     )
 
-    existing_by_date = {rec.date: rec for rec in existing_records}
+    existing_by_key = {(rec.fire_watch_id, rec.date): rec for rec in existing_records}
 
+    new_records = []
     for record in fire_watch_weather_records:
-        existing_record = existing_by_date.get(record.date)
+        existing_record = existing_by_key.get((record.fire_watch_id, record.date))
         if existing_record:
             for attr in FireWatchWeather.UPDATABLE_FIELDS:
                 setattr(existing_record, attr, getattr(record, attr))
         else:
-            session.add(record)
+            new_records.append(record)
+
+    if new_records:
+        session.add_all(new_records)
+
+
+def map_fire_watch_weather(
+    fire_watches: list[FireWatch],
+    station_data: list[WFWXWeatherStation],
+    predictions: list[WeatherIndeterminate],
+    status_id_dict: dict[str, int],
+    prediction_run_timestamp_id: int,
+) -> list[FireWatchWeather]:
+    """
+    Calculate head fire intensity and prescription status for aligned fire watch, station and FWI
+    prediction rows, with the fire behaviour for every row calculated in one vectorized call.
+    """
+    hfi = calculate_hfi(fire_watches, station_data, predictions)
+
+    fire_watch_predictions = []
+    for fire_watch, prediction, row_hfi in zip(fire_watches, predictions, hfi):
+        fire_watch_weather = map_to_fire_watch_weather(
+            fire_watch, prediction, float(row_hfi), prediction_run_timestamp_id
+        )
+
+        # Check prescription status
+        status_id = check_prescription_status(fire_watch, fire_watch_weather, status_id_dict)
+        fire_watch_weather.in_prescription = status_id
+        fire_watch_predictions.append(fire_watch_weather)
+
+    return fire_watch_predictions
+
+
+def missing_hfi_error(fire_watch: FireWatch, prediction: WeatherIndeterminate) -> RuntimeError:
+    return RuntimeError(
+        f"Could not calculate FBP for prediction at {prediction.utc_timestamp} "
+        f"for FireWatch {fire_watch.id} - {fire_watch.title} at station {fire_watch.station_code}"
+    )
 
 
 async def process_predictions(
@@ -391,23 +543,16 @@ async def process_predictions(
         actual_weather_data, prediction_indeterminates
     )
 
-    fire_watch_predictions = []
-    for prediction in fwi_prediction_indeterminates:
-        fbp = calculate_fbp(fire_watch, station_metadata, prediction)
-        if not fbp:
-            raise RuntimeError(
-                f"Could not calculate FBP for prediction at {prediction.utc_timestamp} "
-                f"for FireWatch {fire_watch.id} - {fire_watch.title} at station {fire_watch.station_code}"
-            )
-
-        fire_watch_weather = map_to_fire_watch_weather(
-            fire_watch, prediction, fbp, prediction_run_timestamp_id
-        )
-
-        # Check prescription status
-        status_id = check_prescription_status(fire_watch, fire_watch_weather, status_id_dict)
-        fire_watch_weather.in_prescription = status_id
-        fire_watch_predictions.append(fire_watch_weather)
+    fire_watch_predictions = map_fire_watch_weather(
+        [fire_watch] * len(fwi_prediction_indeterminates),
+        [station_metadata] * len(fwi_prediction_indeterminates),
+        fwi_prediction_indeterminates,
+        status_id_dict,
+        prediction_run_timestamp_id,
+    )
+    for prediction, fire_watch_weather in zip(fwi_prediction_indeterminates, fire_watch_predictions):
+        if np.isnan(fire_watch_weather.hfi):
+            raise missing_hfi_error(fire_watch, prediction)
 
     return fire_watch_predictions
 
@@ -460,9 +605,203 @@ async def process_single_fire_watch(
         )
 
 
+async def gather_station_inputs(
+    session: AsyncSession,
+    station_codes: list[int],
+    prediction_run_timestamp_id: int,
+) -> tuple[dict[int, list[ModelPredictionDetails]], dict[int, list[WeatherIndeterminate]]]:
+    """
+    Gather the inputs for every station used by a FireWatch, so weather shared by fire watches is only
+    fetched once. Model predictions for all stations come from one query, actuals are requested from WF1
+    for batches of stations that need the same day, with a bounded number of requests in flight.
+
+    :return: Model predictions and actual weather data, keyed by station code.
+    """
+    predictions_by_station: dict[int, list[ModelPredictionDetails]] = defaultdict(list)
+    predictions = await get_latest_daily_model_prediction_for_stations(
+        session, station_codes, prediction_run_timestamp_id
+    )
+    for prediction in predictions:
+        predictions_by_station[prediction.station_code].append(prediction)
+
+    stations_by_actual_datetime: dict[datetime, list[int]] = defaultdict(list)
+    for station_code, station_predictions in predictions_by_station.items():
+        first_prediction_date = min(p.prediction_timestamp for p in station_predictions)
+        stations_by_actual_datetime[first_prediction_date - timedelta(days=1)].append(station_code)
+
+    batches = [
+        (actual_datetime_needed, station_batch[i : i + WF1_STATIONS_PER_REQUEST])
+        for actual_datetime_needed, station_batch in stations_by_actual_datetime.items()
+        for i in range(0, len(station_batch), WF1_STATIONS_PER_REQUEST)
+    ]
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_WF1_REQUESTS)
+
+    async def fetch_actuals(actual_datetime_needed: datetime, station_batch: list[int]):
+        async with semaphore:
+            actual_weather_data, _ = await get_actuals_and_forecasts(
+                actual_datetime_needed, actual_datetime_needed, station_batch
+            )
+            return actual_weather_data
+
+    results = await asyncio.gather(
+        *(fetch_actuals(actual_datetime, station_batch) for actual_datetime, station_batch in batches),
+        return_exceptions=True,
+    )
+
+    actuals_by_station: dict[int, list[WeatherIndeterminate]] = defaultdict(list)
+    for (_, station_batch), result in zip(batches, results):
+        if isinstance(result, Exception):
+            # the fire watches at these stations are skipped for missing actuals
+            logger.error(f"Error fetching actual weather data for stations {station_batch}: {result}")
+            continue
+        for actual in result:
+            actuals_by_station[actual.station_code].append(actual)
+
+    return predictions_by_station, actuals_by_station
+
+
+def calculate_stations_fire_watch_weather(
+    fire_watches_by_station: dict[int, list[FireWatch]],
+    station_inputs: dict[int, tuple[list[WeatherIndeterminate], list[WeatherIndeterminate]]],
+    wfwx_station_map: dict[int, WFWXWeatherStation],
+    status_id_dict: dict[str, int],
+    prediction_run_timestamp_id: int,
+) -> list[FireWatchWeather]:
+    """
+    Calculate FireWatchWeather records for the fire watches at the given stations, with the FWI values of
+    every station calculated together and fire behaviour for every fire watch and prediction in one
+    vectorized call. Fire watches missing HFI for any prediction are logged and skipped.
+
+    :param station_inputs: (seed actuals, prediction targets) keyed by station code. Targets are copied
+    before FWI values are calculated, so they're left unchanged if the calculation fails.
+    """
+    seed_indeterminates: list[WeatherIndeterminate] = []
+    targets_by_station: dict[int, list[WeatherIndeterminate]] = {}
+    for station_code, (seeds, targets) in station_inputs.items():
+        seed_indeterminates.extend(seeds)
+        targets_by_station[station_code] = [target.model_copy() for target in targets]
+
+    # targets are updated in place, with every station calculated together
+    calculate_fwi_from_seed_indeterminates(
+        seed_indeterminates,
+        [target for targets in targets_by_station.values() for target in targets],
+    )
+
+    row_fire_watches: list[FireWatch] = []
+    row_stations: list[WFWXWeatherStation] = []
+    row_predictions: list[WeatherIndeterminate] = []
+    for station_code, targets in targets_by_station.items():
+        for fire_watch in fire_watches_by_station[station_code]:
+            logger.info(
+                f"Processing FireWatch {fire_watch.id} - {fire_watch.title} using station {station_code} and {FIREWATCH_WEATHER_MODEL.value} data - prediction_timestamp_id {prediction_run_timestamp_id}."
+            )
+            row_fire_watches.extend([fire_watch] * len(targets))
+            row_stations.extend([wfwx_station_map[station_code]] * len(targets))
+            row_predictions.extend(targets)
+
+    fire_watch_weather = map_fire_watch_weather(
+        row_fire_watches, row_stations, row_predictions, status_id_dict, prediction_run_timestamp_id
+    )
+
+    failed_fire_watch_ids = set()
+    for fire_watch, prediction, record in zip(row_fire_watches, row_predictions, fire_watch_weather):
+        if np.isnan(record.hfi) and fire_watch.id not in failed_fire_watch_ids:
+            failed_fire_watch_ids.add(fire_watch.id)
+            logger.error(
+                f"Error processing FireWatch {fire_watch.id}: {missing_hfi_error(fire_watch, prediction)}"
+            )
+
+    return [
+        record for record in fire_watch_weather if record.fire_watch_id not in failed_fire_watch_ids
+    ]
+
+
+def process_fire_watches(
+    fire_watches: list[FireWatch],
+    wfwx_station_map: dict[int, WFWXWeatherStation],
+    predictions_by_station: dict[int, list[ModelPredictionDetails]],
+    actuals_by_station: dict[int, list[WeatherIndeterminate]],
+    status_id_dict: dict[str, int],
+    prediction_run_timestamp_id: int,
+) -> list[FireWatchWeather]:
+    """
+    Calculate FireWatchWeather records for many fire watches. FWI values are calculated once per station,
+    and fire behaviour for every fire watch and prediction in one vectorized call. If calculating every
+    station together fails, each station is calculated separately. Fire watches that can't be processed
+    are logged and skipped.
+
+    :param fire_watches: The FireWatch instances to process.
+    :param wfwx_station_map: Mapping of station codes to their metadata.
+    :param predictions_by_station: Model predictions keyed by station code.
+    :param actuals_by_station: Actual weather data keyed by station code.
+    :param status_id_dict: Mapping of status IDs to their descriptions.
+    :param prediction_run_timestamp_id: The ID of the prediction run timestamp.
+    :return: FireWatchWeather records for every fire watch that could be processed.
+    """
+    fire_watches_by_station: dict[int, list[FireWatch]] = defaultdict(list)
+    for fire_watch in fire_watches:
+        fire_watches_by_station[fire_watch.station_code].append(fire_watch)
+
+    station_inputs: dict[int, tuple[list[WeatherIndeterminate], list[WeatherIndeterminate]]] = {}
+    for station_code, station_fire_watches in fire_watches_by_station.items():
+        station_metadata = wfwx_station_map.get(station_code)
+        if not station_metadata:
+            for fire_watch in station_fire_watches:
+                logger.warning(
+                    f"Skipping FireWatch {fire_watch.id} - {fire_watch.title}: Missing station metadata."
+                )
+            continue
+
+        station_predictions = predictions_by_station.get(station_code)
+        actual_weather_data = actuals_by_station.get(station_code)
+        try:
+            if not station_predictions:
+                raise MissingWeatherDataError(f"Missing model predictions for station {station_code}.")
+            validate_fire_watch_inputs(station_fire_watches[0], station_metadata, actual_weather_data)
+            targets = [
+                map_model_prediction_to_weather_indeterminate(p, station_metadata)
+                for p in station_predictions
+            ]
+        except Exception as e:
+            for fire_watch in station_fire_watches:
+                logger.error(f"Error processing FireWatch {fire_watch.id}: {e}")
+            continue
+
+        station_inputs[station_code] = (actual_weather_data, targets)
+
+    try:
+        return calculate_stations_fire_watch_weather(
+            fire_watches_by_station,
+            station_inputs,
+            wfwx_station_map,
+            status_id_dict,
+            prediction_run_timestamp_id,
+        )
+    except Exception as e:
+        logger.error(f"Error calculating FireWatch weather for all stations, calculating each station: {e}")
+
+    fire_watch_weather: list[FireWatchWeather] = []
+    for station_code, inputs in station_inputs.items():
+        try:
+            fire_watch_weather.extend(
+                calculate_stations_fire_watch_weather(
+                    fire_watches_by_station,
+                    {station_code: inputs},
+                    wfwx_station_map,
+                    status_id_dict,
+                    prediction_run_timestamp_id,
+                )
+            )
+        except Exception as e:
+            for fire_watch in fire_watches_by_station[station_code]:
+                logger.error(f"Error processing FireWatch {fire_watch.id}: {e}")
+    return fire_watch_weather
+
+
 async def process_all_fire_watch_weather():
     """
-    Process all FireWatch weather data by gathering inputs, validating them, and saving results.
+    Process all FireWatch weather data by gathering inputs, validating them, and saving results. Fire
+    watches are grouped by station, so inputs shared by fire watches are only gathered and calculated once.
     """
 
     async with get_async_write_session_scope() as session:
@@ -483,20 +822,26 @@ async def process_all_fire_watch_weather():
         wfwx_station_map = await get_station_metadata(list(station_ids))
         status_id_dict = await get_all_prescription_status(session)
 
-        for fire_watch in fire_watches_to_process:
-            try:
-                logger.info(
-                    f"Processing FireWatch {fire_watch.id} - {fire_watch.title} using station {fire_watch.station_code} and {FIREWATCH_WEATHER_MODEL.value} data - prediction_timestamp_id {latest_prediction_id}."
-                )
-                await process_single_fire_watch(
-                    session,
-                    fire_watch,
-                    wfwx_station_map,
-                    status_id_dict,
-                    latest_prediction_id,
-                )
-            except Exception as e:
-                logger.error(f"Error processing FireWatch {fire_watch.id}: {e}")
+        predictions_by_station, actuals_by_station = await gather_station_inputs(
+            session,
+            [station_id for station_id in station_ids if station_id in wfwx_station_map],
+            latest_prediction_id,
+        )
+
+        fire_watch_weather = process_fire_watches(
+            fire_watches_to_process,
+            wfwx_station_map,
+            predictions_by_station,
+            actuals_by_station,
+            status_id_dict,
+            latest_prediction_id,
+        )
+
+        if fire_watch_weather:
+            await save_all_fire_watch_weather(session, fire_watch_weather)
+            logger.info(
+                f"Saved {len(fire_watch_weather)} records for {len({r.fire_watch_id for r in fire_watch_weather})} FireWatches."
+            )
 
 
 async def reprocess_fire_watch_weather(
@@ -0,0 +1,55 @@
+""" Redis cache wrapper for the raw WF1 dailies used by the HFI calculator.
+    Every edit in the HFI calculator (selecting a station, changing a fuel type or fire starts)
+    recalculates the fire centre, but the dailies for a fire centre and prep period rarely change
+    between clicks, so we hold on to them for a short while.
+"""
+
+import json
+import logging
+from typing import List, Optional
+from wps_shared import config
+from wps_shared.utils.redis import create_redis
+
+logger = logging.getLogger(__name__)
+cache_expiry_seconds = int(config.get("REDIS_HFI_DAILIES_CACHE_EXPIRY", 60))
+
+
+def _key(fire_centre_id: int, start_timestamp: int, end_timestamp: int, wfwx_station_ids: List[str]) -> str:
+    """ The station ids are part of the key, so that changes to the stations in a fire centre
+    don't serve up dailies for the old set of stations. """
+    station_ids = ",".join(sorted(wfwx_station_ids))
+    return f"hfi_raw_dailies/{fire_centre_id}/{start_timestamp}/{end_timestamp}/{station_ids}"
+
+
+async def get_cached_raw_dailies(fire_centre_id: int,
+                                 start_timestamp: int,
+                                 end_timestamp: int,
+                                 wfwx_station_ids: List[str]) -> Optional[List[dict]]:
+    """ Optionally returns cached raw dailies if they exist. """
+    key = _key(fire_centre_id, start_timestamp, end_timestamp, wfwx_station_ids)
+    cache = create_redis()
+    try:
+        cached_json = cache.get(key)
+    except Exception as error:
+        cached_json = None
+        logger.error(error, exc_info=error)
+    if cached_json:
+        logger.info('redis cache hit %s', key)
+        return json.loads(cached_json.decode())
+
+    logger.info('redis cache miss %s', key)
+    return None
+
+
+async def put_cached_raw_dailies(fire_centre_id: int,
+                                 start_timestamp: int,
+                                 end_timestamp: int,
+                                 wfwx_station_ids: List[str],
+                                 raw_dailies: List[dict]):
+    """ Caches the raw dailies for a fire centre and prep period. """
+    key = _key(fire_centre_id, start_timestamp, end_timestamp, wfwx_station_ids)
+    cache = create_redis()
+    try:
+        cache.set(key, json.dumps(raw_dailies).encode(), ex=cache_expiry_seconds)
+    except Exception as error:
+        logger.error(error, exc_info=error)
@@ -3,7 +3,8 @@
 import logging
 import math
 from collections import defaultdict
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 from itertools import groupby
 from statistics import mean
 from typing import Dict, List, Optional, Set, Tuple
@@ -39,7 +40,7 @@ from wps_shared.schemas.hfi_calc import (
 )
 from wps_shared.schemas.stations import WeatherStation as WFWXWeatherStationDetails
 from wps_shared.schemas.stations import WFWXWeatherStation
-from wps_shared.utils.time import get_hour_20_from_date, get_pst_now
+from wps_shared.utils.time import get_hour_20_from_date, get_pst_now, get_utc_now
 from wps_wf1.wfwx_api import WfwxApi
 
 from app.fire_behaviour.cffdrs import CFFDRSException
@@ -48,31 +49,47 @@ from app.fire_behaviour.prediction import (
     FireBehaviourPredictionInputError,
     calculate_fire_behaviour_prediction,
 )
+from app.hfi.dailies_cache import get_cached_raw_dailies, put_cached_raw_dailies
 
 logger = logging.getLogger(__name__)
 
-
-def generate_station_daily(
-    raw_daily: dict, station: WFWXWeatherStation, fuel_type: FuelTypeModel
-) -> StationDaily:
-    """Transform from the raw daily json object returned by wf1, to our daily object."""
-    pc = fuel_type.percentage_conifer
-    pdf = fuel_type.percentage_dead_fir
+# Number of fire behaviour predictions to hold on to. A fire centre has in the order of a hundred
+# stations, with up to 7 prep days each, and a user may flip between a few fuel types.
+FIRE_BEHAVIOUR_PREDICTION_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=FIRE_BEHAVIOUR_PREDICTION_CACHE_SIZE)
+def calculate_cached_fire_behaviour_prediction(
+    station_code: int,
+    latitude: float,
+    longitude: float,
+    elevation: float,
+    fuel_type_code: str,
+    bui: Optional[float],
+    ffmc: Optional[float],
+    wind_speed: Optional[float],
+    cc: Optional[float],
+    pc: Optional[float],
+    isi: Optional[float],
+    pdf: Optional[float],
+    calculation_date: date,
+) -> FireBehaviourPrediction:
+    """Memoized fire behaviour prediction for a station daily and fuel type.
+
+    Every edit in the HFI calculator re-runs the calculation for the whole fire centre, yet only the
+    station or fuel type that was changed produces different inputs. The prediction only depends on
+    the arguments, so we can safely re-use results (including failed ones) for identical inputs.
+    The calculation date is part of the key, since foliar moisture content depends on the julian date.
+    """
     # we use the fuel type lookup to get default values.
-    cbh = FUEL_TYPE_DEFAULTS[fuel_type.fuel_type_code]["CBH"]
-    cfl = FUEL_TYPE_DEFAULTS[fuel_type.fuel_type_code]["CFL"]
-    isi = raw_daily.get("initialSpreadIndex", None)
-    bui = raw_daily.get("buildUpIndex", None)
-    ffmc = raw_daily.get("fineFuelMoistureCode", None)
-    cc = raw_daily.get("grasslandCuring", None)
-    wind_speed = raw_daily.get("windSpeed", None)
-
+    cbh = FUEL_TYPE_DEFAULTS[fuel_type_code]["CBH"]
+    cfl = FUEL_TYPE_DEFAULTS[fuel_type_code]["CFL"]
     try:
-        fire_behaviour_prediction = calculate_fire_behaviour_prediction(
-            latitude=station.lat,
-            longitude=station.long,
-            elevation=station.elevation,
-            fuel_type=FuelTypeEnum[fuel_type.fuel_type_code],
+        return calculate_fire_behaviour_prediction(
+            latitude=latitude,
+            longitude=longitude,
+            elevation=elevation,
+            fuel_type=FuelTypeEnum[fuel_type_code],
             bui=bui,
             ffmc=ffmc,
             wind_speed=wind_speed,
@@ -82,12 +99,40 @@ def generate_station_daily(
             pdf=pdf,
             cbh=cbh,
             cfl=cfl,
+            calculation_datetime=datetime.combine(calculation_date, time(), tzinfo=timezone.utc),
         )
     except (FireBehaviourPredictionInputError, CFFDRSException) as error:
         logger.info(
-            "Error calculating fire behaviour prediction for station %s : %s", station.code, error
+            "Error calculating fire behaviour prediction for station %s : %s", station_code, error
         )
-        fire_behaviour_prediction = FireBehaviourPrediction(None, None, None, None, None)
+        return FireBehaviourPrediction(None, None, None, None, None)
+
+
+def generate_station_daily(
+    raw_daily: dict, station: WFWXWeatherStation, fuel_type: FuelTypeModel
+) -> StationDaily:
+    """Transform from the raw daily json object returned by wf1, to our daily object."""
+    isi = raw_daily.get("initialSpreadIndex", None)
+    bui = raw_daily.get("buildUpIndex", None)
+    ffmc = raw_daily.get("fineFuelMoistureCode", None)
+    cc = raw_daily.get("grasslandCuring", None)
+    wind_speed = raw_daily.get("windSpeed", None)
+
+    fire_behaviour_prediction = calculate_cached_fire_behaviour_prediction(
+        station_code=station.code,
+        latitude=station.lat,
+        longitude=station.long,
+        elevation=station.elevation,
+        fuel_type_code=fuel_type.fuel_type_code,
+        bui=bui,
+        ffmc=ffmc,
+        wind_speed=wind_speed,
+        cc=cc,
+        pc=fuel_type.percentage_conifer,
+        isi=isi,
+        pdf=fuel_type.percentage_dead_fir,
+        calculation_date=get_utc_now().date(),
+    )
 
     return StationDaily(
         code=station.code,
@@ -259,10 +304,23 @@ async def calculate_latest_hfi_results(
         )
 
         wfwx_station_ids = [wfwx_station.wfwx_id for wfwx_station in wfwx_stations]
-        raw_dailies_generator = await wfwx_api.get_raw_dailies_in_range_generator(
-            wfwx_station_ids, start_timestamp, end_timestamp
+        # Edits in the front end re-request the same dailies over and over, so we keep them around
+        # for a short while.
+        raw_dailies: Optional[List[dict]] = await get_cached_raw_dailies(
+            request.selected_fire_center_id, start_timestamp, end_timestamp, wfwx_station_ids
         )
-        raw_dailies: List[dict] = [raw_daily async for raw_daily in raw_dailies_generator]
+        if raw_dailies is None:
+            raw_dailies_generator = await wfwx_api.get_raw_dailies_in_range_generator(
+                wfwx_station_ids, start_timestamp, end_timestamp
+            )
+            raw_dailies = [raw_daily async for raw_daily in raw_dailies_generator]
+            await put_cached_raw_dailies(
+                request.selected_fire_center_id,
+                start_timestamp,
+                end_timestamp,
+                wfwx_station_ids,
+                raw_dailies,
+            )
         fuel_type_lookup: Dict[int, FuelTypeModel] = generate_fuel_type_lookup(orm_session)
 
         results = calculate_hfi_results(
@@ -372,10 +430,10 @@ def calculate_station_dailies(
     """Build a list of dailies with results from the fire behaviour calculations."""
     area_dailies: List[StationDaily] = []
 
-    selected_station_codes = [
+    selected_station_codes = {
         station.station_code
         for station in filter(lambda station: (station.selected), station_info_list)
-    ]
+    }
     station_info_lookup = {station.station_code: station for station in station_info_list}
 
     for raw_daily in raw_dailies:
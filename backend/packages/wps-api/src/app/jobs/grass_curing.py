@@ -1,15 +1,13 @@
 import asyncio
 import logging
-import math
 import os
 import sys
 import tempfile
 
 import aiofiles
 import numpy as np
-from affine import Affine
 from aiohttp import ClientSession
-from osgeo import gdal, osr
+from osgeo import gdal
 from wps_shared.chatops_notification import send_chatops_notification
 from wps_shared.db.crud.grass_curing import (
     get_last_percent_grass_curing_for_date,
@@ -17,7 +15,7 @@ from wps_shared.db.crud.grass_curing import (
 )
 from wps_shared.db.database import get_async_read_session_scope, get_async_write_session_scope
 from wps_shared.db.models.grass_curing import PercentGrassCuring
-from wps_shared.geospatial.geospatial import SpatialReferenceSystem
+from wps_shared.geospatial.wps_dataset import WPSDataset
 from wps_shared.utils.time import get_utc_now
 from wps_shared.wps_logging import configure_logging
 from wps_wf1.wfwx_api import WfwxApi
@@ -61,42 +59,19 @@ class GrassCuringJob:
         :param stations: A list of weather station objects.
         :return: A tuple of a weather station code and the percent grass curing at its location.
         """
-        raster_band = data_source.GetRasterBand(1)
-        data_np_array = np.array(raster_band.ReadAsArray())
-        forward_transform = Affine.from_gdal(*data_source.GetGeoTransform())
-        reverse_transform = ~forward_transform
-
-        source_srs = osr.SpatialReference()
-
-        # station coords are in lat/lon aka WGS84/EPSG:4326 so we need a corresponding source srs
-        # in order to perform the reprojection
-        source_srs.ImportFromEPSG(SpatialReferenceSystem.WGS84.code)
-
-        target_srs = osr.SpatialReference()
-        target_srs.ImportFromWkt(data_source.GetProjection())
-
-        # CoordinateTransformation.TransformPoint used below requires coords to be in lon, lat order
-        # so we need to explicitly define the order
-        source_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
-        target_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
-
-        coord_transform = osr.CoordinateTransformation(source_srs, target_srs)
-
-        rows, cols = data_np_array.shape
-        for station in stations:
-            x, y, _ = coord_transform.TransformPoint(station.long, station.lat)
-            px, py = reverse_transform * (x, y)
-            px = math.floor(px)
-            py = math.floor(py)
-            if px < 0 or py < 0 or px >= cols or py >= rows:
+        # station coords are in lat/lon aka WGS84/EPSG:4326, sample them all in one go
+        values = WPSDataset(ds_path=None, ds=data_source).extract_values_at_points(
+            np.array([station.lat for station in stations], dtype=np.float64),
+            np.array([station.long for station in stations], dtype=np.float64),
+        )
+        for station, value in zip(stations, values):
+            if value is np.ma.masked:
                 logger.error(
-                    "Station %s at pixel (%s, %s) is out of raster bounds, skipping",
+                    "Station %s is out of raster bounds or on a nodata pixel, skipping",
                     station.code,
-                    px,
-                    py,
                 )
                 continue
-            yield (station.code, data_np_array[py][px])
+            yield (station.code, float(value))
 
     async def _get_last_for_date(self):
         """Get the date of the most recently processed percent grass curing data."""
@@ -11,17 +11,16 @@ import tempfile
 from collections.abc import Generator
 from datetime import datetime, timedelta, timezone
 
-import aiofiles
 import requests
 import wps_shared.utils.time as time_utils
 from sqlalchemy.orm import Session
 from wps_shared.chatops_notification import send_chatops_notification
 from wps_shared.db.crud.weather_models import (
     create_model_run_for_sfms,
-    create_saved_model_run_for_sfms_url,
+    create_saved_model_run_for_sfms_urls,
     delete_rdps_sfms_urls,
     get_rdps_sfms_urls_for_deletion,
-    get_saved_model_run_for_sfms,
+    get_saved_model_run_for_sfms_urls,
 )
 from wps_shared.db.database import get_write_session_scope
 from wps_shared.utils.s3 import apply_retention_policy_on_date_folders, get_client
@@ -43,6 +42,8 @@ logger = logging.getLogger(__name__)
 
 DAYS_TO_RETAIN = 7
 MAX_MODEL_RUN_HOUR = 45
+# Number of grib files downloaded and uploaded to S3 at the same time.
+MAX_CONCURRENT_DOWNLOADS = 8
 
 
 def get_model_run_hours_to_process() -> Generator[int, None, None]:
@@ -76,54 +77,81 @@ class RDPSGrib:
         """Creates a key for storing an object in S3 storage."""
         return f"weather_models/{(ModelEnum.RDPS).lower()}/{self.date_key}/{model_run_hour:02d}/{weather_param}/{file_name}"
 
+    async def _download_and_store(
+        self,
+        client,
+        bucket: str,
+        model_run_hour: int,
+        weather_param: str,
+        url: str,
+        fetcher: ECCCUrlFetcher,
+    ) -> str | None:
+        """Download a grib file and store it in S3.
+
+        :return: The S3 key the file was stored at, or None if the file isn't available (yet).
+        """
+        with tempfile.TemporaryDirectory() as temporary_path:
+            # download is blocking, so it runs in a worker thread to let other files download at the same time.
+            downloaded = await asyncio.to_thread(
+                download,
+                url,
+                temporary_path,
+                "REDIS_CACHE_ENV_CANADA",
+                ModelEnum.RDPS,
+                "REDIS_ENV_CANADA_CACHE_EXPIRY",
+                fetcher,
+            )
+            if not downloaded:
+                return None
+            self.files_downloaded += 1
+            file_name = self._get_file_name_from_url(url)
+            key = self._generate_s3_key(model_run_hour, weather_param, file_name)
+            # If we've downloaded the file ok, we can now save it to S3 storage. The body is streamed
+            # from the file rather than read into memory first.
+            with open(downloaded, "rb") as f:
+                await client.put_object(Bucket=bucket, Key=key, Body=f)
+            return key
+
     async def _process_model_run_urls(
         self, model_run_hour: int, weather_param: str, urls: list[str], fetcher: ECCCUrlFetcher
     ):
         """Process the urls for a model run."""
-        for url in urls:
-            try:
-                # check the database for a record of this file:
-                processed_url = get_saved_model_run_for_sfms(self.session, url)
-                if processed_url:
-                    # This url has already been processed - so we skip it.
-                    logger.debug("file already processed %s", url)
-                    continue
-                else:
-                    # download the file:
-                    with tempfile.TemporaryDirectory() as temporary_path:
-                        downloaded = download(
-                            url,
-                            temporary_path,
-                            "REDIS_CACHE_ENV_CANADA",
-                            ModelEnum.RDPS,
-                            "REDIS_ENV_CANADA_CACHE_EXPIRY",
-                            fetcher,
-                        )
-                        if downloaded:
-                            self.files_downloaded += 1
-                            file_name = self._get_file_name_from_url(url)
-                            key = self._generate_s3_key(model_run_hour, weather_param, file_name)
-                            # If we've downloaded the file ok, we can now save it to S3 storage.
-                            try:
-                                async with get_client() as (client, bucket):
-                                    async with aiofiles.open(downloaded, "rb") as f:
-                                        file_content = await f.read()
-                                    await client.put_object(
-                                        Bucket=bucket, Key=key, Body=file_content
-                                    )
-                                    create_saved_model_run_for_sfms_url(self.session, url, key)
-                            finally:
-                                # delete the file when done.
-                                os.remove(downloaded)
-            except (requests.ConnectionError, requests.Timeout) as exc:
-                self.connection_error_count += 1
-                logger.warning("Connection error for %s: %s", url, exc)
-            except Exception:
-                self.exception_count += 1
-                # We catch and log exceptions, but keep trying to download.
-                # We intentionally catch a broad exception, as we want to try and download as much
-                # as we can.
-                logger.exception("unexpected exception processing %s", url)
+        # check the database for a record of the files in one go:
+        processed_urls = get_saved_model_run_for_sfms_urls(self.session, urls)
+        if processed_urls:
+            # These urls have already been processed - so we skip them.
+            logger.debug("%d files already processed", len(processed_urls))
+        urls_to_process = [url for url in urls if url not in processed_urls]
+        if not urls_to_process:
+            return
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        saved_urls: list[tuple[str, str]] = []
+
+        async def process_url(client, bucket: str, url: str):
+            async with semaphore:
+                try:
+                    key = await self._download_and_store(
+                        client, bucket, model_run_hour, weather_param, url, fetcher
+                    )
+                    if key is not None:
+                        saved_urls.append((url, key))
+                except (requests.ConnectionError, requests.Timeout) as exc:
+                    self.connection_error_count += 1
+                    logger.warning("Connection error for %s: %s", url, exc)
+                except Exception:
+                    self.exception_count += 1
+                    # We catch and log exceptions, but keep trying to download.
+                    # We intentionally catch a broad exception, as we want to try and download as much
+                    # as we can.
+                    logger.exception("unexpected exception processing %s", url)
+
+        try:
+            async with get_client() as (client, bucket):
+                await asyncio.gather(*[process_url(client, bucket, url) for url in urls_to_process])
+        finally:
+            # Record everything that made it to S3 in one go, even if something went wrong along the way.
+            create_saved_model_run_for_sfms_urls(self.session, saved_urls)
 
     async def _process_model_run(self, model_run_hour: int):
         """Process a particular RDPS model run"""
@@ -43,7 +43,7 @@ class SFMSCalcJob:
         hffmc_processor = HourlyFFMCProcessor(start_time, RasterKeyAddresser())
 
         async with S3Client() as s3_client:
-            await hffmc_processor.process(s3_client, multi_wps_dataset_context, MAX_MODEL_RUN_HOUR)
+            await hffmc_processor.process_stacked(s3_client, MAX_MODEL_RUN_HOUR)
 
         # calculate the execution time.
         execution_time = get_utc_now() - start_exec
@@ -19,6 +19,7 @@ from wps_shared.db.crud.fuel_layer import get_fuel_type_raster_by_year
 from wps_shared.db.crud.sfms_run import save_sfms_run
 from wps_shared.db.database import get_async_read_session_scope, get_async_write_session_scope
 from wps_shared.db.models.auto_spatial_advisory import RunTypeEnum
+from wps_shared.geospatial.raster_cache import get_raster_cache
 from wps_shared.run_type import RunType
 from wps_shared.utils.s3_client import S3Client
 from wps_shared.utils.time import (
@@ -114,7 +115,9 @@ async def run_sfms_daily_forecasts(run_datetime: datetime) -> None:
                 )
                 if fuel_type_raster is None:
                     raise RuntimeError(f"No fuel type raster found for {fuel_raster_year}")
-                fuel_raster_path = raster_addresser.gdal_path(fuel_type_raster.object_store_path)
+                fuel_raster_path = await get_raster_cache().get_path(
+                    s3_client, fuel_type_raster.object_store_path
+                )
                 logger.info("Using reference raster: %s", fuel_raster_path)
 
                 async with get_async_write_session_scope() as write_session:
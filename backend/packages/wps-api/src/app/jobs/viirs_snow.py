@@ -1,12 +1,14 @@
 import argparse
 import asyncio
-import glob
 import logging
+import multiprocessing
 import os
 import re
 import sys
 import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import date, datetime, timedelta
+from typing import List
 
 import aiofiles
 import earthaccess as ea
@@ -22,13 +24,13 @@ from wps_shared.utils.s3 import get_client
 from wps_shared.utils.time import vancouver_tz
 from wps_shared.wps_logging import configure_logging
 
-from app.utils.pmtiles import tippecanoe_wrapper, write_geojson
+from app.utils.pmtiles import write_pmtiles
 
 logger = logging.getLogger(__name__)
 
 PRODUCT_VERSION = 2
 SHORT_NAME = "VNP10A1F"
-RAW_SNOW_COVERAGE_NAME = "raw_snow_coverage.tif"
+RAW_SNOW_COVERAGE_NAME = "raw_snow_coverage.vrt"
 RAW_SNOW_COVERAGE_CLIPPED_NAME = "raw_snow_coverage_clipped.tif"
 BINARY_SNOW_COVERAGE_CLASSIFICATION_NAME = "binary_snow_coverage.tif"
 SNOW_COVERAGE_PMTILES_MIN_ZOOM = 4
@@ -43,6 +45,10 @@ GLOBAL_ULY = 10007554
 MODIS_SINUSOIDAL_PROJ4 = "+proj=sinu +R=6371007.181 +nadgrids=@null +wktext +units=m +no_defs"
 RESAMPLING = "near"
 SUBDATASET = "://HDFEOS/GRIDS/VIIRS_Grid_IMG_2D/Data_Fields/CGF_NDSI_Snow_Cover"
+# Number of dates processed at once when catching up on missed days.
+MAX_CONCURRENT_DATES = 3
+# Number of processes used to convert the HDF5 granules to geotiffs.
+GRANULE_CONVERSION_WORKERS = 4
 
 
 class NoGranulesException(Exception):
@@ -139,9 +145,10 @@ def translate_assign_sinu(
     lrx: float,
     lry: float,
     sinu_wkt: str,
+    output_format: str = "GTiff",
 ):
     opts = gdal.TranslateOptions(
-        format="GTiff", outputSRS=sinu_wkt, outputBounds=[ulx, uly, lrx, lry]
+        format=output_format, outputSRS=sinu_wkt, outputBounds=[ulx, uly, lrx, lry]
     )
     out = gdal.Translate(dst_tif, src_name, options=opts)
     if out is None:
@@ -150,6 +157,64 @@ def translate_assign_sinu(
     out = None
 
 
+def warp_to_wgs84(src_name_or_ds, dst_tif: str, resampling: str, dstnodata: float):
+    warp_options = gdal.WarpOptions(
+        dstSRS=SpatialReferenceSystem.WGS84.epsg,
+        resampleAlg=resampling,
+        format="GTiff",
+        dstNodata=dstnodata,
+    )
+    out = gdal.Warp(dst_tif, src_name_or_ds, options=warp_options)
+    if out is None:
+        raise RuntimeError("gdal.Warp failed.")
+    out.FlushCache()
+    out = None
+
+
+def convert_h5_to_geotiff(temp_dir: str, h5_path: str) -> str:
+    """Convert a HDF5 granule to a WGS84 geotiff. Runs in a worker process.
+
+    :param temp_dir: The directory to write the geotiff to.
+    :type temp_dir: str
+    :param h5_path: The path to the snow coverage subdataset of the granule.
+    :type h5_path: str
+    :return: The path to the WGS84 geotiff.
+    :rtype: str
+    """
+    ds = gdal.Open(h5_path)
+    if ds is None:
+        raise RuntimeError(f"Cannot open subdataset: {h5_path}")
+    # Attempt to derive NoData from band 1 if not specified
+    dstnodata = DST_NODATA
+    b1 = ds.GetRasterBand(1)
+    if b1 is not None:
+        nd = b1.GetNoDataValue()
+        if nd is not None:
+            dstnodata = nd
+    meta = ds.GetMetadata()
+    h, v = read_tile_indices(meta, h5_path)
+    width, height = ds.RasterXSize, ds.RasterYSize
+    ulx, uly, lrx, lry, px, py = compute_bounds_for_tile(h, v, width, height)
+
+    logger.info("Assigning MODIS Sinusoidal georeference with:")
+    logger.info(f"  h={h}, v={v}, size={width}x{height}, px={px:.6f} m, py={py:.6f} m")
+    logger.info(f"  ULX={ulx:.3f}, ULY={uly:.3f}, LRX={lrx:.3f}, LRY={lry:.3f}")
+
+    # The sinusoidal georeference is only needed as the input to the warp, so it is assigned in a
+    # VRT rather than by writing out a copy of the granule.
+    sinu_name = f"sinu_{h}_{v}.vrt"
+    sinu_path = os.path.join(temp_dir, sinu_name)
+    sinu_wkt = build_modis_sinu_wkt()
+    translate_assign_sinu(ds, sinu_path, ulx, uly, lrx, lry, sinu_wkt, output_format="VRT")
+
+    wgs84_name = f"wgs_84_{h}_{v}.tif"
+    wgs84_path = os.path.join(temp_dir, wgs84_name)
+    warp_to_wgs84(sinu_path, wgs84_path, RESAMPLING, dstnodata)
+    os.remove(sinu_path)  # Remove the intermediate vrt with the sinusoidal projection
+    ds = None
+    return wgs84_path
+
+
 class ViirsSnowJob:
     """Job that downloads and processed VIIRS snow coverage data from the NSIDC (https://nsidc.org)."""
 
@@ -195,16 +260,24 @@ class ViirsSnowJob:
         h5_paths = [path for path in downloaded if path.name.endswith("h5")]
         return h5_paths
 
-    def _create_snow_coverage_mosaic(self, path: str):
-        """Use GDAL to create a mosaic from mulitple tifs of VIIRS snow data.
+    def _create_snow_coverage_mosaic(self, path: str, tif_paths: List[str]):
+        """Use GDAL to create a mosaic from mulitple tifs of VIIRS snow data. The mosaic is a VRT, so
+        it is only read when the clipped mosaic is written.
 
-        :param path: The path to a temporary directory where the tifs are located. Also where the mosaic will be saved.
+        :param path: The path to a temporary directory where the mosaic will be saved.
         :type path: str
+        :param tif_paths: The paths to the WGS84 tifs of VIIRS snow data.
+        :type tif_paths: List[str]
         """
         output = os.path.join(path, RAW_SNOW_COVERAGE_NAME)
-        files = glob.glob(os.path.join(path, "**/*.tif"), recursive=True)
-        options = gdal.WarpOptions(format="GTiff", srcNodata=255)
-        gdal.Warp(output, files, options=options)
+        # The tifs have slightly different resolutions after being warped from the sinusoidal
+        # projection, use the finest one like gdal.Warp does when mosaicing.
+        options = gdal.BuildVRTOptions(srcNodata=DST_NODATA, VRTNodata=DST_NODATA, resolution="highest")
+        mosaic = gdal.BuildVRT(output, tif_paths, options=options)
+        if mosaic is None:
+            raise RuntimeError("gdal.BuildVRT failed when creating the snow coverage mosaic.")
+        mosaic.FlushCache()
+        mosaic = None
 
     async def _clip_snow_coverage_mosaic(self, sub_dir: str, temp_dir: str):
         """Clip the boundary of the snow data mosaic to the boundary of BC.
@@ -217,8 +290,13 @@ class ViirsSnowJob:
         input_path = os.path.join(sub_dir, RAW_SNOW_COVERAGE_NAME)
         output_path = os.path.join(sub_dir, RAW_SNOW_COVERAGE_CLIPPED_NAME)
         cut_line_path = os.path.join(temp_dir, "bc_boundary.geojson")
-        gdal.Warp(
-            output_path, input_path, format="GTiff", cutlineDSName=cut_line_path, cropToCutline=True
+        await asyncio.to_thread(
+            gdal.Warp,
+            output_path,
+            input_path,
+            format="GTiff",
+            cutlineDSName=cut_line_path,
+            cropToCutline=True,
         )
 
     async def _get_bc_boundary_from_s3(self, path: str):
@@ -251,16 +329,22 @@ class ViirsSnowJob:
             with open(file_path, "rb") as file:
                 await client.put_object(Bucket=bucket, Key=key, Body=file)
 
-    def _classify_snow_coverage(self, path: str):
+    def _classify_snow_coverage(self, path: str, for_date: date) -> str:
+        """Classify the clipped snow coverage mosaic into an in memory raster.
+
+        :return: The /vsimem path of the classified raster, to be unlinked by the caller.
+        :rtype: str
+        """
         source_path = os.path.join(path, RAW_SNOW_COVERAGE_CLIPPED_NAME)
         source = gdal.Open(source_path, gdal.GA_ReadOnly)
         source_band = source.GetRasterBand(1)
         source_data = source_band.ReadAsArray()
         # Classify the data. Snow coverage in the source data is indicated by values in the range of 0-100. I'm using a range of
         # 10 - 100 to increase confidence. In the classified data 1 is assigned to snow covered pixels and all other pixels are 0.
-        classified = np.where((source_data > 10) & (source_data <= 100), 1, 0)
+        classified = ((source_data > 10) & (source_data <= 100)).astype(np.uint8)
         output_driver = gdal.GetDriverByName("GTiff")
-        classified_snow_path = os.path.join(path, BINARY_SNOW_COVERAGE_CLASSIFICATION_NAME)
+        # Dates are processed concurrently, so the in memory path needs to be unique per date.
+        classified_snow_path = f"/vsimem/{for_date.isoformat()}/{BINARY_SNOW_COVERAGE_CLASSIFICATION_NAME}"
         classified_snow = output_driver.Create(
             classified_snow_path,
             xsize=source_band.XSize,
@@ -277,104 +361,81 @@ class ViirsSnowJob:
         source = None
         classified_snow_band = None
         classified_snow = None
+        return classified_snow_path
 
-    async def _create_pmtiles_layer(self, path: str, for_date: date):
-        filename = os.path.join(path, BINARY_SNOW_COVERAGE_CLASSIFICATION_NAME)
-        with polygonize_in_memory(filename, "snow", "snow") as layer:
-            # We need a geojson file to pass to tippecanoe
-            temp_geojson = write_geojson(layer, path)
+    def _create_pmtiles_file(self, path: str, classified_path: str, for_date: date) -> str:
+        """Polygonize the classified snow coverage and write it to a pmtiles file.
+
+        :return: The path to the pmtiles file.
+        :rtype: str
+        """
+        with polygonize_in_memory(classified_path, "snow", "snow") as layer:
             pmtiles_filename = f"snowCoverage{for_date.strftime('%Y%m%d')}.pmtiles"
             temp_pmtiles_filepath = os.path.join(path, pmtiles_filename)
             logger.info(f"Writing snow coverage pmtiles -- {pmtiles_filename}")
-            tippecanoe_wrapper(
-                temp_geojson,
+            write_pmtiles(
+                layer,
                 temp_pmtiles_filepath,
                 min_zoom=SNOW_COVERAGE_PMTILES_MIN_ZOOM,
                 max_zoom=SNOW_COVERAGE_PMTILES_MAX_ZOOM,
             )
+        return temp_pmtiles_filepath
 
-            async with (
-                get_client() as (client, bucket),
-                aiofiles.open(temp_pmtiles_filepath, "rb") as f,
-            ):
-                key = get_pmtiles_filepath(for_date, pmtiles_filename)
-                logger.info(f"Uploading snow coverage file {pmtiles_filename} to {key}")
-                contents = await f.read()
-                await client.put_object(
-                    Bucket=bucket,
-                    Key=key,
-                    ACL=SNOW_COVERAGE_PMTILES_PERMISSIONS,  # We need these to be accessible to everyone
-                    Body=contents,
-                )
-            logger.info("Done uploading snow coverage file")
-
-    def _warp_to_wgs84(self, src_name_or_ds, dst_tif: str, resampling: str, dstnodata: float):
-        warp_options = gdal.WarpOptions(
-            dstSRS=SpatialReferenceSystem.WGS84.epsg,
-            resampleAlg=resampling,
-            format="GTiff",
-            dstNodata=dstnodata,
+    async def _create_pmtiles_layer(self, path: str, classified_path: str, for_date: date):
+        temp_pmtiles_filepath = await asyncio.to_thread(
+            self._create_pmtiles_file, path, classified_path, for_date
         )
-        out = gdal.Warp(dst_tif, src_name_or_ds, options=warp_options)
-        if out is None:
-            raise RuntimeError("gdal.Warp failed.")
-        out.FlushCache()
-        out = None
-
-    def _convert_h5_to_geotiff(self, temp_dir: str, h5_path: str):
-        ds = gdal.Open(h5_path)
-        if ds is None:
-            raise RuntimeError(f"Cannot open subdataset: {h5_path}")
-        # Attempt to derive NoData from band 1 if not specified
-        dstnodata = DST_NODATA
-        b1 = ds.GetRasterBand(1)
-        if b1 is not None:
-            nd = b1.GetNoDataValue()
-            if nd is not None:
-                dstnodata = nd
-        meta = ds.GetMetadata()
-        h, v = read_tile_indices(meta, h5_path)
-        width, height = ds.RasterXSize, ds.RasterYSize
-        ulx, uly, lrx, lry, px, py = compute_bounds_for_tile(h, v, width, height)
-
-        logger.info("Assigning MODIS Sinusoidal georeference with:")
-        logger.info(f"  h={h}, v={v}, size={width}x{height}, px={px:.6f} m, py={py:.6f} m")
-        logger.info(f"  ULX={ulx:.3f}, ULY={uly:.3f}, LRX={lrx:.3f}, LRY={lry:.3f}")
-
-        sinu_name = f"sinu_{h}_{v}.tif"
-        sinu_path = os.path.join(temp_dir, sinu_name)
-        sinu_wkt = build_modis_sinu_wkt()
-        translate_assign_sinu(ds, sinu_path, ulx, uly, lrx, lry, sinu_wkt)
-
-        wgs84_name = f"wgs_84_{h}_{v}.tif"
-        wgs84_path = os.path.join(temp_dir, wgs84_name)
-        self._warp_to_wgs84(sinu_path, wgs84_path, RESAMPLING, dstnodata)
-        os.remove(sinu_path)  # Remove the intermediate tif with the sinusoidal projection
-        ds = None
-
-    async def _process_viirs_snow(self, for_date: date, path: str):
+        pmtiles_filename = os.path.basename(temp_pmtiles_filepath)
+        async with (
+            get_client() as (client, bucket),
+            aiofiles.open(temp_pmtiles_filepath, "rb") as f,
+        ):
+            key = get_pmtiles_filepath(for_date, pmtiles_filename)
+            logger.info(f"Uploading snow coverage file {pmtiles_filename} to {key}")
+            contents = await f.read()
+            await client.put_object(
+                Bucket=bucket,
+                Key=key,
+                ACL=SNOW_COVERAGE_PMTILES_PERMISSIONS,  # We need these to be accessible to everyone
+                Body=contents,
+            )
+        logger.info("Done uploading snow coverage file")
+
+    async def _process_viirs_snow(self, for_date: date, path: str, executor: Executor):
         """Process VIIRS snow data.
 
         :param for_date: The date of interest.
         :type for_date: date
         :param path: A temporary file location for intermediate files.
         :type path: str
+        :param executor: The process pool to convert granules in.
+        :type executor: Executor
         """
         with tempfile.TemporaryDirectory() as sub_dir:
-            h5_paths = self._download_viirs_granules_by_date(for_date, sub_dir)
+            h5_paths = await asyncio.to_thread(
+                self._download_viirs_granules_by_date, for_date, sub_dir
+            )
             # The downloaded snow data is in a HDF5 format (.h5 file extension). Convert to WGS84 geotiffs.
-            for h5_path in h5_paths:
-                logger.info(f"Processing {h5_path}")
-                subdataset_path = f'HDF5:"{h5_path}"{SUBDATASET}'
-                self._convert_h5_to_geotiff(sub_dir, subdataset_path)
+            loop = asyncio.get_running_loop()
+            tif_paths = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        executor, convert_h5_to_geotiff, sub_dir, f'HDF5:"{h5_path}"{SUBDATASET}'
+                    )
+                    for h5_path in h5_paths
+                )
+            )
             # Create a mosaic from the snow coverage imagery, clip it to the boundary of BC and save to S3
-            self._create_snow_coverage_mosaic(sub_dir)
+            await asyncio.to_thread(self._create_snow_coverage_mosaic, sub_dir, tif_paths)
             await self._clip_snow_coverage_mosaic(sub_dir, path)
             await self._save_clipped_snow_coverage_mosaic_to_s3(for_date, sub_dir)
             # Reclassify the clipped snow coverage mosaic to 1 for snow and 0 for all other cells
-            self._classify_snow_coverage(sub_dir)
-            # Create pmtiles file and save to S3
-            await self._create_pmtiles_layer(sub_dir, for_date)
+            classified_path = await asyncio.to_thread(self._classify_snow_coverage, sub_dir, for_date)
+            try:
+                # Create pmtiles file and save to S3
+                await self._create_pmtiles_layer(sub_dir, classified_path, for_date)
+            finally:
+                gdal.Unlink(classified_path)
 
     async def _run_viirs_snow_default(self):
         """Logic for determining start and end dates for processing snow coverage data via a cronjob."""
@@ -426,29 +487,58 @@ class ViirsSnowJob:
             logger.info("Processing of VIIRS snow data is up to date.")
             return
         today_datetime = datetime.now(tz=vancouver_tz)
-        with tempfile.TemporaryDirectory() as temp_dir:
+        dates = [next_date + timedelta(days=day) for day in range((end_date - next_date).days + 1)]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DATES)
+        with (
+            tempfile.TemporaryDirectory() as temp_dir,
+            ProcessPoolExecutor(
+                max_workers=GRANULE_CONVERSION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=gdal.UseExceptions,
+            ) as executor,
+        ):
             # Get the bc_boundary.geojson in a temp_dir. This is expensive so we only want to do this once.
             logger.info("Downloading bc_boundary.geojson from S3.")
             await self._get_bc_boundary_from_s3(temp_dir)
-            while next_date <= end_date:
-                date_string = next_date.strftime("%Y-%m-%d")
-                logger.info(f"Processing snow coverage data for date: {date_string}")
-                tz_aware_datetime = datetime.combine(
-                    next_date, datetime.min.time(), tzinfo=vancouver_tz
-                )
 
-                await self._process_viirs_snow(next_date, temp_dir)
-                async with get_async_write_session_scope() as session:
+            async def process_date(for_date: date):
+                async with semaphore:
+                    logger.info(
+                        f"Processing snow coverage data for date: {for_date.strftime('%Y-%m-%d')}"
+                    )
+                    await self._process_viirs_snow(for_date, temp_dir, executor)
+
+            results = await asyncio.gather(
+                *(process_date(for_date) for for_date in dates), return_exceptions=True
+            )
+
+        # Dates are processed concurrently, but only record the dates up to the first failure, so that
+        # the next run picks up from the first date that wasn't processed.
+        processed_dates = []
+        failure = None
+        for for_date, result in zip(dates, results):
+            if isinstance(result, BaseException):
+                failure = result
+                break
+            processed_dates.append(for_date)
+
+        if processed_dates:
+            async with get_async_write_session_scope() as session:
+                for for_date in processed_dates:
+                    tz_aware_datetime = datetime.combine(
+                        for_date, datetime.min.time(), tzinfo=vancouver_tz
+                    )
                     processed_snow = ProcessedSnow(
                         for_date=tz_aware_datetime,
                         processed_date=today_datetime,
                         snow_source=SnowSourceEnum.viirs,
                     )
                     await save_processed_snow(session, processed_snow)
-                logger.info(
-                    f"Successfully processed VIIRS snow coverage data for date: {date_string}"
-                )
-                next_date = next_date + timedelta(days=1)
+                    logger.info(
+                        f"Successfully processed VIIRS snow coverage data for date: {for_date.strftime('%Y-%m-%d')}"
+                    )
+        if failure is not None:
+            raise failure
 
     async def _run_viirs_snow(self, args: argparse.Namespace):
         """Entry point for running the job."""
@@ -1,9 +1,18 @@
 from collections import defaultdict
 from datetime import datetime, time, timedelta, timezone
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
+import numpy as np
 from cffdrs import buildup_index, drought_code, duff_moisture_code, fine_fuel_moisture_code, fire_weather_index, initial_spread_index
+from cffdrs_vec.fwi import (
+    vectorized_bui,
+    vectorized_dc,
+    vectorized_dmc,
+    vectorized_ffmc,
+    vectorized_fwi,
+    vectorized_isi,
+)
 from sqlalchemy.orm import Session
 from wps_shared import config
 from wps_shared.db.crud.hfi_calc import get_fire_centre_station_codes
@@ -148,15 +157,11 @@ async def format_as_wf1_post_forecasts(
 def actual_exists(forecast: WeatherIndeterminate, actuals: List[WeatherIndeterminate]):
     """Returns True if the actuals contain a WeatherIndeterminate with station_code and utc_timestamp that
     matches those of the forecast; otherwise, returns False."""
-    station_code_matches = [
-        actual for actual in actuals if actual.station_code == forecast.station_code
-    ]
-    utc_timestamp_matches = [
-        station_code_match
-        for station_code_match in station_code_matches
-        if station_code_match.utc_timestamp == forecast.utc_timestamp
-    ]
-    return len(utc_timestamp_matches) > 0
+    return any(
+        actual.station_code == forecast.station_code
+        and actual.utc_timestamp == forecast.utc_timestamp
+        for actual in actuals
+    )
 
 
 def filter_for_api_forecasts(
@@ -164,11 +169,150 @@ def filter_for_api_forecasts(
 ):
     """Returns a list of forecasts where each forecast has a corresponding WeatherIndeterminate in the
     actuals with a matching station_code and utc_timestamp."""
-    filtered_forecasts = []
-    for forecast in forecasts:
-        if actual_exists(forecast, actuals):
-            filtered_forecasts.append(forecast)
-    return filtered_forecasts
+    actual_keys = {(actual.station_code, actual.utc_timestamp) for actual in actuals}
+    return [
+        forecast
+        for forecast in forecasts
+        if (forecast.station_code, forecast.utc_timestamp) in actual_keys
+    ]
+
+
+def _optional_values_to_array(values: List[Optional[float]]) -> np.ndarray:
+    """Converts a list of optional floats into a float64 array, with None represented as NaN."""
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def _array_value_to_optional(value: float) -> Optional[float]:
+    """Converts a value from a float64 array back into an optional float."""
+    return None if np.isnan(value) else float(value)
+
+
+def calculate_fwi_values_for_date(
+    yesterdays: Dict[str, np.ndarray], todays: List[WeatherIndeterminate]
+) -> List[WeatherIndeterminate]:
+    """
+    Vectorized equivalent of calculate_fwi_values, for many stations on the same date.
+
+    :param yesterdays: FFMC, DMC and DC arrays (keyed by "ffmc", "dmc" and "dc") from the day before, aligned
+    with todays. NaN where the value from the day before is missing.
+    :param todays: The WeatherIndeterminates from the date to calculate
+    :return: The updated WeatherIndeterminates
+    """
+    if len(todays) == 0:
+        return todays
+
+    temp = _optional_values_to_array([today.temperature for today in todays])
+    rh = _optional_values_to_array([today.relative_humidity for today in todays])
+    prec = _optional_values_to_array([today.precipitation for today in todays])
+    ws = _optional_values_to_array([today.wind_speed for today in todays])
+    lat = _optional_values_to_array([today.latitude for today in todays])
+    mon = np.array([today.utc_timestamp.month for today in todays], dtype=np.int64)
+
+    ffmc = _optional_values_to_array([today.fine_fuel_moisture_code for today in todays])
+    dmc = _optional_values_to_array([today.duff_moisture_code for today in todays])
+    dc = _optional_values_to_array([today.drought_code for today in todays])
+    isi = _optional_values_to_array([today.initial_spread_index for today in todays])
+    bui = _optional_values_to_array([today.build_up_index for today in todays])
+    fwi = _optional_values_to_array([today.fire_weather_index for today in todays])
+
+    weather_valid = ~(np.isnan(temp) | np.isnan(rh) | np.isnan(prec) | np.isnan(ws))
+
+    mask = weather_valid & ~np.isnan(yesterdays["ffmc"])
+    if mask.any():
+        ffmc[mask] = vectorized_ffmc(yesterdays["ffmc"][mask], temp[mask], rh[mask], ws[mask], prec[mask])
+    mask = weather_valid & ~np.isnan(yesterdays["dmc"])
+    if mask.any():
+        dmc[mask] = vectorized_dmc(
+            yesterdays["dmc"][mask], temp[mask], rh[mask], prec[mask], lat[mask], mon[mask], True
+        )
+    mask = weather_valid & ~np.isnan(yesterdays["dc"])
+    if mask.any():
+        dc[mask] = vectorized_dc(
+            yesterdays["dc"][mask], temp[mask], rh[mask], prec[mask], lat[mask], mon[mask], True
+        )
+    mask = weather_valid & ~np.isnan(ffmc)
+    if mask.any():
+        isi[mask] = vectorized_isi(ffmc[mask], ws[mask], False)
+    mask = weather_valid & ~np.isnan(dmc) & ~np.isnan(dc)
+    if mask.any():
+        bui[mask] = vectorized_bui(dmc[mask], dc[mask])
+    mask = weather_valid & ~np.isnan(isi) & ~np.isnan(bui)
+    if mask.any():
+        fwi[mask] = vectorized_fwi(isi[mask], bui[mask])
+
+    # All the FWIs should already be None if a weather variable is None but let's explicitly set
+    # them to None to prevent erroneous data from being provided to the front end.
+    for values in (ffmc, dmc, dc, isi, bui, fwi):
+        values[~weather_valid] = np.nan
+
+    for idx, today in enumerate(todays):
+        today.fine_fuel_moisture_code = _array_value_to_optional(ffmc[idx])
+        today.duff_moisture_code = _array_value_to_optional(dmc[idx])
+        today.drought_code = _array_value_to_optional(dc[idx])
+        today.initial_spread_index = _array_value_to_optional(isi[idx])
+        today.build_up_index = _array_value_to_optional(bui[idx])
+        today.fire_weather_index = _array_value_to_optional(fwi[idx])
+    return todays
+
+
+def calculate_fwi_chain(
+    indeterminates: List[WeatherIndeterminate], calculate: Optional[List[bool]] = None
+) -> List[WeatherIndeterminate]:
+    """
+    Calculates the daily FWI chain for a list of indeterminates spanning many stations and dates.
+
+    The indeterminates are laid out in a station x date matrix. Walking along the date axis, every
+    indeterminate that has an indeterminate for the same station on the day before is calculated from it,
+    with all stations for a date calculated in a single vectorized call. When there is more than one
+    indeterminate for a station and date, the last one in the list is used as the previous day for the next
+    date. Indeterminates are updated in place.
+
+    :param indeterminates: List of actual and/or forecasted weather values
+    :param calculate: Optional flags aligned with indeterminates. Only flagged indeterminates are calculated,
+    the rest are only used as the day before. Defaults to calculating every indeterminate.
+    :return: The list of indeterminates with calculated fire weather index values
+    """
+    if len(indeterminates) == 0:
+        return indeterminates
+
+    station_index = {
+        code: idx
+        for idx, code in enumerate(sorted({indeterminate.station_code for indeterminate in indeterminates}))
+    }
+    dates = sorted({indeterminate.utc_timestamp.date() for indeterminate in indeterminates})
+    date_index = {for_date: idx for idx, for_date in enumerate(dates)}
+
+    indeterminates_by_date: Dict[int, List[int]] = defaultdict(list)
+    # index into indeterminates of the last indeterminate for each station and date, -1 when there is none
+    last_for_station_date = np.full((len(station_index), len(dates)), -1, dtype=np.int64)
+    for idx, indeterminate in enumerate(indeterminates):
+        col = date_index[indeterminate.utc_timestamp.date()]
+        indeterminates_by_date[col].append(idx)
+        last_for_station_date[station_index[indeterminate.station_code], col] = idx
+
+    # FFMC, DMC and DC for each station and date, as they are after the date has been calculated
+    matrix = {key: np.full(last_for_station_date.shape, np.nan) for key in ("ffmc", "dmc", "dc")}
+
+    for col, for_date in enumerate(dates):
+        previous_col = date_index.get(for_date - timedelta(days=1))
+        if previous_col is not None:
+            todays = [
+                indeterminates[idx]
+                for idx in indeterminates_by_date[col]
+                if (calculate is None or calculate[idx])
+                and last_for_station_date[station_index[indeterminates[idx].station_code], previous_col] >= 0
+            ]
+            rows = np.array([station_index[today.station_code] for today in todays], dtype=np.int64)
+            yesterdays = {key: values[rows, previous_col] for key, values in matrix.items()}
+            calculate_fwi_values_for_date(yesterdays, todays)
+
+        for row in np.nonzero(last_for_station_date[:, col] >= 0)[0]:
+            last = indeterminates[last_for_station_date[row, col]]
+            matrix["ffmc"][row, col] = np.nan if last.fine_fuel_moisture_code is None else last.fine_fuel_moisture_code
+            matrix["dmc"][row, col] = np.nan if last.duff_moisture_code is None else last.duff_moisture_code
+            matrix["dc"][row, col] = np.nan if last.drought_code is None else last.drought_code
+
+    return indeterminates
 
 
 def get_fwi_values(
@@ -184,22 +328,7 @@ def get_fwi_values(
     :return: Actuals and forecasts with calculated fire weather index values
     :rtype: Tuple[List[WeatherIndeterminate], List[WeatherIndeterminate]
     """
-    all_indeterminates = actuals + forecasts
-    indeterminates_dict = defaultdict(dict)
-
-    # Shape indeterminates into nested dicts for quick and easy look ups by station code and date
-    for indeterminate in all_indeterminates:
-        indeterminates_dict[indeterminate.station_code][indeterminate.utc_timestamp.date()] = (
-            indeterminate
-        )
-
-    for idx, indeterminate in enumerate(all_indeterminates):
-        last_indeterminate = indeterminates_dict[indeterminate.station_code].get(
-            indeterminate.utc_timestamp.date() - timedelta(days=1), None
-        )
-        if last_indeterminate is not None:
-            updated_forecast = calculate_fwi_values(last_indeterminate, indeterminate)
-            all_indeterminates[idx] = updated_forecast
+    all_indeterminates = calculate_fwi_chain(actuals + forecasts)
 
     updated_forecasts = [
         indeterminate
@@ -236,25 +365,11 @@ def calculate_fwi_from_seed_indeterminates(
     :param target_indeterminates: List of WeatherIndeterminate objects that need FWI values calculated
     :return: List of updated WeatherIndeterminate objects with calculated FWI values
     """
-    # Combine seed and target indeterminates for lookup
-    all_indeterminates = seed_indeterminates + target_indeterminates
-    indeterminates_dict = defaultdict(dict)
-
-    # Shape indeterminates into nested dicts for quick lookups by station code and date
-    for indeterminate in all_indeterminates:
-        indeterminates_dict[indeterminate.station_code][indeterminate.utc_timestamp.date()] = (
-            indeterminate
-        )
-
-    # Calculate FWI values for target indeterminates
-    for idx, indeterminate in enumerate(target_indeterminates):
-        previous_date = indeterminate.utc_timestamp.date() - timedelta(days=1)
-        last_indeterminate = indeterminates_dict[indeterminate.station_code].get(
-            previous_date, None
-        )
-        if last_indeterminate is not None and indeterminate_missing_fwi(indeterminate):
-            # If the target indeterminate already has FWI values, skip calculation
-            target_indeterminates[idx] = calculate_fwi_values(last_indeterminate, indeterminate)
+    # Seeds are only used as the day before, targets that already have FWI values are left as they are
+    calculate = [False] * len(seed_indeterminates) + [
+        indeterminate_missing_fwi(indeterminate) for indeterminate in target_indeterminates
+    ]
+    calculate_fwi_chain(seed_indeterminates + target_indeterminates, calculate)
 
     return target_indeterminates
 
@@ -333,9 +448,10 @@ def transform_morecastforecastoutput_to_weatherindeterminate(
     into list of WeatherIndeterminate objects to match the structure of the forecasts pulled from WFWX.
     wfwx_stations list (station data from WFWX) is used to populate station_name data.
     """
+    stations_by_code = {station.code: station for station in wfwx_stations}
     weather_indeterminates: List[WeatherIndeterminate] = []
     for output in forecast_outputs:
-        station = next(s for s in wfwx_stations if s.code == output.station_code)
+        station = stations_by_code.get(output.station_code)
 
         weather_indeterminates.append(
             WeatherIndeterminate(
@@ -3,12 +3,71 @@
 
 import os
 import logging
-from statistics import mean
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from fastapi import HTTPException, status
 import wps_shared.schemas.percentiles
+from app.utils.singleton import Singleton
 
 logger = logging.getLogger(__name__)
 
+PERCENTILE_DATA_FOLDER = os.path.join(os.path.dirname(__file__), "data")
+
+# Column order of the values array in YearRangePercentiles.
+FFMC_COLUMN, ISI_COLUMN, BUI_COLUMN = 0, 1, 2
+
+
+@dataclass
+class YearRangePercentiles:
+    """ Pre-calculated percentiles for all stations in a year range, in columnar form. """
+    # station code -> row in values and summaries
+    station_index: Dict[int, int]
+    # one row per station, with ffmc, isi and bui columns. NaN where a value is missing.
+    values: np.ndarray
+    summaries: List[wps_shared.schemas.percentiles.StationSummary]
+
+
+def _load_year_range(foldername: str) -> YearRangePercentiles:
+    """ Parse all the station summary files for a year range. """
+    station_index: Dict[int, int] = {}
+    summaries: List[wps_shared.schemas.percentiles.StationSummary] = []
+    for filename in sorted(os.listdir(foldername)):
+        code, extension = os.path.splitext(filename)
+        if extension != ".json" or not code.isdigit():
+            continue
+        summary = wps_shared.schemas.percentiles.StationSummary.parse_file(os.path.join(foldername, filename))
+        station_index[int(code)] = len(summaries)
+        summaries.append(summary)
+
+    values = np.array([[summary.ffmc, summary.isi, summary.bui] for summary in summaries],
+                      dtype=np.float64).reshape(len(summaries), 3)
+    return YearRangePercentiles(station_index=station_index, values=values, summaries=summaries)
+
+
+@Singleton
+class PercentileStore:
+    """ Singleton that parses the pre-calculated percentile files for every year range once, and keeps them
+    in memory, so that requests don't have to read and parse a file per station.
+    """
+
+    def __init__(self):
+        self.year_ranges: Dict[Tuple[int, int], YearRangePercentiles] = {}
+        for foldername in sorted(os.listdir(PERCENTILE_DATA_FOLDER)):
+            start, _, end = foldername.partition("-")
+            path = os.path.join(PERCENTILE_DATA_FOLDER, foldername)
+            if start.isdigit() and end.isdigit() and os.path.isdir(path):
+                self.year_ranges[(int(start), int(end))] = _load_year_range(path)
+        logger.info('loaded percentiles for year ranges %s', list(self.year_ranges.keys()))
+
+    def get(self, year_range_start: int, year_range_end: int) -> Optional[YearRangePercentiles]:
+        """ Return the percentiles for a year range, if the year range is supported. """
+        return self.year_ranges.get((year_range_start, year_range_end))
+
+
+def _mean_or_none(values: np.ndarray) -> Optional[float]:
+    return float(np.mean(values)) if values.size > 0 else None
+
 
 def get_precalculated_percentiles(request: wps_shared.schemas.percentiles.PercentileRequest):
     """ Return the pre calculated percentile response
@@ -22,18 +81,14 @@ def get_precalculated_percentiles(request: wps_shared.schemas.percentiles.Percen
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail='Weather station is not found.')
 
-    foldername = os.path.join(
-        os.path.dirname(__file__), f"data/{year_range_start}-{year_range_end}")
-    logger.info(foldername)
-
-    if not os.path.exists(foldername):
+    percentiles = PercentileStore.instance().get(year_range_start, year_range_end)
+    if percentiles is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail='The year range is not currently supported.')
 
     # Not every station in the weather station list has pre-calculated percentiles, so check up
-    # front rather than failing part way through the loop below with a FileNotFoundError.
-    missing = [code for code in request.stations
-               if not os.path.isfile(os.path.join(foldername, f"{code}.json"))]
+    # front rather than failing part way through the lookups below.
+    missing = [code for code in request.stations if code not in percentiles.station_index]
     if missing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,23 +97,18 @@ def get_precalculated_percentiles(request: wps_shared.schemas.percentiles.Percen
 
     response = wps_shared.schemas.percentiles.CalculatedResponse(percentile=90, year_range=wps_shared.schemas.percentiles.YearRange(start=year_range_start, end=year_range_end))
 
-    bui = []
-    isi = []
-    ffmc = []
-    for code in request.stations:
-        filename = os.path.join(foldername, f"{code}.json")
-        summary = wps_shared.schemas.percentiles.StationSummary.parse_file(filename)
-
-        if summary.bui and summary.isi and summary.ffmc:
-            bui.append(summary.bui)
-            isi.append(summary.isi)
-            ffmc.append(summary.ffmc)
+    rows = np.array([percentiles.station_index[code] for code in request.stations], dtype=np.int64)
+    for code, row in zip(request.stations, rows):
+        response.stations[code] = percentiles.summaries[row]
 
-        response.stations[code] = summary
+    # Only stations with all of bui, isi and ffmc contribute to the mean values.
+    values = percentiles.values[rows]
+    complete = np.all(~np.isnan(values) & (values != 0), axis=1)
+    values = values[complete]
 
     response.mean_values = wps_shared.schemas.percentiles.MeanValues()
-    response.mean_values.bui = mean(bui) if bui else None
-    response.mean_values.isi = mean(isi) if isi else None
-    response.mean_values.ffmc = mean(ffmc) if ffmc else None
+    response.mean_values.bui = _mean_or_none(values[:, BUI_COLUMN])
+    response.mean_values.isi = _mean_or_none(values[:, ISI_COLUMN])
+    response.mean_values.ffmc = _mean_or_none(values[:, FFMC_COLUMN])
 
     return response
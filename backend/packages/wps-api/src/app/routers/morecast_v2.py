@@ -2,11 +2,12 @@
 
 import logging
 from datetime import date, datetime, time, timedelta, timezone
-from typing import List
+from typing import List, Optional, Tuple
 
 from aiohttp.client import ClientSession
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 from wps_wf1.wfwx_api import WfwxApi
 from wps_shared.auth import audit, auth_with_forecaster_role_required, authentication_required
 from wps_shared.db.crud.grass_curing import get_percent_grass_curing_by_station_for_date_range
@@ -29,6 +30,7 @@ from wps_shared.schemas.morecast_v2 import (
     WeatherIndeterminate,
 )
 from wps_shared.schemas.shared import StationsRequest
+from wps_shared.schemas.stations import WeatherStation, WFWXWeatherStation
 from wps_shared.utils.redis import clear_cache_matching
 from wps_shared.utils.time import get_hour_20_from_date, get_utc_now, vancouver_tz
 from wps_shared.weather_models.fetch.predictions import (
@@ -220,6 +222,49 @@ async def get_observed_dailies(
         return StationDailiesResponse(dailies=observed_dailies)
 
 
+def get_determinates_from_db(
+    station_codes: List[int],
+    all_stations: List[WeatherStation],
+    wfwx_stations: List[WFWXWeatherStation],
+    start_time: datetime,
+    end_time: datetime,
+    min_wf1_actuals_date: Optional[datetime],
+    max_wf1_actuals_date: Optional[datetime],
+) -> Tuple[List[MoreCastForecastOutput], List[WeatherIndeterminate], List[WeatherIndeterminate]]:
+    """Returns our forecasts, the model predictions and the grass curing values for the requested stations
+    within the requested date range."""
+    with get_read_session_scope() as db_session:
+        forecasts_from_db: List[MoreCastForecastOutput] = get_forecasts(
+            db_session, min_wf1_actuals_date, max_wf1_actuals_date, station_codes
+        )
+        predictions: List[WeatherIndeterminate] = (
+            fetch_latest_model_run_predictions_by_station_code_and_date_range(
+                db_session, all_stations, start_time, end_time
+            )
+        )
+        stations_by_code = {station.code: station for station in wfwx_stations}
+        grass_curing_rows = get_percent_grass_curing_by_station_for_date_range(
+            db_session, start_time.date(), end_time.date(), list(stations_by_code.keys())
+        )
+        grass_curing = []
+
+        for gc_tuple in grass_curing_rows:
+            gc_row = gc_tuple[0]
+            current_station = stations_by_code[gc_row.station_code]
+            gc_indeterminate = WeatherIndeterminate(
+                determinate=WeatherDeterminate.GRASS_CURING_CWFIS,
+                station_code=current_station.code,
+                station_name=current_station.name,
+                latitude=current_station.lat,
+                longitude=current_station.long,
+                utc_timestamp=get_hour_20_from_date(gc_row.for_date),
+                grass_curing=gc_row.percent_grass_curing,
+            )
+            grass_curing.append(gc_indeterminate)
+
+    return forecasts_from_db, predictions, grass_curing
+
+
 @router.post(
     "/determinates/{start_date}/{end_date}",
     response_model=IndeterminateDailiesResponse,
@@ -276,48 +321,29 @@ async def get_determinates_for_date_range(
         min_wf1_actuals_date = min(wf1_actuals_dates, default=None)
         max_wf1_actuals_date = max(wf1_actuals_dates, default=None)
 
-    with get_read_session_scope() as db_session:
-        forecasts_from_db: List[MoreCastForecastOutput] = get_forecasts(
-            db_session, min_wf1_actuals_date, max_wf1_actuals_date, request.stations
-        )
-        predictions: List[WeatherIndeterminate] = (
-            fetch_latest_model_run_predictions_by_station_code_and_date_range(
-                db_session, all_stations, start_time, end_time
-            )
-        )
-        station_codes = [station.code for station in wfwx_stations]
-        grass_curing_rows = get_percent_grass_curing_by_station_for_date_range(
-            db_session, start_time.date(), end_time.date(), station_codes
-        )
-        grass_curing = []
-
-        for gc_tuple in grass_curing_rows:
-            gc_row = gc_tuple[0]
-            current_station = [
-                station for station in wfwx_stations if station.code == gc_row.station_code
-            ][0]
-            gc_indeterminate = WeatherIndeterminate(
-                determinate=WeatherDeterminate.GRASS_CURING_CWFIS,
-                station_code=current_station.code,
-                station_name=current_station.name,
-                latitude=current_station.lat,
-                longitude=current_station.long,
-                utc_timestamp=get_hour_20_from_date(gc_row.for_date),
-                grass_curing=gc_row.percent_grass_curing,
-            )
-            grass_curing.append(gc_indeterminate)
+    # The database calls are synchronous, so we run them in a thread to avoid blocking the event loop.
+    forecasts_from_db, predictions, grass_curing = await run_in_threadpool(
+        get_determinates_from_db,
+        request.stations,
+        all_stations,
+        wfwx_stations,
+        start_time,
+        end_time,
+        min_wf1_actuals_date,
+        max_wf1_actuals_date,
+    )
 
-        transformed_forecasts = transform_morecastforecastoutput_to_weatherindeterminate(
-            forecasts_from_db, wfwx_stations
-        )
+    transformed_forecasts = transform_morecastforecastoutput_to_weatherindeterminate(
+        forecasts_from_db, wfwx_stations
+    )
 
-        # Not all weather stations report actuals at the same time, so we can end up in a situation where
-        # for a given date, we need to show the forecast from the wf1 API for one station, and the forecast
-        # from our API database for another station. We can check this by testing for the presence of an
-        # actual for the given date and station; if an actual exists we use the forecast from our API database.
-        transformed_forecasts_to_add = filter_for_api_forecasts(transformed_forecasts, wf1_actuals)
+    # Not all weather stations report actuals at the same time, so we can end up in a situation where
+    # for a given date, we need to show the forecast from the wf1 API for one station, and the forecast
+    # from our API database for another station. We can check this by testing for the presence of an
+    # actual for the given date and station; if an actual exists we use the forecast from our API database.
+    transformed_forecasts_to_add = filter_for_api_forecasts(transformed_forecasts, wf1_actuals)
 
-        wf1_forecasts.extend(transformed_forecasts_to_add)
+    wf1_forecasts.extend(transformed_forecasts_to_add)
 
     return IndeterminateDailiesResponse(
         actuals=wf1_actuals,
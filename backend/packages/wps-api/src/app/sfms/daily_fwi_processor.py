@@ -1,5 +1,4 @@
 import logging
-import os
 import tempfile
 from datetime import datetime, timedelta
 from typing import Callable, Iterator, List, Tuple, cast
@@ -100,27 +99,28 @@ class DailyFWIProcessor:
                         input_datasets
                     )
 
-                    # Warp weather datasets to match fwi
+                    # Warp weather datasets to match fwi, the weather datasets share a grid, so they and
+                    # every following day reuse one cached warp plan
                     warped_temp_ds = temp_ds.warp_to_match(
                         dmc_ds,
-                        f"{temp_dir}/{os.path.basename(temp_key)}.tif",
-                        GDALResamplingMethod.BILINEAR,
+                        resample_method=GDALResamplingMethod.BILINEAR,
+                        reuse_warp_plan=True,
                     )
                     warped_rh_ds = rh_ds.warp_to_match(
                         dmc_ds,
-                        f"{temp_dir}/{os.path.basename(rh_key)}.tif",
-                        GDALResamplingMethod.BILINEAR,
+                        resample_method=GDALResamplingMethod.BILINEAR,
                         max_value=100,
+                        reuse_warp_plan=True,
                     )
                     warped_wind_speed_ds = wind_speed_ds.warp_to_match(
                         dmc_ds,
-                        f"{temp_dir}/{os.path.basename(wind_speed_key)}.tif",
-                        GDALResamplingMethod.BILINEAR,
+                        resample_method=GDALResamplingMethod.BILINEAR,
+                        reuse_warp_plan=True,
                     )
                     warped_precip_ds = precip_ds.warp_to_match(
                         dmc_ds,
-                        f"{temp_dir}/{os.path.basename(precip_key)}.tif",
-                        GDALResamplingMethod.BILINEAR,
+                        resample_method=GDALResamplingMethod.BILINEAR,
+                        reuse_warp_plan=True,
                     )
 
                     # close unneeded datasets to reduce memory usage
@@ -1,11 +1,20 @@
+import asyncio
 import logging
 import os
 import tempfile
+from contextlib import ExitStack
 from datetime import datetime, timedelta
-from typing import List, cast
+from time import perf_counter
+from typing import List, Optional, Tuple, cast
 
+import numpy as np
+from cffdrs_vec.fwi import time_stacked_ffmc
 from osgeo import gdal
-from wps_shared.geospatial.geospatial import GDALResamplingMethod
+from wps_shared.geospatial.geospatial import (
+    GDALResamplingMethod,
+    get_geotiff_bytes,
+    warp_to_match_raster,
+)
 from wps_shared.geospatial.wps_dataset import WPSDataset
 from wps_shared.utils.s3 import set_s3_gdal_config
 from wps_shared.utils.s3_client import S3Client
@@ -13,11 +22,16 @@ from wps_shared.weather_models.rdps import model_run_for_hour
 
 from app.jobs.rdps_sfms import MAX_MODEL_RUN_HOUR
 from app.sfms.daily_fwi_processor import MultiDatasetContext
-from app.sfms.fwi_processor import calculate_ffmc
+from app.sfms.fwi_processor import calculate_ffmc, check_weather_values
 from app.sfms.raster_addresser import RasterKeyAddresser
 
 logger = logging.getLogger(__name__)
 
+# Number of hFFMC grid rows calculated at a time by the time stacked calculation.
+HFFMC_STACK_BLOCK_ROWS = 256
+# Maximum number of calculated hFFMC rasters uploaded at the same time.
+HFFMC_UPLOAD_CONCURRENCY = 8
+
 
 class HourlyFFMCProcessor:
     """
@@ -28,6 +42,34 @@ class HourlyFFMCProcessor:
         self.start_datetime = start_datetime
         self.addresser = addresser
 
+    def _get_rdps_model_run_start(self) -> datetime:
+        """Determine the start of the most recent RDPS model run."""
+        rdps_model_run_hour = model_run_for_hour(self.start_datetime.hour)
+        return datetime(
+            year=self.start_datetime.year,
+            month=self.start_datetime.month,
+            day=self.start_datetime.day,
+            hour=rdps_model_run_hour,
+            tzinfo=self.start_datetime.tzinfo,
+        )
+
+    async def _get_seed_hffmc_key(
+        self, s3_client: S3Client, rdps_model_run_start: datetime
+    ) -> Optional[str]:
+        """
+        Determine key to the initial/seed hFFMC from SFMS and check if it exists. Initial hffmc will be a 04 or 16 hour hffmc from SFMS.
+
+        :return: the seed hFFMC key, or None if it doesn't exist
+        """
+        hffmc_key = self.addresser.get_uploaded_hffmc_key(rdps_model_run_start)
+        hffmc_key_exists = await s3_client.all_objects_exist(hffmc_key)
+        if not hffmc_key_exists:
+            logger.warning(
+                f"Missing initial hFFMC raster from SFMS for date {self.start_datetime}. Missing key is {hffmc_key}."
+            )
+            return None
+        return hffmc_key
+
     async def process(
         self,
         s3_client: S3Client,
@@ -44,23 +86,9 @@ class HourlyFFMCProcessor:
         # 5. Start calculating hFFMC from model run hour 0 through to 47. Save the calculated hFFMCs to S3. Most recently calculated hFFMC is used as input to the next hour's hFFMC calculation.
         # 6. hFFMC rasters are saved to S3 with UTC based keys.
 
-        # Determine most recent RDPS model run
-        rdps_model_run_hour = model_run_for_hour(self.start_datetime.hour)
-        rdps_model_run_start = datetime(
-            year=self.start_datetime.year,
-            month=self.start_datetime.month,
-            day=self.start_datetime.day,
-            hour=rdps_model_run_hour,
-            tzinfo=self.start_datetime.tzinfo,
-        )
-
-        # Determine key to the initial/seed hFFMC from SFMS and check if it exists. Initial hffmc will be a 04 or 16 hour hffmc from SFMS.
-        hffmc_key = self.addresser.get_uploaded_hffmc_key(rdps_model_run_start)
-        hffmc_key_exists = await s3_client.all_objects_exist(hffmc_key)
-        if not hffmc_key_exists:
-            logger.warning(
-                f"Missing initial hFFMC raster from SFMS for date {self.start_datetime}. Missing key is {hffmc_key}."
-            )
+        rdps_model_run_start = self._get_rdps_model_run_start()
+        hffmc_key = await self._get_seed_hffmc_key(s3_client, rdps_model_run_start)
+        if hffmc_key is None:
             return
 
         for hour in range(0, hours_to_process):
@@ -135,3 +163,135 @@ class HourlyFFMCProcessor:
                     )
                     # Clear gdal virtual file system cache of S3 metadata in order to allow newly uploaded hffmc rasters to be opened immediately.
                     gdal.VSICurlClearCache()
+
+    async def process_stacked(
+        self, s3_client: S3Client, hours_to_process: int = MAX_MODEL_RUN_HOUR
+    ):
+        """
+        Calculate the same hourly FFMC rasters as process, in one pass over the stack of hourly weather inputs.
+
+        The weather inputs of every hour are warped onto the seed hFFMC grid lazily, read a block of rows at
+        a time as (hour, row, col) stacks and the FFMC recursion is run along the hour axis in a single
+        compiled kernel, so intermediate hFFMC rasters are never written and re-read. Calculated rasters are
+        uploaded concurrently once every hour is calculated.
+        """
+        set_s3_gdal_config()
+
+        rdps_model_run_start = self._get_rdps_model_run_start()
+        hffmc_key = await self._get_seed_hffmc_key(s3_client, rdps_model_run_start)
+        if hffmc_key is None:
+            return
+
+        resolved_hours = await asyncio.gather(
+            *(
+                self.addresser.resolve_weather_data_keys_hffmc(s3_client, rdps_model_run_start, hour)
+                for hour in range(hours_to_process)
+            )
+        )
+        weather_keys = []
+        for hour, resolved in enumerate(resolved_hours):
+            if resolved is None:
+                logger.warning(
+                    "Missing weather keys for model run: %s and hour %d", rdps_model_run_start, hour
+                )
+                break
+            weather_keys.append(self.addresser.gdal_prefix_keys(*resolved))
+        if not weather_keys:
+            return
+
+        (hffmc_key,) = self.addresser.gdal_prefix_keys(hffmc_key)
+        hffmc_values, geotransform, projection, nodata_value = await asyncio.to_thread(
+            calculate_time_stacked_hffmc, hffmc_key, weather_keys
+        )
+
+        semaphore = asyncio.Semaphore(HFFMC_UPLOAD_CONCURRENCY)
+
+        async def upload(hour: int):
+            key = self.addresser.get_calculated_hffmc_index_key(
+                rdps_model_run_start + timedelta(hours=hour)
+            )
+            async with semaphore:
+                body = await asyncio.to_thread(
+                    encode_hffmc_raster, hffmc_values[hour], geotransform, projection, nodata_value
+                )
+                logger.info("Writing to S3: %s", key)
+                await s3_client.put_object(key=key, body=body)
+
+        await asyncio.gather(*(upload(hour) for hour in range(len(weather_keys))))
+        # Clear gdal virtual file system cache of S3 metadata in order to allow newly uploaded hffmc rasters to be opened immediately.
+        gdal.VSICurlClearCache()
+
+
+def read_weather_block(band: gdal.Band, yoff: int, rows: int) -> np.ndarray:
+    """Read a block of rows of a weather band, with nodata replaced by 0."""
+    values = band.ReadAsArray(0, yoff, band.XSize, rows)
+    nodata_value = band.GetNoDataValue()
+    if nodata_value is not None:
+        values[values == nodata_value] = 0
+    return values
+
+
+def calculate_time_stacked_hffmc(
+    hffmc_key: str, weather_keys: List[Tuple[str, str, str, str]]
+) -> Tuple[np.ndarray, tuple, str, Optional[float]]:
+    """
+    Calculate hourly FFMC for every hour of weather inputs, starting from the seed hFFMC.
+
+    :param hffmc_key: gdal path to the seed hFFMC raster
+    :param weather_keys: gdal paths to the (temp, rh, wind speed, precip) rasters of each hour, in order
+    :return: float32 (hour, row, col) hFFMC values, and the geotransform, projection and nodata value of the seed hFFMC
+    """
+    with ExitStack() as stack:
+        hffmc_ds: gdal.Dataset = stack.enter_context(gdal.Open(hffmc_key, gdal.GA_ReadOnly))
+        hffmc_band: gdal.Band = hffmc_ds.GetRasterBand(1)
+        nodata_value = hffmc_band.GetNoDataValue()
+
+        # (hour, parameter) warped VRT bands, the sources are kept open for the VRTs to read from
+        weather_bands = []
+        for hour_keys in weather_keys:
+            hour_bands = []
+            for key in hour_keys:
+                source_ds = stack.enter_context(gdal.Open(key, gdal.GA_ReadOnly))
+                warped_ds = warp_to_match_raster(
+                    source_ds, hffmc_ds, "", GDALResamplingMethod.BILINEAR, output_format="VRT"
+                )
+                stack.callback(warped_ds.Close)
+                hour_bands.append(warped_ds.GetRasterBand(1))
+            weather_bands.append(hour_bands)
+
+        start = perf_counter()
+        hffmc_values = np.empty(
+            (len(weather_keys), hffmc_ds.RasterYSize, hffmc_ds.RasterXSize), dtype=np.float32
+        )
+        for yoff in range(0, hffmc_ds.RasterYSize, HFFMC_STACK_BLOCK_ROWS):
+            rows = min(HFFMC_STACK_BLOCK_ROWS, hffmc_ds.RasterYSize - yoff)
+            seed_hffmc = hffmc_band.ReadAsArray(0, yoff, hffmc_ds.RasterXSize, rows).astype(np.float64)
+            nodata_mask = seed_hffmc == nodata_value if nodata_value is not None else None
+            if nodata_mask is not None:
+                seed_hffmc[nodata_mask] = 0
+            temp, rh, wind_speed, precip = (
+                np.stack([read_weather_block(hour_bands[i], yoff, rows) for hour_bands in weather_bands])
+                for i in range(4)
+            )
+            # clamp any relative humidity above 100 to 100
+            rh = np.minimum(rh, 100)
+            check_weather_values(rh, precip, wind_speed)
+
+            block_values = time_stacked_ffmc(seed_hffmc, temp, rh, wind_speed, precip)
+            if nodata_mask is not None:
+                block_values[:, nodata_mask] = nodata_value
+            hffmc_values[:, yoff : yoff + rows] = block_values
+        logger.info(
+            "%f seconds to calculate %d hours of time stacked ffmc",
+            perf_counter() - start,
+            len(weather_keys),
+        )
+        return hffmc_values, hffmc_ds.GetGeoTransform(), hffmc_ds.GetProjection(), nodata_value
+
+
+def encode_hffmc_raster(
+    values: np.ndarray, geotransform: tuple, projection: str, nodata_value: Optional[float]
+) -> bytes:
+    """Encode a calculated hFFMC grid as GeoTIFF bytes."""
+    with WPSDataset.from_array(values, geotransform, projection, nodata_value) as ds:
+        return get_geotiff_bytes(ds.as_gdal_ds())
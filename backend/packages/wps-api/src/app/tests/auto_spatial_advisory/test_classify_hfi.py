@@ -0,0 +1,19 @@
+import numpy as np
+
+from app.auto_spatial_advisory.classify_hfi import classify_hfi_array
+from app.auto_spatial_advisory.snow import classify_snow_coverage
+
+
+def test_classify_hfi_array():
+    hfi = np.array([[0, 3999.9, 4000], [9999.9, 10000, np.nan]], dtype=np.float32)
+
+    classified = classify_hfi_array(hfi)
+
+    assert classified.dtype == np.uint8
+    assert classified.tolist() == [[0, 0, 1], [1, 2, 0]]
+
+
+def test_classify_snow_coverage():
+    snow = np.array([0, 10, 11, 100, 101, 255], dtype=np.uint8)
+
+    assert classify_snow_coverage(snow).tolist() == [False, False, True, True, False, False]
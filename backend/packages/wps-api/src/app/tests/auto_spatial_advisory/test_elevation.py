@@ -0,0 +1,49 @@
+import numpy as np
+
+import app.auto_spatial_advisory.elevation as elevation
+from app.auto_spatial_advisory.elevation import count_tpi_hfi_pixels_by_zone, get_fire_zone_tpi_stats
+
+
+class ArrayBand:
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self.YSize, self.XSize = data.shape
+
+    def ReadAsArray(self, xoff, yoff, xsize, ysize):
+        return self.data[yoff : yoff + ysize, xoff : xoff + xsize]
+
+
+def test_count_tpi_hfi_pixels_by_zone_reads_in_blocks(monkeypatch):
+    monkeypatch.setattr(elevation, "TPI_STATS_BLOCK_ROWS", 1)
+    tpi = np.array([[1, 2, 3], [3, 4, 1], [2, 2, 1]], dtype=np.uint8)
+    hfi = np.array([[1, 2, 0], [2, 2, 1], [1, 0, 2]], dtype=np.uint8)
+    zone_ids = np.array([[5, 5, 5], [5, 5, 2], [0, 2, 2]], dtype=np.uint16)
+
+    counts = count_tpi_hfi_pixels_by_zone(ArrayBand(tpi), ArrayBand(hfi), ArrayBand(zone_ids), 6)
+
+    assert counts.shape == (6, 4, 3)
+    assert counts[5, 1, 1] == 1
+    assert counts[5, 2, 2] == 1
+    assert counts[5, 3, 0] == 1
+    assert counts[5, 3, 2] == 1
+    assert counts[2, 1, 1] == 1
+    assert counts[2, 2, 0] == 1
+    assert counts[2, 1, 2] == 1
+    # TPI no data (4) and pixels outside every zone aren't counted
+    assert counts.sum() == 7
+
+
+def test_get_fire_zone_tpi_stats():
+    counts = np.zeros((6, 4, 3), dtype=np.int64)
+    counts[5, 1] = [10, 1, 2]
+    counts[5, 3] = [4, 0, 5]
+    counts[2, 2] = [7, 0, 0]
+
+    stats = get_fire_zone_tpi_stats(counts, [2, 5, 8])
+
+    # only advisory and warning HFI pixels are counted, every shape has stats
+    assert stats == {
+        2: {1: 0, 2: 0, 3: 0},
+        5: {1: 3, 2: 0, 3: 5},
+        8: {1: 0, 2: 0, 3: 0},
+    }
@@ -0,0 +1,62 @@
+import numpy as np
+from osgeo import gdal, osr
+from shapely.geometry import box
+
+from app.auto_spatial_advisory.process_high_hfi_area import (
+    calculate_high_hfi_areas,
+    count_high_hfi_pixels_by_zone,
+)
+
+
+def test_count_high_hfi_pixels_by_zone():
+    classified_hfi = np.array([[0, 1, 1, 2], [2, 2, 1, 0]], dtype=np.uint8)
+    zone_ids = np.array([[3, 3, 3, 3], [0, 5, 5, 5]], dtype=np.int32)
+
+    counts = count_high_hfi_pixels_by_zone(classified_hfi, zone_ids)
+
+    assert counts.shape == (6, 3)
+    assert counts[3].tolist() == [0, 2, 1]
+    assert counts[5].tolist() == [0, 1, 1]
+    # pixels outside every zone aren't counted
+    assert counts.sum() == 5
+
+
+def test_count_high_hfi_pixels_by_zone_no_zones():
+    classified_hfi = np.array([[1, 2]], dtype=np.uint8)
+    zone_ids = np.zeros((1, 2), dtype=np.int32)
+
+    counts = count_high_hfi_pixels_by_zone(classified_hfi, zone_ids)
+
+    assert counts.sum() == 0
+
+
+def test_calculate_high_hfi_areas():
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3005)
+    srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    # 4x2 grid of 2km pixels
+    classified_hfi = np.array([[1, 1, 2, 0], [2, 0, 1, 1]], dtype=np.uint8)
+    path = "/vsimem/test_classified_hfi.tif"
+    ds = gdal.GetDriverByName("GTiff").Create(path, 4, 2, 1, gdal.GDT_Byte)
+    ds.SetGeoTransform((1000000, 2000, 0, 1000000, 0, -2000))
+    ds.SetProjection(srs.ExportToWkt())
+    ds.GetRasterBand(1).WriteArray(classified_hfi)
+    ds = None
+    # zone 7 covers the left two columns, zone 9 the right two
+    zones = [
+        (7, box(1000000, 996000, 1004000, 1000000).wkb),
+        (9, box(1004000, 996000, 1008000, 1000000).wkb),
+    ]
+
+    try:
+        areas = calculate_high_hfi_areas(path, zones, srs)
+    finally:
+        gdal.Unlink(path)
+
+    pixel_area = 2000 * 2000
+    assert sorted(areas) == [
+        (7, 1, 2 * pixel_area),
+        (7, 2, pixel_area),
+        (9, 1, 2 * pixel_area),
+        (9, 2, pixel_area),
+    ]
@@ -0,0 +1,110 @@
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from osgeo import gdal, osr
+
+from app.auto_spatial_advisory.process_hfi import classify_and_snow_mask_hfi
+from app.auto_spatial_advisory.snow import get_snow_covered_pixels
+
+HFI_PATH = "/vsimem/test_snow_hfi.tif"
+SNOW_PATH = "/vsimem/test_snow_coverage.tif"
+# 4 x 2 HFI pixels of 2km in BC Albers, the snow raster covers the west half
+HFI_GEO_TRANSFORM = (1000000, 2000, 0, 1000000, 0, -2000)
+HFI_CENTRE_X = 1004000
+SNOW_PIXEL_DEGREES = 0.001
+
+
+def _srs(epsg: int) -> osr.SpatialReference:
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(epsg)
+    srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return srs
+
+
+def _create_hfi(values: np.ndarray) -> gdal.Dataset:
+    ds = gdal.GetDriverByName("GTiff").Create(
+        HFI_PATH, values.shape[1], values.shape[0], 1, gdal.GDT_Float32
+    )
+    ds.SetGeoTransform(HFI_GEO_TRANSFORM)
+    ds.SetProjection(_srs(3005).ExportToWkt())
+    ds.GetRasterBand(1).WriteArray(values)
+    ds.FlushCache()
+    return ds
+
+
+def _create_snow_coverage():
+    """
+    Snow coverage in EPSG:4326 like the processed VIIRS snow coverage, covered by snow (NDSI 50) west of
+    the centre of the HFI grid and not (NDSI 5) east of it.
+    """
+    to_lon_lat = osr.CoordinateTransformation(_srs(3005), _srs(4326))
+    minx, pixel_width, _, maxy, _, pixel_height = HFI_GEO_TRANSFORM
+    corners = [
+        to_lon_lat.TransformPoint(x, y)[:2]
+        for x in (minx, minx + 4 * pixel_width)
+        for y in (maxy, maxy + 2 * pixel_height)
+    ]
+    centre_lon = to_lon_lat.TransformPoint(HFI_CENTRE_X, maxy + pixel_height)[0]
+    west = min(lon for lon, _ in corners) - 0.05
+    east = max(lon for lon, _ in corners) + 0.05
+    south = min(lat for _, lat in corners) - 0.05
+    north = max(lat for _, lat in corners) + 0.05
+    columns = int(np.ceil((east - west) / SNOW_PIXEL_DEGREES))
+    rows = int(np.ceil((north - south) / SNOW_PIXEL_DEGREES))
+
+    pixel_lons = west + (np.arange(columns) + 0.5) * SNOW_PIXEL_DEGREES
+    snow = np.where(pixel_lons < centre_lon, 50, 5).astype(np.uint8)
+    ds = gdal.GetDriverByName("GTiff").Create(SNOW_PATH, columns, rows, 1, gdal.GDT_Byte)
+    ds.SetGeoTransform((west, SNOW_PIXEL_DEGREES, 0, north, 0, -SNOW_PIXEL_DEGREES))
+    ds.SetProjection(_srs(4326).ExportToWkt())
+    ds.GetRasterBand(1).WriteArray(np.tile(snow, (rows, 1)))
+    ds = None
+
+
+@pytest.fixture
+def snow_coverage(monkeypatch):
+    _create_snow_coverage()
+    monkeypatch.setattr("app.auto_spatial_advisory.snow.set_s3_gdal_config", lambda: None)
+    monkeypatch.setattr(
+        "app.auto_spatial_advisory.snow.get_snow_coverage_key", lambda for_date: SNOW_PATH
+    )
+    yield SimpleNamespace(for_date=date(2024, 8, 10))
+    gdal.Unlink(SNOW_PATH)
+    gdal.Unlink(HFI_PATH)
+
+
+def test_get_snow_covered_pixels_warps_snow_onto_hfi_grid(snow_coverage):
+    hfi = _create_hfi(np.zeros((2, 4), dtype=np.float32))
+
+    snow_covered = get_snow_covered_pixels(hfi, snow_coverage)
+
+    np.testing.assert_array_equal(
+        snow_covered, [[True, True, False, False], [True, True, False, False]]
+    )
+
+
+def test_classify_and_snow_mask_hfi_zeroes_snow_covered_pixels(monkeypatch, snow_coverage):
+    monkeypatch.setattr("app.auto_spatial_advisory.process_hfi.set_s3_gdal_config", lambda: None)
+    _create_hfi(
+        np.array([[5000, 12000, 5000, 12000], [100, 4000, 10000, np.nan]], dtype=np.float32)
+    )
+
+    classified = classify_and_snow_mask_hfi(HFI_PATH, snow_coverage)
+
+    assert classified.GetGeoTransform() == HFI_GEO_TRANSFORM
+    np.testing.assert_array_equal(
+        classified.GetRasterBand(1).ReadAsArray(), [[0, 0, 1, 2], [0, 0, 2, 0]]
+    )
+
+
+def test_classify_and_snow_mask_hfi_without_snow(monkeypatch, snow_coverage):
+    monkeypatch.setattr("app.auto_spatial_advisory.process_hfi.set_s3_gdal_config", lambda: None)
+    _create_hfi(np.array([[5000, 12000, 100, 4000], [0, 0, 0, 0]], dtype=np.float32))
+
+    classified = classify_and_snow_mask_hfi(HFI_PATH, None)
+
+    np.testing.assert_array_equal(
+        classified.GetRasterBand(1).ReadAsArray(), [[1, 2, 0, 1], [0, 0, 0, 0]]
+    )
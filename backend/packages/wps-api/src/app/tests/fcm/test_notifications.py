@@ -1,10 +1,12 @@
 """Unit tests for FCM notification logic."""
 
+import asyncio
 from datetime import date, datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from app.fcm.notifications import (
+    SendRateLimiter,
     build_fcm_message,
     build_notification_content,
     build_notification_data,
@@ -18,7 +20,7 @@ from wps_shared.db.crud.auto_spatial_advisory import ZoneAdvisoryStatus
 from wps_shared.db.models.auto_spatial_advisory import RunTypeEnum
 
 GET_ZONES = "app.fcm.notifications.get_zones_with_advisories"
-GET_TOKENS = "app.fcm.notifications.get_device_tokens_for_zone"
+GET_TOKENS = "app.fcm.notifications.get_device_tokens_for_zones"
 UPDATE_TOKENS = "app.fcm.notifications.update_device_tokens_are_active"
 SEND_MULTICAST = "app.fcm.notifications.messaging.send_each_for_multicast_async"
 GET_VANCOUVER_NOW = "app.fcm.notifications.get_vancouver_now"
@@ -150,7 +152,7 @@ async def test_trigger_notifications_no_subscribers():
     )
     with (
         patch(GET_ZONES, return_value=[zone]),
-        patch(GET_TOKENS, return_value=[]),
+        patch(GET_TOKENS, return_value={}),
         patch(SEND_MULTICAST) as mock_send,
         patch(GET_VANCOUVER_NOW) as mock_now,
     ):
@@ -176,9 +178,9 @@ async def test_trigger_notifications_sends_multicast():
 
     with (
         patch(GET_ZONES, return_value=[zone]),
-        patch(GET_TOKENS, return_value=tokens),
+        patch(GET_TOKENS, return_value={"42": tokens}),
         patch(SEND_MULTICAST, new_callable=AsyncMock, return_value=mock_response) as mock_send,
-        patch("app.fcm.notifications.handle_fcm_response", new_callable=AsyncMock),
+        patch("app.fcm.notifications.handle_fcm_response", return_value=[]),
         patch(GET_VANCOUVER_NOW) as mock_now,
     ):
         mock_now.return_value.date.return_value = FOR_DATE
@@ -207,9 +209,9 @@ async def test_trigger_notifications_batches_tokens_over_limit():
 
     with (
         patch(GET_ZONES, return_value=[zone]),
-        patch(GET_TOKENS, return_value=tokens),
+        patch(GET_TOKENS, return_value={"42": tokens}),
         patch(SEND_MULTICAST, new_callable=AsyncMock, return_value=mock_response) as mock_send,
-        patch("app.fcm.notifications.handle_fcm_response", new_callable=AsyncMock),
+        patch("app.fcm.notifications.handle_fcm_response", return_value=[]),
         patch(GET_VANCOUVER_NOW) as mock_now,
     ):
         mock_now.return_value.date.return_value = FOR_DATE
@@ -239,14 +241,14 @@ async def test_trigger_notifications_calls_handle_response():
 
     with (
         patch(GET_ZONES, return_value=[zone]),
-        patch(GET_TOKENS, return_value=tokens),
+        patch(GET_TOKENS, return_value={"42": tokens}),
         patch(SEND_MULTICAST, new_callable=AsyncMock, return_value=mock_response),
-        patch("app.fcm.notifications.handle_fcm_response", new_callable=AsyncMock) as mock_handle,
+        patch("app.fcm.notifications.handle_fcm_response", return_value=[]) as mock_handle,
         patch(GET_VANCOUVER_NOW) as mock_now,
     ):
         mock_now.return_value.date.return_value = FOR_DATE
         await trigger_notifications(session, RunTypeEnum.forecast, RUN_GET_VANCOUVER_NOW, FOR_DATE)
-        mock_handle.assert_called_once_with(session, FOR_DATE, "Kamloops", tokens, mock_response)
+        mock_handle.assert_called_once_with(FOR_DATE, "Kamloops", tokens, mock_response)
 
 
 @pytest.mark.anyio
@@ -272,13 +274,13 @@ async def test_trigger_notifications_continues_on_send_failure():
 
     with (
         patch(GET_ZONES, return_value=[zone_a, zone_b]),
-        patch(GET_TOKENS, return_value=["token"]),
+        patch(GET_TOKENS, return_value={"1": ["token"], "2": ["token"]}),
         patch(
             SEND_MULTICAST,
             new_callable=AsyncMock,
             side_effect=[firebase_exceptions.UnavailableError("FCM error", None), mock_response],
         ) as mock_send,
-        patch("app.fcm.notifications.handle_fcm_response", new_callable=AsyncMock) as mock_handle,
+        patch("app.fcm.notifications.handle_fcm_response", return_value=[]) as mock_handle,
         patch(GET_VANCOUVER_NOW) as mock_now,
     ):
         mock_now.return_value.date.return_value = FOR_DATE
@@ -310,23 +312,17 @@ async def test_trigger_notifications_skips_zone_with_missing_placename():
         mock_send.assert_not_called()
 
 
-@pytest.mark.anyio
-async def test_handle_fcm_response_all_success():
+def test_handle_fcm_response_all_success():
     """All successful responses — no tokens deactivated."""
-    session = AsyncMock()
     response = MagicMock(spec=messaging.BatchResponse)
     response.failure_count = 0
     response.responses = [MagicMock(success=True), MagicMock(success=True)]
 
-    with patch(UPDATE_TOKENS, new_callable=AsyncMock) as mock_update:
-        await handle_fcm_response(session, date(2026, 4, 1), "Kamloops", ["t1", "t2"], response)
-        mock_update.assert_not_called()
+    assert handle_fcm_response(date(2026, 4, 1), "Kamloops", ["t1", "t2"], response) == []
 
 
-@pytest.mark.anyio
-async def test_handle_fcm_response_permanent_failure_deactivates_token():
+def test_handle_fcm_response_permanent_failure_deactivates_token():
     """UnregisteredError tokens are permanently deactivated."""
-    session = AsyncMock()
     resp_ok = MagicMock(success=True)
     resp_fail = MagicMock(
         success=False, exception=messaging.UnregisteredError("token expired", None)
@@ -335,17 +331,14 @@ async def test_handle_fcm_response_permanent_failure_deactivates_token():
     response.failure_count = 1
     response.responses = [resp_ok, resp_fail]
 
-    with patch(UPDATE_TOKENS, new_callable=AsyncMock) as mock_update:
-        await handle_fcm_response(
-            session, date(2026, 4, 1), "Kamloops", ["token_good", "token_bad"], response
-        )
-        mock_update.assert_called_once_with(session, ["token_bad"], False)
+    result = handle_fcm_response(
+        date(2026, 4, 1), "Kamloops", ["token_good", "token_bad"], response
+    )
+    assert result == ["token_bad"]
 
 
-@pytest.mark.anyio
-async def test_handle_fcm_response_transient_failure_does_not_deactivate():
+def test_handle_fcm_response_transient_failure_does_not_deactivate():
     """Transient failures (non-UnregisteredError) do not deactivate the token."""
-    session = AsyncMock()
     resp_fail = MagicMock(
         success=False, exception=firebase_exceptions.UnavailableError("server down", None)
     )
@@ -353,10 +346,108 @@ async def test_handle_fcm_response_transient_failure_does_not_deactivate():
     response.failure_count = 1
     response.responses = [resp_fail]
 
-    with patch(UPDATE_TOKENS, new_callable=AsyncMock) as mock_update:
-        await handle_fcm_response(session, date(2026, 4, 1), "Kamloops", ["token_ok"], response)
+    assert handle_fcm_response(date(2026, 4, 1), "Kamloops", ["token_ok"], response) == []
+
+
+class FakeMulticastSender:
+    """Local stand-in for messaging.send_each_for_multicast_async, that records what was sent and how
+    many sends were in flight at once. Tokens in unregistered fail with UnregisteredError."""
+
+    def __init__(self, unregistered: frozenset[str] = frozenset(), delay: float = 0.01):
+        self.unregistered = unregistered
+        self.delay = delay
+        self.messages: list[messaging.MulticastMessage] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, message: messaging.MulticastMessage) -> messaging.BatchResponse:
+        self.messages.append(message)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return messaging.BatchResponse(
+            [
+                messaging.SendResponse(None, messaging.UnregisteredError("unregistered", None))
+                if token in self.unregistered
+                else messaging.SendResponse({"name": f"message-{token}"}, None)
+                for token in message.tokens
+            ]
+        )
+
+
+def make_zone(source_identifier: str) -> ZoneAdvisoryStatus:
+    return ZoneAdvisoryStatus(
+        advisory_shape_id=int(source_identifier),
+        fire_centre_id=1,
+        source_identifier=source_identifier,
+        placename_label=f"Zone {source_identifier}",
+        status="advisory",
+    )
+
+
+@pytest.mark.anyio
+async def test_trigger_notifications_sends_batches_concurrently():
+    """Batches for every zone are sent with a fake sender, with a bounded number in flight."""
+    session = AsyncMock()
+    zones = [make_zone(str(i)) for i in range(1, 6)]
+    tokens_by_zone = {zone.source_identifier: [f"token_{zone.source_identifier}"] for zone in zones}
+    sender = FakeMulticastSender()
+
+    with (
+        patch(GET_ZONES, return_value=zones),
+        patch(GET_TOKENS, return_value=tokens_by_zone) as mock_get_tokens,
+        patch(UPDATE_TOKENS, new_callable=AsyncMock) as mock_update,
+        patch(GET_VANCOUVER_NOW) as mock_now,
+        patch("app.fcm.notifications.FCM_MAX_CONCURRENT_SENDS", 2),
+        patch("app.fcm.notifications.FCM_MAX_SENDS_PER_SECOND", 0),
+    ):
+        mock_now.return_value.date.return_value = FOR_DATE
+        await trigger_notifications(
+            session, RunTypeEnum.forecast, RUN_GET_VANCOUVER_NOW, FOR_DATE, send_multicast=sender
+        )
+        mock_get_tokens.assert_awaited_once_with(session, ["1", "2", "3", "4", "5"])
         mock_update.assert_not_called()
 
+    assert sorted(token for message in sender.messages for token in message.tokens) == sorted(
+        token for tokens in tokens_by_zone.values() for token in tokens
+    )
+    assert sender.max_in_flight == 2
+
+
+@pytest.mark.anyio
+async def test_trigger_notifications_deactivates_invalid_tokens_in_bulk():
+    """Unregistered tokens from every batch are deactivated with a single update."""
+    session = AsyncMock()
+    zones = [make_zone("1"), make_zone("2")]
+    tokens_by_zone = {"1": ["good_1", "bad_1"], "2": ["bad_2", "good_2"]}
+    sender = FakeMulticastSender(unregistered=frozenset({"bad_1", "bad_2"}))
+
+    with (
+        patch(GET_ZONES, return_value=zones),
+        patch(GET_TOKENS, return_value=tokens_by_zone),
+        patch(UPDATE_TOKENS, new_callable=AsyncMock) as mock_update,
+        patch(GET_VANCOUVER_NOW) as mock_now,
+    ):
+        mock_now.return_value.date.return_value = FOR_DATE
+        await trigger_notifications(
+            session, RunTypeEnum.forecast, RUN_GET_VANCOUVER_NOW, FOR_DATE, send_multicast=sender
+        )
+        mock_update.assert_awaited_once_with(session, ["bad_1", "bad_2"], False)
+
+
+@pytest.mark.anyio
+async def test_send_rate_limiter_spaces_out_sends():
+    """The rate limiter spaces out the start of consecutive sends."""
+    rate_limiter = SendRateLimiter(sends_per_second=20)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(3):
+        await rate_limiter.wait()
+    assert loop.time() - start >= 0.1 - 0.01
+
 
 ZONE = ZoneAdvisoryStatus(
     advisory_shape_id=1,
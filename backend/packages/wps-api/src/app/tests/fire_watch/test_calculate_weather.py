@@ -1,21 +1,24 @@
 from unittest import mock
+import numpy as np
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch, create_autospec
 
 from wps_shared.db.models.fire_watch import FireWatch, FireWatchWeather
 from wps_shared.fuel_types import FuelTypeEnum
-from app.fire_behaviour.prediction import FireBehaviourPrediction
 from app.fire_watch.calculate_weather import (
     FIREWATCH_WEATHER_MODEL,
     calculate_fbp,
+    calculate_hfi,
     check_optional_fwi_fields,
     check_prescription_status,
     gather_fire_watch_inputs,
+    gather_station_inputs,
     get_station_metadata,
     in_range,
     map_model_prediction_to_weather_indeterminate,
     process_all_fire_watch_weather,
+    process_fire_watches,
     process_predictions,
     process_single_fire_watch,
     save_all_fire_watch_weather,
@@ -126,13 +129,6 @@ def mock_actual_weather_data():
     ]
 
 
-@pytest.fixture
-def mock_fbp_result():
-    return FireBehaviourPrediction(
-        hfi=1000, ros=0.5, intensity_group=3, sixty_minute_fire_size=2.0, fire_type="Surface"
-    )
-
-
 @pytest.fixture
 def mock_status_id_dict():
     return {"all": 1, "hfi": 2, "no": 3}
@@ -379,14 +375,16 @@ async def test_process_predictions(
     mock_predictions,
     mock_actual_weather_data,
     mock_status_id_dict,
-    mock_fbp_result,
     mocker,
 ):
     mocker.patch(
         "app.fire_watch.calculate_weather.map_model_prediction_to_weather_indeterminate",
         side_effect=lambda p, s: mock_actual_weather_data[0],
     )
-    mocker.patch("app.fire_watch.calculate_weather.calculate_fbp", return_value=mock_fbp_result)
+    mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_hfi",
+        side_effect=lambda fire_watches, stations, predictions: np.full(len(predictions), 1000.0),
+    )
 
     result = await process_predictions(
         mock_fire_watch,
@@ -400,6 +398,61 @@ async def test_process_predictions(
     assert result[0].hfi == 1000
 
 
+@pytest.mark.anyio
+async def test_process_predictions_raises_if_hfi_missing(
+    mock_fire_watch,
+    mock_station_metadata,
+    mock_predictions,
+    mock_actual_weather_data,
+    mock_status_id_dict,
+    mocker,
+):
+    mocker.patch(
+        "app.fire_watch.calculate_weather.map_model_prediction_to_weather_indeterminate",
+        side_effect=lambda p, s: mock_actual_weather_data[0],
+    )
+    mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_hfi",
+        side_effect=lambda fire_watches, stations, predictions: np.full(len(predictions), np.nan),
+    )
+
+    with pytest.raises(RuntimeError, match="Could not calculate FBP"):
+        await process_predictions(
+            mock_fire_watch,
+            mock_station_metadata,
+            mock_predictions,
+            mock_actual_weather_data,
+            mock_status_id_dict,
+            1,
+        )
+
+
+def test_calculate_hfi_matches_calculate_fbp(
+    mock_fire_watch, mock_partial_fire_watch, mock_station_metadata, mock_actual_weather_data
+):
+    c7b_fire_watch = FireWatch(
+        id=2, station_code=101, fuel_type=FuelTypeEnum.C7B, percent_grass_curing=80
+    )
+    fire_watches = [mock_fire_watch, mock_partial_fire_watch, c7b_fire_watch]
+    prediction = mock_actual_weather_data[0]
+
+    result = calculate_hfi(
+        fire_watches, [mock_station_metadata] * len(fire_watches), [prediction] * len(fire_watches)
+    )
+
+    for fire_watch, hfi in zip(fire_watches, result):
+        expected = calculate_fbp(fire_watch, mock_station_metadata, prediction)
+        assert hfi == pytest.approx(expected.hfi)
+
+
+def test_calculate_hfi_missing_inputs(mock_fire_watch, mock_station_metadata, mock_actual_weather_data):
+    prediction = mock_actual_weather_data[0].model_copy(update={"build_up_index": None})
+
+    result = calculate_hfi([mock_fire_watch], [mock_station_metadata], [prediction])
+
+    assert np.isnan(result[0])
+
+
 @pytest.mark.anyio
 async def test_process_all_fire_watch_weather_skips_if_weather_exists(mocker, mock_fire_watch):
     mocker.patch(
@@ -447,19 +500,246 @@ async def test_process_all_fire_watch_weather_processes_fire_watches(
         "app.fire_watch.calculate_weather.get_all_prescription_status",
         return_value=mock_status_id_dict,
     )
-    mock_process_single_fire_watch = mocker.patch(
-        "app.fire_watch.calculate_weather.process_single_fire_watch", AsyncMock()
+    mock_gather_station_inputs = mocker.patch(
+        "app.fire_watch.calculate_weather.gather_station_inputs",
+        AsyncMock(return_value=("predictions", "actuals")),
+    )
+    mock_record = FireWatchWeather(fire_watch_id=mock_fire_watch.id)
+    mock_process_fire_watches = mocker.patch(
+        "app.fire_watch.calculate_weather.process_fire_watches", return_value=[mock_record]
+    )
+    mock_save = mocker.patch(
+        "app.fire_watch.calculate_weather.save_all_fire_watch_weather", AsyncMock()
     )
 
     await process_all_fire_watch_weather()
 
-    mock_process_single_fire_watch.assert_called_once_with(
-        mock.ANY,
-        mock_fire_watch,
+    mock_gather_station_inputs.assert_awaited_once_with(mock.ANY, [101], 1)
+    mock_process_fire_watches.assert_called_once_with(
+        [mock_fire_watch],
         {101: mock_station_metadata},
+        "predictions",
+        "actuals",
         mock_status_id_dict,
         1,
     )
+    mock_save.assert_awaited_once_with(mock.ANY, [mock_record])
+
+
+@pytest.mark.anyio
+async def test_gather_station_inputs_fetches_shared_actuals_once(
+    mocker, mock_actual_weather_data
+):
+    mock_session = AsyncMock()
+    predictions = generate_mock_predictions(
+        [datetime(2025, 5, 5, 20, tzinfo=timezone.utc), datetime(2025, 5, 6, 20, tzinfo=timezone.utc)]
+    )
+    other_station_predictions = [
+        p.model_copy(update={"station_code": 102}) for p in predictions
+    ]
+    other_station_actual = mock_actual_weather_data[0].model_copy(update={"station_code": 102})
+    mock_get_predictions = mocker.patch(
+        "app.fire_watch.calculate_weather.get_latest_daily_model_prediction_for_stations",
+        return_value=predictions + other_station_predictions,
+    )
+    mock_get_actuals = mocker.patch(
+        "app.fire_watch.calculate_weather.get_actuals_and_forecasts",
+        return_value=(mock_actual_weather_data + [other_station_actual], []),
+    )
+
+    predictions_by_station, actuals_by_station = await gather_station_inputs(
+        mock_session, [101, 102], 1
+    )
+
+    mock_get_predictions.assert_awaited_once_with(mock_session, [101, 102], 1)
+    actual_datetime = datetime(2025, 5, 4, 20, tzinfo=timezone.utc)
+    mock_get_actuals.assert_awaited_once_with(actual_datetime, actual_datetime, [101, 102])
+    assert predictions_by_station[101] == predictions
+    assert predictions_by_station[102] == other_station_predictions
+    assert actuals_by_station[101] == mock_actual_weather_data
+    assert actuals_by_station[102] == [other_station_actual]
+
+
+@pytest.mark.anyio
+async def test_gather_station_inputs_batches_wf1_requests(mocker, mock_actual_weather_data):
+    mocker.patch("app.fire_watch.calculate_weather.WF1_STATIONS_PER_REQUEST", 2)
+    station_codes = [101, 102, 103]
+    predictions = [
+        p.model_copy(update={"station_code": code})
+        for code in station_codes
+        for p in generate_mock_predictions([datetime(2025, 5, 5, 20, tzinfo=timezone.utc)])
+    ]
+    mocker.patch(
+        "app.fire_watch.calculate_weather.get_latest_daily_model_prediction_for_stations",
+        return_value=predictions,
+    )
+    mock_get_actuals = mocker.patch(
+        "app.fire_watch.calculate_weather.get_actuals_and_forecasts",
+        side_effect=[(mock_actual_weather_data, []), RuntimeError("WF1 unavailable")],
+    )
+
+    _, actuals_by_station = await gather_station_inputs(AsyncMock(), station_codes, 1)
+
+    assert [c.args[2] for c in mock_get_actuals.await_args_list] == [[101, 102], [103]]
+    assert actuals_by_station[101] == mock_actual_weather_data
+    assert 103 not in actuals_by_station
+
+
+def test_process_fire_watches_calculates_shared_station_once(
+    mocker,
+    mock_fire_watch,
+    mock_partial_fire_watch,
+    mock_station_metadata,
+    mock_predictions,
+    mock_actual_weather_data,
+    mock_status_id_dict,
+):
+    mock_partial_fire_watch.id = 2
+    mock_calculate_fwi = mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_fwi_from_seed_indeterminates",
+        side_effect=lambda seeds, targets: targets,
+    )
+    mock_calculate_hfi = mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_hfi",
+        side_effect=lambda fire_watches, stations, predictions: np.full(len(predictions), 1000.0),
+    )
+
+    result = process_fire_watches(
+        [mock_fire_watch, mock_partial_fire_watch],
+        {101: mock_station_metadata},
+        {101: mock_predictions},
+        {101: mock_actual_weather_data},
+        mock_status_id_dict,
+        1,
+    )
+
+    mock_calculate_fwi.assert_called_once()
+    assert len(mock_calculate_fwi.call_args.args[1]) == len(mock_predictions)
+    mock_calculate_hfi.assert_called_once()
+    assert len(result) == 2 * len(mock_predictions)
+    assert {r.fire_watch_id for r in result} == {1, 2}
+
+
+def test_process_fire_watches_skips_failed_fire_watches(
+    mocker,
+    mock_fire_watch,
+    mock_partial_fire_watch,
+    mock_station_metadata,
+    mock_predictions,
+    mock_actual_weather_data,
+    mock_status_id_dict,
+):
+    mock_partial_fire_watch.id = 2
+    mock_partial_fire_watch.station_code = 102
+    mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_fwi_from_seed_indeterminates",
+        side_effect=lambda seeds, targets: targets,
+    )
+    # the first fire watch is missing hfi for one of its predictions
+    mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_hfi",
+        side_effect=lambda fire_watches, stations, predictions: np.array(
+            [np.nan] + [1000.0] * (len(predictions) - 1)
+        ),
+    )
+
+    result = process_fire_watches(
+        [mock_fire_watch, mock_partial_fire_watch],
+        {101: mock_station_metadata},
+        {101: mock_predictions},
+        {101: mock_actual_weather_data},
+        mock_status_id_dict,
+        1,
+    )
+
+    # fire watch 2 is skipped for missing station metadata, fire watch 1 for missing hfi
+    assert result == []
+
+
+def test_process_fire_watches_skips_stations_that_fail_validation(
+    mocker,
+    mock_fire_watch,
+    mock_partial_fire_watch,
+    mock_station_metadata,
+    mock_predictions,
+    mock_actual_weather_data,
+    mock_status_id_dict,
+):
+    mock_partial_fire_watch.id = 2
+    mock_partial_fire_watch.station_code = 102
+    other_station_predictions = [p.model_copy(update={"station_code": 102}) for p in mock_predictions]
+
+    def validate_fire_watch_inputs(fire_watch, station_metadata, actual_weather_data):
+        if fire_watch.station_code == 102:
+            raise ValueError("bad weather data")
+        return True
+
+    mocker.patch(
+        "app.fire_watch.calculate_weather.validate_fire_watch_inputs",
+        side_effect=validate_fire_watch_inputs,
+    )
+    mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_fwi_from_seed_indeterminates",
+        side_effect=lambda seeds, targets: targets,
+    )
+    mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_hfi",
+        side_effect=lambda fire_watches, stations, predictions: np.full(len(predictions), 1000.0),
+    )
+
+    result = process_fire_watches(
+        [mock_fire_watch, mock_partial_fire_watch],
+        {101: mock_station_metadata, 102: mock_station_metadata},
+        {101: mock_predictions, 102: other_station_predictions},
+        {101: mock_actual_weather_data, 102: mock_actual_weather_data},
+        mock_status_id_dict,
+        1,
+    )
+
+    assert len(result) == len(mock_predictions)
+    assert {r.fire_watch_id for r in result} == {1}
+
+
+def test_process_fire_watches_calculates_stations_separately_when_batch_fails(
+    mocker,
+    mock_fire_watch,
+    mock_partial_fire_watch,
+    mock_station_metadata,
+    mock_predictions,
+    mock_actual_weather_data,
+    mock_status_id_dict,
+):
+    mock_partial_fire_watch.id = 2
+    mock_partial_fire_watch.station_code = 102
+    other_station_predictions = [p.model_copy(update={"station_code": 102}) for p in mock_predictions]
+
+    def calculate_fwi_from_seed_indeterminates(seeds, targets):
+        if any(target.station_code == 102 for target in targets):
+            raise ValueError("bad weather data")
+        return targets
+
+    mock_calculate_fwi = mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_fwi_from_seed_indeterminates",
+        side_effect=calculate_fwi_from_seed_indeterminates,
+    )
+    mocker.patch(
+        "app.fire_watch.calculate_weather.calculate_hfi",
+        side_effect=lambda fire_watches, stations, predictions: np.full(len(predictions), 1000.0),
+    )
+
+    result = process_fire_watches(
+        [mock_fire_watch, mock_partial_fire_watch],
+        {101: mock_station_metadata, 102: mock_station_metadata},
+        {101: mock_predictions, 102: other_station_predictions},
+        {101: mock_actual_weather_data, 102: mock_actual_weather_data},
+        mock_status_id_dict,
+        1,
+    )
+
+    # once for every station together, then once for each station
+    assert mock_calculate_fwi.call_count == 3
+    assert len(result) == len(mock_predictions)
+    assert {r.fire_watch_id for r in result} == {1}
 
 
 @pytest.mark.anyio
@@ -472,7 +752,7 @@ async def test_save_all_fire_watch_weather_adds_new_records(mocker):
 
     # Simulate no existing record found
     mocker.patch(
-        "app.fire_watch.calculate_weather.get_fire_watch_weather_by_fire_watch_id_and_model_run",
+        "app.fire_watch.calculate_weather.get_fire_watch_weather_by_fire_watch_ids_and_model_run",
         return_value=None,
     )
 
@@ -480,7 +760,7 @@ async def test_save_all_fire_watch_weather_adds_new_records(mocker):
 
     await save_all_fire_watch_weather(mock_session, [mock_record])
 
-    mock_session.add.assert_called_once_with(mock_record)
+    mock_session.add_all.assert_called_once_with([mock_record])
 
 
 @pytest.mark.anyio
@@ -495,9 +775,10 @@ async def test_save_all_fire_watch_weather_updates_existing_records(mocker):
 
     # Simulate existing record found
     existing_record = create_autospec(FireWatchWeather)
+    existing_record.fire_watch_id = 1
     existing_record.date = "2025-05-05"
     mocker.patch(
-        "app.fire_watch.calculate_weather.get_fire_watch_weather_by_fire_watch_id_and_model_run",
+        "app.fire_watch.calculate_weather.get_fire_watch_weather_by_fire_watch_ids_and_model_run",
         return_value=[existing_record],
     )
 
@@ -506,7 +787,7 @@ async def test_save_all_fire_watch_weather_updates_existing_records(mocker):
     await save_all_fire_watch_weather(mock_session, [mock_record])
 
     # Should not add new record
-    mock_session.add.assert_not_called()
+    mock_session.add_all.assert_not_called()
     # Should update fields
     assert existing_record.temperature == mock_record.temperature
     assert existing_record.hfi == mock_record.hfi
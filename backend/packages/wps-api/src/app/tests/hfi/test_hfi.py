@@ -26,12 +26,16 @@ from wps_shared.schemas.shared import FuelType
 from wps_shared.schemas.stations import WFWXWeatherStation
 from wps_shared.utils.time import get_pst_now, get_utc_now
 
+import app.hfi.hfi_calc
 import app.routers.hfi_calc
+from app.fire_behaviour.prediction import FireBehaviourPrediction
 from app.hfi.hfi_calc import (
+    calculate_cached_fire_behaviour_prediction,
     calculate_hfi_results,
     calculate_max_intensity_group,
     calculate_mean_intensity,
     calculate_prep_level,
+    generate_station_daily,
     validate_date_range,
     validate_station_daily,
 )
@@ -405,3 +409,41 @@ def test_inclusive_date_math_bad_start_date():
     """Test that range calculation doesn't raise exception with invalid end date."""
     with pytest.raises(InvalidDateRangeError):
         DateRange(start_date=date(2020, 5, 26), end_date=date(2020, 5, 25)).days_in_range()
+
+
+def test_fire_behaviour_prediction_memoized_per_station_daily_and_fuel_type(mocker: MockerFixture):
+    """Identical station daily and fuel type inputs only calculate fire behaviour once"""
+    calculate_cached_fire_behaviour_prediction.cache_clear()
+    calculate_spy = mocker.patch.object(
+        app.hfi.hfi_calc,
+        "calculate_fire_behaviour_prediction",
+        return_value=FireBehaviourPrediction(1.0, 100.0, 1, 1.0, None),
+    )
+    c1 = hfi_calc_models.FuelType(
+        id=1, abbrev="C1", description="C1", fuel_type_code="C1", percentage_conifer=100, percentage_dead_fir=0
+    )
+    c2 = hfi_calc_models.FuelType(
+        id=2, abbrev="C2", description="C2", fuel_type_code="C2", percentage_conifer=100, percentage_dead_fir=0
+    )
+    wfwx_station = WFWXWeatherStation(
+        wfwx_id="1", code=1, name="station1", latitude=12.1, longitude=12.1, elevation=123, zone_code="1"
+    )
+    raw_daily = {
+        "stationId": "1",
+        "weatherTimestamp": get_utc_now().timestamp() * 1000,
+        "lastEntityUpdateTimestamp": get_utc_now().timestamp() * 1000,
+        "buildUpIndex": 50.0,
+        "fineFuelMoistureCode": 90.0,
+        "initialSpreadIndex": 10.0,
+        "windSpeed": 20.0,
+    }
+
+    first = generate_station_daily(raw_daily, wfwx_station, c1)
+    second = generate_station_daily(dict(raw_daily), wfwx_station, c1)
+    assert calculate_spy.call_count == 1
+    assert first.hfi == second.hfi == 100.0
+
+    # a different fuel type for the same daily is a different calculation
+    generate_station_daily(raw_daily, wfwx_station, c2)
+    assert calculate_spy.call_count == 2
+    calculate_cached_fire_behaviour_prediction.cache_clear()
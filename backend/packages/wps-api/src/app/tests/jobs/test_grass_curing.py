@@ -50,10 +50,15 @@ def _make_mock_client_session(mocker: MockerFixture, content: bytes = b"fake tif
     return mock_session, mock_response
 
 
-def _make_mock_data_source(data: np.ndarray, geo_transform: tuple):
+def _make_mock_data_source(data: np.ndarray, geo_transform: tuple, nodata=None):
     """Build a mock gdal data source from a numpy array and a GDAL geotransform tuple."""
     mock_band = MagicMock()
-    mock_band.ReadAsArray.return_value = data
+    mock_band.ReadAsArray.side_effect = lambda xoff, yoff, win_xsize, win_ysize: data[
+        yoff : yoff + win_ysize, xoff : xoff + win_xsize
+    ]
+    mock_band.XSize = data.shape[1]
+    mock_band.YSize = data.shape[0]
+    mock_band.GetNoDataValue.return_value = nodata
     mock_ds = MagicMock()
     mock_ds.GetRasterBand.return_value = mock_band
     mock_ds.GetGeoTransform.return_value = geo_transform
@@ -315,6 +320,33 @@ def test_yield_value_for_stations_skips_station_south_of_raster():
     assert results == []
 
 
+def test_yield_value_for_stations_skips_station_on_nodata_pixel():
+    """Test that a station on a nodata pixel is skipped, while the others are still sampled."""
+    stations = [
+        SimpleNamespace(code=1, long=-120.3, lat=50.7),  # Kamloops area
+        SimpleNamespace(code=2, long=-115.0, lat=49.0),  # Cranbrook area
+    ]
+    bc_albers_coords = [_wgs84_to_bc_albers.TransformPoint(s.long, s.lat)[:2] for s in stations]
+
+    pixel_size = 100_000
+    origin_x = min(x for x, _ in bc_albers_coords) - 0.5 * pixel_size
+    origin_y = max(y for _, y in bc_albers_coords) + 0.5 * pixel_size
+    geo_transform = (origin_x, pixel_size, 0.0, origin_y, 0.0, -pixel_size)
+    pixel_indices = [
+        (math.floor((x - origin_x) / pixel_size), math.floor((origin_y - y) / pixel_size))
+        for x, y in bc_albers_coords
+    ]
+    data = np.full((max(r for _, r in pixel_indices) + 1, max(c for c, _ in pixel_indices) + 1), 60)
+    col, row = pixel_indices[0]
+    data[row][col] = -1
+
+    mock_ds = _make_mock_data_source(data, geo_transform, nodata=-1)
+
+    results = list(GrassCuringJob()._yield_value_for_stations(mock_ds, stations))
+
+    assert results == [(2, 60)]
+
+
 def test_process_grass_curing_saves_value_per_station(mocker: MockerFixture, monkeypatch):
     """Test that _process_grass_curing saves one record per station returned by the API."""
 
@@ -1,6 +1,6 @@
 """Unit tests for the RDPS SFMS downloader job."""
 
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 
@@ -39,6 +39,18 @@ def write_session_scope():
     yield MagicMock(spec=Session)
 
 
+def patch_s3_client(mocker: MockerFixture) -> MagicMock:
+    client = MagicMock()
+    client.put_object = AsyncMock()
+
+    @asynccontextmanager
+    async def get_client():
+        yield client, "bucket"
+
+    mocker.patch(f"{MODULE_PATH}.get_client", get_client)
+    return client
+
+
 def patch_job_dependencies(mocker: MockerFixture, fake_rdps_grib: FakeRDPSGrib):
     mocker.patch(f"{MODULE_PATH}.time_utils.get_utc_now", return_value=JOB_NOW)
     mocker.patch(f"{MODULE_PATH}.get_write_session_scope", write_session_scope)
@@ -61,7 +73,9 @@ async def test_process_model_run_urls_classifies_download_errors(
     expected_connection_errors: int,
     expected_exceptions: int,
 ):
-    mocker.patch(f"{MODULE_PATH}.get_saved_model_run_for_sfms", return_value=None)
+    mocker.patch(f"{MODULE_PATH}.get_saved_model_run_for_sfms_urls", return_value=set())
+    mocker.patch(f"{MODULE_PATH}.create_saved_model_run_for_sfms_urls")
+    patch_s3_client(mocker)
     fetcher = MagicMock()
     fetcher.get.side_effect = download_error
 
@@ -73,6 +87,38 @@ async def test_process_model_run_urls_classifies_download_errors(
     assert rdps_grib.exception_count == expected_exceptions
 
 
+@pytest.mark.anyio
+async def test_process_model_run_urls_skips_processed_urls_and_records_in_one_batch(
+    mocker: MockerFixture, tmp_path
+):
+    processed_url = RDPS_URL.replace("PT001H", "PT000H")
+    new_urls = [RDPS_URL, RDPS_URL.replace("PT001H", "PT002H")]
+    mocker.patch(
+        f"{MODULE_PATH}.get_saved_model_run_for_sfms_urls", return_value={processed_url}
+    )
+    create_spy = mocker.patch(f"{MODULE_PATH}.create_saved_model_run_for_sfms_urls")
+    client = patch_s3_client(mocker)
+
+    def mock_download(url: str, path: str, *_):
+        target = tmp_path / url.split("/")[-1]
+        target.write_bytes(b"grib")
+        return str(target)
+
+    download_spy = mocker.patch(f"{MODULE_PATH}.download", side_effect=mock_download)
+
+    session = MagicMock(spec=Session)
+    rdps_grib = rdps_sfms.RDPSGrib(session)
+    await rdps_grib._process_model_run_urls(0, "temp", [processed_url, *new_urls], MagicMock())
+
+    assert sorted(call.args[0] for call in download_spy.call_args_list) == sorted(new_urls)
+    assert client.put_object.call_count == 2
+    assert rdps_grib.files_downloaded == 2
+    create_spy.assert_called_once()
+    saved_urls = create_spy.call_args.args[1]
+    assert sorted(url for url, _ in saved_urls) == sorted(new_urls)
+    assert all(key.startswith("weather_models/rdps/") and key.endswith(".grib2") for _, key in saved_urls)
+
+
 @pytest.mark.anyio
 async def test_rdps_job_does_not_fail_for_connection_errors_only(mocker: MockerFixture):
     patch_job_dependencies(mocker, FakeRDPSGrib(exception_count=0, connection_error_count=2))
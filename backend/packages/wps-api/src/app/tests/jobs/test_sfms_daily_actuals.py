@@ -104,6 +104,11 @@ def mock_dependencies(mocker: MockerFixture, mock_s3_client, mock_wfwx_api) -> M
         return_value=mock_fuel_type_raster,
     )
 
+    # Mock the local raster cache the fuel raster is read from
+    mock_raster_cache = MagicMock()
+    mock_raster_cache.get_path = AsyncMock(return_value="/tmp/raster_cache/fuel.tif")
+    mocker.patch(f"{MODULE_PATH}.get_raster_cache", return_value=mock_raster_cache)
+
     # Mock get_async_read_session_scope
     mock_read_session = MagicMock(spec=AsyncSession)
 
@@ -5,6 +5,7 @@ import math
 import os
 import re
 import types
+from contextlib import asynccontextmanager
 from datetime import date, datetime, timedelta
 
 import pytest
@@ -341,3 +342,54 @@ def test_viirs_snow_job_fails_on_earthdata_access_auth_failure(
     assert excinfo.value.code == os.EX_SOFTWARE
     # Assert that rocket chat was called.
     assert chatops_spy.call_count == 1
+
+
+def _mock_write_session(mocker: MockerFixture):
+    @asynccontextmanager
+    async def mock_write_session_scope():
+        yield mocker.MagicMock()
+
+    mocker.patch.object(viirs_snow, "get_async_write_session_scope", mock_write_session_scope)
+    return mocker.patch.object(viirs_snow, "save_processed_snow", new_callable=mocker.AsyncMock)
+
+
+@pytest.mark.anyio
+async def test_run_viirs_snow_by_date_processes_every_date(
+    mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+):
+    processed = []
+
+    async def mock__process_viirs_snow(self, for_date: date, path: str, executor):
+        processed.append(for_date)
+
+    monkeypatch.setattr(ViirsSnowJob, "_get_bc_boundary_from_s3", mock__get_bc_boundary_from_s3)
+    monkeypatch.setattr(ViirsSnowJob, "_process_viirs_snow", mock__process_viirs_snow)
+    save_spy = _mock_write_session(mocker)
+
+    await ViirsSnowJob()._run_viirs_snow_by_date(date(2025, 1, 1), date(2025, 1, 5))
+
+    expected = [date(2025, 1, 1) + timedelta(days=day) for day in range(5)]
+    assert sorted(processed) == expected
+    saved_dates = [call.args[1].for_date.date() for call in save_spy.call_args_list]
+    assert saved_dates == expected
+
+
+@pytest.mark.anyio
+async def test_run_viirs_snow_by_date_records_dates_before_first_failure(
+    mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+):
+    async def mock__process_viirs_snow(self, for_date: date, path: str, executor):
+        if for_date == date(2025, 1, 3):
+            raise NoGranulesException("No granules available.")
+
+    monkeypatch.setattr(ViirsSnowJob, "_get_bc_boundary_from_s3", mock__get_bc_boundary_from_s3)
+    monkeypatch.setattr(ViirsSnowJob, "_process_viirs_snow", mock__process_viirs_snow)
+    save_spy = _mock_write_session(mocker)
+
+    with pytest.raises(NoGranulesException):
+        await ViirsSnowJob()._run_viirs_snow_by_date(date(2025, 1, 1), date(2025, 1, 5))
+
+    # The dates after the failure were processed, but aren't recorded so the next run picks up from
+    # the failed date.
+    saved_dates = [call.args[1].for_date.date() for call in save_spy.call_args_list]
+    assert saved_dates == [date(2025, 1, 1), date(2025, 1, 2)]
@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from unittest.mock import AsyncMock, Mock, patch
 import pytest
@@ -7,6 +7,7 @@ from math import isclose
 from wps_shared.db.models.morecast_v2 import MorecastForecastRecord
 from app.morecast_v2.forecasts import (
     actual_exists,
+    calculate_fwi_chain,
     calculate_fwi_values,
     construct_wf1_forecast,
     construct_wf1_forecasts,
@@ -355,3 +356,36 @@ def test_calculate_fwi_values_missing_weather():
     assert result.fine_fuel_moisture_code is None
     assert result.fire_weather_index is None
     assert result.initial_spread_index is None
+
+
+def test_calculate_fwi_chain_matches_scalar_calculation_over_multiple_days():
+    day_1 = actual_indeterminate_1.model_copy()
+    day_2 = forecast_indeterminate_1.model_copy()
+    day_3 = forecast_indeterminate_1.model_copy(update={"utc_timestamp": end_time + timedelta(days=1), "temperature": 12.0})
+    other_station_day_1 = actual_indeterminate_2.model_copy()
+    other_station_day_2 = forecast_indeterminate_2.model_copy()
+
+    result = calculate_fwi_chain([day_1, other_station_day_1, day_2, other_station_day_2, day_3])
+
+    expected_day_2 = calculate_fwi_values(actual_indeterminate_1.model_copy(), forecast_indeterminate_1.model_copy())
+    expected_day_3 = calculate_fwi_values(expected_day_2.model_copy(), day_3.model_copy())
+    expected_other_station_day_2 = calculate_fwi_values(actual_indeterminate_2.model_copy(), forecast_indeterminate_2.model_copy())
+    for actual, expected in [(result[2], expected_day_2), (result[4], expected_day_3), (result[3], expected_other_station_day_2)]:
+        assert isclose(actual.fine_fuel_moisture_code, expected.fine_fuel_moisture_code, abs_tol=0.001)
+        assert isclose(actual.duff_moisture_code, expected.duff_moisture_code, abs_tol=0.001)
+        assert isclose(actual.drought_code, expected.drought_code, abs_tol=0.001)
+        assert isclose(actual.initial_spread_index, expected.initial_spread_index, abs_tol=0.001)
+        assert isclose(actual.build_up_index, expected.build_up_index, abs_tol=0.001)
+        assert isclose(actual.fire_weather_index, expected.fire_weather_index, abs_tol=0.001)
+    # the first day has nothing to calculate from, so it is left as is
+    assert result[0].fine_fuel_moisture_code == actual_indeterminate_1.fine_fuel_moisture_code
+
+
+def test_calculate_fwi_chain_missing_weather():
+    result = calculate_fwi_chain([actual_indeterminate_1.model_copy(), forecast_indeterminate_missing_temperature.model_copy(update={"station_code": 123})])
+    assert result[1].fine_fuel_moisture_code is None
+    assert result[1].duff_moisture_code is None
+    assert result[1].drought_code is None
+    assert result[1].initial_spread_index is None
+    assert result[1].build_up_index is None
+    assert result[1].fire_weather_index is None
@@ -157,23 +157,33 @@ async def test_daily_fwi_processor(mocker: MockerFixture):
 
         # Verify weather inputs are warped to match dmc raster
         assert temp_ds_spy.call_args_list == [
-            mocker.call(mock_dmc_ds, mocker.ANY, GDALResamplingMethod.BILINEAR),
-            mocker.call(mock_dmc_ds, mocker.ANY, GDALResamplingMethod.BILINEAR),
+            mocker.call(mock_dmc_ds, resample_method=GDALResamplingMethod.BILINEAR, reuse_warp_plan=True),
+            mocker.call(mock_dmc_ds, resample_method=GDALResamplingMethod.BILINEAR, reuse_warp_plan=True),
         ]
 
         assert rh_ds_spy.call_args_list == [
-            mocker.call(mock_dmc_ds, mocker.ANY, GDALResamplingMethod.BILINEAR, max_value=100),
-            mocker.call(mock_dmc_ds, mocker.ANY, GDALResamplingMethod.BILINEAR, max_value=100),
+            mocker.call(
+                mock_dmc_ds,
+                resample_method=GDALResamplingMethod.BILINEAR,
+                max_value=100,
+                reuse_warp_plan=True,
+            ),
+            mocker.call(
+                mock_dmc_ds,
+                resample_method=GDALResamplingMethod.BILINEAR,
+                max_value=100,
+                reuse_warp_plan=True,
+            ),
         ]
 
         assert wind_speed_ds_spy.call_args_list == [
-            mocker.call(mock_dmc_ds, mocker.ANY, GDALResamplingMethod.BILINEAR),
-            mocker.call(mock_dmc_ds, mocker.ANY, GDALResamplingMethod.BILINEAR),
+            mocker.call(mock_dmc_ds, resample_method=GDALResamplingMethod.BILINEAR, reuse_warp_plan=True),
+            mocker.call(mock_dmc_ds, resample_method=GDALResamplingMethod.BILINEAR, reuse_warp_plan=True),
         ]
 
         assert precip_ds_spy.call_args_list == [
-            mocker.call(mock_dmc_ds, mocker.ANY, GDALResamplingMethod.BILINEAR),
-            mocker.call(mock_dmc_ds, mocker.ANY, GDALResamplingMethod.BILINEAR),
+            mocker.call(mock_dmc_ds, resample_method=GDALResamplingMethod.BILINEAR, reuse_warp_plan=True),
+            mocker.call(mock_dmc_ds, resample_method=GDALResamplingMethod.BILINEAR, reuse_warp_plan=True),
         ]
 
         for dmc_calls in calculate_dmc_spy.call_args_list:
@@ -1,7 +1,10 @@
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock
 
+import numpy as np
 import pytest
+from cffdrs_vec.fwi import vectorized_ffmc
+from osgeo import gdal, osr
 from pytest_mock import MockerFixture
 
 from wps_shared.geospatial.wps_dataset import WPSDataset
@@ -180,3 +183,88 @@ async def test_hourly_ffmc_processor_uses_legacy_keys_when_new_absent(mocker: Mo
     assert "CMC_reg_TMP" in temp_key
     assert "CMC_reg_RH" in rh_key
     assert "CMC_reg_WIND" in wind_speed_key
+
+
+def _write_raster(path: str, values: np.ndarray, nodata_value=None):
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3005)
+    ds = gdal.GetDriverByName("GTiff").Create(path, values.shape[1], values.shape[0], 1, gdal.GDT_Float32)
+    ds.SetGeoTransform((1000000, 2000, 0, 1000000, 0, -2000))
+    ds.SetProjection(srs.ExportToWkt())
+    if nodata_value is not None:
+        ds.GetRasterBand(1).SetNoDataValue(nodata_value)
+    ds.GetRasterBand(1).WriteArray(values)
+    ds = None
+
+
+@pytest.mark.anyio
+async def test_hourly_ffmc_processor_stacked(mocker: MockerFixture):
+    mocker.patch.object(hourly_ffmc_processor, "HFFMC_STACK_BLOCK_ROWS", 1)
+    num_hours_to_process = 3
+    seed_hffmc = np.array([[85.0, 70.0, -9999.0], [90.0, 60.0, 88.0]], dtype=np.float32)
+    seed_key = "/vsimem/test_stacked_hffmc_seed.tif"
+    _write_raster(seed_key, seed_hffmc, nodata_value=-9999.0)
+    rng = np.random.default_rng(seed=42)
+    weather = []
+    for hour in range(num_hours_to_process):
+        hour_values = (
+            rng.uniform(0, 30, seed_hffmc.shape),  # temp
+            rng.uniform(10, 110, seed_hffmc.shape),  # rh, clamped to 100
+            rng.uniform(0, 40, seed_hffmc.shape),  # wind speed
+            rng.uniform(0, 2, seed_hffmc.shape),  # precip
+        )
+        hour_keys = tuple(f"/vsimem/test_stacked_hffmc_{hour}_{param}.tif" for param in range(4))
+        for key, values in zip(hour_keys, hour_values):
+            _write_raster(key, values)
+        weather.append((hour_keys, hour_values))
+
+    mock_key_addresser = RasterKeyAddresser()
+    mocker.patch.object(mock_key_addresser, "get_uploaded_hffmc_key", return_value=seed_key)
+    mocker.patch.object(mock_key_addresser, "gdal_prefix_keys", side_effect=lambda *keys: keys)
+    mocker.patch.object(
+        mock_key_addresser,
+        "resolve_weather_data_keys_hffmc",
+        side_effect=lambda _, __, hour: weather[hour][0],
+    )
+    hffmc_processor = HourlyFFMCProcessor(TEST_DATETIME, mock_key_addresser)
+
+    mock_s3_client = AsyncMock(spec=S3Client)
+    mock_s3_client.all_objects_exist.return_value = True
+
+    try:
+        await hffmc_processor.process_stacked(mock_s3_client, num_hours_to_process)
+    finally:
+        for key in [seed_key, *(key for hour_keys, _ in weather for key in hour_keys)]:
+            gdal.Unlink(key)
+
+    uploads = {call.kwargs["key"]: call.kwargs["body"] for call in mock_s3_client.put_object.call_args_list}
+    expected_hffmc = seed_hffmc.astype(np.float64)
+    nodata_mask = seed_hffmc == -9999.0
+    for hour, (_, (temp, rh, wind_speed, precip)) in enumerate(weather):
+        expected_hffmc = vectorized_ffmc(
+            np.where(nodata_mask, 0, expected_hffmc), temp, np.minimum(rh, 100), wind_speed, precip
+        )
+        key = mock_key_addresser.get_calculated_hffmc_index_key(RDPS_MODEL_RUN_DATETIME + timedelta(hours=hour))
+        with WPSDataset.from_bytes(uploads[key]) as hffmc_ds:
+            band = hffmc_ds.as_gdal_ds().GetRasterBand(1)
+            assert band.GetNoDataValue() == -9999.0
+            actual = band.ReadAsArray()
+        assert actual[nodata_mask].tolist() == [-9999.0]
+        np.testing.assert_allclose(actual[~nodata_mask], expected_hffmc[~nodata_mask], rtol=1e-4)
+    assert len(uploads) == num_hours_to_process
+
+
+@pytest.mark.anyio
+async def test_hourly_ffmc_processor_stacked_stops_at_missing_weather(mocker: MockerFixture):
+    mock_key_addresser = RasterKeyAddresser()
+    mocker.patch.object(mock_key_addresser, "resolve_weather_data_keys_hffmc", return_value=None)
+    calculate_spy = mocker.patch.object(hourly_ffmc_processor, "calculate_time_stacked_hffmc")
+    hffmc_processor = HourlyFFMCProcessor(TEST_DATETIME, mock_key_addresser)
+
+    mock_s3_client = AsyncMock(spec=S3Client)
+    mock_s3_client.all_objects_exist.return_value = True
+
+    await hffmc_processor.process_stacked(mock_s3_client, 2)
+
+    calculate_spy.assert_not_called()
+    mock_s3_client.put_object.assert_not_called()
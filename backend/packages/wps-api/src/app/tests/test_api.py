@@ -1,9 +1,13 @@
 """ Unit tests for API.
 """
+import json
+import os
+from statistics import mean
 import pytest
 from aiohttp import ClientSession
 from starlette.testclient import TestClient
 import app.main
+import app.percentile
 from wps_shared.tests.common import default_mock_client_get
 
 
@@ -57,3 +61,17 @@ def test_percentile_no_invalid_year_errors(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(ClientSession, "get", default_mock_client_get)
     response = client.post(PERCENTILE_URL, headers={"Content-Type": "application/json"}, json={"stations": ["331", "328"], "percentile": 90, "year_range": {"start": 2004, "end": 2019}})
     assert response.status_code == 400
+
+
+def test_percentile_mean_values(monkeypatch: pytest.MonkeyPatch):
+    """Test that the mean values are calculated from the pre-calculated station summaries."""
+    client = TestClient(app.main.app)
+    monkeypatch.setattr(ClientSession, "get", default_mock_client_get)
+    response = client.post(PERCENTILE_URL, headers={"Content-Type": "application/json"}, json={"stations": ["331", "328"], "percentile": 90, "year_range": {"start": 2014, "end": 2023}})
+    assert response.status_code == 200
+    summaries = []
+    for code in ["331", "328"]:
+        with open(os.path.join(os.path.dirname(app.percentile.__file__), "data", "2014-2023", f"{code}.json")) as summary_file:
+            summaries.append(json.load(summary_file))
+    for index in ["ffmc", "isi", "bui"]:
+        assert response.json()["mean_values"][index] == pytest.approx(mean(summary[index] for summary in summaries))
@@ -0,0 +1,57 @@
+import io
+import json
+import subprocess
+
+import pytest
+from osgeo import ogr, osr
+
+from app.utils.pmtiles import write_ndjson_features, write_pmtiles
+
+
+def _create_polygon_layer(data_source: ogr.DataSource) -> ogr.Layer:
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3005)
+    layer = data_source.CreateLayer("polygons", srs=srs, geom_type=ogr.wkbPolygon)
+    layer.CreateField(ogr.FieldDefn("hfi", ogr.OFTInteger))
+    for hfi, x in [(1, 1000000), (2, 1010000)]:
+        feature = ogr.Feature(layer.GetLayerDefn())
+        feature.SetField("hfi", hfi)
+        feature.SetGeometry(ogr.CreateGeometryFromWkt(f"POLYGON (({x} 1000000, {x + 2000} 1000000, {x + 2000} 1002000, {x} 1000000))"))
+        layer.CreateFeature(feature)
+    return layer
+
+
+def test_write_ndjson_features():
+    data_source = ogr.GetDriverByName("Memory").CreateDataSource("test_write_ndjson_features")
+    layer = _create_polygon_layer(data_source)
+    output = io.StringIO()
+
+    write_ndjson_features(layer, output)
+
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 2
+    features = [json.loads(line) for line in lines]
+    assert [feature["properties"]["hfi"] for feature in features] == [1, 2]
+    for feature in features:
+        assert feature["geometry"]["type"] == "Polygon"
+        # projected to EPSG:4326, in lon/lat order
+        lon, lat = feature["geometry"]["coordinates"][0][0]
+        assert -140 < lon < -110
+        assert 45 < lat < 62
+
+
+def test_write_pmtiles_raises_when_tippecanoe_fails(mocker):
+    process = mocker.MagicMock()
+    process.__enter__.return_value = process
+    process.stdin = io.StringIO()
+    process.returncode = 1
+    popen = mocker.patch("app.utils.pmtiles.subprocess.Popen", return_value=process)
+    data_source = ogr.GetDriverByName("Memory").CreateDataSource("test_write_pmtiles")
+    layer = _create_polygon_layer(data_source)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        write_pmtiles(layer, "/tmp/out.pmtiles")
+
+    cmd = popen.call_args.args[0]
+    assert "--read-parallel" in cmd
+    assert "--layer=temp_polys" in cmd
@@ -1,7 +1,10 @@
 import os
 import json
 import importlib
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 import pytest
+from dateutil import parser
 from aiohttp import ClientSession
 from fastapi.testclient import TestClient
 import app.main
@@ -23,14 +26,6 @@ def _patch_function(monkeypatch, module_name: str, function_name: str, json_file
 @pytest.mark.parametrize(
     "codes, endpoint, crud_mapping, expected_status_code, expected_response_file",
     [
-        ([322], "/api/weather_models/GDPS/predictions/summaries/", "test_models_predictions_summaries_crud_mappings.json", 200, "test_models_predictions_summaries_response.json"),
-        (
-            [322, 838],
-            "/api/weather_models/GDPS/predictions/summaries/",
-            "test_models_predictions_summaries_multiple_crud_mappings.json",
-            200,
-            "test_models_predictions_summaries_response_multiple.json",
-        ),
         (
             [838],
             "/api/weather_models/GDPS/predictions/most_recent/",
@@ -68,3 +63,39 @@ def test_successful_model_endpoint_calls(codes, endpoint, crud_mapping, expected
     assert response.status_code == expected_status_code
     expected_response = load_json_file(__file__)(expected_response_file)
     assert response.json() == expected_response
+
+
+def _load_prediction_summaries(json_filename: str):
+    """Load the summarized rows returned by the percentile query from json_filename"""
+    with open(os.path.join(os.path.dirname(__file__), json_filename), "r", encoding="utf-8") as tmp:
+        rows = json.load(tmp)
+    for row in rows:
+        row["prediction_timestamp"] = parser.isoparse(row["prediction_timestamp"])
+    return [SimpleNamespace(**row) for row in rows]
+
+
+@pytest.mark.parametrize(
+    "codes, summaries_file, expected_response_file",
+    [
+        ([322], "test_models_predictions_summaries_sql_response.json", "test_models_predictions_summaries_response.json"),
+        ([322, 838], "test_models_predictions_summaries_sql_response_multiple.json", "test_models_predictions_summaries_response_multiple.json"),
+    ],
+)
+@pytest.mark.usefixtures("mock_jwt_decode")
+def test_model_prediction_summaries(codes, summaries_file, expected_response_file, monkeypatch):
+    """The percentiles are calculated by the database, the endpoint groups them by station."""
+    query = MagicMock()
+    query.all.return_value = _load_prediction_summaries(summaries_file)
+    monkeypatch.setattr(
+        importlib.import_module("wps_shared.weather_models.fetch.summaries"),
+        "get_station_model_prediction_summaries",
+        lambda *_: query,
+    )
+    monkeypatch.setattr(ClientSession, "get", default_mock_client_get)
+
+    client = TestClient(app.main.app)
+    response = client.post("/api/weather_models/GDPS/predictions/summaries/", headers={"Authorization": "Bearer token"}, json={"stations": codes})
+
+    assert response.status_code == 200
+    expected_response = load_json_file(__file__)(expected_response_file)
+    assert response.json() == expected_response
@@ -1,6 +1,6 @@
 import os
-from datetime import datetime, timezone
-from unittest.mock import patch
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 
 import numpy as np
 import pytest
@@ -10,6 +10,7 @@ from app.weather_models.precip_rdps_model import (
     compute_and_store_precip_rasters,
     compute_precip_difference,
     generate_24_hour_accumulating_precip_raster,
+    get_computed_precip_key,
     get_raster_keys_to_diff,
     get_raster_keys_to_diff_legacy,
 )
@@ -287,11 +288,69 @@ async def return_none_tuple(timestamp: datetime):
     return (None, None, None)
 
 
-@patch(
-    "app.weather_models.precip_rdps_model.generate_24_hour_accumulating_precip_raster",
-    return_none_tuple,
-)
+def mock_s3_client(mocker: MockerFixture, existing_keys: list):
+    """Patch the S3 client, with existing_keys already in the bucket."""
+    client = mocker.MagicMock()
+    client.list_objects_v2 = mocker.AsyncMock(
+        return_value={"Contents": [{"Key": key} for key in existing_keys]}
+    )
+    client.put_object = mocker.AsyncMock()
+
+    @asynccontextmanager
+    async def get_client():
+        yield client, "bucket"
+
+    mocker.patch("app.weather_models.precip_rdps_model.get_client", get_client)
+    return client
+
+
 @pytest.mark.anyio
-async def test_compute_and_store_precip_rasters_no_today_data_does_not_throw():
+async def test_compute_and_store_precip_rasters_no_today_data_does_not_throw(mocker: MockerFixture):
+    mock_s3_client(mocker, [])
+    mocker.patch(
+        "app.weather_models.precip_rdps_model.generate_24_hour_accumulating_precip_raster",
+        return_none_tuple,
+    )
     timestamp = datetime.fromisoformat("2024-06-10T18:42:49+00:00")
     await compute_and_store_precip_rasters(timestamp)
+
+
+@pytest.mark.anyio
+async def test_compute_and_store_precip_rasters_skips_existing_rasters(mocker: MockerFixture):
+    """
+    Verify that no source rasters are read when all the computed rasters already exist.
+    """
+    timestamp = datetime(2024, 6, 10, 12, tzinfo=timezone.utc)
+    client = mock_s3_client(
+        mocker, [get_computed_precip_key(timestamp + timedelta(hours=hour)) for hour in range(36)]
+    )
+    generate_spy = mocker.patch(
+        "app.weather_models.precip_rdps_model.generate_24_hour_accumulating_precip_raster",
+    )
+    await compute_and_store_precip_rasters(timestamp)
+
+    generate_spy.assert_not_called()
+    client.put_object.assert_not_called()
+    # Computed rasters for the 36 hours are spread across 3 folders, each folder is listed once.
+    assert client.list_objects_v2.call_count == 3
+
+
+@pytest.mark.anyio
+async def test_compute_and_store_precip_rasters_stores_missing_rasters(mocker: MockerFixture):
+    """
+    Verify that only the hours without a computed raster are calculated and uploaded.
+    """
+    timestamp = datetime(2024, 6, 10, 12, tzinfo=timezone.utc)
+    missing_keys = [get_computed_precip_key(timestamp + timedelta(hours=hour)) for hour in (3, 30)]
+    client = mock_s3_client(
+        mocker,
+        [get_computed_precip_key(timestamp + timedelta(hours=hour)) for hour in range(36) if hour not in (3, 30)],
+    )
+    mocker.patch(
+        "app.weather_models.precip_rdps_model.generate_24_hour_accumulating_precip_raster",
+        return_value=(np.ones((2, 2)), geotransform, projection),
+    )
+    await compute_and_store_precip_rasters(timestamp)
+
+    assert sorted(call.kwargs["Key"] for call in client.put_object.call_args_list) == sorted(missing_keys)
+    assert all(isinstance(call.kwargs["Body"], bytes) for call in client.put_object.call_args_list)
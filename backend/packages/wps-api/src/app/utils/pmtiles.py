@@ -1,6 +1,9 @@
-from osgeo import gdal, ogr
+from osgeo import ogr, osr
+import json
 import os
 import subprocess
+from typing import Optional, TextIO
+from wps_shared import config
 
 # There are a lot of tippecanoe command line arguments worth exploring. The "--coalesce" option was required when creating
 # a pmtiles file from the 500m fuel grid. The 500m fuel grid had too many features per tile and increased tile size above 500KB
@@ -9,29 +12,21 @@ import subprocess
 # with identical attributes into larger features with a net result of decreasing tile size a while maintaining the correct
 # visual representation of the underlying tif.
 
+# Number of threads tippecanoe may use, defaults to the number of cpus tippecanoe can see.
+TIPPECANOE_MAX_THREADS = config.get("TIPPECANOE_MAX_THREADS")
 
-def tippecanoe_wrapper(
-    geojson_filepath: str, output_pmtiles_filepath: str, min_zoom: int = 4, max_zoom: int = 11
-):
-    """
-    Wrapper for the tippecanoe cli tool
+# tippecanoe derives the layer name from the input file name, which was "temp_polys.geojson" when we wrote
+# geojson files to disk. Keep the same name for streamed input so existing pmtiles consumers see the same layer.
+PMTILES_LAYER_NAME = "temp_polys"
 
-    :param geojson_filepath: Path to input geojson (must be in EPSG:4326)
-    :type geojson_filepath: str
-    :param output_pmtile: Path to output pmtiles file
-    :type output_pmtiles_filepath: str
-    :param min_zoom: pmtiles zoom out level
-    :type min_zoom: int
-    :param max_zoom: pmtiles zoom in level
-    :type max_zoom: int
-    """
-    cmd = [
+
+def _tippecanoe_args(output_pmtiles_filepath: str, min_zoom: int, max_zoom: int) -> list[str]:
+    return [
         "tippecanoe",
         f"--minimum-zoom={min_zoom}",
         f"--maximum-zoom={max_zoom}",
         "--projection=EPSG:4326",
         f"--output={output_pmtiles_filepath}",
-        geojson_filepath,
         "--force",  # overwrite output file if it exists
         "--no-progress-indicator",  # Don't report progress, but still give warnings
         "--coalesce",
@@ -39,39 +34,73 @@ def tippecanoe_wrapper(
         "--hilbert",  # put features in Hilbert Curve order instead of the usual Z-Order, should improve spatial coalescing
     ]
 
-    subprocess.run(cmd, check=True)
+
+def _tippecanoe_env() -> Optional[dict]:
+    if not TIPPECANOE_MAX_THREADS:
+        return None
+    return {**os.environ, "TIPPECANOE_MAX_THREADS": str(TIPPECANOE_MAX_THREADS)}
 
 
-def write_geojson(polygons: ogr.Layer, output_dir: str) -> str:
+def write_ndjson_features(polygons: ogr.Layer, output: TextIO):
     """
-    Write geojson file, projected in EPSG:4326, from ogr.Layer object
+    Write every feature of an ogr.Layer as newline delimited geojson, projected in EPSG:4326
 
     :param polygons: Polygon layer
     :type polygons: ogr.Layer
-    :param output_dir: Output directory
-    :type output_dir: str
-    :return: Path to geojson file
-    :rtype: str
+    :param output: Text stream to write features to, one per line
+    :type output: TextIO
     """
-    # We can't use an in-memory layer for translating, so we'll create a temp layer
-    # Using a geopackage since it supports all projections and doesn't limit field name lengths.
-    temp_gpkg = os.path.join(output_dir, "temp_polys.gpkg")
-    driver = ogr.GetDriverByName("GPKG")
-    temp_data_source = driver.CreateDataSource(temp_gpkg)
-    temp_data_source.CopyLayer(polygons, "poly_layer")
+    # tippecanoe recommends the input geojson be in EPSG:4326 [https://github.com/felt/tippecanoe#projection-of-input]
+    target_srs = osr.SpatialReference()
+    target_srs.ImportFromEPSG(4326)
+    target_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    source_srs = polygons.GetSpatialRef()
+    coordinate_transform = None
+    if source_srs is not None and not source_srs.IsSame(target_srs):
+        source_srs = source_srs.Clone()
+        source_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        coordinate_transform = osr.CoordinateTransformation(source_srs, target_srs)
 
-    # We need a geojson file to pass to tippecanoe
-    temp_geojson = os.path.join(output_dir, "temp_polys.geojson")
+    polygons.ResetReading()
+    for feature in polygons:
+        geometry = feature.GetGeometryRef()
+        if geometry is None:
+            continue
+        if coordinate_transform is not None:
+            geometry = geometry.Clone()
+            geometry.Transform(coordinate_transform)
+        output.write(f'{{"type":"Feature","properties":{json.dumps(feature.items())},"geometry":{geometry.ExportToJson()}}}\n')
 
-    # tippecanoe recommends the input geojson be in EPSG:4326 [https://github.com/felt/tippecanoe#projection-of-input]
-    gdal.VectorTranslate(
-        destNameOrDestDS=temp_geojson,
-        srcDS=temp_gpkg,
-        format="GeoJSON",
-        dstSRS="EPSG:4326",
-        reproject=True,
-    )
 
-    del temp_gpkg
+def write_pmtiles(polygons: ogr.Layer, output_pmtiles_filepath: str, min_zoom: int = 4, max_zoom: int = 11):
+    """
+    Stream an ogr.Layer straight into tippecanoe as newline delimited geojson, without writing intermediate files.
+    Each feature is on its own line, so tippecanoe can parse the input in parallel.
+
+    :param polygons: Polygon layer
+    :type polygons: ogr.Layer
+    :param output_pmtiles_filepath: Path to output pmtiles file
+    :type output_pmtiles_filepath: str
+    :param min_zoom: pmtiles zoom out level
+    :type min_zoom: int
+    :param max_zoom: pmtiles zoom in level
+    :type max_zoom: int
+    """
+    cmd = _tippecanoe_args(output_pmtiles_filepath, min_zoom, max_zoom) + [
+        f"--layer={PMTILES_LAYER_NAME}",
+        "--read-parallel",
+    ]
 
-    return temp_geojson
+    with subprocess.Popen(cmd, stdin=subprocess.PIPE, env=_tippecanoe_env(), text=True, encoding="utf-8") as process:
+        try:
+            write_ndjson_features(polygons, process.stdin)
+        except BrokenPipeError:
+            # tippecanoe exited early, the return code below explains why
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
@@ -1,13 +1,15 @@
+import asyncio
 import logging
 import os
+import posixpath
 import tempfile
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import List, Set
 
 import numpy
 from numba import vectorize
 from osgeo import gdal
-from wps_shared import config
 from wps_shared.utils.s3 import get_client, read_into_memory
 from wps_shared.weather_models import ModelEnum
 from wps_shared.weather_models.rdps import RDPSKeyAddresser, adjust_forecast_hour
@@ -17,6 +19,9 @@ _rdps = RDPSKeyAddresser()
 logger = logging.getLogger(__name__)
 
 RDPS_PRECIP_ACC_RASTER_PERMISSIONS = "public-read"
+# Number of hours of the model run to diff, encode and upload at the same time. Each hour holds
+# two full RDPS rasters in memory.
+PRECIP_RASTER_CONCURRENCY = 4
 
 
 @dataclass
@@ -30,74 +35,134 @@ class TemporalPrecip:
         return self.timestamp > other.timestamp
 
 
+def get_computed_precip_key(accumulation_timestamp: datetime) -> str:
+    """Return the key of the computed 24 hour accumulated precip raster for a timestamp."""
+    return (
+        f"weather_models/{ModelEnum.RDPS.lower()}/{accumulation_timestamp.date().isoformat()}/"
+        + _rdps.compose_computed_precip_rdps_key(accumulation_end_datetime=accumulation_timestamp)
+    )
+
+
+async def list_existing_keys(client, bucket: str, keys: List[str]) -> Set[str]:
+    """
+    Return the subset of keys that already exist in the object store, listing each folder the
+    keys live in once, rather than making a request per key.
+    """
+    existing_keys = set()
+    for prefix in sorted({posixpath.dirname(key) + "/" for key in keys}):
+        kwargs = {"Bucket": bucket, "Prefix": prefix}
+        while True:
+            res = await client.list_objects_v2(**kwargs)
+            existing_keys.update(content["Key"] for content in res.get("Contents", []))
+            if not res.get("IsTruncated"):
+                break
+            kwargs["ContinuationToken"] = res.get("NextContinuationToken")
+    return existing_keys.intersection(keys)
+
+
+def write_precip_raster(temp_filename: str, precip_diff_raster: numpy.ndarray, geotransform, projection) -> bytes:
+    """Write the precip raster to a GeoTIFF and return its contents."""
+    driver = gdal.GetDriverByName("GTiff")
+    rows, cols = precip_diff_raster.shape
+    output_dataset = driver.Create(temp_filename, cols, rows, 1, gdal.GDT_Float32)
+    if output_dataset is None:
+        raise IOError("Unable to create %s", temp_filename)
+    output_dataset.SetGeoTransform(geotransform)
+    output_dataset.SetProjection(projection)
+
+    output_band = output_dataset.GetRasterBand(1)
+    output_band.WriteArray(precip_diff_raster)
+    output_band.FlushCache()
+    output_band = None
+    del output_band
+    output_dataset = None
+    del output_dataset
+
+    with open(temp_filename, "rb") as file:
+        return file.read()
+
+
+async def compute_and_store_precip_raster(
+    client, bucket: str, model_run_timestamp: datetime, hour: int, key: str
+) -> bool:
+    """
+    Compute the 24 hour accumulated precip raster for an hour of the model run and store it.
+
+    :return: False if the RDPS precip data for the hour is not available yet, True otherwise.
+    """
+    accumulation_timestamp = model_run_timestamp + timedelta(hours=hour)
+    (
+        precip_diff_raster,
+        geotransform,
+        projection,
+    ) = await generate_24_hour_accumulating_precip_raster(accumulation_timestamp)
+    if precip_diff_raster is None:
+        return False
+
+    logger.info(
+        "Uploading RDPS 24 hour acc precip raster for date: %s, hour: %s, forecast hour: %s to %s",
+        model_run_timestamp.date().isoformat(),
+        model_run_timestamp.hour,
+        adjust_forecast_hour(model_run_timestamp.hour, hour),
+        key,
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_filename = os.path.join(
+            temp_dir, model_run_timestamp.date().isoformat() + "precip" + str(hour) + ".tif"
+        )
+        body = await asyncio.to_thread(
+            write_precip_raster, temp_filename, precip_diff_raster, geotransform, projection
+        )
+
+    await client.put_object(
+        Bucket=bucket,
+        Key=key,
+        ACL=RDPS_PRECIP_ACC_RASTER_PERMISSIONS,  # We need these to be accessible to everyone
+        Body=body,
+    )
+    logger.info("Done uploading file to %s", key)
+    return True
+
+
 async def compute_and_store_precip_rasters(model_run_timestamp: datetime):
     """
     Given a UTC datetime, trigger 36 hours worth of accumulated precip
     difference rasters and store them.
     """
+    keys = {
+        hour: get_computed_precip_key(model_run_timestamp + timedelta(hours=hour))
+        for hour in range(0, 36)
+    }
     async with get_client() as (client, bucket):
-        for hour in range(0, 36):
-            accumulation_timestamp = model_run_timestamp + timedelta(hours=hour)
-            (
-                precip_diff_raster,
-                geotransform,
-                projection,
-            ) = await generate_24_hour_accumulating_precip_raster(accumulation_timestamp)
-            if precip_diff_raster is None:
-                # If there is no precip_diff_raster, RDPS precip data is not available. We'll retry the cron job in one hour.
-                logger.warning(
-                    f"No precip raster data for hour: {hour} and model run timestamp: {model_run_timestamp.strftime('%Y-%m-%d_%H:%M:%S')}"
-                )
-                break
-            key = (
-                f"weather_models/{ModelEnum.RDPS.lower()}/{accumulation_timestamp.date().isoformat()}/"
-                + _rdps.compose_computed_precip_rdps_key(accumulation_end_datetime=accumulation_timestamp)
-            )
-
-            res = await client.list_objects_v2(Bucket=bucket, Prefix=key, MaxKeys=1)
-            if "Contents" in res:
-                logger.info("File already exists for key: %s, skipping", key)
-                continue
-
-            bucket = config.get("OBJECT_STORE_BUCKET")
-
-            logger.info(
-                "Uploading RDPS 24 hour acc precip raster for date: %s, hour: %s, forecast hour: %s to %s",
-                model_run_timestamp.date().isoformat(),
-                model_run_timestamp.hour,
-                adjust_forecast_hour(model_run_timestamp.hour, hour),
-                key,
-            )
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_filename = os.path.join(
-                    temp_dir, model_run_timestamp.date().isoformat() + "precip" + str(hour) + ".tif"
-                )
-                # Create temp file
-                driver = gdal.GetDriverByName("GTiff")
-                rows, cols = precip_diff_raster.shape
-                output_dataset = driver.Create(temp_filename, cols, rows, 1, gdal.GDT_Float32)
-                output_dataset.SetGeoTransform(geotransform)
-                output_dataset.SetProjection(projection)
-
-                if output_dataset is None:
-                    raise IOError("Unable to create %s", key)
-
-                output_band = output_dataset.GetRasterBand(1)
-                output_band.WriteArray(precip_diff_raster)
-                output_band.FlushCache()
-                output_dataset = None
-                del output_dataset
-                output_band = None
-                del output_band
-
-                await client.put_object(
-                    Bucket=bucket,
-                    Key=key,
-                    ACL=RDPS_PRECIP_ACC_RASTER_PERMISSIONS,  # We need these to be accessible to everyone
-                    Body=open(temp_filename, "rb"),
+        # Check which rasters have already been computed before reading any source rasters, so that
+        # re-runs don't download and diff data for hours that are already done.
+        existing_keys = await list_existing_keys(client, bucket, list(keys.values()))
+        pending_hours = [hour for hour, key in keys.items() if key not in existing_keys]
+        logger.info(
+            "%d of %d precip rasters already exist for model run timestamp: %s",
+            len(keys) - len(pending_hours),
+            len(keys),
+            model_run_timestamp.strftime("%Y-%m-%d_%H:%M:%S"),
+        )
+        if not pending_hours:
+            return
+
+        semaphore = asyncio.Semaphore(PRECIP_RASTER_CONCURRENCY)
+
+        async def process_hour(hour: int) -> bool:
+            async with semaphore:
+                return await compute_and_store_precip_raster(
+                    client, bucket, model_run_timestamp, hour, keys[hour]
                 )
 
-                logger.info("Done uploading file to %s", key)
+        results = await asyncio.gather(*[process_hour(hour) for hour in pending_hours])
+
+    missing_hours = [hour for hour, stored in zip(pending_hours, results) if not stored]
+    if missing_hours:
+        # If there is no precip_diff_raster, RDPS precip data is not available. We'll retry the cron job in one hour.
+        logger.warning(
+            f"No precip raster data for hours: {missing_hours} and model run timestamp: {model_run_timestamp.strftime('%Y-%m-%d_%H:%M:%S')}"
+        )
 
 
 async def generate_24_hour_accumulating_precip_raster(timestamp: datetime):
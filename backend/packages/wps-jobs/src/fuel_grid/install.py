@@ -1,17 +1,12 @@
+import asyncio
 import logging
 import os
 import tempfile
-from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Sequence
 
 import aiofiles
-import numpy as np
-from geoalchemy2.elements import WKBElement, WKTElement
-from geoalchemy2.shape import to_shape
-from osgeo import ogr
-from shapely import wkb as shapely_wkb
 from sqlalchemy.ext.asyncio import AsyncSession
 from wps_shared import config
 from wps_shared.db.crud.auto_spatial_advisory import (
@@ -37,11 +32,9 @@ from wps_shared.sfms.raster_addresser import BaseRasterAddresser, S3Key
 from wps_shared.utils.s3_client import S3Client
 from wps_shared.utils.time import get_utc_now
 
-from fuel_grid.combustible_area import calculate_combustible_area_by_fire_zone
 from fuel_grid.fuel_masked_tpi import prepare_masked_tif
-from fuel_grid.fuel_type_area import calculate_fuel_type_areas_per_zone
 from fuel_grid.fuel_type_layer import fuel_type_iterator_by_key
-from fuel_grid.tpi_fuel_area import calculate_masked_tpi_areas
+from fuel_grid.zone_fuel_stats import ZoneFuelStats, calculate_zone_fuel_stats
 
 logger = logging.getLogger(__name__)
 
@@ -416,14 +409,18 @@ async def populate_static_fuel_grid_data(
     fuel_type_raster: FuelTypeRaster,
     fuel_masked_tpi_key: str,
 ) -> FuelGridInstallCounts:
-    fuel_raster_key = BaseRasterAddresser().gdal_path(S3Key(fuel_type_raster.object_store_path))
-    tpi_filename = fuel_masked_tpi_key.removeprefix("dem/tpi/")
+    raster_addresser = BaseRasterAddresser()
+    fuel_raster_key = raster_addresser.gdal_path(S3Key(fuel_type_raster.object_store_path))
+    masked_tpi_key = raster_addresser.gdal_path(S3Key(fuel_masked_tpi_key))
     zones = await get_fire_zone_unit_shapes(session)
 
-    fuel_type_rows = populate_advisory_fuel_types(session, fuel_type_raster, fuel_raster_key)
-    await populate_advisory_shape_fuels(session, fuel_type_raster, fuel_raster_key, zones)
-    populate_combustible_area(session, fuel_type_raster, zones, fuel_type_rows)
-    populate_tpi_fuel_area(session, fuel_type_raster, tpi_filename, zones)
+    populate_advisory_fuel_types(session, fuel_type_raster, fuel_raster_key)
+    zone_fuel_stats = await asyncio.to_thread(
+        calculate_zone_fuel_stats, fuel_raster_key, masked_tpi_key, zones
+    )
+    await populate_advisory_shape_fuels(session, fuel_type_raster, zone_fuel_stats)
+    populate_combustible_area(session, fuel_type_raster, zone_fuel_stats)
+    populate_tpi_fuel_area(session, fuel_type_raster, zone_fuel_stats)
     # flush derived rows so verification can query them before the transaction commits.
     await session.flush()
     return await verify_static_fuel_grid_data(session, fuel_type_raster.id)
@@ -437,125 +434,70 @@ async def get_fire_zone_unit_shapes(session: AsyncSession) -> Sequence[Shape]:
 def populate_advisory_fuel_types(
     session: AsyncSession, fuel_type_raster: FuelTypeRaster, fuel_raster_key: str
 ) -> list[FuelType]:
-    fuel_type_rows = []
-    for fuel_type_id, geom in fuel_type_iterator_by_key(fuel_raster_key):
-        fuel_type = FuelType(
+    fuel_type_rows = [
+        FuelType(
             fuel_type_id=fuel_type_id,
             geom=geom,
             fuel_type_raster_id=fuel_type_raster.id,
         )
-        session.add(fuel_type)
-        fuel_type_rows.append(fuel_type)
+        for fuel_type_id, geom in fuel_type_iterator_by_key(fuel_raster_key)
+    ]
+    session.add_all(fuel_type_rows)
     return fuel_type_rows
 
 
 async def populate_advisory_shape_fuels(
     session: AsyncSession,
     fuel_type_raster: FuelTypeRaster,
-    fuel_raster_key: str,
-    zones: Sequence[Shape],
+    zone_fuel_stats: ZoneFuelStats,
 ) -> None:
     sfms_fuel_types = await get_fuel_types_id_dict(session)
-    all_zone_data = calculate_fuel_type_areas_per_zone(fuel_raster_key, zones)
-    for zone_data in all_zone_data:
-        for advisory_shape_id, fuel_type_id, fuel_area in zone_data:
-            session.add(
-                AdvisoryShapeFuels(
-                    advisory_shape_id=advisory_shape_id,
-                    fuel_type=sfms_fuel_types[int(fuel_type_id)],
-                    fuel_area=fuel_area,
-                    fuel_type_raster_id=fuel_type_raster.id,
-                )
+    session.add_all(
+        [
+            AdvisoryShapeFuels(
+                advisory_shape_id=advisory_shape_id,
+                fuel_type=sfms_fuel_types[fuel_type_id],
+                fuel_area=fuel_area,
+                fuel_type_raster_id=fuel_type_raster.id,
             )
+            for advisory_shape_id, fuel_type_id, fuel_area in zone_fuel_stats.fuel_type_areas
+        ]
+    )
 
 
 def populate_combustible_area(
     session: AsyncSession,
     fuel_type_raster: FuelTypeRaster,
-    zones: Sequence[Shape],
-    fuel_type_rows: list[FuelType],
+    zone_fuel_stats: ZoneFuelStats,
 ) -> None:
-    combustible_fuel_type_rows = [
-        fuel_type
-        for fuel_type in fuel_type_rows
-        if fuel_type.fuel_type_id < 99 and fuel_type.fuel_type_id > 0
-    ]
-
-    with fuel_types_layer_from_rows(combustible_fuel_type_rows) as fuel_types:
-        for _, area, advisory_shape_id in calculate_combustible_area_by_fire_zone(
-            fuel_types, zones
-        ):
-            if advisory_shape_id is None or area is None:
-                continue
-            session.add(
-                CombustibleArea(
-                    advisory_shape_id=advisory_shape_id,
-                    combustible_area=area,
-                    fuel_type_raster_id=fuel_type_raster.id,
-                )
+    session.add_all(
+        [
+            CombustibleArea(
+                advisory_shape_id=advisory_shape_id,
+                combustible_area=area,
+                fuel_type_raster_id=fuel_type_raster.id,
             )
+            for advisory_shape_id, area in zone_fuel_stats.combustible_areas
+        ]
+    )
 
 
 def populate_tpi_fuel_area(
     session: AsyncSession,
     fuel_type_raster: FuelTypeRaster,
-    tpi_filename: str,
-    zones: Sequence[Shape],
+    zone_fuel_stats: ZoneFuelStats,
 ) -> None:
-    for advisory_shape_id, tpi_class, fuel_area in calculate_masked_tpi_areas(zones, tpi_filename):
-        session.add(
+    session.add_all(
+        [
             TPIFuelArea(
                 advisory_shape_id=advisory_shape_id,
                 tpi_class=tpi_class,
-                fuel_area=float(
-                    fuel_area.item() if isinstance(fuel_area, np.generic) else fuel_area
-                ),
+                fuel_area=fuel_area,
                 fuel_type_raster_id=fuel_type_raster.id,
             )
-        )
-
-
-# in-memory geometry conversion for combustible-area calculation
-
-
-@contextmanager
-def fuel_types_layer_from_db(session_rows):
-    with fuel_types_layer_from_rows(session_rows) as fuel_types:
-        yield fuel_types
-
-
-@contextmanager
-def fuel_types_layer_from_rows(fuel_type_rows):
-    mem_driver = ogr.GetDriverByName("MEM")
-    mem_ds = mem_driver.CreateDataSource("fuel_types")
-    fuel_types_layer = mem_ds.CreateLayer("fuel_types", geom_type=ogr.wkbPolygon)
-    fuel_types_layer.CreateField(ogr.FieldDefn("id", ogr.OFTInteger))
-    fuel_types_layer.CreateField(ogr.FieldDefn("fuel_type_id", ogr.OFTInteger))
-
-    for index, row in enumerate(fuel_type_rows, start=1):
-        shapely_obj = fuel_type_geom_to_shape(row.geom)
-        feature = ogr.Feature(fuel_types_layer.GetLayerDefn())
-        feature.SetGeometry(ogr.CreateGeometryFromWkt(shapely_obj.wkt))
-        feature.SetField("id", row.id if row.id is not None else index)
-        feature.SetField("fuel_type_id", row.fuel_type_id)
-        fuel_types_layer.CreateFeature(feature)
-        feature = None
-
-    try:
-        yield fuel_types_layer
-    finally:
-        mem_ds = None
-
-
-def fuel_type_geom_to_shape(geom):
-    # unflushed GeoAlchemy geometry values are still hex EWKB strings at this point.
-    if isinstance(geom, str):
-        return shapely_wkb.loads(geom, hex=True)
-    if isinstance(geom, bytes):
-        return shapely_wkb.loads(geom)
-    if isinstance(geom, WKBElement | WKTElement):
-        return to_shape(geom)
-    raise TypeError(f"Unsupported fuel type geometry: {type(geom).__name__}")
+            for advisory_shape_id, tpi_class, fuel_area in zone_fuel_stats.tpi_fuel_areas
+        ]
+    )
 
 
 # verification
@@ -0,0 +1,138 @@
+"""
+Calculates the static per fire zone fuel statistics of a fuel grid: the area of each fuel type, the
+combustible area and the fuel covered area of each TPI class.
+
+Each raster is read once, a block of rows at a time, with the fire zones rasterized onto just that
+block of the raster's grid, counting pixels per zone and value with a single bincount per block.
+Neither the raster nor the zone ids are ever held in memory for the whole grid.
+"""
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+from geoalchemy2.shape import to_shape
+from osgeo import gdal, ogr, osr
+
+from wps_shared.db.models.auto_spatial_advisory import Shape, TPIClassEnum
+from wps_shared.geospatial.geospatial import (
+    NAD83_BC_ALBERS,
+    create_zone_layer,
+    rasterize_zone_window,
+)
+from wps_shared.utils.s3 import set_s3_gdal_config
+
+# Number of raster rows read at a time.
+ZONE_STATS_BLOCK_ROWS = 1024
+# Fuel type ids 1 - 98 are combustible, 0 is no data and 99+ are non fuel.
+NON_FUEL_TYPE_ID = 99
+TPI_CLASS_COUNT = max(tpi_class.value for tpi_class in TPIClassEnum) + 1
+# Zone ids are rasterized as uint16.
+MAX_ZONE_ID = np.iinfo(np.uint16).max
+
+
+@dataclass(frozen=True)
+class ZoneFuelStats:
+    # (advisory shape id, fuel type id, area in square metres)
+    fuel_type_areas: list[tuple[int, int, float]]
+    # (advisory shape id, combustible area in square metres)
+    combustible_areas: list[tuple[int, float]]
+    # (advisory shape id, tpi class, fuel covered area in square metres)
+    tpi_fuel_areas: list[tuple[int, TPIClassEnum, float]]
+
+
+def count_pixels_by_zone(
+    raster_ds: gdal.Dataset, zone_layer: ogr.Layer, zone_count: int, value_count: int
+) -> np.ndarray:
+    """
+    Count the pixels of each value in each zone, reading the raster and rasterizing the zones a
+    block of rows at a time.
+
+    :param raster_ds: raster to count the first band of
+    :param zone_layer: zone layer, see create_zone_layer
+    :param zone_count: one more than the largest zone id
+    :param value_count: values from 0 up to, but not including, value_count are counted
+    :return: pixel counts indexed by [zone id, value]
+    """
+    band = raster_ds.GetRasterBand(1)
+    counts = np.zeros(zone_count * value_count, dtype=np.int64)
+    for yoff in range(0, band.YSize, ZONE_STATS_BLOCK_ROWS):
+        rows = min(ZONE_STATS_BLOCK_ROWS, band.YSize - yoff)
+        values = band.ReadAsArray(0, yoff, band.XSize, rows)
+        block_zone_ids = rasterize_zone_window(raster_ds, zone_layer, yoff, rows)
+        counted = (block_zone_ids > 0) & (values >= 0) & (values < value_count)
+        counts += np.bincount(
+            block_zone_ids[counted].astype(np.int64) * value_count + values[counted].astype(np.int64),
+            minlength=counts.size,
+        )
+    return counts.reshape(zone_count, value_count)
+
+
+def count_raster_pixels_by_zone(
+    raster_key: str, zone_layer: ogr.Layer, zone_count: int, value_count: int
+) -> tuple[np.ndarray, float]:
+    """
+    Count the raster's pixels by zone and value.
+
+    :return: pixel counts indexed by [zone id, value], and the area of a pixel in square metres
+    """
+    with gdal.Open(raster_key, gdal.GA_ReadOnly) as raster_ds:
+        counts = count_pixels_by_zone(raster_ds, zone_layer, zone_count, value_count)
+        geo_transform = raster_ds.GetGeoTransform()
+    return counts, abs(geo_transform[1] * geo_transform[5])
+
+
+def calculate_zone_fuel_stats(
+    fuel_raster_key: str, masked_tpi_key: str, zones: Sequence[Shape]
+) -> ZoneFuelStats:
+    """
+    Calculate the fuel type, combustible and TPI class fuel areas of every fire zone.
+
+    :param fuel_raster_key: gdal path to the fuel type raster
+    :param masked_tpi_key: gdal path to the classified TPI raster masked to fuel covered pixels
+    :param zones: fire zone units
+    :return: areas per zone, only including areas greater than 0
+    """
+    set_s3_gdal_config()
+    zone_wkbs = [(zone.id, to_shape(zone.geom).wkb) for zone in zones]
+    zone_count = max((zone_id for zone_id, _ in zone_wkbs), default=0) + 1
+    if zone_count > MAX_ZONE_ID + 1:
+        raise ValueError(f"Zone ids must not be greater than {MAX_ZONE_ID}")
+    # advisory shapes are stored in BC Albers.
+    zone_srs = osr.SpatialReference()
+    zone_srs.ImportFromEPSG(NAD83_BC_ALBERS)
+    zone_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    zone_source = create_zone_layer(zone_wkbs, zone_srs)
+    zone_layer = zone_source.GetLayer(0)
+
+    fuel_counts, fuel_pixel_area = count_raster_pixels_by_zone(
+        fuel_raster_key, zone_layer, zone_count, NON_FUEL_TYPE_ID
+    )
+    # 0 is no data
+    fuel_counts[:, 0] = 0
+    zone_ids, fuel_type_ids = np.nonzero(fuel_counts)
+    fuel_type_areas = [
+        (int(zone_id), int(fuel_type_id), float(fuel_counts[zone_id, fuel_type_id] * fuel_pixel_area))
+        for zone_id, fuel_type_id in zip(zone_ids, fuel_type_ids)
+    ]
+    combustible_counts = fuel_counts.sum(axis=1)
+    combustible_areas = [
+        (int(zone_id), float(combustible_counts[zone_id] * fuel_pixel_area))
+        for zone_id in np.flatnonzero(combustible_counts)
+    ]
+
+    tpi_counts, tpi_pixel_area = count_raster_pixels_by_zone(
+        masked_tpi_key, zone_layer, zone_count, TPI_CLASS_COUNT
+    )
+    # 0 is masked out, non fuel pixels
+    tpi_counts[:, 0] = 0
+    tpi_fuel_areas = [
+        (int(zone_id), TPIClassEnum(int(tpi_class)), float(tpi_counts[zone_id, tpi_class] * tpi_pixel_area))
+        for zone_id, tpi_class in zip(*np.nonzero(tpi_counts))
+    ]
+
+    return ZoneFuelStats(
+        fuel_type_areas=fuel_type_areas,
+        combustible_areas=combustible_areas,
+        tpi_fuel_areas=tpi_fuel_areas,
+    )
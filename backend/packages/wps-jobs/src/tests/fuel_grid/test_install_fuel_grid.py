@@ -1,11 +1,8 @@
 from datetime import datetime
-from types import SimpleNamespace
 from typing import cast
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from shapely import wkb
-from shapely.geometry import Polygon
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fuel_grid.install import (
@@ -13,13 +10,13 @@ from fuel_grid.install import (
     ProcessedFuelRaster,
     create_fuel_type_raster_record,
     ensure_fuel_masked_tpi_raster,
-    fuel_types_layer_from_db,
     get_or_create_processed_fuel_raster,
     install_fuel_grid,
     populate_static_fuel_grid_data,
     process_fuel_type_raster_for_install,
     verify_static_fuel_grid_data,
 )
+from fuel_grid.zone_fuel_stats import ZoneFuelStats
 from wps_shared.db.models.fuel_type_raster import FuelRasterInstallStatus, FuelTypeRaster
 from wps_shared.sfms.raster_addresser import BaseRasterAddresser
 
@@ -94,24 +91,6 @@ def patch_no_matching_fuel_raster(monkeypatch):
     )
 
 
-def test_fuel_types_layer_from_db_accepts_unflushed_hex_wkb():
-    geom = wkb.dumps(
-        Polygon([(0, 0), (0, 10), (10, 10), (10, 0), (0, 0)]),
-        hex=True,
-        srid=3005,
-    )
-    row = SimpleNamespace(id=None, fuel_type_id=1, geom=geom)
-
-    with fuel_types_layer_from_db([row]) as layer:
-        layer.ResetReading()
-        feature = layer.GetNextFeature()
-
-        assert layer.GetFeatureCount() == 1
-        assert feature.GetField("id") == 1
-        assert feature.GetField("fuel_type_id") == 1
-        assert feature.GetGeometryRef().GetArea() == 100
-
-
 @pytest.mark.anyio
 async def test_process_fuel_type_raster_for_install_creates_new_version(monkeypatch):
     mock_process = AsyncMock(
@@ -325,6 +304,10 @@ async def test_populate_static_fuel_grid_data_flushes_once_after_population(monk
         tpi_fuel_area=1,
         advisory_shape_fuels_duplicates=0,
     )
+    zone_fuel_stats = ZoneFuelStats(
+        fuel_type_areas=[(1, 2, 100.0)], combustible_areas=[(1, 100.0)], tpi_fuel_areas=[]
+    )
+    calculate_zone_fuel_stats = MagicMock(return_value=zone_fuel_stats)
     populate_advisory_fuel_types = MagicMock(return_value=["fuel-type-row"])
     populate_advisory_shape_fuels = AsyncMock()
     populate_combustible_area = MagicMock()
@@ -336,6 +319,7 @@ async def test_populate_static_fuel_grid_data_flushes_once_after_population(monk
         "fuel_grid.install.get_fire_zone_unit_shape_type_id", AsyncMock(return_value=1)
     )
     monkeypatch.setattr("fuel_grid.install.get_fire_zone_units", AsyncMock(return_value=["zone"]))
+    monkeypatch.setattr("fuel_grid.install.calculate_zone_fuel_stats", calculate_zone_fuel_stats)
     monkeypatch.setattr(
         "fuel_grid.install.populate_advisory_fuel_types", populate_advisory_fuel_types
     )
@@ -355,9 +339,13 @@ async def test_populate_static_fuel_grid_data_flushes_once_after_population(monk
     assert counts == expected_counts
     assert flush_count == 1
     populate_advisory_fuel_types.assert_called_once()
-    populate_advisory_shape_fuels.assert_awaited_once()
-    populate_combustible_area.assert_called_once()
-    populate_tpi_fuel_area.assert_called_once()
+    # zone statistics come from a single pass over the fuel and masked TPI rasters
+    calculate_zone_fuel_stats.assert_called_once_with("fuel-key", "fuel-key", ["zone"])
+    populate_advisory_shape_fuels.assert_awaited_once_with(
+        session, fuel_type_raster, zone_fuel_stats
+    )
+    populate_combustible_area.assert_called_once_with(session, fuel_type_raster, zone_fuel_stats)
+    populate_tpi_fuel_area.assert_called_once_with(session, fuel_type_raster, zone_fuel_stats)
     verify_static_fuel_grid_data.assert_awaited_once_with(session, 42)
 
 
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import numpy as np
+from geoalchemy2.shape import from_shape
+from osgeo import gdal, osr
+from shapely.geometry import box
+from shapely.ops import unary_union
+
+import fuel_grid.zone_fuel_stats as zone_fuel_stats
+from fuel_grid.zone_fuel_stats import calculate_zone_fuel_stats, count_pixels_by_zone
+from wps_shared.db.models.auto_spatial_advisory import TPIClassEnum
+from wps_shared.geospatial.geospatial import create_zone_layer
+
+
+def _zone_srs() -> osr.SpatialReference:
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3005)
+    srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return srs
+
+
+def test_count_pixels_by_zone_reads_in_blocks(monkeypatch):
+    monkeypatch.setattr(zone_fuel_stats, "ZONE_STATS_BLOCK_ROWS", 1)
+    values = np.array([[0, 1, 1], [2, 99, 1], [2, 2, 1]], dtype=np.uint8)
+    raster_ds = gdal.GetDriverByName("MEM").Create("", 3, 3, 1, gdal.GDT_Byte)
+    raster_ds.SetGeoTransform((1000000, 100, 0, 1000000, 0, -100))
+    raster_ds.SetProjection(_zone_srs().ExportToWkt())
+    raster_ds.GetRasterBand(1).WriteArray(values)
+    # zone 4 covers the first row and the first two pixels of the second row, zone 2 the rest,
+    # except the first pixel of the last row
+    zone_4 = unary_union(
+        [box(1000000, 999900, 1000300, 1000000), box(1000000, 999800, 1000200, 999900)]
+    )
+    zone_2 = unary_union(
+        [box(1000200, 999800, 1000300, 999900), box(1000100, 999700, 1000300, 999800)]
+    )
+    zone_source = create_zone_layer([(4, zone_4.wkb), (2, zone_2.wkb)], _zone_srs())
+
+    counts = count_pixels_by_zone(raster_ds, zone_source.GetLayer(0), 5, 99)
+
+    assert counts.shape == (5, 99)
+    assert counts[4, :3].tolist() == [1, 2, 1]
+    assert counts[2, :3].tolist() == [0, 2, 1]
+    # values out of range and pixels outside every zone aren't counted
+    assert counts.sum() == 7
+
+
+def _write_raster(path: str, data: np.ndarray):
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3005)
+    ds = gdal.GetDriverByName("GTiff").Create(path, data.shape[1], data.shape[0], 1, gdal.GDT_Byte)
+    ds.SetGeoTransform((1000000, 100, 0, 1000000, 0, -100))
+    ds.SetProjection(srs.ExportToWkt())
+    ds.GetRasterBand(1).WriteArray(data)
+    ds = None
+
+
+def test_calculate_zone_fuel_stats():
+    fuel_path = "/vsimem/test_zone_fuel_stats_fuel.tif"
+    tpi_path = "/vsimem/test_zone_fuel_stats_tpi.tif"
+    _write_raster(fuel_path, np.array([[1, 1, 102, 0], [2, 2, 2, 1]], dtype=np.uint8))
+    _write_raster(tpi_path, np.array([[1, 3, 0, 0], [2, 2, 2, 1]], dtype=np.uint8))
+    zones = [
+        # left two columns
+        SimpleNamespace(id=7, geom=from_shape(box(1000000, 999800, 1000200, 1000000), srid=3005)),
+        # right two columns
+        SimpleNamespace(id=9, geom=from_shape(box(1000200, 999800, 1000400, 1000000), srid=3005)),
+    ]
+
+    try:
+        stats = calculate_zone_fuel_stats(fuel_path, tpi_path, zones)
+    finally:
+        gdal.Unlink(fuel_path)
+        gdal.Unlink(tpi_path)
+
+    pixel_area = 100 * 100
+    assert sorted(stats.fuel_type_areas) == [
+        (7, 1, 2 * pixel_area),
+        (7, 2, 2 * pixel_area),
+        (9, 1, pixel_area),
+        (9, 2, pixel_area),
+    ]
+    assert sorted(stats.combustible_areas) == [(7, 4 * pixel_area), (9, 2 * pixel_area)]
+    assert sorted(stats.tpi_fuel_areas, key=lambda area: (area[0], area[1].value)) == [
+        (7, TPIClassEnum.valley_bottom, pixel_area),
+        (7, TPIClassEnum.mid_slope, 2 * pixel_area),
+        (7, TPIClassEnum.upper_slope, pixel_area),
+        (9, TPIClassEnum.valley_bottom, pixel_area),
+        (9, TPIClassEnum.mid_slope, pixel_area),
+    ]
@@ -4,11 +4,13 @@ import logging
 import os
 from operator import itemgetter
 
+import numpy as np
 import pytest
 import weather_model_jobs.utils.process_grib as process_grib
 from osgeo import gdal
 from pyproj import CRS
-from wps_shared.geospatial.geospatial import NAD83_CRS
+from wps_shared.geospatial.geospatial import NAD83_CRS, geo_to_pixel_indices, get_transformer
+from wps_shared.geospatial.wps_dataset import read_values_at_pixels
 
 logger = logging.getLogger(__name__)
 
@@ -86,25 +88,19 @@ def test_get_dataset_geometry(filename, origin, pixel_size):
         ),
     ],
 )
-def test_calculate_raster_coordinates(
+def test_station_pixel_indices_and_values(
     filename, geographic_coordinate, raster_coordinate, expected_value
 ):
     grib_path = get_grib_file_path(filename)
     dataset = gdal.Open(grib_path, gdal.GA_ReadOnly)
     proj_crs = CRS.from_string(dataset.GetProjection())
-    transformer = process_grib.get_transformer(NAD83_CRS, proj_crs)
+    transformer = get_transformer(NAD83_CRS, proj_crs)
     padf_transform = process_grib.get_dataset_transform(grib_path)
     longitude, latitude = geographic_coordinate
-    actual_raster_coordinate = process_grib.calculate_raster_coordinate(
-        longitude, latitude, padf_transform, transformer
-    )
-    assert actual_raster_coordinate == raster_coordinate
+    raster_x, raster_y = transformer.transform(np.array([longitude]), np.array([latitude]))
+    cols, rows = geo_to_pixel_indices(padf_transform.to_gdal(), raster_x, raster_y)
+    assert (cols[0], rows[0]) == raster_coordinate
 
-    x_coordinate, y_coordinate = actual_raster_coordinate
-    assert 0 <= x_coordinate < dataset.RasterXSize
-    assert 0 <= y_coordinate < dataset.RasterYSize
-
-    value = dataset.GetRasterBand(1).ReadAsArray(
-        x_coordinate, y_coordinate, 1, 1
-    )[0, 0]
-    assert value == pytest.approx(expected_value)
+    values, in_bounds = read_values_at_pixels(dataset.GetRasterBand(1), cols, rows)
+    assert in_bounds.all()
+    assert values[0] == pytest.approx(expected_value)
@@ -6,7 +6,7 @@ from aiohttp import ClientSession
 from osgeo import gdal
 from pyproj import CRS
 from weather_model_jobs.utils import process_grib
-from wps_shared.geospatial.geospatial import NAD83_CRS
+from wps_shared.geospatial.geospatial import NAD83_CRS, get_transformer
 from wps_shared.tests.common import default_mock_client_get
 from wps_shared.weather_models import ModelEnum
 
@@ -60,8 +60,8 @@ def test_read_single_raster_value(monkeypatch: pytest.MonkeyPatch):
     # (this step is included because HRDPS grib files are in another coordinate system)
     wkt = dataset.GetProjection()
     crs = CRS.from_string(wkt)
-    raster_to_geo_transformer = process_grib.get_transformer(crs, NAD83_CRS)
-    geo_to_raster_transformer = process_grib.get_transformer(NAD83_CRS, crs)
+    raster_to_geo_transformer = get_transformer(crs, NAD83_CRS)
+    geo_to_raster_transformer = get_transformer(NAD83_CRS, crs)
     padf_transform = process_grib.get_dataset_transform(filename)
 
     processor = process_grib.GribFileProcessor(
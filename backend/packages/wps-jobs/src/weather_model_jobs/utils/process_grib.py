@@ -1,16 +1,15 @@
 """Read a grib file, and store values relevant to weather stations in database."""
 
 from datetime import datetime
-import math
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from osgeo import gdal
-from pyproj import CRS, Transformer
-from affine import Affine
+from pyproj import CRS
 import numpy as np
 from wps_wf1.wfwx_api import get_stations_synchronously
-from wps_shared.geospatial.geospatial import NAD83_CRS, get_dataset_transform, get_transformer
+from wps_shared.geospatial.geospatial import NAD83_CRS, geo_to_pixel_indices, get_cached_transformer, get_dataset_transform
+from wps_shared.geospatial.wps_dataset import read_values_at_pixels
 from wps_shared.db.models.weather_models import ModelRunPrediction, PredictionModel, PredictionModelRunTimestamp
 from wps_shared.db.crud.weather_models import get_prediction_model, get_or_create_prediction_run
 from wps_shared.weather_models import ModelEnum, ProjectionEnum
@@ -41,18 +40,6 @@ class ModelRunInfo:
         self.variable_name: Optional[str] = variable_name
 
 
-def calculate_raster_coordinate(longitude: float, latitude: float, transform: Affine, transformer: Transformer):
-    """From a given longitude and latitude, calculate the raster coordinate corresponding to the
-    top left point of the grid surrounding the given geographic coordinate.
-    """
-    # Because not all model types use EPSG:4269 projection, we first convert longitude and latitude
-    # to whichever projection and coordinate system the grib file is using
-    raster_long, raster_lat = transformer.transform(longitude, latitude)
-    reverse = ~transform
-    i_index, j_index = reverse * (raster_long, raster_lat)
-    return (math.floor(i_index), math.floor(j_index))
-
-
 def convert_mps_to_kph(value: float):
     """Convert a value from metres per second to kilometres per hour."""
     return value / 1000 * 3600
@@ -90,50 +77,51 @@ class GribFileProcessor:
         self.raster_to_geo_transformer = raster_to_geo_transformer
         self.geo_to_raster_transformer = geo_to_raster_transformer
         self.prediction_model: Optional[PredictionModel] = None
-
-    def yield_value_for_stations(self, raster_band: gdal.Dataset):
-        """Given a list of stations, and a gdal dataset, yield relevant data value"""
-        for station in self.stations:
-            longitude = station.long
-            latitude = station.lat
-
-            x_coordinate, y_coordinate = calculate_raster_coordinate(longitude, latitude, self.padf_transform, self.geo_to_raster_transformer)
-
-            if 0 <= x_coordinate < raster_band.XSize and 0 <= y_coordinate < raster_band.YSize:
-                value = raster_band.ReadAsArray(x_coordinate, y_coordinate, 1, 1)[0, 0]
-            else:
+        self._station_pixel_indices: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._station_pixel_indices_key = None
+
+    def get_station_pixel_indices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (col, row) raster indices of every station, transformed in one vectorized call.
+        All the grib files for a model share a grid, so the indices are reused until the grid changes."""
+        cache_key = (self.padf_transform, id(self.geo_to_raster_transformer))
+        if self._station_pixel_indices_key != cache_key:
+            raster_x, raster_y = self.geo_to_raster_transformer.transform(
+                np.array([station.long for station in self.stations], dtype=np.float64),
+                np.array([station.lat for station in self.stations], dtype=np.float64),
+            )
+            self._station_pixel_indices = geo_to_pixel_indices(self.padf_transform.to_gdal(), raster_x, raster_y)
+            self._station_pixel_indices_key = cache_key
+        return self._station_pixel_indices
+
+    def yield_value_for_stations(self, raster_band: gdal.Band):
+        """Given a list of stations, and a gdal raster band, yield relevant data value"""
+        cols, rows = self.get_station_pixel_indices()
+        values, in_bounds = read_values_at_pixels(raster_band, cols, rows)
+        for station, value, station_in_bounds in zip(self.stations, values, in_bounds):
+            if not station_in_bounds:
                 logger.warning("coordinate not in raster - %s", station)
                 continue
 
             yield (station, value)
 
-    def yield_uv_wind_data_for_stations(self, u_raster_band: gdal.Dataset, v_raster_band: gdal.Dataset, variable: str):
-        """Given a list of stations and 2 gdal datasets (one for u-component of wind, one for v-component
+    def yield_uv_wind_data_for_stations(self, u_raster_band: gdal.Band, v_raster_band: gdal.Band, variable: str):
+        """Given a list of stations and 2 gdal raster bands (one for u-component of wind, one for v-component
         of wind), yield relevant data
         """
-        for station in self.stations:
-            longitude = station.long
-            latitude = station.lat
-
-            x_coordinate, y_coordinate = calculate_raster_coordinate(longitude, latitude, self.padf_transform, self.geo_to_raster_transformer)
-
-            if (
-                0 <= x_coordinate < u_raster_band.XSize
-                and 0 <= x_coordinate < v_raster_band.XSize
-                and 0 <= y_coordinate < u_raster_band.YSize
-                and 0 <= y_coordinate < v_raster_band.YSize
-            ):
-                u_value = u_raster_band.ReadAsArray(x_coordinate, y_coordinate, 1, 1)[0, 0]
-                v_value = v_raster_band.ReadAsArray(x_coordinate, y_coordinate, 1, 1)[0, 0]
-
-                if variable == "wdir_tgl_10":
-                    yield (station, calculate_wind_dir_from_u_v(u_value, v_value))
-                elif variable == "wind_tgl_10":
-                    metres_per_second_speed = calculate_wind_speed_from_u_v(u_value, v_value)
-                    kilometres_per_hour_speed = convert_mps_to_kph(metres_per_second_speed)
-                    yield (station, kilometres_per_hour_speed)
-            else:
+        cols, rows = self.get_station_pixel_indices()
+        u_values, u_in_bounds = read_values_at_pixels(u_raster_band, cols, rows)
+        v_values, v_in_bounds = read_values_at_pixels(v_raster_band, cols, rows)
+        for station, u_value, v_value, station_in_bounds in zip(self.stations, u_values, v_values, u_in_bounds & v_in_bounds):
+            if not station_in_bounds:
                 logger.warning("coordinate not in u/v wind rasters - %s", station)
+                continue
+
+            if variable == "wdir_tgl_10":
+                yield (station, calculate_wind_dir_from_u_v(u_value, v_value))
+            elif variable == "wind_tgl_10":
+                metres_per_second_speed = calculate_wind_speed_from_u_v(u_value, v_value)
+                kilometres_per_hour_speed = convert_mps_to_kph(metres_per_second_speed)
+                yield (station, kilometres_per_hour_speed)
 
     def get_wind_dir_values(self, u_points: List[int], zipped_uv_values):
         """Get calculated wind direction values for list of points and zipped u,v values"""
@@ -277,8 +265,8 @@ class GribFileProcessor:
         # (this step is included because HRDPS grib files are in another coordinate system)
         wkt = dataset.GetProjection()
         crs = CRS.from_string(wkt)
-        self.raster_to_geo_transformer = get_transformer(crs, NAD83_CRS)
-        self.geo_to_raster_transformer = get_transformer(NAD83_CRS, crs)
+        self.raster_to_geo_transformer = get_cached_transformer(crs, NAD83_CRS)
+        self.geo_to_raster_transformer = get_cached_transformer(NAD83_CRS, crs)
 
         self.padf_transform = get_dataset_transform(filename)
         # get the model (.e.g. GPDS/RDPS latlon24x.24):
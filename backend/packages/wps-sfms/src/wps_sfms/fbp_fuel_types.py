@@ -1,7 +1,7 @@
 """Fuel-grid classifications used by SFMS fire behaviour calculations."""
 
 from types import MappingProxyType
-from typing import Mapping
+from typing import Mapping, Optional
 
 import numpy as np
 from cffdrs_vec.fbp import FUEL_TYPE_CODES
@@ -55,16 +55,82 @@ PERCENT_CONIFER_GRID_VALUES = frozenset(
 GRASS_FUEL_LOAD = 0.35
 
 
-def _integer_fuel_values(fuel: np.ndarray) -> set[int]:
-    finite_values = fuel[np.isfinite(fuel)]
-    non_integral = finite_values[finite_values != np.rint(finite_values)]
-    if non_integral.size:
-        values = sorted(np.unique(non_integral).tolist())
-        raise ValueError(f"Fuel raster contains non-integral classifications: {values}")
-    return {int(value) for value in np.unique(finite_values)}
+# Fuel grid values index the fuel grid lookup directly. The table has one entry past the largest
+# known value, so values outside the table clip onto an unknown entry.
+FUEL_GRID_LOOKUP_SIZE = max(*FUEL_TYPES_BY_GRID_VALUE, *CFFDRS_NON_FUEL_TYPES_BY_GRID_VALUE) + 2
+FUEL_GRID_LOOKUP_DTYPE = np.dtype(
+    [
+        ("fuel_type_code", np.int64),
+        ("known", np.bool_),
+        ("non_combustible", np.bool_),
+        ("percent_conifer", np.bool_),
+    ],
+    align=True,
+)
+
+
+def _build_fuel_grid_lookup() -> np.ndarray:
+    lookup = np.zeros(FUEL_GRID_LOOKUP_SIZE, dtype=FUEL_GRID_LOOKUP_DTYPE)
+    lookup["fuel_type_code"] = NODATA_FUEL_TYPE_CODE
+    for grid_value, fuel_type in FUEL_TYPES_BY_GRID_VALUE.items():
+        lookup[grid_value] = (
+            FUEL_TYPE_CODES[fuel_type.value],
+            True,
+            False,
+            grid_value in PERCENT_CONIFER_GRID_VALUES,
+        )
+    for grid_value, fuel_type in CFFDRS_NON_FUEL_TYPES_BY_GRID_VALUE.items():
+        lookup[grid_value] = (FUEL_TYPE_CODES[fuel_type], True, True, False)
+    lookup.flags.writeable = False
+    return lookup
+
+
+FUEL_GRID_LOOKUP = _build_fuel_grid_lookup()
+_NODATA_FUEL_GRID_ENTRY = np.array(
+    (NODATA_FUEL_TYPE_CODE, True, False, False), dtype=FUEL_GRID_LOOKUP_DTYPE
+)
+
+
+def lookup_fuel_grid(fuel: np.ndarray, nodata_value: Optional[float] = None) -> np.ndarray:
+    """Look up the CFFDRS fuel-type code and classification of every pixel of an SFMS fuel raster.
 
+    Integer rasters index ``FUEL_GRID_LOOKUP`` directly in their native data type, so every field
+    comes from a single gather. Floating point rasters are checked for fractional classifications
+    first. Pixels that are nan or equal to ``nodata_value`` receive ``NODATA_FUEL_TYPE_CODE`` and
+    are neither non-combustible nor mixedwood.
 
-def fuel_type_codes_from_grid(fuel: np.ndarray) -> np.ndarray:
+    The returned array has the same shape as ``fuel`` and the ``FUEL_GRID_LOOKUP_DTYPE`` fields. A
+    ``ValueError`` is raised if the source contains a fractional or unknown classification.
+    """
+    missing = None
+    if np.issubdtype(fuel.dtype, np.floating):
+        missing = ~np.isfinite(fuel)
+        if nodata_value is not None:
+            missing |= fuel == nodata_value
+        non_integral = ~missing & (fuel != np.rint(fuel))
+        if np.any(non_integral):
+            values = sorted(np.unique(fuel[non_integral]).tolist())
+            raise ValueError(f"Fuel raster contains non-integral classifications: {values}")
+        indices = np.where(missing, FUEL_GRID_LOOKUP_SIZE - 1, fuel).astype(np.intp)
+    else:
+        indices = fuel
+        if nodata_value is not None:
+            missing = fuel == nodata_value
+
+    fuel_grid = FUEL_GRID_LOOKUP.take(indices, mode="clip")
+    unsupported = ~fuel_grid["known"]
+    if missing is not None:
+        unsupported &= ~missing
+    if np.any(unsupported):
+        values = sorted(int(value) for value in np.unique(fuel[unsupported]))
+        raise ValueError(f"Fuel raster contains unsupported classifications: {values}")
+
+    if missing is not None:
+        fuel_grid[missing] = _NODATA_FUEL_GRID_ENTRY
+    return fuel_grid
+
+
+def fuel_type_codes_from_grid(fuel: np.ndarray, nodata_value: Optional[float] = None) -> np.ndarray:
     """Convert an SFMS fuel raster into the fuel-type codes used by CFFDRS.
 
     Every recognized classification, including the non-fuel and water classes, receives its
@@ -74,16 +140,4 @@ def fuel_type_codes_from_grid(fuel: np.ndarray) -> np.ndarray:
     The returned array has the same shape as ``fuel`` and uses the ``int64`` data type. A
     ``ValueError`` is raised if the source contains a fractional or unknown classification.
     """
-    known_values = set(FUEL_TYPES_BY_GRID_VALUE) | set(NON_COMBUSTIBLE_FUEL_VALUES)
-    unexpected_values = _integer_fuel_values(fuel) - known_values
-    if unexpected_values:
-        raise ValueError(
-            f"Fuel raster contains unsupported classifications: {sorted(unexpected_values)}"
-        )
-
-    fuel_type_codes = np.full(fuel.shape, NODATA_FUEL_TYPE_CODE, dtype=np.int64)
-    for grid_value, fuel_type in FUEL_TYPES_BY_GRID_VALUE.items():
-        fuel_type_codes[fuel == grid_value] = FUEL_TYPE_CODES[fuel_type.value]
-    for grid_value, fuel_type in CFFDRS_NON_FUEL_TYPES_BY_GRID_VALUE.items():
-        fuel_type_codes[fuel == grid_value] = FUEL_TYPE_CODES[fuel_type]
-    return fuel_type_codes
+    return lookup_fuel_grid(fuel, nodata_value)["fuel_type_code"]
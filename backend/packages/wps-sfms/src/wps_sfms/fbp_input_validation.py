@@ -2,12 +2,13 @@
 
 import numpy as np
 
-from wps_sfms.fbp_fuel_types import PERCENT_CONIFER_GRID_VALUES
 
+def validate_percent_conifer(fuel_grid: np.ndarray, percent_conifer: np.ndarray) -> None:
+    """Require percent conifer to be present and within range on M1/M2 pixels.
 
-def validate_percent_conifer(fuel: np.ndarray, percent_conifer: np.ndarray) -> None:
-    """Require percent conifer to be present and within range on M1/M2 pixels."""
-    mixedwood_mask = np.isin(fuel, tuple(PERCENT_CONIFER_GRID_VALUES))
+    ``fuel_grid`` is the fuel raster looked up with ``wps_sfms.fbp_fuel_types.lookup_fuel_grid``.
+    """
+    mixedwood_mask = fuel_grid["percent_conifer"]
     invalid = mixedwood_mask & (
         ~np.isfinite(percent_conifer) | (percent_conifer < 0) | (percent_conifer > 100)
     )
@@ -1,14 +1,17 @@
 """Raster processor for Fire Behaviour Prediction surface fuel consumption."""
 
 import logging
+import os
+import tempfile
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from time import perf_counter
-from typing import Callable, ContextManager, Generator, List
+from typing import Callable, ContextManager, Generator, List, Optional
 
 import numpy as np
 from cffdrs_vec.fbp import vectorized_surface_fuel_consumption
+from osgeo import gdal
 from wps_shared.geospatial.geospatial import rasters_match
 from wps_shared.geospatial.wps_dataset import WPSDataset
 from wps_shared.utils.s3 import gdal_s3_context
@@ -17,14 +20,13 @@ from wps_shared.utils.s3_client import S3Client
 from wps_sfms.fbp_fuel_types import (
     GRASS_FUEL_LOAD,
     NODATA_FUEL_TYPE_CODE,
-    NON_COMBUSTIBLE_FUEL_VALUES,
-    fuel_type_codes_from_grid,
+    lookup_fuel_grid,
 )
 from wps_sfms.fbp_input_validation import validate_percent_conifer
 from wps_sfms.interpolation.common import SFMS_NO_DATA
-from wps_sfms.publish import publish_dataset
+from wps_sfms.publish import publish_geotiff
 from wps_sfms.raster_inputs import SurfaceFuelConsumptionInputs
-from wps_sfms.raster_output import create_masked_output_dataset
+from wps_sfms.raster_output import create_masked_output_geotiff, iter_row_windows
 
 logger = logging.getLogger(__name__)
 
@@ -45,28 +47,50 @@ class SurfaceFuelConsumptionDatasets:
     percent_conifer: WPSDataset
 
 
+def _read_window(dataset: WPSDataset, row_offset: int, rows: int) -> np.ndarray:
+    """Read a window of rows with source nodata replaced by nan."""
+    band: gdal.Band = dataset.as_gdal_ds().GetRasterBand(1)
+    values = band.ReadAsArray(0, row_offset, band.XSize, rows)
+    if not np.issubdtype(values.dtype, np.floating):
+        values = values.astype(np.float64)
+    nodata_value = band.GetNoDataValue()
+    if nodata_value is not None:
+        values[values == nodata_value] = np.nan
+    return values
+
+
+def _read_fuel_grid_window(dataset: WPSDataset, row_offset: int, rows: int) -> np.ndarray:
+    """Read a window of fuel classifications in the raster's native dtype and look them up."""
+    band: gdal.Band = dataset.as_gdal_ds().GetRasterBand(1)
+    fuel = band.ReadAsArray(0, row_offset, band.XSize, rows)
+    return lookup_fuel_grid(fuel, band.GetNoDataValue())
+
+
 def calculate_surface_fuel_consumption(
     datasets: SurfaceFuelConsumptionDatasets,
+    row_offset: int = 0,
+    rows: Optional[int] = None,
 ) -> SurfaceFuelConsumptionResult:
-    """Calculate SFC with zero for recognized non-fuel pixels."""
-    fuel, _ = datasets.fuel.replace_nodata_with(np.nan)
-    ffmc, _ = datasets.ffmc.replace_nodata_with(np.nan)
-    bui, _ = datasets.bui.replace_nodata_with(np.nan)
-    percent_conifer, _ = datasets.percent_conifer.replace_nodata_with(np.nan)
-
-    fuel_type_codes = fuel_type_codes_from_grid(fuel)
-    validate_percent_conifer(fuel, percent_conifer)
-
-    non_combustible_mask = np.isin(fuel, tuple(NON_COMBUSTIBLE_FUEL_VALUES))
+    """Calculate SFC with zero for recognized non-fuel pixels, for a window of rows or the whole grid."""
+    if rows is None:
+        rows = datasets.fuel.as_gdal_ds().RasterYSize - row_offset
+    fuel_grid = _read_fuel_grid_window(datasets.fuel, row_offset, rows)
+    ffmc = _read_window(datasets.ffmc, row_offset, rows)
+    bui = _read_window(datasets.bui, row_offset, rows)
+    percent_conifer = _read_window(datasets.percent_conifer, row_offset, rows)
+
+    validate_percent_conifer(fuel_grid, percent_conifer)
+
+    fuel_type_codes = fuel_grid["fuel_type_code"]
+    non_combustible_mask = fuel_grid["non_combustible"]
     calculation_mask = (
         ~non_combustible_mask
         & (fuel_type_codes != NODATA_FUEL_TYPE_CODE)
         & np.isfinite(ffmc)
         & np.isfinite(bui)
     )
-    output = np.full(fuel.shape, SFMS_NO_DATA, dtype=np.float32)
+    output = np.full(fuel_grid.shape, SFMS_NO_DATA, dtype=np.float32)
     if np.any(calculation_mask):
-        start = perf_counter()
         calculated = vectorized_surface_fuel_consumption(
             fuel_type_codes[calculation_mask],
             ffmc[calculation_mask],
@@ -74,7 +98,6 @@ def calculate_surface_fuel_consumption(
             percent_conifer[calculation_mask],
             GRASS_FUEL_LOAD,
         )
-        logger.info("%f seconds to calculate vectorized SFC", perf_counter() - start)
         output[calculation_mask] = np.where(np.isfinite(calculated), calculated, SFMS_NO_DATA)
 
     # cffdrs clamps to a 0.000001 floor, so set recognized non-fuel pixels to exact zero.
@@ -155,23 +178,29 @@ class SurfaceFuelConsumptionProcessor:
                 self.datetime_to_process.date(),
             )
 
-            with self._open_datasets(input_dataset_context, inputs) as datasets:
+            with (
+                self._open_datasets(input_dataset_context, inputs) as datasets,
+                tempfile.TemporaryDirectory() as tmp_dir,
+            ):
                 self._validate_grids(datasets, inputs)
-                result = calculate_surface_fuel_consumption(datasets)
-
-                with create_masked_output_dataset(
-                    result.values,
-                    datasets.fuel,
-                    result.nodata_value,
-                ) as output_ds:
-                    output_band = output_ds.as_gdal_ds().GetRasterBand(1)
-                    output_band.SetDescription("surface_fuel_consumption")
-                    output_band.SetUnitType("kg/m2")
-                    published = await publish_dataset(
-                        s3_client=s3_client,
-                        dataset=output_ds,
-                        output_key=inputs.output_key,
-                    )
+                output_path = os.path.join(tmp_dir, os.path.basename(inputs.output_key))
+
+                start = perf_counter()
+                with create_masked_output_geotiff(
+                    output_path, datasets.fuel, SFMS_NO_DATA
+                ) as output:
+                    output.band.SetDescription("surface_fuel_consumption")
+                    output.band.SetUnitType("kg/m2")
+                    for row_offset, rows in iter_row_windows(datasets.fuel):
+                        result = calculate_surface_fuel_consumption(datasets, row_offset, rows)
+                        output.write(result.values, row_offset)
+                logger.info("%f seconds to calculate SFC", perf_counter() - start)
+
+                published = await publish_geotiff(
+                    s3_client=s3_client,
+                    geotiff_path=output_path,
+                    output_key=inputs.output_key,
+                )
 
             logger.info(
                 "Stored SFC %s: %s (COG: %s)",
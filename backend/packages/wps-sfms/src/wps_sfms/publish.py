@@ -33,21 +33,31 @@ async def publish_dataset(
 ) -> PublishedRaster:
     """Upload a GeoTIFF to object storage and optionally generate a matching web COG."""
 
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = os.path.join(tmp_dir, os.path.basename(str(output_key)))
+        dataset.export_to_geotiff(tmp_path)
+        return await publish_geotiff(s3_client, tmp_path, output_key, generate_cog)
+
+
+async def publish_geotiff(
+    s3_client: S3Client,
+    geotiff_path: str,
+    output_key: S3Key | str,
+    generate_cog: bool = True,
+) -> PublishedRaster:
+    """Upload a GeoTIFF that is already written to disk and optionally generate a matching web COG."""
+
     raster_addresser = SFMSNGRasterAddresser()
     s3_output_key = S3Key(str(output_key))
     cog_key = raster_addresser.get_cog_key(s3_output_key) if generate_cog else None
 
     set_s3_gdal_config()
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = os.path.join(tmp_dir, os.path.basename(s3_output_key))
-        dataset.export_to_geotiff(tmp_path)
-
-        logger.info("Writing raster to S3: %s", s3_output_key)
-        async with aiofiles.open(tmp_path, "rb") as f:
-            await s3_client.put_object(key=s3_output_key, body=await f.read())
+    logger.info("Writing raster to S3: %s", s3_output_key)
+    async with aiofiles.open(geotiff_path, "rb") as f:
+        await s3_client.put_object(key=s3_output_key, body=await f.read())
 
-        if cog_key is not None:
-            generate_web_optimized_cog(input_path=tmp_path, output_path=cog_key)
+    if cog_key is not None:
+        generate_web_optimized_cog(input_path=geotiff_path, output_path=cog_key)
 
     return PublishedRaster(output_key=s3_output_key, cog_key=cog_key)
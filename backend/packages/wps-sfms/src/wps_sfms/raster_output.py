@@ -1,9 +1,11 @@
 """Shared construction of final masked SFMS calculation rasters."""
 
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Iterator
 
 import numpy as np
+from osgeo import gdal
+from wps_shared.geospatial.geospatial import rasters_match
 from wps_shared.geospatial.wps_dataset import WPSDataset
 
 from wps_sfms.sfmsng_raster_addresser import SFMSNGRasterAddresser
@@ -44,3 +46,79 @@ def create_masked_output_dataset(
         nodata_value,
     ) as output_ds:
         yield output_ds
+
+
+# Approximate number of rows calculated and written at a time by block-wise calculations.
+OUTPUT_BLOCK_ROWS = 512
+OUTPUT_GEOTIFF_CREATION_OPTIONS = ["TILED=YES", "COMPRESS=LZW", "BIGTIFF=IF_SAFER"]
+
+
+def iter_row_windows(reference: WPSDataset, block_rows: int = OUTPUT_BLOCK_ROWS) -> Iterator[tuple[int, int]]:
+    """
+    Yield (row offset, row count) windows covering the reference grid, rounded to whole blocks of the
+    reference band so each block is read once.
+    """
+    band: gdal.Band = reference.as_gdal_ds().GetRasterBand(1)
+    _, block_y_size = band.GetBlockSize()
+    rows_per_window = max(block_rows // block_y_size, 1) * block_y_size
+    for row_offset in range(0, band.YSize, rows_per_window):
+        yield row_offset, min(rows_per_window, band.YSize - row_offset)
+
+
+class MaskedOutputWriter:
+    """Writes windows of an output raster with the BC mask enforced as the final value boundary."""
+
+    def __init__(self, dataset: gdal.Dataset, mask: WPSDataset, nodata_value: float):
+        self.band: gdal.Band = dataset.GetRasterBand(1)
+        self._mask_band: gdal.Band = mask.as_gdal_ds().GetRasterBand(1)
+        self._nodata_value = nodata_value
+
+    def write(self, values: np.ndarray, row_offset: int) -> None:
+        rows, columns = values.shape
+        if columns != self.band.XSize or row_offset + rows > self.band.YSize:
+            raise ValueError(
+                "Output window does not fit the reference grid: "
+                f"{values.shape} at row {row_offset} vs {(self.band.YSize, self.band.XSize)}"
+            )
+        mask_data = self._mask_band.ReadAsArray(0, row_offset, columns, rows)
+        valid_mask = mask_data != 0
+        mask_nodata = self._mask_band.GetNoDataValue()
+        if mask_nodata is not None:
+            valid_mask &= mask_data != mask_nodata
+
+        # cast before masking so GDAL does not convert Float64 nodata to Float32 inconsistently
+        masked_values = values.astype(np.float32, copy=True)
+        masked_values[~valid_mask] = self._nodata_value
+        self.band.WriteArray(masked_values, 0, row_offset)
+
+
+@contextmanager
+def create_masked_output_geotiff(
+    output_path: str,
+    reference: WPSDataset,
+    nodata_value: float,
+) -> Generator[MaskedOutputWriter, None, None]:
+    """
+    Create a tiled Float32 GeoTIFF on the reference grid for writing window by window, so outputs never
+    need to be held in memory whole. The file is complete once the context exits.
+    """
+    reference_ds = reference.as_gdal_ds()
+    with open_bc_mask_dataset() as mask:
+        if not rasters_match(reference_ds, mask.as_gdal_ds()):
+            raise ValueError("Mask grid does not match reference grid")
+
+        output_ds: gdal.Dataset = gdal.GetDriverByName("GTiff").Create(
+            output_path,
+            reference_ds.RasterXSize,
+            reference_ds.RasterYSize,
+            1,
+            gdal.GDT_Float32,
+            options=OUTPUT_GEOTIFF_CREATION_OPTIONS,
+        )
+        output_ds.SetGeoTransform(reference_ds.GetGeoTransform())
+        output_ds.SetProjection(reference_ds.GetProjection())
+        output_ds.GetRasterBand(1).SetNoDataValue(nodata_value)
+        try:
+            yield MaskedOutputWriter(output_ds, mask, nodata_value)
+        finally:
+            output_ds.Close()
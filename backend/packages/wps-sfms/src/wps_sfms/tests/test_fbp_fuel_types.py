@@ -11,6 +11,7 @@ from wps_sfms.fbp_fuel_types import (
     PERCENT_CONIFER_GRID_VALUES,
     SEASONAL_FUEL_TYPE_OVERRIDES,
     fuel_type_codes_from_grid,
+    lookup_fuel_grid,
 )
 
 
@@ -85,3 +86,49 @@ def test_fuel_type_codes_from_grid_maps_combustible_non_fuel_and_nodata_cells():
 def test_fuel_type_codes_from_grid_rejects_unexpected_values(fuel: np.ndarray, match: str):
     with pytest.raises(ValueError, match=match):
         fuel_type_codes_from_grid(fuel)
+
+
+def test_lookup_fuel_grid_gathers_integer_rasters_in_native_dtype():
+    fuel = np.array([[1, 14, 99, 102, 0]], dtype=np.uint8)
+
+    fuel_grid = lookup_fuel_grid(fuel, nodata_value=0)
+
+    np.testing.assert_array_equal(
+        fuel_grid["fuel_type_code"],
+        [
+            [
+                FUEL_TYPE_CODES["C1"],
+                FUEL_TYPE_CODES["M1"],
+                FUEL_TYPE_CODES["NF"],
+                FUEL_TYPE_CODES["WA"],
+                NODATA_FUEL_TYPE_CODE,
+            ]
+        ],
+    )
+    np.testing.assert_array_equal(fuel_grid["non_combustible"], [[False, False, True, True, False]])
+    np.testing.assert_array_equal(fuel_grid["percent_conifer"], [[False, True, False, False, False]])
+
+
+def test_lookup_fuel_grid_treats_float_nodata_value_as_missing():
+    fuel = np.array([[2, -9999]], dtype=np.float32)
+
+    fuel_grid = lookup_fuel_grid(fuel, nodata_value=-9999.0)
+
+    np.testing.assert_array_equal(
+        fuel_grid["fuel_type_code"], [[FUEL_TYPE_CODES["C2"], NODATA_FUEL_TYPE_CODE]]
+    )
+
+
+@pytest.mark.parametrize(
+    "fuel",
+    [
+        np.array([[0]], dtype=np.uint8),
+        np.array([[103]], dtype=np.uint8),
+        np.array([[255]], dtype=np.uint8),
+        np.array([[-5]], dtype=np.int16),
+        np.array([[1000]], dtype=np.int16),
+    ],
+)
+def test_lookup_fuel_grid_rejects_unknown_integer_values(fuel: np.ndarray):
+    with pytest.raises(ValueError, match="unsupported classifications"):
+        lookup_fuel_grid(fuel)
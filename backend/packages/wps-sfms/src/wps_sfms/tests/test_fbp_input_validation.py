@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from wps_sfms.fbp_fuel_types import lookup_fuel_grid
 from wps_sfms.fbp_input_validation import validate_percent_conifer
 
 
@@ -10,7 +11,7 @@ def test_invalid_mixedwood_percent_conifer_fails(percent_conifer: float):
     values = np.array([[percent_conifer]], dtype=np.float32)
 
     with pytest.raises(ValueError, match="missing or out-of-range"):
-        validate_percent_conifer(fuel, values)
+        validate_percent_conifer(lookup_fuel_grid(fuel), values)
 
 
 @pytest.mark.parametrize("percent_conifer", [0, 100])
@@ -18,11 +19,11 @@ def test_mixedwood_percent_conifer_accepts_range_boundaries(percent_conifer: flo
     fuel = np.array([[14]], dtype=np.float32)
     values = np.array([[percent_conifer]], dtype=np.float32)
 
-    validate_percent_conifer(fuel, values)
+    validate_percent_conifer(lookup_fuel_grid(fuel), values)
 
 
 def test_invalid_percent_conifer_is_ignored_outside_mixedwood():
     fuel = np.array([[1, 99, 102]], dtype=np.float32)
     values = np.array([[np.nan, -1, 101]], dtype=np.float32)
 
-    validate_percent_conifer(fuel, values)
+    validate_percent_conifer(lookup_fuel_grid(fuel), values)
@@ -2,11 +2,16 @@ from contextlib import contextmanager
 
 import numpy as np
 import pytest
+from osgeo import gdal
 from wps_shared.geospatial.wps_dataset import WPSDataset
 from wps_shared.tests.geospatial.dataset_common import create_test_dataset
 
 from wps_sfms.interpolation.common import SFMS_NO_DATA
-from wps_sfms.raster_output import create_masked_output_dataset
+from wps_sfms.raster_output import (
+    create_masked_output_dataset,
+    create_masked_output_geotiff,
+    iter_row_windows,
+)
 
 EXTENT = (-121.0, -119.0, 48.0, 50.0)
 
@@ -82,3 +87,34 @@ def test_rejects_mask_grid_that_does_not_match_reference(mocker):
             SFMS_NO_DATA,
         ):
             pass
+
+
+def test_masked_output_geotiff_is_written_window_by_window(mocker):
+    reference = make_dataset(np.ones((3, 2), dtype=np.float32))
+    mask = make_dataset(np.array([[1, 0], [1, 1], [SFMS_NO_DATA, 1]], dtype=np.float32))
+    patch_mask_dataset(mocker, mask)
+    output_path = "/vsimem/test_masked_output.tif"
+
+    with create_masked_output_geotiff(output_path, reference, SFMS_NO_DATA) as output:
+        for row_offset, rows in iter_row_windows(reference, block_rows=1):
+            output.write(np.full((rows, 2), row_offset + 1, dtype=np.float64), row_offset)
+
+    with gdal.Open(output_path) as output_ds:
+        band = output_ds.GetRasterBand(1)
+        assert band.GetNoDataValue() == pytest.approx(SFMS_NO_DATA)
+        np.testing.assert_array_equal(
+            band.ReadAsArray(),
+            np.array([[1, SFMS_NO_DATA], [2, 2], [SFMS_NO_DATA, 3]], dtype=np.float32),
+        )
+    gdal.Unlink(output_path)
+
+
+def test_masked_output_geotiff_rejects_window_outside_reference_grid(mocker):
+    reference = make_dataset(np.ones((2, 2), dtype=np.float32))
+    patch_mask_dataset(mocker, make_dataset(np.ones((2, 2), dtype=np.float32)))
+    output_path = "/vsimem/test_masked_output_outside.tif"
+
+    with pytest.raises(ValueError, match="Output window does not fit the reference grid"):
+        with create_masked_output_geotiff(output_path, reference, SFMS_NO_DATA) as output:
+            output.write(np.ones((2, 2), dtype=np.float32), 1)
+    gdal.Unlink(output_path)
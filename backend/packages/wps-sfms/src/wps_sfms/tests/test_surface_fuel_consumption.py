@@ -23,9 +23,11 @@ TEST_DATETIME = datetime(2024, 7, 4, 20, tzinfo=timezone.utc)
 NODATA = -9999.0
 
 
-def make_dataset(path: str, values: np.ndarray, nodata: float = NODATA) -> WPSDataset:
+def make_dataset(
+    path: str, values: np.ndarray, nodata: float = NODATA, data_type: int = gdal.GDT_Float32
+) -> WPSDataset:
     rows, columns = values.shape
-    dataset = gdal.GetDriverByName("MEM").Create("", columns, rows, 1, gdal.GDT_Float32)
+    dataset = gdal.GetDriverByName("MEM").Create("", columns, rows, 1, data_type)
     dataset.SetGeoTransform((0, 2_000, 0, 10_000, 0, -2_000))
     spatial_reference = osr.SpatialReference()
     spatial_reference.ImportFromEPSG(3005)
@@ -111,6 +113,26 @@ def test_non_fuel_becomes_zero_and_source_nodata_remains_sfms_nodata():
     np.testing.assert_array_equal(result.values, np.array([[0, 0, SFMS_NO_DATA]], dtype=np.float32))
 
 
+def test_integer_fuel_raster_is_calculated_in_its_native_dtype():
+    float_datasets = make_datasets(np.array([[1, 14, 99, NODATA]], dtype=np.float32))
+    byte_datasets = SurfaceFuelConsumptionDatasets(
+        fuel=make_dataset(
+            "fuel.tif", np.array([[1, 14, 99, 0]], dtype=np.uint8), 0, gdal.GDT_Byte
+        ),
+        ffmc=float_datasets.ffmc,
+        bui=float_datasets.bui,
+        percent_conifer=make_dataset(
+            "percent_conifer.tif", np.array([[NODATA, 60, NODATA, NODATA]], dtype=np.float32)
+        ),
+    )
+
+    result = calculate_surface_fuel_consumption(byte_datasets)
+
+    assert result.values[0, 0] > 0
+    assert result.values[0, 1] > 0
+    np.testing.assert_array_equal(result.values[0, 2:], [0, SFMS_NO_DATA])
+
+
 def test_non_fuel_becomes_zero_when_weather_is_nodata():
     datasets = make_datasets(
         np.array([[99, 102]], dtype=np.float32),
@@ -135,6 +157,21 @@ def test_weather_nodata_propagates_to_output():
     np.testing.assert_array_equal(result.values, np.full((1, 2), SFMS_NO_DATA, dtype=np.float32))
 
 
+def test_calculation_of_a_window_matches_the_whole_grid():
+    datasets = make_datasets(
+        np.array([[1, 2], [99, NODATA], [3, 14]], dtype=np.float32),
+        ffmc=np.array([[90, 85], [90, 90], [NODATA, 88]], dtype=np.float32),
+        percent_conifer=np.array([[NODATA, NODATA], [NODATA, NODATA], [NODATA, 60]], dtype=np.float32),
+    )
+
+    whole_grid = calculate_surface_fuel_consumption(datasets)
+    windows = [calculate_surface_fuel_consumption(datasets, row, 1) for row in range(3)]
+
+    np.testing.assert_array_equal(
+        np.concatenate([window.values for window in windows]), whole_grid.values
+    )
+
+
 def test_percent_conifer_nodata_is_ignored_outside_mixedwood():
     datasets = make_datasets(np.array([[1]], dtype=np.float32))
 
@@ -198,19 +235,20 @@ async def test_processor_publishes_masked_output_with_metadata(
     captured = {}
     output_mask.as_gdal_ds().GetRasterBand(1).WriteArray(np.array([[0]], dtype=np.float32))
 
-    async def capture_publish(*, dataset, output_key, **_kwargs):
-        band = dataset.as_gdal_ds().GetRasterBand(1)
-        captured["output_key"] = output_key
-        captured["description"] = band.GetDescription()
-        captured["unit"] = band.GetUnitType()
-        captured["nodata"] = band.GetNoDataValue()
-        captured["value"] = band.ReadAsArray()[0, 0]
+    async def capture_publish(*, geotiff_path, output_key, **_kwargs):
+        with gdal.Open(geotiff_path) as dataset:
+            band = dataset.GetRasterBand(1)
+            captured["output_key"] = output_key
+            captured["description"] = band.GetDescription()
+            captured["unit"] = band.GetUnitType()
+            captured["nodata"] = band.GetNoDataValue()
+            captured["value"] = band.ReadAsArray()[0, 0]
         return SimpleNamespace(output_key=output_key, cog_key="sfc_cog.tif")
 
     s3_client = SimpleNamespace(all_objects_exist=AsyncMock(return_value=True))
     clear_cache = mocker.patch("wps_shared.utils.s3.gdal.VSICurlClearCache")
     mocker.patch(
-        "wps_sfms.processors.surface_fuel_consumption.publish_dataset",
+        "wps_sfms.processors.surface_fuel_consumption.publish_geotiff",
         side_effect=capture_publish,
     )
 
@@ -236,7 +274,7 @@ async def test_processor_publish_failure_propagates_and_clears_cache(mocker: Moc
     processor = SurfaceFuelConsumptionProcessor(TEST_DATETIME)
     input_context = make_dataset_context(datasets)
     mocker.patch(
-        "wps_sfms.processors.surface_fuel_consumption.publish_dataset",
+        "wps_sfms.processors.surface_fuel_consumption.publish_geotiff",
         new=AsyncMock(side_effect=RuntimeError("COG generation failed")),
     )
     clear_cache = mocker.patch("wps_shared.utils.s3.gdal.VSICurlClearCache")
@@ -256,7 +294,7 @@ async def test_processor_rejects_mismatched_grid(mocker: MockerFixture):
     input_context = make_dataset_context(datasets)
     mocker.patch("wps_sfms.processors.surface_fuel_consumption.rasters_match", return_value=False)
     publish = mocker.patch(
-        "wps_sfms.processors.surface_fuel_consumption.publish_dataset", new=AsyncMock()
+        "wps_sfms.processors.surface_fuel_consumption.publish_geotiff", new=AsyncMock()
     )
 
     with pytest.raises(ValueError, match="does not match the fuel grid"):
@@ -11,7 +11,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
 from wps_shared.db.models.auto_spatial_advisory import (
-    AdvisoryElevationStats,
     AdvisoryFuelStats,
     AdvisoryHFIPercentConifer,
     AdvisoryHFIWindSpeed,
@@ -569,8 +568,8 @@ async def get_high_hfi_area(
     return result.all()
 
 
-async def save_high_hfi_area(session: AsyncSession, high_hfi_area: HighHfiArea):
-    session.add(high_hfi_area)
+async def save_high_hfi_areas(session: AsyncSession, high_hfi_areas: List[HighHfiArea]):
+    session.add_all(high_hfi_areas)
 
 
 async def store_advisory_fuel_stats(
@@ -612,42 +611,6 @@ async def save_advisory_fuel_stats(
     session.add_all(advisory_fuel_stats)
 
 
-async def calculate_high_hfi_areas(
-    session: AsyncSession, run_type: RunType, run_datetime: datetime, for_date: date
-) -> List[Row]:
-    """
-    Given a 'run_parameters_id', which represents a unqiue combination of run_type, run_datetime
-    and for_date, individually sum the areas in each firezone with:
-        1. 4000 <= HFI < 10000 (aka 'advisory_area')
-        2. HFI >= 10000 (aka 'warn_area')
-    """
-    logger.info("starting high HFI by zone intersection query")
-    perf_start = perf_counter()
-
-    stmt = (
-        select(
-            Shape.id.label("shape_id"),
-            ClassifiedHfi.threshold.label("threshold"),
-            func.sum(ClassifiedHfi.geom.ST_Intersection(Shape.geom).ST_Area()).label("area"),
-        )
-        .join_from(Shape, ClassifiedHfi, ClassifiedHfi.geom.ST_Intersects(Shape.geom))
-        .where(ClassifiedHfi.run_type == run_type.value)
-        .where(ClassifiedHfi.run_datetime == run_datetime)
-        .where(ClassifiedHfi.for_date == for_date)
-        .group_by(Shape.id)
-        .group_by(ClassifiedHfi.threshold)
-    )
-
-    result = await session.execute(stmt)
-    all_high_hfi = result.all()
-    perf_end = perf_counter()
-    delta = perf_end - perf_start
-    logger.info(
-        "%f delta count before and after calculate high HFI by zone intersection query", delta
-    )
-    return all_high_hfi
-
-
 async def get_run_parameters_id(
     session: AsyncSession,
     run_type: RunType,
@@ -699,12 +662,6 @@ async def mark_run_parameter_complete(
     await session.execute(stmt)
 
 
-async def save_advisory_elevation_stats(
-    session: AsyncSession, advisory_elevation_stats: AdvisoryElevationStats
-):
-    session.add(advisory_elevation_stats)
-
-
 async def save_advisory_elevation_tpi_stats(
     session: AsyncSession, advisory_elevation_stats: List[AdvisoryTPIStats]
 ):
@@ -160,14 +160,25 @@ async def upsert_notification_settings(
     return True
 
 
-async def get_device_tokens_for_zone(session: AsyncSession, fire_shape_source_id: str) -> list[str]:
-    """Return active FCM tokens subscribed to the given fire_shape_source_id."""
+async def get_device_tokens_for_zones(
+    session: AsyncSession, fire_shape_source_ids: list[str]
+) -> dict[str, list[str]]:
+    """Return active FCM tokens subscribed to each of the given fire_shape_source_ids, in one query.
+
+    Zones without any active subscribers are not included in the result.
+    """
+    if not fire_shape_source_ids:
+        return {}
     result = await session.execute(
-        select(DeviceToken.token)
+        select(NotificationSettings.fire_shape_source_id, DeviceToken.token)
         .join(NotificationSettings, NotificationSettings.device_token_id == DeviceToken.id)
         .where(
-            NotificationSettings.fire_shape_source_id == fire_shape_source_id,
+            NotificationSettings.fire_shape_source_id.in_(fire_shape_source_ids),
             DeviceToken.is_active == True,
         )
+        .order_by(NotificationSettings.fire_shape_source_id, DeviceToken.id)
     )
-    return list(result.scalars().all())
+    tokens_by_zone: dict[str, list[str]] = {}
+    for fire_shape_source_id, token in result.all():
+        tokens_by_zone.setdefault(fire_shape_source_id, []).append(token)
+    return tokens_by_zone
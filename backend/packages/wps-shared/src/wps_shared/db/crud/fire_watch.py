@@ -105,18 +105,16 @@ async def get_all_prescription_status(session: AsyncSession) -> dict[str, int]:
     return {name: id for id, name in result.all()}
 
 
-async def get_fire_watch_weather_by_fire_watch_id_and_model_run(
-    session: AsyncSession, fire_watch_id: int, prediction_model_run_timestamp_id: int
+async def get_fire_watch_weather_by_fire_watch_ids_and_model_run(
+    session: AsyncSession, fire_watch_ids: list[int], prediction_model_run_timestamp_id: int
 ):
     stmt = select(FireWatchWeather).where(
-        FireWatchWeather.fire_watch_id == fire_watch_id,
+        FireWatchWeather.fire_watch_id.in_(fire_watch_ids),
         FireWatchWeather.prediction_model_run_timestamp_id == prediction_model_run_timestamp_id,
     )
 
     result = await session.execute(stmt)
-    existing_record = result.scalars().all()
-
-    return existing_record
+    return result.scalars().all()
 
 
 async def get_all_fire_watch_weather_with_prescription_status(
@@ -2,7 +2,7 @@
 
 import logging
 import datetime
-from typing import List, Union
+from typing import List, Set, Tuple, Union
 from sqlalchemy import and_, extract, func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -98,21 +98,36 @@ def delete_model_run_predictions(session: Session, older_than: datetime):
     ).delete()
 
 
-def get_station_model_predictions_order_by_prediction_timestamp(
+def get_station_model_prediction_summaries(
     session: Session,
     station_codes: List,
     model: ModelEnum,
     start_date: datetime.datetime,
     end_date: datetime.datetime,
-) -> List[Union[WeatherStationModelPrediction, PredictionModel]]:
-    """Fetch model predictions for given stations within given time range ordered by station code
-    and prediction timestamp.
+):
+    """Fetch the 5th, 50th and 90th percentile of temperature and relative humidity for given
+    stations within a given time range, across all the model runs that predicted each timestamp,
+    ordered by station code and prediction timestamp.
 
-    This is useful if you're interested in seeing all the different predictions regardles of
-    model run.
+    The percentiles are calculated by the database (percentile_cont interpolates linearly, same as
+    numpy.percentile), so only one row per station and timestamp is returned.
     """
+    # Missing and zero values have never been included in the summaries.
+    tmp_tgl_2 = func.nullif(WeatherStationModelPrediction.tmp_tgl_2, 0)
+    rh_tgl_2 = func.nullif(WeatherStationModelPrediction.rh_tgl_2, 0)
     query = (
-        session.query(WeatherStationModelPrediction, PredictionModel)
+        session.query(
+            WeatherStationModelPrediction.station_code,
+            WeatherStationModelPrediction.prediction_timestamp,
+            PredictionModel.name,
+            PredictionModel.abbreviation,
+            func.percentile_cont(0.05).within_group(tmp_tgl_2).label("tmp_tgl_2_5th"),
+            func.percentile_cont(0.5).within_group(tmp_tgl_2).label("tmp_tgl_2_median"),
+            func.percentile_cont(0.9).within_group(tmp_tgl_2).label("tmp_tgl_2_90th"),
+            func.percentile_cont(0.05).within_group(rh_tgl_2).label("rh_tgl_2_5th"),
+            func.percentile_cont(0.5).within_group(rh_tgl_2).label("rh_tgl_2_median"),
+            func.percentile_cont(0.9).within_group(rh_tgl_2).label("rh_tgl_2_90th"),
+        )
         .join(
             PredictionModelRunTimestamp,
             PredictionModelRunTimestamp.id
@@ -125,6 +140,13 @@ def get_station_model_predictions_order_by_prediction_timestamp(
         .filter(WeatherStationModelPrediction.prediction_timestamp >= start_date)
         .filter(WeatherStationModelPrediction.prediction_timestamp <= end_date)
         .filter(PredictionModel.abbreviation == model)
+        .group_by(
+            WeatherStationModelPrediction.station_code,
+            WeatherStationModelPrediction.prediction_timestamp,
+            PredictionModel.name,
+            PredictionModel.abbreviation,
+        )
+        .having(and_(func.count(tmp_tgl_2) > 0, func.count(rh_tgl_2) > 0))
         .order_by(WeatherStationModelPrediction.station_code)
         .order_by(WeatherStationModelPrediction.prediction_timestamp)
     )
@@ -164,46 +186,24 @@ def get_station_model_predictions(
     return query
 
 
-def get_latest_station_model_prediction_per_day(
+def get_latest_station_model_predictions_for_range(
     session: Session,
     station_codes: List[int],
     model: str,
-    day_start: datetime.datetime,
-    day_end: datetime.datetime,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
 ):
     """
-    All weather station model predictions for:
-     - a given day
+    The latest updated 20:00UTC weather station model prediction for:
+     - each day in the given range
      - a given model
      - each station in the given list
-    ordered by update_timestamp
-
-    This is done by joining the predictions on their runs,
-    that are filtered by the day and the 20:00UTC predictions.
+    ordered by prediction_timestamp and station_code.
 
-    In turn prediction runs are filtered via a join
-    on runs that are for the selected model.
+    Uses DISTINCT ON to pick the most recently updated prediction (i.e. the latest model run) for
+    each station and prediction timestamp over the whole range in a single query.
     """
-    subquery = (
-        session.query(
-            func.max(WeatherStationModelPrediction.prediction_timestamp).label("latest_prediction"),
-            WeatherStationModelPrediction.station_code,
-            func.date(WeatherStationModelPrediction.prediction_timestamp).label("unique_day"),
-        )
-        .filter(
-            WeatherStationModelPrediction.station_code.in_(station_codes),
-            WeatherStationModelPrediction.prediction_timestamp >= day_start,
-            WeatherStationModelPrediction.prediction_timestamp <= day_end,
-            func.date_part("hour", WeatherStationModelPrediction.prediction_timestamp) == 20,
-        )
-        .group_by(
-            WeatherStationModelPrediction.station_code,
-            func.date(WeatherStationModelPrediction.prediction_timestamp).label("unique_day"),
-        )
-        .subquery("latest")
-    )
-
-    result = (
+    latest = (
         session.query(
             WeatherStationModelPrediction.id,
             WeatherStationModelPrediction.prediction_timestamp,
@@ -226,47 +226,47 @@ def get_latest_station_model_prediction_per_day(
         .join(
             PredictionModel, PredictionModelRunTimestamp.prediction_model_id == PredictionModel.id
         )
-        .join(
-            subquery,
-            and_(
-                WeatherStationModelPrediction.prediction_timestamp == subquery.c.latest_prediction,
-                WeatherStationModelPrediction.station_code == subquery.c.station_code,
-            ),
+        .filter(
+            WeatherStationModelPrediction.station_code.in_(station_codes),
+            WeatherStationModelPrediction.prediction_timestamp >= start_time,
+            WeatherStationModelPrediction.prediction_timestamp <= end_time,
+            func.date_part("hour", WeatherStationModelPrediction.prediction_timestamp) == 20,
+            PredictionModel.abbreviation == model,
         )
-        .filter(PredictionModel.abbreviation == model)
-        .order_by(WeatherStationModelPrediction.update_date.desc())
+        .distinct(
+            WeatherStationModelPrediction.station_code,
+            WeatherStationModelPrediction.prediction_timestamp,
+        )
+        .order_by(
+            WeatherStationModelPrediction.station_code,
+            WeatherStationModelPrediction.prediction_timestamp,
+            WeatherStationModelPrediction.update_date.desc(),
+        )
+        .subquery()
+    )
+    return (
+        session.query(latest)
+        .order_by(latest.c.prediction_timestamp, latest.c.station_code)
+        .yield_per(1000)
     )
-    return result
 
 
-def get_latest_station_prediction(
+def get_latest_station_predictions_for_range(
     session: Session,
     station_codes: List[int],
-    day_start: datetime.datetime,
-    day_end: datetime.datetime,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
 ):
-    logger.info("Getting data from weather_station_model_predictions.")
+    """
+    The latest updated 20:00UTC weather station prediction for each model, station and day in the
+    given range, ordered by prediction_timestamp, station_code and model.
 
-    latest_predictions_subquery = (
-        session.query(
-            func.max(WeatherStationModelPrediction.prediction_timestamp).label("latest_prediction"),
-            WeatherStationModelPrediction.station_code,
-            func.date(WeatherStationModelPrediction.prediction_timestamp).label("unique_day"),
-        )
-        .filter(
-            extract("hour", WeatherStationModelPrediction.prediction_timestamp) == 20,
-            WeatherStationModelPrediction.station_code.in_(station_codes),
-            WeatherStationModelPrediction.prediction_timestamp >= day_start,
-            WeatherStationModelPrediction.prediction_timestamp <= day_end,
-        )
-        .group_by(
-            WeatherStationModelPrediction.station_code,
-            func.date(WeatherStationModelPrediction.prediction_timestamp),
-        )
-        .subquery()
-    )
+    Uses DISTINCT ON to pick the most recently updated prediction (i.e. the latest model run) for
+    each station, model and prediction timestamp over the whole range in a single query.
+    """
+    logger.info("Getting data from weather_station_model_predictions.")
 
-    result = (
+    latest = (
         session.query(
             WeatherStationModelPrediction.prediction_timestamp,
             PredictionModel.abbreviation,
@@ -291,21 +291,30 @@ def get_latest_station_prediction(
         .join(
             PredictionModel, PredictionModel.id == PredictionModelRunTimestamp.prediction_model_id
         )
-        .join(
-            latest_predictions_subquery,
-            (
-                WeatherStationModelPrediction.prediction_timestamp
-                == latest_predictions_subquery.c.latest_prediction
-            )
-            & (
-                WeatherStationModelPrediction.station_code
-                == latest_predictions_subquery.c.station_code
-            ),
+        .filter(
+            extract("hour", WeatherStationModelPrediction.prediction_timestamp) == 20,
+            WeatherStationModelPrediction.station_code.in_(station_codes),
+            WeatherStationModelPrediction.prediction_timestamp >= start_time,
+            WeatherStationModelPrediction.prediction_timestamp <= end_time,
+        )
+        .distinct(
+            WeatherStationModelPrediction.station_code,
+            PredictionModel.abbreviation,
+            WeatherStationModelPrediction.prediction_timestamp,
         )
-        .order_by(WeatherStationModelPrediction.update_date.desc())
+        .order_by(
+            WeatherStationModelPrediction.station_code,
+            PredictionModel.abbreviation,
+            WeatherStationModelPrediction.prediction_timestamp,
+            WeatherStationModelPrediction.update_date.desc(),
+        )
+        .subquery()
+    )
+    return (
+        session.query(latest)
+        .order_by(latest.c.prediction_timestamp, latest.c.station_code, latest.c.abbreviation)
+        .yield_per(1000)
     )
-
-    return result
 
 
 async def get_latest_daily_model_prediction_for_stations(
@@ -419,18 +428,26 @@ def get_processed_file_record(session: Session, url: str) -> ProcessedModelRunUr
     return processed_file
 
 
-def get_saved_model_run_for_sfms(session: Session, url: str) -> SavedModelRunForSFMSUrl:
-    """Get record corresponding to a processed model run url for sfms"""
-    return session.query(SavedModelRunForSFMSUrl).filter(SavedModelRunForSFMSUrl.url == url).first()
+def get_saved_model_run_for_sfms_urls(session: Session, urls: List[str]) -> Set[str]:
+    """Get the subset of model run urls for sfms that have already been processed"""
+    if not urls:
+        return set()
+    query = session.query(SavedModelRunForSFMSUrl.url).filter(SavedModelRunForSFMSUrl.url.in_(urls))
+    return {row.url for row in query}
 
 
-def create_saved_model_run_for_sfms_url(session: Session, url: str, key: str):
-    """Create a record of a model run url that has been downloaded and stored in S3."""
+def create_saved_model_run_for_sfms_urls(session: Session, saved_urls: List[Tuple[str, str]]):
+    """Create records of model run urls that have been downloaded and stored in S3.
+
+    :param saved_urls: (url, s3 key) pairs
+    """
+    if not saved_urls:
+        return
     now = get_utc_now()
-    saved_model_run_for_sfms_url = SavedModelRunForSFMSUrl(
-        url=url, create_date=now, update_date=now, s3_key=key
+    session.add_all(
+        SavedModelRunForSFMSUrl(url=url, create_date=now, update_date=now, s3_key=key)
+        for url, key in saved_urls
     )
-    session.add(saved_model_run_for_sfms_url)
     session.commit()
 
 
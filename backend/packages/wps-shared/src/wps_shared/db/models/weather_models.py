@@ -250,6 +250,13 @@ class WeatherStationModelPrediction(Base):
     __tablename__ = "weather_station_model_predictions"
     __table_args__ = (
         UniqueConstraint("station_code", "prediction_model_run_timestamp_id", "prediction_timestamp"),
+        # Supports picking the latest updated prediction per station and prediction timestamp over a date range.
+        Index(
+            "ix_weather_station_model_predictions_station_timestamp_update",
+            "station_code",
+            "prediction_timestamp",
+            "update_date",
+        ),
         {"comment": "The interpolated weather values for a weather station, weather date, and model run"},
     )
 
@@ -1,6 +1,10 @@
+import uuid
+from dataclasses import dataclass
 from enum import Enum
-from typing import Final, Tuple
+from functools import lru_cache
+from typing import Final, NamedTuple, Optional, Tuple
 
+import numpy as np
 from affine import Affine
 from osgeo import gdal, ogr, osr
 from pyproj import CRS, Transformer
@@ -67,6 +71,7 @@ def warp_to_match_raster(
     ds_to_match: gdal.Dataset,
     output_path: str,
     resample_method: GDALResamplingMethod = GDALResamplingMethod.NEAREST_NEIGHBOUR,
+    output_format: Optional[str] = None,
 ) -> gdal.Dataset:
     """
     Warp the source dataset to match the extent, pixel size, and projection of the other dataset.
@@ -75,6 +80,8 @@ def warp_to_match_raster(
     :param ds_to_match: the reference dataset raster to match the source against
     :param output_path: output path of the resulting raster
     :param resample_method: gdal resampling algorithm
+    :param output_format: gdal driver of the output, e.g. "VRT" to warp lazily as blocks are read,
+        guessed from the output path when omitted
     :return: warped raster dataset
     """
     source_geotransform = ds_to_match.GetGeoTransform()
@@ -95,6 +102,7 @@ def warp_to_match_raster(
         xRes=x_res,
         yRes=y_res,
         resampleAlg=resample_method.value,
+        **({"format": output_format} if output_format else {}),
     )
 
 
@@ -253,6 +261,78 @@ def rasters_match(raster1: gdal.Dataset, raster2: gdal.Dataset) -> bool:
     return pixel_size_match and extent_match and projection_match
 
 
+def create_zone_layer(
+    zones: list[tuple[int, bytes]], zone_srs: osr.SpatialReference
+) -> ogr.DataSource:
+    """
+    Creates an in memory layer of zone geometries, with the id of each zone in a zone_id field.
+
+    :param zones: (zone id, WKB geometry) pairs, zone ids must be greater than 0.
+    :param zone_srs: The spatial reference of the zone geometries.
+    :return: Data source of the "zones" layer, keep a reference to it while the layer is used.
+    """
+    vector_ds = ogr.GetDriverByName("Memory").CreateDataSource("zones")
+    layer = vector_ds.CreateLayer("zones", srs=zone_srs, geom_type=ogr.wkbMultiPolygon)
+    layer.CreateField(ogr.FieldDefn("zone_id", ogr.OFTInteger))
+    for zone_id, zone_wkb in zones:
+        feature = ogr.Feature(layer.GetLayerDefn())
+        feature.SetField("zone_id", zone_id)
+        feature.SetGeometry(ogr.CreateGeometryFromWkb(zone_wkb))
+        layer.CreateFeature(feature)
+        feature = None
+    return vector_ds
+
+
+def rasterize_zone_window(
+    reference_ds: gdal.Dataset,
+    zone_layer: ogr.Layer,
+    yoff: int,
+    rows: int,
+    data_type: int = gdal.GDT_UInt16,
+) -> np.ndarray:
+    """
+    Burns zone ids into a window of full width rows of the reference dataset's grid, so only the
+    window is held in memory.
+
+    :param reference_ds: Opened gdal dataset whose grid the zones are rasterized onto.
+    :param zone_layer: Zone layer, see create_zone_layer.
+    :param yoff: First row of the window.
+    :param rows: Number of rows in the window.
+    :param data_type: gdal data type of the zone ids, must hold the largest zone id.
+    :return: Array of rows by the reference dataset's width, 0 where a pixel is in no zone.
+    """
+    geotransform = list(reference_ds.GetGeoTransform())
+    # the origin of the window's first row
+    geotransform[0] += yoff * geotransform[2]
+    geotransform[3] += yoff * geotransform[5]
+    window_ds = gdal.GetDriverByName("MEM").Create("", reference_ds.RasterXSize, rows, 1, data_type)
+    window_ds.SetGeoTransform(geotransform)
+    window_ds.SetProjection(reference_ds.GetProjection())
+    gdal.RasterizeLayer(window_ds, [1], zone_layer, options=["ATTRIBUTE=zone_id"])
+    zone_ids = window_ds.GetRasterBand(1).ReadAsArray()
+    window_ds = None
+    return zone_ids
+
+
+def rasterize_zone_ids(
+    reference_ds: gdal.Dataset, zones: list[tuple[int, bytes]], zone_srs: osr.SpatialReference
+) -> np.ndarray:
+    """
+    Burns zone ids into a raster on the same grid as the reference dataset.
+
+    :param reference_ds: Opened gdal dataset whose grid the zones are rasterized onto.
+    :param zones: (zone id, WKB geometry) pairs, zone ids must be greater than 0.
+    :param zone_srs: The spatial reference of the zone geometries.
+    :return: int32 array shaped like the reference dataset, 0 where a pixel is in no zone.
+    """
+    vector_ds = create_zone_layer(zones, zone_srs)
+    zone_ids = rasterize_zone_window(
+        reference_ds, vector_ds.GetLayer(0), 0, reference_ds.RasterYSize, gdal.GDT_Int32
+    )
+    vector_ds = None
+    return zone_ids
+
+
 def calculate_geographic_coordinate(point: Tuple[int], transform: Affine, transformer: Transformer):
     """Calculate the geographic coordinates for a given points"""
     x_coordinate, y_coordinate = transform * point
@@ -272,6 +352,227 @@ def get_transformer(crs_from, crs_to):
     return Transformer.from_crs(crs_from, crs_to, always_xy=True)
 
 
+@lru_cache(maxsize=32)
+def get_cached_transformer(crs_from, crs_to) -> Transformer:
+    """Like get_transformer, but reuses one transformer per (source, target) pair, since creating a
+    transformer is much slower than using one. crs_from and crs_to must be hashable, e.g. an
+    "EPSG:xxxx" string, a WKT string or a pyproj CRS."""
+    return get_transformer(crs_from, crs_to)
+
+
+# Number of warp plans kept, each holds a few arrays the size of its target grid.
+WARP_PLAN_CACHE_SIZE = 8
+# Bilinear samples with less total weight of valid source pixels than this are nodata, as in gdal.
+MIN_BILINEAR_WEIGHT = 0.00001
+
+
+class RasterGrid(NamedTuple):
+    """The hashable grid definition of a raster: where its pixels are, not their values."""
+
+    geotransform: Tuple[float, float, float, float, float, float]
+    x_size: int
+    y_size: int
+    projection: str
+
+
+def get_raster_grid(ds: gdal.Dataset) -> RasterGrid:
+    """The grid of an opened gdal dataset."""
+    return RasterGrid(tuple(ds.GetGeoTransform()), ds.RasterXSize, ds.RasterYSize, ds.GetProjection())
+
+
+@dataclass(frozen=True)
+class WarpPlan:
+    """
+    Where the pixel centres of a target grid fall on a source grid, for resampling any raster on the
+    source grid onto the target grid with array indexing instead of a gdal.Warp per raster.
+
+    For nearest neighbour, cols and rows are the source pixel each target pixel centre falls in. For
+    bilinear, they're the upper left of the four source pixels surrounding the target pixel centre, and
+    col_fractions and row_fractions the position of the centre between them.
+    """
+
+    target_grid: RasterGrid
+    resample_method: GDALResamplingMethod
+    cols: np.ndarray
+    rows: np.ndarray
+    col_fractions: Optional[np.ndarray]
+    row_fractions: Optional[np.ndarray]
+    # False where a target pixel centre is outside the source grid
+    in_source: np.ndarray
+
+    def apply(self, values: np.ndarray, nodata_value: Optional[float] = None) -> np.ndarray:
+        """
+        Resample source grid values onto the target grid. Source nodata pixels are excluded from bilinear
+        samples, and target pixels without any valid source pixels are set to nodata, or 0 if there isn't one.
+
+        :param values: values of a raster on the source grid
+        :param nodata_value: nodata value of the source raster
+        :return: float64 values on the target grid
+        """
+        y_size, x_size = values.shape
+        valid = np.ones(values.shape, dtype=bool) if nodata_value is None else values != nodata_value
+        if self.resample_method == GDALResamplingMethod.NEAREST_NEIGHBOUR:
+            resampled = values[self.rows, self.cols].astype(np.float64)
+            sampled = self.in_source & valid[self.rows, self.cols]
+        else:
+            weighted_sum = np.zeros(self.cols.shape, dtype=np.float64)
+            total_weight = np.zeros(self.cols.shape, dtype=np.float64)
+            for row_offset, col_offset in ((0, 0), (0, 1), (1, 0), (1, 1)):
+                rows = self.rows + row_offset
+                cols = self.cols + col_offset
+                inside = (rows >= 0) & (rows < y_size) & (cols >= 0) & (cols < x_size)
+                rows = np.clip(rows, 0, y_size - 1)
+                cols = np.clip(cols, 0, x_size - 1)
+                row_weight = self.row_fractions if row_offset else 1 - self.row_fractions
+                col_weight = self.col_fractions if col_offset else 1 - self.col_fractions
+                weight = np.where(inside & valid[rows, cols], row_weight * col_weight, 0)
+                weighted_sum += weight * values[rows, cols]
+                total_weight += weight
+            sampled = self.in_source & (total_weight >= MIN_BILINEAR_WEIGHT)
+            resampled = np.divide(
+                weighted_sum, total_weight, out=np.zeros_like(weighted_sum), where=sampled
+            )
+        resampled[~sampled] = 0 if nodata_value is None else nodata_value
+        return resampled.reshape(self.target_grid.y_size, self.target_grid.x_size)
+
+
+def _create_grid_dataset(grid: RasterGrid, band_count: int = 0) -> gdal.Dataset:
+    """An in memory float64 dataset on a grid."""
+    ds = gdal.GetDriverByName("MEM").Create("", grid.x_size, grid.y_size, band_count, gdal.GDT_Float64)
+    ds.SetGeoTransform(grid.geotransform)
+    ds.SetProjection(grid.projection)
+    return ds
+
+
+def get_source_pixel_coordinates(
+    source_grid: RasterGrid, target_grid: RasterGrid
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The fractional source grid pixel coordinates of every target pixel centre, using the gdal transformer
+    gdal.Warp uses between the two grids without approximation, so projections gdal supports but pyproj
+    might not parse, e.g. the rotated pole grids of GRIB files, are handled the same way as by gdal.Warp.
+
+    :return: flattened source pixel x and y of every target pixel centre, not finite where the
+    transformation fails
+    """
+    source_ds = _create_grid_dataset(source_grid)
+    target_ds = _create_grid_dataset(target_grid)
+    transformer = gdal.Transformer(target_ds, source_ds, [])
+
+    rows, cols = np.indices((target_grid.y_size, target_grid.x_size), dtype=np.float64)
+    coordinates_ds = _create_grid_dataset(target_grid, band_count=3)
+    x_band, y_band, z_band = (coordinates_ds.GetRasterBand(i) for i in (1, 2, 3))
+    x_band.WriteArray(cols + 0.5)
+    y_band.WriteArray(rows + 0.5)
+    z_band.Fill(0)
+    # transforms every target pixel/line in place, to source pixel/line
+    if transformer.TransformGeolocations(x_band, y_band, z_band) != gdal.CE_None:
+        raise RuntimeError("Failed to transform target pixel coordinates to the source grid")
+    return x_band.ReadAsArray().ravel(), y_band.ReadAsArray().ravel()
+
+
+@lru_cache(maxsize=WARP_PLAN_CACHE_SIZE)
+def get_warp_plan(
+    source_grid: RasterGrid, target_grid: RasterGrid, resample_method: GDALResamplingMethod
+) -> WarpPlan:
+    """
+    Plan resampling rasters on the source grid onto the target grid. Plans are cached per source grid,
+    target grid and resampling method, so every raster on the same grids reuses one plan.
+
+    :raises ValueError: if the resampling method isn't nearest neighbour or bilinear, or no target pixel
+    centre falls inside the source grid
+    """
+    if resample_method not in (GDALResamplingMethod.NEAREST_NEIGHBOUR, GDALResamplingMethod.BILINEAR):
+        raise ValueError(f"Warp plans don't support {resample_method} resampling")
+
+    pixel_x, pixel_y = get_source_pixel_coordinates(source_grid, target_grid)
+    in_source = (
+        np.isfinite(pixel_x)
+        & np.isfinite(pixel_y)
+        & (pixel_x >= 0)
+        & (pixel_x < source_grid.x_size)
+        & (pixel_y >= 0)
+        & (pixel_y < source_grid.y_size)
+    )
+    if not in_source.any():
+        raise ValueError("No target pixel centre falls inside the source grid")
+    pixel_x = np.where(in_source, pixel_x, 0.5)
+    pixel_y = np.where(in_source, pixel_y, 0.5)
+
+    if resample_method == GDALResamplingMethod.NEAREST_NEIGHBOUR:
+        return WarpPlan(
+            target_grid=target_grid,
+            resample_method=resample_method,
+            cols=np.floor(pixel_x).astype(np.int32),
+            rows=np.floor(pixel_y).astype(np.int32),
+            col_fractions=None,
+            row_fractions=None,
+            in_source=in_source,
+        )
+    # bilinear samples between the centres of the surrounding source pixels
+    pixel_x -= 0.5
+    pixel_y -= 0.5
+    cols = np.floor(pixel_x)
+    rows = np.floor(pixel_y)
+    return WarpPlan(
+        target_grid=target_grid,
+        resample_method=resample_method,
+        cols=cols.astype(np.int32),
+        rows=rows.astype(np.int32),
+        col_fractions=(pixel_x - cols).astype(np.float32),
+        row_fractions=(pixel_y - rows).astype(np.float32),
+        in_source=in_source,
+    )
+
+
+def geo_to_pixel_indices(
+    geotransform: Tuple[float, float, float, float, float, float], xs: np.ndarray, ys: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert arrays of coordinates in a raster's projection to the (col, row) indices of the pixels
+    containing them.
+
+    Uses the inverse geotransform, so rotated/sheared geotransforms are handled, and floors rather
+    than truncates, so points fractionally outside the raster get negative indices instead of being
+    rounded into bounds at 0. Coordinates that failed to transform (inf/nan) get an index of -1.
+
+    :param geotransform: gdal geotransform of the raster
+    :param xs: x coordinates in the raster's projection
+    :param ys: y coordinates in the raster's projection
+    :return: int64 arrays of column and row indices
+    """
+    inverse = gdal.InvGeoTransform(geotransform)
+    pixel_x = inverse[0] + xs * inverse[1] + ys * inverse[2]
+    pixel_y = inverse[3] + xs * inverse[4] + ys * inverse[5]
+    finite = np.isfinite(pixel_x) & np.isfinite(pixel_y)
+    cols = np.floor(np.where(finite, pixel_x, -1)).astype(np.int64)
+    rows = np.floor(np.where(finite, pixel_y, -1)).astype(np.int64)
+    return cols, rows
+
+
+def get_geotiff_bytes(dataset: gdal.Dataset, creation_options: Optional[list[str]] = None) -> bytes:
+    """
+    Encode a dataset, e.g. an in memory MEM dataset, as GeoTIFF bytes without writing it to disk.
+
+    :param dataset: Opened gdal dataset.
+    :param creation_options: GTiff creation options, e.g. ["COMPRESS=DEFLATE"].
+    :return: The GeoTIFF file contents.
+    """
+    path = f"/vsimem/geotiff_{uuid.uuid4().hex}.tif"
+    try:
+        output = gdal.GetDriverByName("GTiff").CreateCopy(path, dataset, options=creation_options or [])
+        output.FlushCache()
+        output = None
+        vsi_file = gdal.VSIFOpenL(path, "rb")
+        try:
+            size = gdal.VSIStatL(path).size
+            return bytes(gdal.VSIFReadL(1, size, vsi_file))
+        finally:
+            gdal.VSIFCloseL(vsi_file)
+    finally:
+        gdal.Unlink(path)
+
+
 def clear_gdal_runtime_cache():
     """Clear the GDAL cache to free up memory after processing large rasters."""
     gdal.VSICurlClearCache()
@@ -0,0 +1,163 @@
+"""
+Persistent local cache for static rasters kept in the object store (DEM, TPI, fuel grids).
+
+Cached copies are content addressed by the object's S3 key and ETag, so an object that is replaced in
+the object store is fetched again, while an unchanged object is only downloaded once per host instead
+of being re-read over /vsis3 on every run. Copies are stored as tiled, compressed GeoTIFFs, so GDAL only
+reads and caches the blocks a job actually touches. The least recently used copies are evicted once the
+cache grows beyond its size limit.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import uuid
+from functools import lru_cache
+from typing import Optional
+
+import aiofiles
+from osgeo import gdal
+
+from wps_shared import config
+from wps_shared.geospatial.wps_dataset import WPSDataset
+from wps_shared.utils.s3_client import S3Client
+
+logger = logging.getLogger(__name__)
+
+# Directory the cached rasters are written to, should be on a volume that outlives a single job.
+RASTER_CACHE_DIR = config.get(
+    "RASTER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "wps_raster_cache")
+)
+# Once the cached rasters exceed this size, the least recently used ones are removed.
+RASTER_CACHE_MAX_BYTES = int(config.get("RASTER_CACHE_MAX_BYTES", 10 * 1024 * 1024 * 1024))
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+CACHED_RASTER_EXTENSION = ".tif"
+CACHED_RASTER_CREATION_OPTIONS = [
+    "TILED=YES",
+    "BLOCKXSIZE=512",
+    "BLOCKYSIZE=512",
+    "COMPRESS=DEFLATE",
+    "BIGTIFF=IF_SAFER",
+    "NUM_THREADS=ALL_CPUS",
+]
+
+
+def translate_to_cached_raster(source_path: str, output_path: str):
+    """Re-write a downloaded raster as a tiled, compressed GeoTIFF."""
+    ds = gdal.Translate(
+        output_path, source_path, format="GTiff", creationOptions=CACHED_RASTER_CREATION_OPTIONS
+    )
+    # closing flushes the output to disk before the cache renames it into place
+    ds.Close()
+
+
+def is_cached_raster(filename: str) -> bool:
+    """Cached rasters are named <sha256>.tif, anything else in the directory is a partial download."""
+    stem, extension = os.path.splitext(filename)
+    return extension == CACHED_RASTER_EXTENSION and "." not in stem
+
+
+class RasterCache:
+    """Size bounded, on disk cache of rasters from the object store, keyed on (S3 key, ETag)."""
+
+    def __init__(
+        self, cache_dir: str = RASTER_CACHE_DIR, max_size_bytes: int = RASTER_CACHE_MAX_BYTES
+    ):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        # in flight downloads by cache path, so concurrent requests for a raster share one download
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def cache_path(self, key: str, etag: str) -> str:
+        digest = hashlib.sha256(f"{key}\n{etag}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}{CACHED_RASTER_EXTENSION}")
+
+    async def get_path(self, s3_client: S3Client, key: str) -> str:
+        """
+        Return a local path to a cached copy of an object, downloading it on a cache miss.
+
+        :param s3_client: open s3 client for the bucket the object is in
+        :param key: s3 key of the raster, or its /vsis3/ path
+        :return: path to a tiled, compressed local copy of the raster
+        """
+        key = key.removeprefix(f"/vsis3/{s3_client.bucket}/")
+        etag = await s3_client.get_etag(key)
+        path = self.cache_path(key, etag)
+        if os.path.exists(path):
+            logger.info("Raster cache hit for %s", key)
+            # bump the modified time, eviction removes the least recently used rasters first
+            os.utime(path)
+            return path
+
+        task = self._pending.get(path)
+        if task is None:
+            task = asyncio.create_task(self._fetch(s3_client, key, path))
+            self._pending[path] = task
+            task.add_done_callback(lambda _: self._pending.pop(path, None))
+        # shielded, so one cancelled caller doesn't abort the download for everyone else
+        return await asyncio.shield(task)
+
+    async def open(self, s3_client: S3Client, key: str) -> WPSDataset:
+        """Return a WPSDataset for a cached copy of an object, downloading it on a cache miss."""
+        return WPSDataset(await self.get_path(s3_client, key))
+
+    async def _fetch(self, s3_client: S3Client, key: str, path: str) -> str:
+        logger.info("Raster cache miss for %s, downloading", key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        partial_id = uuid.uuid4().hex
+        download_path = f"{path}.{partial_id}.download"
+        translated_path = f"{path}.{partial_id}{CACHED_RASTER_EXTENSION}"
+        try:
+            response = await s3_client.get_object(key)
+            async with response["Body"] as stream, aiofiles.open(download_path, "wb") as f:
+                while chunk := await stream.read(DOWNLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+            await asyncio.to_thread(translate_to_cached_raster, download_path, translated_path)
+            # atomic, so other jobs sharing the cache directory never see a partially written raster
+            os.replace(translated_path, path)
+        finally:
+            for partial_path in (download_path, translated_path):
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> list[str]:
+        """
+        Remove the least recently used rasters until the cache is within its size limit.
+
+        :param keep: path that must not be evicted, e.g. the raster that was just downloaded
+        :return: paths of the evicted rasters
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and is_cached_raster(entry.name):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        evicted = []
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                # jobs that already have the raster open keep reading it until they close it
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            evicted.append(path)
+        if evicted:
+            logger.info("Evicted %d rasters from the raster cache", len(evicted))
+        return evicted
+
+
+@lru_cache(maxsize=1)
+def get_raster_cache() -> RasterCache:
+    """The raster cache shared by everything in this process."""
+    return RasterCache()
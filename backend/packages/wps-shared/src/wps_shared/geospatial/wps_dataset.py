@@ -1,4 +1,3 @@
-import math
 import uuid
 from contextlib import ExitStack, contextmanager
 from typing import Iterator, List, Optional, Tuple, Union
@@ -6,7 +5,15 @@ from osgeo import gdal, osr
 import numpy as np
 import io
 
-from wps_shared.geospatial.geospatial import GDALResamplingMethod, rasters_match
+from wps_shared.geospatial.geospatial import (
+    GDALResamplingMethod,
+    SpatialReferenceSystem,
+    geo_to_pixel_indices,
+    get_cached_transformer,
+    get_raster_grid,
+    get_warp_plan,
+    rasters_match,
+)
 
 gdal.UseExceptions()
 
@@ -175,6 +182,7 @@ class WPSDataset:
         output_path: str | None = None,
         resample_method: GDALResamplingMethod = GDALResamplingMethod.NEAREST_NEIGHBOUR,
         max_value: float | None = None,
+        reuse_warp_plan: bool = False,
     ):
         """
         Warp the dataset to match the extent, pixel size, and projection of the other dataset.
@@ -182,8 +190,15 @@ class WPSDataset:
         :param other: the reference WPSDataset raster to match the source against
         :param output_path: output path of the resulting raster
         :param resample_method: gdal resampling algorithm
+        :param max_value: clamp any warped value above max_value to max_value
+        :param reuse_warp_plan: resample with the cached warp plan of the two grids into an in memory
+            dataset instead of running gdal.Warp, output_path is ignored. Only nearest neighbour and
+            bilinear resampling are supported.
         :return: warped raster dataset
         """
+        if reuse_warp_plan:
+            return self._warp_to_match_with_plan(other, resample_method, max_value)
+
         if output_path is None:
             output_path = f"/vsimem/warp_{uuid.uuid4().hex}.tif"
 
@@ -225,6 +240,30 @@ class WPSDataset:
 
         return WPSDataset(ds_path=None, ds=warped_ds)
 
+    def _warp_to_match_with_plan(
+        self,
+        other: "WPSDataset",
+        resample_method: GDALResamplingMethod,
+        max_value: float | None,
+    ) -> "WPSDataset":
+        band: gdal.Band = self.ds.GetRasterBand(self.band)
+        nodata_value = band.GetNoDataValue()
+        plan = get_warp_plan(get_raster_grid(self.ds), get_raster_grid(other.ds), resample_method)
+        array = plan.apply(band.ReadAsArray(), nodata_value)
+        if max_value is not None:
+            # clamp any value above the max_value to the max_value, leaving nodata as is
+            clamped = array > max_value
+            if nodata_value is not None:
+                clamped &= array != nodata_value
+            array[clamped] = max_value
+        return WPSDataset.from_array(
+            array,
+            other.ds.GetGeoTransform(),
+            other.ds.GetProjection(),
+            nodata_value,
+            datatype=band.DataType,
+        )
+
     def replace_nodata_with(self, new_no_data_value: int = 0):
         """
         Reads the first band of a dataset, replaces NoData values with new_no_data_value, returns the array and the nodata value.
@@ -439,43 +478,72 @@ class WPSDataset:
 
     def extract_value_at_point(self, lat: float, lon: float) -> Optional[float]:
         """Return the raster value at a WGS84 lat/lon coordinate, or None if out of bounds or nodata."""
-        geotransform = self.ds.GetGeoTransform()
-
-        src_srs = osr.SpatialReference()
-        src_srs.ImportFromWkt(self.ds.GetProjection())
-        src_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
-
-        wgs84 = osr.SpatialReference()
-        wgs84.ImportFromEPSG(4326)
-        wgs84.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        value = self.extract_values_at_points(np.array([lat]), np.array([lon]))[0]
+        return None if value is np.ma.masked else float(value)
 
-        x, y, _ = osr.CoordinateTransformation(wgs84, src_srs).TransformPoint(lon, lat)
+    def extract_values_at_points(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        points_crs: str = SpatialReferenceSystem.WGS84.srs,
+    ) -> np.ma.MaskedArray:
+        """
+        Return the raster values at arrays of lat/lon coordinates.
 
-        # Use GDAL's own inverse transform rather than manual division: it handles
-        # rotated/sheared geotransforms, and floor() (vs int() truncation) correctly
-        # sends points fractionally outside the raster (e.g. col == -0.0003) to a
-        # negative pixel coordinate instead of rounding them into bounds at 0.
-        inverse_geotransform = gdal.InvGeoTransform(geotransform)
-        pixel_x, pixel_y = gdal.ApplyGeoTransform(inverse_geotransform, x, y)
-        col = math.floor(pixel_x)
-        row = math.floor(pixel_y)
+        All points are transformed in one vectorized call with a cached transformer, and the values
+        are read with a single read of the smallest window that contains every in bounds point.
 
-        if row < 0 or row >= self.ds.RasterYSize or col < 0 or col >= self.ds.RasterXSize:
-            return None
+        :param lats: latitudes of the points
+        :param lons: longitudes of the points
+        :param points_crs: CRS the points are in, WGS84 by default
+        :return: float64 masked array of values, masked where a point is out of bounds or nodata
+        """
+        transformer = get_cached_transformer(points_crs, self.ds.GetProjection())
+        xs, ys = transformer.transform(
+            np.asarray(lons, dtype=np.float64), np.asarray(lats, dtype=np.float64)
+        )
+        cols, rows = geo_to_pixel_indices(self.ds.GetGeoTransform(), xs, ys)
 
-        band = self.ds.GetRasterBand(1)
+        band: gdal.Band = self.ds.GetRasterBand(self.band)
+        values, in_bounds = read_values_at_pixels(band, cols, rows)
+        values = values.astype(np.float64)
+        mask = ~in_bounds
         nodata = band.GetNoDataValue()
-        value = float(band.ReadAsArray(col, row, 1, 1)[0][0])
-
-        if nodata is not None and math.isclose(value, nodata, rel_tol=1e-9):
-            return None
-
-        return value
+        if nodata is not None:
+            mask |= np.isclose(values, nodata, rtol=1e-9, atol=0)
+        return np.ma.MaskedArray(values, mask=mask)
 
     def close(self):
         self.ds = None
 
 
+def read_values_at_pixels(
+    band: gdal.Band, cols: np.ndarray, rows: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read the band values at arrays of pixel indices, with a single read of the smallest window
+    that contains every in bounds pixel.
+
+    :param band: the band to read
+    :param cols: column index of each pixel, may be out of bounds
+    :param rows: row index of each pixel, may be out of bounds
+    :return: tuple of (values in the band's dtype, in bounds mask), values are 0 where out of bounds
+    """
+    in_bounds = (cols >= 0) & (cols < band.XSize) & (rows >= 0) & (rows < band.YSize)
+    if not in_bounds.any():
+        return np.zeros(cols.shape, dtype=np.float64), in_bounds
+
+    in_bounds_cols = cols[in_bounds]
+    in_bounds_rows = rows[in_bounds]
+    col_min, col_max = int(in_bounds_cols.min()), int(in_bounds_cols.max())
+    row_min, row_max = int(in_bounds_rows.min()), int(in_bounds_rows.max())
+    window = band.ReadAsArray(col_min, row_min, col_max - col_min + 1, row_max - row_min + 1)
+
+    values = np.zeros(cols.shape, dtype=window.dtype)
+    values[in_bounds] = window[in_bounds_rows - row_min, in_bounds_cols - col_min]
+    return values, in_bounds
+
+
 @contextmanager
 def multi_wps_dataset_context(dataset_paths: List[str]) -> Iterator[List[WPSDataset]]:
     """
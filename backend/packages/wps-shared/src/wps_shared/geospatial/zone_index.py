@@ -0,0 +1,211 @@
+"""
+Zone id rasters, for calculating per fire zone statistics on a static grid with array indexing instead of
+clipping every raster to every zone.
+
+A zone id raster holds, for every pixel of a grid, the id of the advisory shape the pixel centre falls in.
+They're persisted to the object store under a key derived from the zone index version, the grid and the
+zone geometries, so each is generated once per grid and set of zones, and regenerated automatically when
+either changes. Jobs read them through the raster cache, as tiled GeoTIFFs on disk, so the zone ids
+of large grids can be read a block at a time alongside the rasters they summarize.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from typing import AsyncIterator, Optional
+
+import aiofiles
+import numpy as np
+from osgeo import gdal, osr
+
+from wps_shared.geospatial.geospatial import create_zone_layer
+from wps_shared.geospatial.raster_cache import RasterCache, get_raster_cache
+from wps_shared.utils.s3_client import MULTIPART_UPLOAD_PART_SIZE, S3Client
+
+logger = logging.getLogger(__name__)
+
+# Bump when the way zone id rasters are generated changes, so persisted rasters are regenerated.
+ZONE_INDEX_VERSION = 2
+ZONE_INDEX_PREFIX = "zone_ids"
+ZONE_ID_RASTER_CREATION_OPTIONS = [
+    "TILED=YES",
+    "BLOCKXSIZE=512",
+    "BLOCKYSIZE=512",
+    "COMPRESS=DEFLATE",
+    "PREDICTOR=2",
+    "BIGTIFF=IF_SAFER",
+]
+# Zone ids are stored as uint16.
+MAX_ZONE_ID = np.iinfo(np.uint16).max
+
+
+class ZoneIndex:
+    """Pixel indices of every zone on a grid, grouped with a single sort of the zone id raster."""
+
+    def __init__(self, zone_ids: np.ndarray):
+        """
+        :param zone_ids: zone id of every pixel, 0 where a pixel is in no zone
+        """
+        self.shape = zone_ids.shape
+        flat_zone_ids = zone_ids.ravel()
+        self._order = np.argsort(flat_zone_ids, kind="stable")
+        ids, starts, counts = np.unique(
+            flat_zone_ids[self._order], return_index=True, return_counts=True
+        )
+        self._slices = {
+            int(zone_id): slice(int(start), int(start + count))
+            for zone_id, start, count in zip(ids, starts, counts)
+            if zone_id > 0
+        }
+
+    @property
+    def zone_ids(self) -> list[int]:
+        """Ids of the zones that contain at least one pixel centre."""
+        return list(self._slices)
+
+    def pixel_indices(self, zone_id: int) -> np.ndarray:
+        """
+        :return: flat indices of the pixels in the zone, empty when the zone contains no pixel centre
+        """
+        zone_slice = self._slices.get(zone_id)
+        if zone_slice is None:
+            return np.empty(0, dtype=self._order.dtype)
+        return self._order[zone_slice]
+
+    def values(self, data: np.ndarray, zone_id: int) -> np.ndarray:
+        """
+        :param data: raster values on the same grid as the zone index
+        :return: values of the pixels in the zone
+        """
+        if data.shape != self.shape:
+            raise ValueError(f"Data shape {data.shape} does not match zone index shape {self.shape}")
+        return data.reshape(-1)[self.pixel_indices(zone_id)]
+
+
+def get_zone_id_raster_key(reference_ds: gdal.Dataset, zones: list[tuple[int, bytes]]) -> str:
+    """
+    The object store key of the zone id raster for a grid and set of zones.
+
+    :param reference_ds: Opened gdal dataset on the grid of the zone id raster.
+    :param zones: (zone id, WKB geometry) pairs.
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        f"{reference_ds.RasterXSize},{reference_ds.RasterYSize},{reference_ds.GetGeoTransform()},{reference_ds.GetProjection()}".encode()
+    )
+    for zone_id, zone_wkb in sorted(zones):
+        digest.update(f"{zone_id}:".encode())
+        digest.update(bytes(zone_wkb))
+    return f"{ZONE_INDEX_PREFIX}/v{ZONE_INDEX_VERSION}/{digest.hexdigest()}.tif"
+
+
+def write_zone_id_raster(
+    reference_ds: gdal.Dataset,
+    zones: list[tuple[int, bytes]],
+    zone_srs: osr.SpatialReference,
+    output_path: str,
+):
+    """
+    Rasterize the zones onto the grid of the reference dataset, straight into a tiled uint16 GeoTIFF
+    on disk, so the zone ids of the whole grid are never held in memory.
+
+    :param reference_ds: Opened gdal dataset on the grid of the zone id raster.
+    :param zones: (zone id, WKB geometry) pairs, zone ids must be from 1 up to MAX_ZONE_ID.
+    :param zone_srs: The spatial reference of the zone geometries.
+    :param output_path: Path the GeoTIFF is written to.
+    """
+    if any(zone_id < 1 or zone_id > MAX_ZONE_ID for zone_id, _ in zones):
+        raise ValueError(f"Zone ids must be from 1 up to {MAX_ZONE_ID}")
+    zone_ds: gdal.Dataset = gdal.GetDriverByName("GTiff").Create(
+        output_path,
+        reference_ds.RasterXSize,
+        reference_ds.RasterYSize,
+        1,
+        gdal.GDT_UInt16,
+        options=ZONE_ID_RASTER_CREATION_OPTIONS,
+    )
+    zone_ds.SetGeoTransform(reference_ds.GetGeoTransform())
+    zone_ds.SetProjection(reference_ds.GetProjection())
+    zone_ds.GetRasterBand(1).SetNoDataValue(0)
+    vector_ds = create_zone_layer(zones, zone_srs)
+    gdal.RasterizeLayer(zone_ds, [1], vector_ds.GetLayer(0), options=["ATTRIBUTE=zone_id"])
+    vector_ds = None
+    zone_ds.Close()
+
+
+async def read_file_chunks(path: str) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(MULTIPART_UPLOAD_PART_SIZE):
+            yield chunk
+
+
+async def get_zone_id_raster_path(
+    s3_client: S3Client,
+    reference_ds: gdal.Dataset,
+    zones: list[tuple[int, bytes]],
+    zone_srs: osr.SpatialReference,
+    raster_cache: Optional[RasterCache] = None,
+) -> str:
+    """
+    Get a local path to the zone id raster of a grid, a tiled uint16 GeoTIFF on the grid with 0
+    where a pixel is in no zone. The persisted zone id raster is read through the raster cache when
+    it exists, otherwise the zones are rasterized onto the grid and persisted for next time.
+
+    :param s3_client: Open s3 client for the bucket zone id rasters are persisted in.
+    :param reference_ds: Opened gdal dataset on the grid of the zone ids.
+    :param zones: (zone id, WKB geometry) pairs, zone ids must be from 1 up to MAX_ZONE_ID.
+    :param zone_srs: The spatial reference of the zone geometries.
+    :param raster_cache: The cache to read the zone id raster through, defaults to the shared one.
+    :return: Path to the zone id raster.
+    """
+    key = get_zone_id_raster_key(reference_ds, zones)
+    if not await s3_client.object_exists(key):
+        logger.info("Creating zone id raster %s", key)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zone_id_path = os.path.join(temp_dir, "zone_ids.tif")
+            await asyncio.to_thread(
+                write_zone_id_raster, reference_ds, zones, zone_srs, zone_id_path
+            )
+            await s3_client.upload_stream(key, read_file_chunks(zone_id_path))
+    return await (raster_cache or get_raster_cache()).get_path(s3_client, key)
+
+
+def read_zone_ids(zone_id_raster_path: str) -> np.ndarray:
+    """Read every zone id of a zone id raster."""
+    with gdal.Open(zone_id_raster_path, gdal.GA_ReadOnly) as zone_ds:
+        return zone_ds.GetRasterBand(1).ReadAsArray()
+
+
+async def get_zone_ids(
+    s3_client: S3Client,
+    reference_ds: gdal.Dataset,
+    zones: list[tuple[int, bytes]],
+    zone_srs: osr.SpatialReference,
+    raster_cache: Optional[RasterCache] = None,
+) -> np.ndarray:
+    """
+    Get the zone ids of every pixel of a grid, from the persisted zone id raster, see
+    get_zone_id_raster_path. The whole grid is read into memory, so large grids should read the zone
+    id raster a block at a time instead.
+
+    :return: uint16 array shaped like the reference dataset, 0 where a pixel is in no zone.
+    """
+    zone_id_raster_path = await get_zone_id_raster_path(
+        s3_client, reference_ds, zones, zone_srs, raster_cache
+    )
+    return await asyncio.to_thread(read_zone_ids, zone_id_raster_path)
+
+
+async def get_zone_index(
+    s3_client: S3Client,
+    reference_ds: gdal.Dataset,
+    zones: list[tuple[int, bytes]],
+    zone_srs: osr.SpatialReference,
+    raster_cache: Optional[RasterCache] = None,
+) -> ZoneIndex:
+    """
+    Get the zone index of a grid, from the persisted zone id raster, see get_zone_ids.
+    """
+    return ZoneIndex(await get_zone_ids(s3_client, reference_ds, zones, zone_srs, raster_cache))
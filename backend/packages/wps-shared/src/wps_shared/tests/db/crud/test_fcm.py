@@ -13,7 +13,7 @@ from wps_shared.db.crud.fcm import (
     get_active_device_by_device_id,
     get_device_by_device_id,
     get_device_token_for_registration,
-    get_device_tokens_for_zone,
+    get_device_tokens_for_zones,
     get_notification_settings_for_device,
     save_device_token,
     update_device_token_is_active,
@@ -378,32 +378,32 @@ async def test_upsert_notification_settings_unknown_device_returns_false(
 
 
 @pytest.mark.anyio
-async def test_get_device_tokens_for_zone_returns_active_tokens(async_session: AsyncSession):
-    """get_device_tokens_for_zone returns the FCM token for an active subscribed device."""
+async def test_get_device_tokens_for_zones_groups_tokens_by_zone(async_session: AsyncSession):
+    """get_device_tokens_for_zones resolves the subscriptions for many zones in one query."""
     await upsert_notification_settings(
-        async_session, mock_device_id, [mock_fire_shape_source_identifier]
+        async_session,
+        mock_device_id,
+        [mock_fire_shape_source_identifier, mock_fire_shape_source_identifier_2],
     )
     await async_session.commit()
 
-    result = await get_device_tokens_for_zone(async_session, mock_fire_shape_source_identifier)
-    assert result == [mock_fcm_token]
+    result = await get_device_tokens_for_zones(
+        async_session, [mock_fire_shape_source_identifier, mock_fire_shape_source_identifier_2, "0"]
+    )
+    assert result == {
+        mock_fire_shape_source_identifier: [mock_fcm_token],
+        mock_fire_shape_source_identifier_2: [mock_fcm_token],
+    }
 
 
 @pytest.mark.anyio
-async def test_get_device_tokens_for_zone_excludes_inactive_tokens(async_session: AsyncSession):
-    """get_device_tokens_for_zone does not return tokens from inactive devices."""
+async def test_get_device_tokens_for_zones_excludes_inactive_tokens(async_session: AsyncSession):
+    """get_device_tokens_for_zones does not return tokens from inactive devices."""
     await upsert_notification_settings(
         async_session, mock_device_id, [mock_fire_shape_source_identifier]
     )
     await update_device_token_is_active(async_session, mock_fcm_token, False)
     await async_session.commit()
 
-    result = await get_device_tokens_for_zone(async_session, mock_fire_shape_source_identifier)
-    assert result == []
-
-
-@pytest.mark.anyio
-async def test_get_device_tokens_for_zone_no_subscribers(async_session: AsyncSession):
-    """get_device_tokens_for_zone returns empty list when no device subscribes to the zone."""
-    result = await get_device_tokens_for_zone(async_session, mock_fire_shape_source_identifier)
-    assert result == []
+    result = await get_device_tokens_for_zones(async_session, [mock_fire_shape_source_identifier])
+    assert result == {}
@@ -0,0 +1,184 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from testcontainers.postgres import PostgresContainer
+
+from wps_shared.db.crud.weather_models import (
+    get_latest_station_model_predictions_for_range,
+    get_latest_station_predictions_for_range,
+    get_station_model_prediction_summaries,
+)
+from wps_shared.db.models.weather_models import (
+    PredictionModel,
+    PredictionModelRunTimestamp,
+    WeatherStationModelPrediction,
+)
+from wps_shared.tests.common import TESTCONTAINERS_POSTGRES_IMAGE
+from wps_shared.weather_models import ModelEnum
+
+start_time = datetime(2025, 7, 1, tzinfo=timezone.utc)
+end_time = datetime(2025, 7, 3, 23, tzinfo=timezone.utc)
+day_one = datetime(2025, 7, 1, 20, tzinfo=timezone.utc)
+day_two = datetime(2025, 7, 2, 20, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="function")
+def postgres_container():
+    with PostgresContainer(TESTCONTAINERS_POSTGRES_IMAGE) as postgres:
+        yield postgres
+
+
+@pytest.fixture(scope="function")
+def session(postgres_container):
+    engine = create_engine(postgres_container.get_connection_url())
+    PredictionModel.__table__.create(engine)
+    PredictionModelRunTimestamp.__table__.create(engine)
+    WeatherStationModelPrediction.__table__.create(engine)
+
+    with Session(engine) as session:
+        yield session
+
+    engine.dispose()
+
+
+def add_model_run(session: Session, model: PredictionModel, run_hour: int) -> PredictionModelRunTimestamp:
+    model_run = PredictionModelRunTimestamp(
+        prediction_model=model,
+        prediction_run_timestamp=datetime(2025, 7, 1, run_hour, tzinfo=timezone.utc),
+        complete=True,
+        interpolated=True,
+    )
+    session.add(model_run)
+    return model_run
+
+
+def add_prediction(
+    session: Session,
+    model_run: PredictionModelRunTimestamp,
+    station_code: int,
+    prediction_timestamp: datetime,
+    update_hour: int,
+    tmp_tgl_2: float,
+    rh_tgl_2: float | None = None,
+):
+    update_date = datetime(2025, 7, 1, update_hour, tzinfo=timezone.utc)
+    session.add(
+        WeatherStationModelPrediction(
+            prediction_model_run_timestamp=model_run,
+            station_code=station_code,
+            prediction_timestamp=prediction_timestamp,
+            tmp_tgl_2=tmp_tgl_2,
+            rh_tgl_2=rh_tgl_2,
+            create_date=update_date,
+            update_date=update_date,
+        )
+    )
+
+
+@pytest.fixture(scope="function")
+def predictions(session: Session):
+    """Two runs of GDPS and one of RDPS, with the later GDPS run updated more recently."""
+    gdps = PredictionModel(name="GDPS", abbreviation="GDPS", projection="latlon.15x.15")
+    rdps = PredictionModel(name="RDPS", abbreviation="RDPS", projection="ps10km")
+    session.add_all([gdps, rdps])
+    gdps_00 = add_model_run(session, gdps, 0)
+    gdps_12 = add_model_run(session, gdps, 12)
+    rdps_00 = add_model_run(session, rdps, 0)
+
+    for station_code in (1, 2):
+        add_prediction(session, gdps_00, station_code, day_one, 4, 10.0)
+        add_prediction(session, gdps_12, station_code, day_one, 16, 11.0)
+        add_prediction(session, gdps_00, station_code, day_two, 4, 20.0)
+        add_prediction(session, gdps_12, station_code, day_two, 16, 21.0)
+        add_prediction(session, rdps_00, station_code, day_one, 6, 30.0)
+    # an older run updated last is the latest prediction
+    add_prediction(session, gdps_00, 3, day_one, 18, 40.0)
+    add_prediction(session, gdps_12, 3, day_one, 16, 41.0)
+    # not a 20:00 UTC prediction
+    add_prediction(session, gdps_12, 1, datetime(2025, 7, 1, 21, tzinfo=timezone.utc), 17, 50.0)
+    session.commit()
+
+
+def test_get_latest_station_model_predictions_for_range(session: Session, predictions):
+    result = get_latest_station_model_predictions_for_range(
+        session, [1, 2, 3], "GDPS", start_time, end_time
+    ).all()
+
+    assert [
+        (row.prediction_timestamp, row.station_code, row.abbreviation, row.tmp_tgl_2)
+        for row in result
+    ] == [
+        (day_one, 1, "GDPS", 11.0),
+        (day_one, 2, "GDPS", 11.0),
+        (day_one, 3, "GDPS", 40.0),
+        (day_two, 1, "GDPS", 21.0),
+        (day_two, 2, "GDPS", 21.0),
+    ]
+
+
+def test_get_latest_station_model_predictions_for_range_filters_stations(
+    session: Session, predictions
+):
+    result = get_latest_station_model_predictions_for_range(
+        session, [2], "RDPS", start_time, end_time
+    ).all()
+
+    assert [(row.prediction_timestamp, row.station_code, row.tmp_tgl_2) for row in result] == [
+        (day_one, 2, 30.0)
+    ]
+
+
+def test_get_latest_station_predictions_for_range(session: Session, predictions):
+    result = get_latest_station_predictions_for_range(session, [1, 3], start_time, end_time).all()
+
+    assert [
+        (row.prediction_timestamp, row.station_code, row.abbreviation, row.tmp_tgl_2)
+        for row in result
+    ] == [
+        (day_one, 1, "GDPS", 11.0),
+        (day_one, 1, "RDPS", 30.0),
+        (day_one, 3, "GDPS", 40.0),
+        (day_two, 1, "GDPS", 21.0),
+    ]
+
+
+@pytest.fixture(scope="function")
+def summary_predictions(session: Session):
+    """Five GDPS runs predicting the same hours for station 1, and one RDPS run."""
+    gdps = PredictionModel(name="GDPS", abbreviation="GDPS", projection="latlon.15x.15")
+    rdps = PredictionModel(name="RDPS", abbreviation="RDPS", projection="ps10km")
+    session.add_all([gdps, rdps])
+    gdps_runs = [add_model_run(session, gdps, run_hour) for run_hour in (0, 3, 6, 9, 12)]
+    rdps_00 = add_model_run(session, rdps, 0)
+    # a sixth run predicting zeroes, which are left out of the summaries
+    gdps_15 = add_model_run(session, gdps, 15)
+
+    for index, model_run in enumerate(gdps_runs):
+        add_prediction(session, model_run, 1, day_one, 16, 10.0 * (index + 1), 60.0 + 10 * index)
+        add_prediction(session, model_run, 1, day_two, 16, 5.0, 50.0)
+    add_prediction(session, gdps_15, 1, day_one, 16, 0, 0)
+    add_prediction(session, gdps_runs[0], 2, day_one, 16, 15.0, 40.0)
+    add_prediction(session, rdps_00, 1, day_one, 16, 100.0, 100.0)
+    session.commit()
+
+
+def test_get_station_model_prediction_summaries(session: Session, summary_predictions):
+    result = get_station_model_prediction_summaries(
+        session, [1], ModelEnum.GDPS, start_time, end_time
+    ).all()
+
+    assert [(row.station_code, row.prediction_timestamp, row.abbreviation) for row in result] == [
+        (1, day_one, "GDPS"),
+        (1, day_two, "GDPS"),
+    ]
+    day_one_summary, day_two_summary = result
+    # linearly interpolated between the five runs, like numpy.percentile
+    assert day_one_summary.tmp_tgl_2_5th == pytest.approx(12.0)
+    assert day_one_summary.tmp_tgl_2_median == pytest.approx(30.0)
+    assert day_one_summary.tmp_tgl_2_90th == pytest.approx(46.0)
+    assert day_one_summary.rh_tgl_2_5th == pytest.approx(62.0)
+    assert day_one_summary.rh_tgl_2_median == pytest.approx(80.0)
+    assert day_one_summary.rh_tgl_2_90th == pytest.approx(96.0)
+    assert (day_two_summary.tmp_tgl_2_median, day_two_summary.rh_tgl_2_median) == (5.0, 50.0)
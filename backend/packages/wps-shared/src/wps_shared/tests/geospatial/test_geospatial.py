@@ -1,8 +1,11 @@
+import uuid
 from affine import Affine
 import os
+import numpy as np
 import pytest
+from osgeo import gdal, osr
 from pyproj import CRS
-from wps_shared.geospatial.geospatial import NAD83_CRS, calculate_geographic_coordinate, get_transformer
+from wps_shared.geospatial.geospatial import NAD83_CRS, calculate_geographic_coordinate, get_geotiff_bytes, get_transformer
 
 def read_file_contents(filename):
     """Given a filename, return json"""
@@ -27,4 +30,33 @@ def test_calculate_geographic_coordinate(geotransform, wkt_projection_string, ra
     transformer = get_transformer(proj_crs, NAD83_CRS)
     padf_transform = Affine.from_gdal(*geotransform)
     calculated_geographic_coordinate = calculate_geographic_coordinate(raster_coordinate, padf_transform, transformer)
-    assert calculated_geographic_coordinate == geographic_coordinate
\ No newline at end of file
+    assert calculated_geographic_coordinate == geographic_coordinate
+
+
+def test_get_geotiff_bytes_round_trip():
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3005)
+    values = np.array([[0, 1, 2], [2, 1, 0]], dtype=np.uint8)
+    source = gdal.GetDriverByName("MEM").Create("", 3, 2, 1, gdal.GDT_Byte)
+    source.SetGeoTransform((1000000, 2000, 0, 1000000, 0, -2000))
+    source.SetProjection(srs.ExportToWkt())
+    source.GetRasterBand(1).SetNoDataValue(0)
+    source.GetRasterBand(1).WriteArray(values)
+
+    geotiff = get_geotiff_bytes(source, ["COMPRESS=DEFLATE"])
+
+    assert geotiff[:4] in (b"II*\x00", b"MM\x00*")
+    path = f"/vsimem/test_geotiff_{uuid.uuid4().hex}.tif"
+    gdal.FileFromMemBuffer(path, geotiff)
+    try:
+        with gdal.Open(path) as result:
+            assert result.GetDriver().ShortName == "GTiff"
+            assert result.GetGeoTransform() == source.GetGeoTransform()
+            assert osr.SpatialReference(wkt=result.GetProjection()).IsSame(srs)
+            assert result.GetMetadataItem("COMPRESSION", "IMAGE_STRUCTURE") == "DEFLATE"
+            band = result.GetRasterBand(1)
+            assert band.DataType == gdal.GDT_Byte
+            assert band.GetNoDataValue() == 0
+            np.testing.assert_array_equal(band.ReadAsArray(), values)
+    finally:
+        gdal.Unlink(path)
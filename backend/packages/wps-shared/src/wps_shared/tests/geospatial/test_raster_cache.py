@@ -0,0 +1,146 @@
+import asyncio
+import os
+import shutil
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from osgeo import gdal
+
+from wps_shared.geospatial.raster_cache import RasterCache, translate_to_cached_raster
+
+MODULE_PATH = "wps_shared.geospatial.raster_cache"
+RASTER_CONTENT = b"not really a raster"
+
+
+class FakeBody:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def read(self, size: int) -> bytes:
+        chunk, self.content = self.content[:size], self.content[size:]
+        return chunk
+
+
+def make_s3_client(etag: str = "etag-1"):
+    s3_client = MagicMock()
+    s3_client.bucket = "test-bucket"
+    s3_client.get_etag = AsyncMock(return_value=etag)
+
+    async def get_object(key):
+        # the download is slow enough for concurrent requests to overlap
+        await asyncio.sleep(0)
+        return {"Body": FakeBody(RASTER_CONTENT)}
+
+    s3_client.get_object = AsyncMock(side_effect=get_object)
+    return s3_client
+
+
+@pytest.fixture
+def copy_translate(mocker):
+    """Stand in for the gdal translate, so the cache can be tested with arbitrary bytes."""
+    return mocker.patch(
+        f"{MODULE_PATH}.translate_to_cached_raster", side_effect=shutil.copyfile
+    )
+
+
+@pytest.mark.anyio
+async def test_get_path_downloads_on_miss(tmp_path, copy_translate):
+    cache = RasterCache(str(tmp_path), max_size_bytes=1024)
+    s3_client = make_s3_client()
+
+    path = await cache.get_path(s3_client, "/vsis3/test-bucket/dem/tpi/tpi.tif")
+
+    assert path == cache.cache_path("dem/tpi/tpi.tif", "etag-1")
+    with open(path, "rb") as f:
+        assert f.read() == RASTER_CONTENT
+    s3_client.get_etag.assert_awaited_once_with("dem/tpi/tpi.tif")
+    s3_client.get_object.assert_awaited_once_with("dem/tpi/tpi.tif")
+    # only the cached raster is left behind, no partial downloads
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+@pytest.mark.anyio
+async def test_get_path_hit_does_not_download(tmp_path, copy_translate):
+    cache = RasterCache(str(tmp_path), max_size_bytes=1024)
+    s3_client = make_s3_client()
+
+    first = await cache.get_path(s3_client, "dem/tpi/tpi.tif")
+    second = await cache.get_path(s3_client, "dem/tpi/tpi.tif")
+
+    assert first == second
+    assert s3_client.get_object.await_count == 1
+    assert copy_translate.call_count == 1
+
+
+@pytest.mark.anyio
+async def test_get_path_changed_etag_downloads_again(tmp_path, copy_translate):
+    cache = RasterCache(str(tmp_path), max_size_bytes=1024)
+
+    first = await cache.get_path(make_s3_client("etag-1"), "dem/tpi/tpi.tif")
+    second = await cache.get_path(make_s3_client("etag-2"), "dem/tpi/tpi.tif")
+
+    assert first != second
+    assert os.path.exists(second)
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_share_one_download(tmp_path, copy_translate):
+    cache = RasterCache(str(tmp_path), max_size_bytes=1024)
+    s3_client = make_s3_client()
+
+    paths = await asyncio.gather(*[cache.get_path(s3_client, "fuel/fuel.tif") for _ in range(3)])
+
+    assert len(set(paths)) == 1
+    assert s3_client.get_object.await_count == 1
+
+
+@pytest.mark.anyio
+async def test_failed_download_leaves_no_partial_files(tmp_path, mocker):
+    mocker.patch(f"{MODULE_PATH}.translate_to_cached_raster", side_effect=RuntimeError("bad tif"))
+    cache = RasterCache(str(tmp_path), max_size_bytes=1024)
+
+    with pytest.raises(RuntimeError):
+        await cache.get_path(make_s3_client(), "fuel/fuel.tif")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = RasterCache(str(tmp_path), max_size_bytes=25)
+    paths = [cache.cache_path(f"key_{i}", "etag") for i in range(3)]
+    for i, path in enumerate(paths):
+        with open(path, "wb") as f:
+            f.write(b"x" * 10)
+        os.utime(path, (i, i))
+    # partial downloads from another job are never evicted
+    partial = f"{paths[0]}.abc.download"
+    with open(partial, "wb") as f:
+        f.write(b"x" * 100)
+
+    evicted = cache.evict(keep=paths[0])
+
+    assert evicted == [paths[1]]
+    assert os.path.exists(paths[0])
+    assert os.path.exists(paths[2])
+    assert os.path.exists(partial)
+
+
+def test_translate_to_cached_raster_is_tiled_and_compressed(tmp_path):
+    source_path = os.path.join(os.path.dirname(__file__), "snow_masked_hfi20240810.tif")
+    output_path = str(tmp_path / "cached.tif")
+
+    translate_to_cached_raster(source_path, output_path)
+
+    with gdal.Open(source_path) as source, gdal.Open(output_path) as cached:
+        assert cached.GetRasterBand(1).GetBlockSize() == [512, 512]
+        assert cached.GetMetadata("IMAGE_STRUCTURE")["COMPRESSION"] == "DEFLATE"
+        assert cached.GetGeoTransform() == source.GetGeoTransform()
+        assert (
+            cached.GetRasterBand(1).ReadAsArray() == source.GetRasterBand(1).ReadAsArray()
+        ).all()
@@ -1,9 +1,10 @@
 import os
 import numpy as np
-from osgeo import gdal
+from osgeo import gdal, osr
 import pytest
 import tempfile
 
+from wps_shared.geospatial.geospatial import GDALResamplingMethod, get_warp_plan
 from wps_shared.geospatial.wps_dataset import WPSDataset, multi_wps_dataset_context
 from wps_shared.tests.geospatial.dataset_common import create_mock_gdal_dataset, create_test_dataset
 
@@ -226,6 +227,150 @@ def test_raster_warp_max_value():
     mercator_ds = None
 
 
+@pytest.mark.parametrize(
+    "resample_method", [GDALResamplingMethod.NEAREST_NEIGHBOUR, GDALResamplingMethod.BILINEAR]
+)
+def test_raster_warp_with_plan_matches_gdal_warp(resample_method):
+    # 3005 source covering part of a 4326 target, so some target pixels are outside the source
+    source_ds = create_test_dataset("test_dataset_1.tif", 50, 40, (1000000, 1500000, 400000, 800000), 3005)
+    target_ds = create_test_dataset("test_dataset_2.tif", 60, 60, (-130, -118, 48, 56), 4326)
+
+    with (
+        WPSDataset(ds_path=None, ds=source_ds) as source_wps_ds,
+        WPSDataset(ds_path=None, ds=target_ds) as target_wps_ds,
+    ):
+        expected = source_wps_ds.warp_to_match(target_wps_ds, "/vsimem/test.tif", resample_method)
+        actual = source_wps_ds.warp_to_match(
+            target_wps_ds, resample_method=resample_method, reuse_warp_plan=True
+        )
+        expected_array = expected.as_gdal_ds().GetRasterBand(1).ReadAsArray()
+        actual_array = actual.as_gdal_ds().GetRasterBand(1).ReadAsArray()
+        assert actual.as_gdal_ds().GetGeoTransform() == target_ds.GetGeoTransform()
+        # gdal.Warp approximates the coordinate transformation, so allow the odd pixel to differ
+        assert np.mean(np.isclose(actual_array, expected_array, atol=1e-3)) > 0.99
+        gdal.Unlink("/vsimem/test.tif")
+
+
+# rotated pole of the RDPS RLatLon0.09 grid, as gdal reads it from the GRIB2 files
+RDPS_ROTATED_POLE_PROJ4 = (
+    "+proj=ob_tran +o_proj=longlat +o_lon_p=0 +o_lat_p=31.758312 +lon_0=-92.402969 "
+    "+R=6371229 +no_defs"
+)
+
+
+def _create_rotated_pole_source(target_ds: gdal.Dataset) -> gdal.Dataset:
+    """A 0.09 degree rotated pole grid of random values, covering the target dataset with a margin."""
+    rotated_srs = osr.SpatialReference()
+    rotated_srs.ImportFromProj4(RDPS_ROTATED_POLE_PROJ4)
+    rotated_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    target_srs = osr.SpatialReference(wkt=target_ds.GetProjection())
+    target_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    to_rotated = osr.CoordinateTransformation(target_srs, rotated_srs)
+    minx, x_res, _, maxy, _, y_res = target_ds.GetGeoTransform()
+    edge_points = [
+        to_rotated.TransformPoint(minx + x_res * col, maxy + y_res * row)[:2]
+        for col in range(0, target_ds.RasterXSize + 1, 10)
+        for row in range(0, target_ds.RasterYSize + 1, 10)
+    ]
+    pixel_size = 0.09
+    west = min(x for x, _ in edge_points) - 5 * pixel_size
+    north = max(y for _, y in edge_points) + 5 * pixel_size
+    cols = int(np.ceil((max(x for x, _ in edge_points) + 5 * pixel_size - west) / pixel_size))
+    rows = int(np.ceil((north - min(y for _, y in edge_points) + 5 * pixel_size) / pixel_size))
+
+    source_ds = gdal.GetDriverByName("MEM").Create("", cols, rows, 1, gdal.GDT_Float32)
+    source_ds.SetGeoTransform((west, pixel_size, 0, north, 0, -pixel_size))
+    source_ds.SetProjection(rotated_srs.ExportToWkt())
+    rng = np.random.default_rng(seed=42)
+    source_ds.GetRasterBand(1).WriteArray(rng.random((rows, cols)).astype(np.float32) * 100)
+    return source_ds
+
+
+@pytest.mark.parametrize(
+    "resample_method", [GDALResamplingMethod.NEAREST_NEIGHBOUR, GDALResamplingMethod.BILINEAR]
+)
+def test_raster_warp_with_plan_matches_gdal_warp_from_rotated_pole(resample_method):
+    # a 2km BC Albers grid, like the SFMS rasters the RDPS weather is warped onto
+    target_ds = create_test_dataset(
+        "test_dataset_2.tif", 100, 80, (1000000, 1200000, 500000, 660000), 3005
+    )
+    source_ds = _create_rotated_pole_source(target_ds)
+    geotransform = target_ds.GetGeoTransform()
+    expected_ds = gdal.Warp(
+        "",
+        source_ds,
+        format="MEM",
+        dstSRS=target_ds.GetProjection(),
+        outputBounds=(
+            geotransform[0],
+            geotransform[3] + geotransform[5] * target_ds.RasterYSize,
+            geotransform[0] + geotransform[1] * target_ds.RasterXSize,
+            geotransform[3],
+        ),
+        width=target_ds.RasterXSize,
+        height=target_ds.RasterYSize,
+        resampleAlg=resample_method.value,
+        # gdal.Warp approximates the transformation by default, the plan doesn't
+        errorThreshold=0,
+    )
+
+    get_warp_plan.cache_clear()
+    with (
+        WPSDataset(ds_path=None, ds=source_ds) as source_wps_ds,
+        WPSDataset(ds_path=None, ds=target_ds) as target_wps_ds,
+    ):
+        actual = source_wps_ds.warp_to_match(
+            target_wps_ds, resample_method=resample_method, reuse_warp_plan=True
+        )
+        actual_array = actual.as_gdal_ds().GetRasterBand(1).ReadAsArray()
+
+    expected_array = expected_ds.GetRasterBand(1).ReadAsArray()
+    # every target pixel is sampled, none silently become 0
+    assert np.all(expected_array > 0)
+    if resample_method == GDALResamplingMethod.NEAREST_NEIGHBOUR:
+        np.testing.assert_array_equal(actual_array, expected_array)
+    else:
+        np.testing.assert_allclose(actual_array, expected_array, rtol=1e-5, atol=1e-4)
+
+
+def test_warp_plan_requires_overlapping_grids():
+    source_ds = create_test_dataset("test_dataset_1.tif", 4, 4, (0, 40, 0, 40), 3005)
+    target_ds = create_test_dataset("test_dataset_2.tif", 4, 4, (1000, 1040, 1000, 1040), 3005)
+
+    with (
+        WPSDataset(ds_path=None, ds=source_ds) as source_wps_ds,
+        WPSDataset(ds_path=None, ds=target_ds) as target_wps_ds,
+    ):
+        with pytest.raises(ValueError, match="No target pixel centre"):
+            source_wps_ds.warp_to_match(target_wps_ds, reuse_warp_plan=True)
+
+
+def test_raster_warp_with_plan_reuses_plan_and_clamps():
+    source_ds = create_test_dataset(
+        "test_dataset_1.tif", 4, 4, (0, 40, 0, 40), 3005, fill_value=90, no_data_value=-1
+    )
+    band = source_ds.GetRasterBand(1)
+    array = band.ReadAsArray()
+    array[0, 0] = 101  # value to be clamped
+    array[3, 3] = -1  # nodata isn't clamped
+    band.WriteArray(array)
+    target_ds = create_test_dataset("test_dataset_2.tif", 4, 4, (0, 40, 0, 40), 3005)
+
+    get_warp_plan.cache_clear()
+    with (
+        WPSDataset(ds_path=None, ds=source_ds) as source_wps_ds,
+        WPSDataset(ds_path=None, ds=target_ds) as target_wps_ds,
+    ):
+        output_ds = source_wps_ds.warp_to_match(target_wps_ds, max_value=100, reuse_warp_plan=True)
+        source_wps_ds.warp_to_match(target_wps_ds, max_value=100, reuse_warp_plan=True)
+        out_array = output_ds.as_gdal_ds().GetRasterBand(1).ReadAsArray()
+
+    assert out_array[0, 0] == 100
+    assert out_array[3, 3] == -1
+    assert np.count_nonzero(out_array == 90) == 14
+    assert get_warp_plan.cache_info().hits == 1
+
+
 def test_export_to_geotiff():
     extent1 = (-1, 1, -1, 1)  # xmin, xmax, ymin, ymax
     ds_1 = create_test_dataset(
@@ -535,6 +680,22 @@ class TestExtractValueAtPoint:
         with WPSDataset(ds_path=None, ds=gdal_ds) as ds:
             assert ds.extract_value_at_point(lat=58.5, lon=-129.5) == pytest.approx(7.0)
 
+    def test_extract_values_at_points_masks_out_of_bounds_and_nodata(self):
+        gdal_ds = create_test_dataset(
+            "test.tif", 10, 10, self._EXTENT, 4326, fill_value=1.0, no_data_value=-9999.0
+        )
+        values = np.arange(100, dtype=np.float32).reshape(10, 10)
+        values[5, 4] = -9999.0
+        gdal_ds.GetRasterBand(1).WriteArray(values)
+        lats = np.array([58.5, 53.5, 0.0, 53.5, 50.5])
+        lons = np.array([-129.5, -125.5, 0.0, -130.0005, -121.5])
+        with WPSDataset(ds_path=None, ds=gdal_ds) as ds:
+            result = ds.extract_values_at_points(lats, lons)
+
+        assert result.mask.tolist() == [False, True, True, True, False]
+        assert result[0] == pytest.approx(0.0)
+        assert result[4] == pytest.approx(88.0)
+
 
 class TestApplyMask:
     """Tests for WPSDataset.apply_mask method."""
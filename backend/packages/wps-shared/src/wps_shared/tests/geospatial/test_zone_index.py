@@ -0,0 +1,163 @@
+import hashlib
+
+import numpy as np
+import pytest
+from osgeo import gdal, osr
+from shapely.geometry import box
+
+from wps_shared.geospatial.raster_cache import RasterCache
+from wps_shared.geospatial.zone_index import (
+    ZoneIndex,
+    get_zone_id_raster_key,
+    get_zone_id_raster_path,
+    get_zone_index,
+    write_zone_id_raster,
+)
+
+
+def test_zone_index_pixel_indices():
+    zone_ids = np.array([[3, 3, 0], [5, 3, 5]], dtype=np.int32)
+    data = np.array([[1, 2, 3], [4, 5, 6]])
+
+    zone_index = ZoneIndex(zone_ids)
+
+    assert zone_index.zone_ids == [3, 5]
+    assert zone_index.pixel_indices(3).tolist() == [0, 1, 4]
+    assert zone_index.values(data, 3).tolist() == [1, 2, 5]
+    assert zone_index.values(data, 5).tolist() == [4, 6]
+    # zones without any pixels are empty, not an error
+    assert zone_index.values(data, 7).tolist() == []
+
+
+def test_zone_index_values_shape_mismatch():
+    zone_index = ZoneIndex(np.ones((2, 2), dtype=np.int32))
+
+    with pytest.raises(ValueError):
+        zone_index.values(np.ones((3, 2)), 1)
+
+
+def _create_reference_ds() -> gdal.Dataset:
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3005)
+    ds = gdal.GetDriverByName("MEM").Create("", 4, 2, 1, gdal.GDT_Float32)
+    ds.SetGeoTransform((1000000, 2000, 0, 1000000, 0, -2000))
+    ds.SetProjection(srs.ExportToWkt())
+    return ds
+
+
+def _zone_srs() -> osr.SpatialReference:
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(3005)
+    srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return srs
+
+
+ZONES = [
+    (7, box(1000000, 996000, 1004000, 1000000).wkb),
+    (9, box(1004000, 996000, 1008000, 1000000).wkb),
+]
+
+
+def test_get_zone_id_raster_key_changes_with_zones():
+    reference_ds = _create_reference_ds()
+
+    key = get_zone_id_raster_key(reference_ds, ZONES)
+
+    assert key.startswith("zone_ids/v2/")
+    assert key == get_zone_id_raster_key(reference_ds, list(reversed(ZONES)))
+    assert key != get_zone_id_raster_key(reference_ds, ZONES[:1])
+
+
+class FakeBody:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def read(self, size: int) -> bytes:
+        chunk, self.content = self.content[:size], self.content[size:]
+        return chunk
+
+
+class InMemoryS3Client:
+    """Just enough of an S3Client to persist and cache zone id rasters, kept in memory."""
+
+    bucket = "test-bucket"
+
+    def __init__(self, objects: dict[str, bytes] | None = None):
+        self.objects = dict(objects or {})
+        self.uploaded_keys = []
+
+    async def object_exists(self, key: str) -> bool:
+        return key in self.objects
+
+    async def get_etag(self, key: str) -> str:
+        return hashlib.md5(self.objects[key]).hexdigest()
+
+    async def get_object(self, key: str):
+        return {"Body": FakeBody(self.objects[key])}
+
+    async def upload_stream(self, key: str, chunks) -> int:
+        self.objects[key] = b"".join([chunk async for chunk in chunks])
+        self.uploaded_keys.append(key)
+        return len(self.objects[key])
+
+
+@pytest.mark.anyio
+async def test_get_zone_index_creates_and_persists_zone_ids(tmp_path):
+    reference_ds = _create_reference_ds()
+    s3_client = InMemoryS3Client()
+    raster_cache = RasterCache(str(tmp_path / "cache"))
+
+    zone_index = await get_zone_index(s3_client, reference_ds, ZONES, _zone_srs(), raster_cache)
+
+    assert zone_index.pixel_indices(7).tolist() == [0, 1, 4, 5]
+    assert zone_index.pixel_indices(9).tolist() == [2, 3, 6, 7]
+    assert s3_client.uploaded_keys == [get_zone_id_raster_key(reference_ds, ZONES)]
+
+
+@pytest.mark.anyio
+async def test_get_zone_index_reads_persisted_zone_ids(tmp_path):
+    reference_ds = _create_reference_ds()
+    # persisted zone ids that differ from the zones, to tell reading them apart from rasterizing
+    persisted_path = str(tmp_path / "persisted.tif")
+    persisted_zones = [(7, box(1000000, 998000, 1004000, 1000000).wkb)]
+    write_zone_id_raster(reference_ds, persisted_zones, _zone_srs(), persisted_path)
+    with open(persisted_path, "rb") as f:
+        s3_client = InMemoryS3Client({get_zone_id_raster_key(reference_ds, ZONES): f.read()})
+    raster_cache = RasterCache(str(tmp_path / "cache"))
+
+    zone_index = await get_zone_index(s3_client, reference_ds, ZONES, _zone_srs(), raster_cache)
+
+    assert zone_index.pixel_indices(7).tolist() == [0, 1]
+    assert zone_index.zone_ids == [7]
+    assert s3_client.uploaded_keys == []
+
+
+@pytest.mark.anyio
+async def test_get_zone_id_raster_path_is_tiled_uint16(tmp_path):
+    reference_ds = _create_reference_ds()
+    raster_cache = RasterCache(str(tmp_path / "cache"))
+
+    path = await get_zone_id_raster_path(
+        InMemoryS3Client(), reference_ds, ZONES, _zone_srs(), raster_cache
+    )
+
+    with gdal.Open(path) as zone_ds:
+        zone_band = zone_ds.GetRasterBand(1)
+        assert zone_band.DataType == gdal.GDT_UInt16
+        assert zone_band.GetBlockSize() == [512, 512]
+        assert zone_band.GetNoDataValue() == 0
+        assert zone_ds.GetGeoTransform() == reference_ds.GetGeoTransform()
+        assert zone_band.ReadAsArray().tolist() == [[7, 7, 9, 9], [7, 7, 9, 9]]
+
+
+def test_write_zone_id_raster_rejects_ids_outside_uint16(tmp_path):
+    with pytest.raises(ValueError):
+        write_zone_id_raster(
+            _create_reference_ds(), [(70000, ZONES[0][1])], _zone_srs(), str(tmp_path / "ids.tif")
+        )
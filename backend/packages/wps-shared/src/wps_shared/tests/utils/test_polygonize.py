@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import shapely
+from osgeo import gdal
+
+from wps_shared.utils.polygonize import dissolve_seam_pieces, polygonize_in_memory, polygonize_tiled
+
+
+def test_dissolve_seam_pieces():
+    values = np.array([1, 1, 1, 2, 1])
+    polygons = np.array(
+        [
+            shapely.box(0, 0, 2, 2),
+            # shares an edge with the first piece
+            shapely.box(2, 0, 4, 1),
+            # only touches the second piece at a corner
+            shapely.box(4, 1, 5, 2),
+            # shares an edge, but has a different value
+            shapely.box(0, 2, 2, 3),
+            # connected to the first piece through the second
+            shapely.box(3, -1, 4, 0),
+        ]
+    )
+
+    dissolved = sorted(dissolve_seam_pieces(values, polygons), key=lambda feature: (feature[0], feature[1].area))
+
+    assert [(value, polygon.area) for value, polygon in dissolved] == [(1, 1), (1, 7), (2, 2)]
+    assert all(polygon.geom_type == "Polygon" for _, polygon in dissolved)
+
+
+def test_polygonize_tiled_matches_in_memory():
+    rng = np.random.default_rng(0)
+    data = np.kron(rng.integers(0, 4, (6, 7)), np.ones((5, 5), dtype=np.int64)).astype(np.uint8)
+    data[rng.random(data.shape) < 0.05] = 255
+    ds = gdal.GetDriverByName("MEM").Create("", data.shape[1], data.shape[0], 1, gdal.GDT_Byte)
+    ds.SetGeoTransform((1000000, 100, 0, 1000000, 0, -100))
+    band = ds.GetRasterBand(1)
+    band.SetNoDataValue(255)
+    band.WriteArray(data)
+
+    with polygonize_in_memory(ds, "test", "value") as layer:
+        expected = sorted(
+            (feature.GetField(0), round(shapely.from_wkb(bytes(feature.GetGeometryRef().ExportToWkb())).area))
+            for feature in layer
+        )
+    tiled = sorted((value, round(polygon.area)) for value, polygon in polygonize_tiled(ds, tile_size=8))
+
+    assert tiled == expected
+
+
+@pytest.mark.parametrize(
+    "data_type,nodata_value",
+    [(gdal.GDT_Int16, -1), (gdal.GDT_Float32, -9999.0)],
+)
+def test_polygonize_tiled_keeps_values_outside_byte_range(data_type: int, nodata_value: float):
+    data = np.array(
+        [
+            [300, 300, 1000, 1000],
+            [300, 300, 1000, 1000],
+            [256, nodata_value, 1000, 1000],
+        ]
+    )
+    ds = gdal.GetDriverByName("MEM").Create("", data.shape[1], data.shape[0], 1, data_type)
+    ds.SetGeoTransform((1000000, 100, 0, 1000000, 0, -100))
+    band = ds.GetRasterBand(1)
+    band.SetNoDataValue(nodata_value)
+    band.WriteArray(data)
+
+    tiled = sorted((value, round(polygon.area)) for value, polygon in polygonize_tiled(ds, tile_size=2))
+
+    assert tiled == [(256, 10000), (300, 40000), (1000, 60000)]
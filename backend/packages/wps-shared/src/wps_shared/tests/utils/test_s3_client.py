@@ -639,3 +639,65 @@ async def test_object_exists_raises_on_non_404_client_error(code: str):
         s3.client.head_object.side_effect = make_client_error(code)
         with pytest.raises(ClientError):
             await s3.object_exists("some/key.tif")
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.anyio
+async def test_upload_stream_small_object_uses_put_object(s3_client_mock):
+    size = await s3_client_mock.upload_stream("key", _chunks(b"ab", b"cd"), part_size=5)
+
+    assert size == 4
+    s3_client_mock.client.put_object.assert_awaited_once_with(
+        Bucket=s3_client_mock.bucket, Key="key", Body=b"abcd"
+    )
+    s3_client_mock.client.create_multipart_upload.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_upload_stream_large_object_uses_multipart_upload(s3_client_mock):
+    s3_client_mock.client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    s3_client_mock.client.upload_part.side_effect = [{"ETag": "1"}, {"ETag": "2"}, {"ETag": "3"}]
+
+    size = await s3_client_mock.upload_stream("key", _chunks(b"abc", b"defgh", b"ijkl"), part_size=5)
+
+    assert size == 12
+    assert [call.kwargs["Body"] for call in s3_client_mock.client.upload_part.call_args_list] == [
+        b"abcde",
+        b"fghij",
+        b"kl",
+    ]
+    s3_client_mock.client.complete_multipart_upload.assert_awaited_once_with(
+        Bucket=s3_client_mock.bucket,
+        Key="key",
+        UploadId="upload-id",
+        MultipartUpload={
+            "Parts": [
+                {"ETag": "1", "PartNumber": 1},
+                {"ETag": "2", "PartNumber": 2},
+                {"ETag": "3", "PartNumber": 3},
+            ]
+        },
+    )
+    s3_client_mock.client.put_object.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_upload_stream_aborts_multipart_upload_on_error(s3_client_mock):
+    s3_client_mock.client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    s3_client_mock.client.upload_part.return_value = {"ETag": "1"}
+
+    async def failing_chunks():
+        yield b"abcdef"
+        raise ConnectionError("connection reset")
+
+    with pytest.raises(ConnectionError):
+        await s3_client_mock.upload_stream("key", failing_chunks(), part_size=5)
+
+    s3_client_mock.client.abort_multipart_upload.assert_awaited_once_with(
+        Bucket=s3_client_mock.bucket, Key="key", UploadId="upload-id"
+    )
+    s3_client_mock.client.complete_multipart_upload.assert_not_called()
@@ -2,21 +2,26 @@
 
 import logging
 from contextlib import contextmanager
+from typing import Generator, Tuple, Union
 
 import numpy as np
+import shapely
 from osgeo import gdal, ogr, osr
 
 logger = logging.getLogger(__name__)
 
+# Width and height, in pixels, of the windows polygonize_tiled reads at a time.
+POLYGONIZE_TILE_SIZE = 2048
 
-def _create_in_memory_band(data: np.ndarray, cols, rows, projection, geotransform):
+
+def _create_in_memory_band(data: np.ndarray, cols, rows, projection, geotransform, data_type=gdal.GDT_Byte):
     """Create an in memory data band to represent a single raster layer.
     See https://gdal.org/user/raster_data_model.html#raster-band for a complete
     description of what a raster band is.
     """
     mem_driver = gdal.GetDriverByName("MEM")
 
-    dataset = mem_driver.Create("memory", cols, rows, 1, gdal.GDT_Byte)
+    dataset = mem_driver.Create("memory", cols, rows, 1, data_type)
     dataset.SetProjection(projection)
     dataset.SetGeoTransform(geotransform)
     band = dataset.GetRasterBand(1)
@@ -26,9 +31,12 @@ def _create_in_memory_band(data: np.ndarray, cols, rows, projection, geotransfor
 
 
 @contextmanager
-def polygonize_in_memory(geotiff_filename, layer, field) -> ogr.Layer:
-    """Given some tiff file, return a polygonized version of it, in memory, as an ogr layer."""
-    source: gdal.Dataset = gdal.Open(geotiff_filename, gdal.GA_ReadOnly)
+def polygonize_in_memory(geotiff_filename: Union[str, gdal.Dataset], layer, field) -> ogr.Layer:
+    """Given some tiff file, or an already open dataset, return a polygonized version of it, in memory, as an ogr layer."""
+    if isinstance(geotiff_filename, gdal.Dataset):
+        source = geotiff_filename
+    else:
+        source: gdal.Dataset = gdal.Open(geotiff_filename, gdal.GA_ReadOnly)
 
     source_band = source.GetRasterBand(1)
     nodata_value = source_band.GetNoDataValue()
@@ -65,6 +73,135 @@ def polygonize_in_memory(geotiff_filename, layer, field) -> ogr.Layer:
     del dst_ds, dst_layer
 
 
+def _polygonize_tile(
+    source_band: gdal.Band, nodata_value, xoff: int, yoff: int, cols: int, rows: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Polygonize a single window of a raster band. The polygons are in pixel coordinates of the whole
+    raster, so pieces of the same feature in neighbouring windows share exactly the same edges.
+
+    :return: pixel values and polygons of every feature in the window
+    """
+    tile_data = source_band.ReadAsArray(xoff, yoff, cols, rows)
+    # the tile keeps the source data type, so values aren't truncated before polygonizing
+    tile_ds, tile_band = _create_in_memory_band(
+        tile_data, cols, rows, "", (xoff, 1, 0, yoff, 0, 1), source_band.DataType
+    )
+    mask_data = tile_data != nodata_value if nodata_value is not None else np.ones(tile_data.shape, dtype=bool)
+    mask_ds, mask_band = _create_in_memory_band(mask_data, cols, rows, "", (xoff, 1, 0, yoff, 0, 1))
+
+    dst_ds: ogr.DataSource = ogr.GetDriverByName("MEM").CreateDataSource("tile")
+    dst_layer: ogr.Layer = dst_ds.CreateLayer("tile", None, ogr.wkbPolygon)
+    dst_layer.CreateField(ogr.FieldDefn("value", ogr.OFTInteger))
+    gdal.Polygonize(tile_band, mask_band, dst_layer, 0, [], callback=None)
+
+    values = []
+    polygons = []
+    for feature in dst_layer:
+        values.append(feature.GetField(0))
+        polygons.append(bytes(feature.GetGeometryRef().ExportToWkb()))
+    del tile_ds, tile_band, mask_ds, mask_band, dst_layer, dst_ds
+    return np.array(values, dtype=np.int64), shapely.from_wkb(polygons)
+
+
+def _touches_tile_seam(
+    polygons: np.ndarray, xoff: int, yoff: int, cols: int, rows: int, raster_cols: int, raster_rows: int
+) -> np.ndarray:
+    """Mask of the polygons, in pixel coordinates, that reach an edge of their window shared with another window."""
+    minx, miny, maxx, maxy = shapely.bounds(polygons).T
+    return (
+        ((minx == xoff) & (xoff > 0))
+        | ((maxx == xoff + cols) & (xoff + cols < raster_cols))
+        | ((miny == yoff) & (yoff > 0))
+        | ((maxy == yoff + rows) & (yoff + rows < raster_rows))
+    )
+
+
+def _find_root(parents: list[int], i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def dissolve_seam_pieces(values: np.ndarray, polygons: np.ndarray) -> Generator[Tuple[int, shapely.Geometry], None, None]:
+    """
+    Dissolve pieces of features that were split across window seams back into whole features.
+    Pieces are only joined when they have the same value and share an edge, matching the 4-connectedness
+    gdal.Polygonize uses; pieces that only share a corner stay separate features.
+
+    :param values: pixel value of every piece
+    :param polygons: every piece, in pixel coordinates
+    :return: generator of (pixel value, dissolved polygon)
+    """
+    parents = list(range(len(polygons)))
+    tree = shapely.STRtree(polygons)
+    left, right = tree.query(polygons, predicate="intersects")
+    candidates = (left < right) & (values[left] == values[right])
+    left, right = left[candidates], right[candidates]
+    shares_edge = shapely.get_dimensions(shapely.intersection(polygons[left], polygons[right])) >= 1
+    for i, j in zip(left[shares_edge], right[shares_edge]):
+        root_i, root_j = _find_root(parents, int(i)), _find_root(parents, int(j))
+        if root_i != root_j:
+            parents[root_j] = root_i
+
+    components: dict[int, list[int]] = {}
+    for i in range(len(polygons)):
+        components.setdefault(_find_root(parents, i), []).append(i)
+    for root, members in components.items():
+        if len(members) == 1:
+            yield int(values[root]), polygons[root]
+        else:
+            yield int(values[root]), shapely.union_all(polygons[members])
+
+
+def _pixel_to_geo(polygons: np.ndarray, geotransform) -> np.ndarray:
+    """Apply a gdal geotransform to polygons in pixel coordinates."""
+    matrix = np.array([[geotransform[1], geotransform[4]], [geotransform[2], geotransform[5]]])
+    origin = np.array([geotransform[0], geotransform[3]])
+    return shapely.transform(polygons, lambda coords: coords @ matrix + origin)
+
+
+def polygonize_tiled(
+    raster: Union[str, gdal.Dataset], tile_size: int = POLYGONIZE_TILE_SIZE
+) -> Generator[Tuple[int, shapely.Geometry], None, None]:
+    """
+    Polygonize a raster one window at a time, so peak memory is bounded by the window size rather than
+    the raster size. Features entirely inside a window are yielded as soon as the window is processed,
+    features that cross window seams are dissolved and yielded once every window has been processed.
+
+    :param raster: path to a raster, or an already open dataset, polygonizing band 1
+    :param tile_size: width and height of the windows, in pixels
+    :return: generator of (pixel value, polygon in the raster's spatial reference)
+    """
+    if isinstance(raster, gdal.Dataset):
+        source = raster
+    else:
+        source: gdal.Dataset = gdal.Open(raster, gdal.GA_ReadOnly)
+    source_band: gdal.Band = source.GetRasterBand(1)
+    nodata_value = source_band.GetNoDataValue()
+    geotransform = source.GetGeoTransform()
+    raster_cols, raster_rows = source_band.XSize, source_band.YSize
+
+    seam_values = []
+    seam_polygons = []
+    for yoff in range(0, raster_rows, tile_size):
+        rows = min(tile_size, raster_rows - yoff)
+        for xoff in range(0, raster_cols, tile_size):
+            cols = min(tile_size, raster_cols - xoff)
+            values, polygons = _polygonize_tile(source_band, nodata_value, xoff, yoff, cols, rows)
+            on_seam = _touches_tile_seam(polygons, xoff, yoff, cols, rows, raster_cols, raster_rows)
+            seam_values.append(values[on_seam])
+            seam_polygons.append(polygons[on_seam])
+            yield from zip(values[~on_seam].tolist(), _pixel_to_geo(polygons[~on_seam], geotransform))
+
+    seam_values = np.concatenate(seam_values) if seam_values else np.empty(0, dtype=np.int64)
+    seam_polygons = np.concatenate(seam_polygons) if seam_polygons else np.empty(0, dtype=object)
+    logger.info("Dissolving %d polygons that cross tile seams", len(seam_polygons))
+    for value, polygon in dissolve_seam_pieces(seam_values, seam_polygons):
+        yield value, _pixel_to_geo(polygon, geotransform)
+
+
 def polygonize_geotiff_to_shapefile(raster_source_filename: str, vector_dest_filename: str):
     """
     TODO: Automate this.
@@ -2,7 +2,7 @@ import hashlib
 import io
 import logging
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 import aiofiles
 from aiobotocore.session import get_session
@@ -13,6 +13,9 @@ from wps_shared.geospatial.wps_dataset import WPSDataset
 
 logger = logging.getLogger(__name__)
 
+# S3 requires every part of a multipart upload, except the last, to be at least 5MB.
+MULTIPART_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
 
 class S3Client:
     def __init__(
@@ -64,6 +67,11 @@ class S3Client:
                 return False
         return True
 
+    async def get_etag(self, key: str) -> str:
+        """Return the ETag of an object, without the surrounding quotes."""
+        response = await self.client.head_object(Bucket=self.bucket, Key=key)
+        return response["ETag"].strip('"')
+
     async def get_content_hash(self, key, hash_alg: str = "sha256"):
         response = await self.client.get_object(Bucket=self.bucket, Key=key)
         async with response["Body"] as stream:
@@ -99,6 +107,73 @@ class S3Client:
     async def put_object(self, key: str, body: Any):
         await self.client.put_object(Bucket=self.bucket, Key=key, Body=body)
 
+    async def upload_stream(
+        self, key: str, chunks: AsyncIterator[bytes], part_size: int = MULTIPART_UPLOAD_PART_SIZE
+    ) -> int:
+        """
+        Upload a stream of bytes to an object, holding at most one part in memory at a time.
+
+        Streams that fit in a single part are uploaded with put_object, larger streams with a
+        multipart upload, which is aborted if anything goes wrong so no orphaned parts are left.
+
+        :param key: s3 key to upload to
+        :param chunks: async iterator of bytes, e.g. an aiohttp response.content.iter_chunked(...)
+        :param part_size: size of the multipart upload parts, S3 requires at least 5MB
+        :return: number of bytes uploaded
+        """
+        buffer = bytearray()
+        upload_id = None
+        parts = []
+        size = 0
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                size += len(chunk)
+                while len(buffer) >= part_size:
+                    if upload_id is None:
+                        response = await self.client.create_multipart_upload(
+                            Bucket=self.bucket, Key=key
+                        )
+                        upload_id = response["UploadId"]
+                    part_number = len(parts) + 1
+                    response = await self.client.upload_part(
+                        Bucket=self.bucket,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=part_number,
+                        Body=bytes(buffer[:part_size]),
+                    )
+                    parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+                    del buffer[:part_size]
+
+            if upload_id is None:
+                await self.put_object(key=key, body=bytes(buffer))
+                return size
+
+            if buffer:
+                part_number = len(parts) + 1
+                response = await self.client.upload_part(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=bytes(buffer),
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+            await self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+            return size
+        except BaseException:
+            if upload_id is not None:
+                try:
+                    await self.client.abort_multipart_upload(
+                        Bucket=self.bucket, Key=key, UploadId=upload_id
+                    )
+                except ClientError as e:
+                    logger.warning("Failed to abort multipart upload for %s: %s", key, e)
+            raise
+
     async def copy_object(self, old_key: str, new_key: str):
         await self.client.copy_object(
             Bucket=self.bucket, CopySource={"Bucket": self.bucket, "Key": old_key}, Key=new_key
@@ -4,7 +4,6 @@ import datetime
 import logging
 from collections import defaultdict
 from datetime import time
-from itertools import groupby
 from time import perf_counter
 from typing import List
 
@@ -13,8 +12,8 @@ from sqlalchemy.orm import Session
 
 import wps_shared.db.database
 from wps_shared.db.crud.weather_models import (
-    get_latest_station_model_prediction_per_day,
-    get_latest_station_prediction,
+    get_latest_station_model_predictions_for_range,
+    get_latest_station_predictions_for_range,
     get_station_model_prediction_from_previous_model_run,
     get_station_model_predictions,
 )
@@ -101,26 +100,45 @@ def fetch_model_run_predictions_by_station_code_and_date_range(
         return marshall_predictions(session, model, historic_predictions, all_stations)
 
 
+def _get_range_window(start_time: datetime.datetime, end_time: datetime.datetime):
+    """Returns the start of the first day and the end of the last day in the range, in Vancouver time."""
+    days = get_days_from_range(start_time, end_time)
+    if len(days) == 0:
+        return None
+    range_start = datetime.datetime.combine(days[0], time.min, tzinfo=vancouver_tz)
+    range_end = datetime.datetime.combine(days[-1], time.max, tzinfo=vancouver_tz)
+    return range_start, range_end
+
+
 def fetch_latest_daily_model_run_predictions_by_station_code_and_date_range(
     model: ModelEnum,
     station_codes: List[int],
     start_time: datetime.datetime,
     end_time: datetime.datetime,
     all_stations: List[WeatherStation],
-) -> List[WeatherStationModelRunsPredictions]:
-    results = []
-    days = get_days_from_range(start_time, end_time)
+) -> List[WeatherStationModelPredictionValues]:
+    """Fetch the latest 20:00UTC model prediction per station for each day in the date range, ordered
+    by day and station code."""
+    window = _get_range_window(start_time, end_time)
+    if window is None:
+        return []
     stations = {station.code: station for station in all_stations}
 
     with wps_shared.db.database.get_read_session_scope() as session:
-        for day in days:
-            day_results = []
-
-            day_start = datetime.datetime.combine(day, time.min, tzinfo=vancouver_tz)
-            day_end = datetime.datetime.combine(day, time.max, tzinfo=vancouver_tz)
-
-            daily_result = get_latest_station_model_prediction_per_day(
-                session, station_codes, model, day_start, day_end
+        return [
+            WeatherStationModelPredictionValues(
+                id=str(id),
+                abbreviation=model_abbrev,
+                station=stations[station_code],
+                temperature=temp,
+                bias_adjusted_temperature=bias_adjusted_temp,
+                relative_humidity=rh,
+                bias_adjusted_relative_humidity=bias_adjusted_rh,
+                precip_24hours=precip_24hours,
+                wind_speed=wind_speed,
+                wind_direction=wind_dir,
+                datetime=timestamp,
+                update_date=update_date,
             )
             for (
                 id,
@@ -135,33 +153,10 @@ def fetch_latest_daily_model_run_predictions_by_station_code_and_date_range(
                 wind_dir,
                 wind_speed,
                 update_date,
-            ) in daily_result:
-                day_results.append(
-                    WeatherStationModelPredictionValues(
-                        id=str(id),
-                        abbreviation=model_abbrev,
-                        station=stations[station_code],
-                        temperature=temp,
-                        bias_adjusted_temperature=bias_adjusted_temp,
-                        relative_humidity=rh,
-                        bias_adjusted_relative_humidity=bias_adjusted_rh,
-                        precip_24hours=precip_24hours,
-                        wind_speed=wind_speed,
-                        wind_direction=wind_dir,
-                        datetime=timestamp,
-                        update_date=update_date,
-                    )
-                )
-            # sort the list by station_code
-            day_results.sort(key=lambda x: x.station.code)
-
-            # group the list by station_code
-            groups = groupby(day_results, key=lambda x: x.station.code)
-            for station_code, station_predictions in groups:
-                prediction_list = list(station_predictions)
-                latest_for_station = max(prediction_list, key=lambda x: x.update_date)
-                results.append(latest_for_station)
-        return results
+            ) in get_latest_station_model_predictions_for_range(
+                session, station_codes, model, *window
+            )
+        ]
 
 
 def fetch_latest_model_run_predictions_by_station_code_and_date_range(
@@ -172,84 +167,64 @@ def fetch_latest_model_run_predictions_by_station_code_and_date_range(
 ) -> List[WeatherIndeterminate]:
     cffdrs_start = perf_counter()
     results: List[WeatherIndeterminate] = []
-    days = get_days_from_range(start_time, end_time)
+    window = _get_range_window(start_time, end_time)
+    if window is None:
+        return results
     stations = {station.code: station for station in all_stations}
-    active_station_codes = stations.keys()
-    for day in days:
-        day_start = datetime.datetime.combine(day, time.min, tzinfo=vancouver_tz)
-        day_end = datetime.datetime.combine(day, time.max, tzinfo=vancouver_tz)
-
-        daily_result = get_latest_station_prediction(
-            session, active_station_codes, day_start, day_end
-        )
-        for (
-            timestamp,
-            model_abbrev,
-            prediction_run_timestamp,
-            station_code,
-            rh,
-            temp,
-            bias_adjusted_temp,
-            bias_adjusted_rh,
-            bias_adjusted_wind_speed,
-            bias_adjusted_wdir,
-            precip_24hours,
-            bias_adjusted_precip_24h,
-            wind_dir,
-            wind_speed,
-        ) in daily_result:
-            if model_abbrev == ModelEnum.ECMWF.value:
-                continue
-            # Create two WeatherIndeterminates, one for model predictions and one for bias corrected predictions
-            results.append(
-                WeatherIndeterminate(
-                    station_code=station_code,
-                    station_name=stations[station_code].name,
-                    determinate=model_abbrev,
-                    utc_timestamp=timestamp,
-                    temperature=temp,
-                    relative_humidity=rh,
-                    precipitation=precip_24hours,
-                    wind_direction=wind_dir,
-                    wind_speed=wind_speed,
-                    prediction_run_timestamp=prediction_run_timestamp,
-                )
+    active_station_codes = list(stations.keys())
+
+    for (
+        timestamp,
+        model_abbrev,
+        prediction_run_timestamp,
+        station_code,
+        rh,
+        temp,
+        bias_adjusted_temp,
+        bias_adjusted_rh,
+        bias_adjusted_wind_speed,
+        bias_adjusted_wdir,
+        precip_24hours,
+        bias_adjusted_precip_24h,
+        wind_dir,
+        wind_speed,
+    ) in get_latest_station_predictions_for_range(session, active_station_codes, *window):
+        if model_abbrev == ModelEnum.ECMWF.value:
+            continue
+        # Create two WeatherIndeterminates, one for model predictions and one for bias corrected predictions
+        results.append(
+            WeatherIndeterminate(
+                station_code=station_code,
+                station_name=stations[station_code].name,
+                determinate=model_abbrev,
+                utc_timestamp=timestamp,
+                temperature=temp,
+                relative_humidity=rh,
+                precipitation=precip_24hours,
+                wind_direction=wind_dir,
+                wind_speed=wind_speed,
+                prediction_run_timestamp=prediction_run_timestamp,
             )
-            results.append(
-                WeatherIndeterminate(
-                    station_code=station_code,
-                    station_name=stations[station_code].name,
-                    determinate=f"{model_abbrev}_BIAS",
-                    utc_timestamp=timestamp,
-                    temperature=bias_adjusted_temp,
-                    relative_humidity=bias_adjusted_rh,
-                    precipitation=bias_adjusted_precip_24h,
-                    wind_speed=bias_adjusted_wind_speed,
-                    wind_direction=bias_adjusted_wdir,
-                    prediction_run_timestamp=prediction_run_timestamp,
-                )
+        )
+        results.append(
+            WeatherIndeterminate(
+                station_code=station_code,
+                station_name=stations[station_code].name,
+                determinate=f"{model_abbrev}_BIAS",
+                utc_timestamp=timestamp,
+                temperature=bias_adjusted_temp,
+                relative_humidity=bias_adjusted_rh,
+                precipitation=bias_adjusted_precip_24h,
+                wind_speed=bias_adjusted_wind_speed,
+                wind_direction=bias_adjusted_wdir,
+                prediction_run_timestamp=prediction_run_timestamp,
             )
-    post_processed_results = post_process_fetched_predictions(results)
+        )
     cffdrs_end = perf_counter()
     delta = cffdrs_end - cffdrs_start
     # Any delta below 100 milliseconds is just noise in the logs.
     if delta > 0.1:
         logger.info("%f delta count before and after latest prediction model query", delta)
-    return post_processed_results
-
-
-def post_process_fetched_predictions(weather_indeterminates: List[WeatherIndeterminate]):
-    results: List[WeatherIndeterminate] = []
-    grouped_data = defaultdict(list)
-
-    for weather_indeterminate in weather_indeterminates:
-        key = f"${weather_indeterminate.station_code}-${str(weather_indeterminate.determinate)}-${weather_indeterminate.utc_timestamp.date()}"
-        grouped_data[key].append(weather_indeterminate)
-
-    for key, station_indeterminates in grouped_data.items():
-        latest_for_station = max(station_indeterminates, key=lambda x: x.utc_timestamp)
-        results.append(latest_for_station)
-
     return results
 
 
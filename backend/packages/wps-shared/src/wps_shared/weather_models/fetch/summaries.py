@@ -2,15 +2,10 @@
 
 import datetime
 import logging
-from typing import List, Union
-
-from numpy import percentile
+from typing import List
 
 import wps_shared.db.database
-from wps_shared.db.crud.weather_models import (
-    get_station_model_predictions_order_by_prediction_timestamp,
-)
-from wps_shared.db.models.weather_models import PredictionModel, WeatherStationModelPrediction
+from wps_shared.db.crud.weather_models import get_station_model_prediction_summaries
 from wps_shared.schemas.stations import WeatherStation
 from wps_shared.schemas.weather_models import (
     WeatherModelPredictionSummary,
@@ -23,118 +18,19 @@ logger = logging.getLogger(__name__)
 
 
 KEYS = ("tmp_tgl_2", "rh_tgl_2")
+PERCENTILES = ("5th", "median", "90th")
 
 
-def _build_query_to_get_predictions(
-    station_codes: List[int], model: ModelEnum, time_of_interest: datetime
-) -> List[Union[WeatherStationModelPrediction, PredictionModel]]:
-    """Build a query to get the predictions for a given list of weather stations for a specified
+def _get_prediction_summaries(station_codes: List[int], model: ModelEnum, time_of_interest: datetime):
+    """Get the summarized predictions for a given list of weather stations for a specified
     model.
     """
-    # Build the query:
     with wps_shared.db.database.get_read_session_scope() as session:
         # We are only interested in the last 5 days.
         back_5_days = time_of_interest - datetime.timedelta(days=5)
-        response = get_station_model_predictions_order_by_prediction_timestamp(
+        return get_station_model_prediction_summaries(
             session, station_codes, model, back_5_days, time_of_interest
-        )
-    return response
-
-
-class ModelPredictionSummaryBuilder:
-    """Class for generating ModelPredictionSummaries"""
-
-    def __init__(self, stations):
-        """Prepare class."""
-        self.prev_time = None
-        self.prev_station = None
-        self.values = None
-        self.prediction_summaries = []
-        self.prediction_summary = None
-        self.stations = stations
-
-    def init_values(self):
-        """Initialize values."""
-        self.values = {}
-        for key in KEYS:
-            self.values[key] = []
-
-    def calculate_and_append_percentiles(self, timestamp: datetime.datetime, values: dict) -> None:
-        """Calculate percentiles and append."""
-        data = {"datetime": timestamp}
-        for key in KEYS:
-            data["{}_5th".format(key)] = percentile(values[key], 5)
-            data["{}_median".format(key)] = percentile(values[key], 50)
-            data["{}_90th".format(key)] = percentile(values[key], 90)
-        summary_value = WeatherModelPredictionSummaryValues(**data)
-        self.prediction_summary.values.append(summary_value)
-
-    def calculate_summaries(self, prev_time):
-        """Calculate and append percentiles if present"""
-        if self.values:
-            self.calculate_and_append_percentiles(self.prev_time, self.values)
-        self.prev_time = prev_time
-        self.values = None
-
-    def handle_new_station(
-        self, prediction: WeatherStationModelPrediction, prediction_model: PredictionModel
-    ):
-        """When a new station is detected, we need to:
-        -) calculate percentiles for accumulated values.
-        -) prepare a summary for the new station.
-        """
-        self.prev_station = prediction.station_code
-        self.prediction_summary = WeatherModelPredictionSummary(
-            station=self.stations[prediction.station_code],
-            model=WeatherPredictionModel(
-                name=prediction_model.name, abbrev=prediction_model.abbreviation
-            ),
-            values=[],
-        )
-        self.prediction_summaries.append(self.prediction_summary)
-        # Set prev_time (so that we don't trigger calculate_summaries)
-        self.prev_time = prediction.prediction_timestamp
-
-    def accumulate_values(self, prediction: WeatherStationModelPrediction):
-        """As we iterate through predictions, we accumulate the values so that we can calculate
-        the percentiles."""
-        for key in KEYS:
-            # Get the values.
-            key_value = getattr(prediction, key)
-            if key_value:
-                if not self.values:
-                    self.init_values()
-                self.values[key].append(key_value)
-
-    def get_summaries(
-        self, model: ModelEnum, station_codes: List[int], time_of_interest: datetime
-    ) -> List[WeatherModelPredictionSummary]:
-        """Given a model and station codes, return list of weather summaries."""
-        # Get list of stations.
-        self.stations = {station.code: station for station in self.stations}
-
-        # Build database query
-        new_query = _build_query_to_get_predictions(station_codes, model, time_of_interest)
-
-        # Iterate through the result of our query.
-        for prediction, prediction_model in new_query:
-            if prediction.station_code != self.prev_station:
-                # when the station changes, we need to process accumulated values and
-                # create new responses for the new station.
-                if self.prev_station is not None:
-                    # This isn't the 1st new station we've had, so before moving on,
-                    # we need to finish calculating the values for the previous station.
-                    self.calculate_summaries(prediction.prediction_timestamp)
-                self.handle_new_station(prediction, prediction_model)
-            elif self.prev_time != prediction.prediction_timestamp:
-                # The timestamp has changed, process the accumulated values:
-                self.calculate_summaries(prediction.prediction_timestamp)
-
-            # Accumulate the values (to be processed at next station change, time change, or when done):
-            self.accumulate_values(prediction)
-
-        self.calculate_summaries(None)
-        return self.prediction_summaries
+        ).all()
 
 
 def fetch_model_prediction_summaries(
@@ -145,5 +41,24 @@ def fetch_model_prediction_summaries(
 ) -> List[WeatherModelPredictionSummary]:
     """Given a model type (e.g. GDPS) and a  list of station codes, return a corresponding list of model
     prediction summaries containing various percentiles."""
-    builder = ModelPredictionSummaryBuilder(stations)
-    return builder.get_summaries(model, station_codes, time_of_interest)
+    stations = {station.code: station for station in stations}
+    prediction_summaries: List[WeatherModelPredictionSummary] = []
+    prediction_summary = None
+
+    # Rows are ordered by station and then timestamp, with the percentiles already calculated.
+    for row in _get_prediction_summaries(station_codes, model, time_of_interest):
+        if prediction_summary is None or prediction_summary.station.code != row.station_code:
+            prediction_summary = WeatherModelPredictionSummary(
+                station=stations[row.station_code],
+                model=WeatherPredictionModel(name=row.name, abbrev=row.abbreviation),
+                values=[],
+            )
+            prediction_summaries.append(prediction_summary)
+        data = {"datetime": row.prediction_timestamp}
+        for key in KEYS:
+            for percentile in PERCENTILES:
+                name = f"{key}_{percentile}"
+                data[name] = getattr(row, name)
+        prediction_summary.values.append(WeatherModelPredictionSummaryValues(**data))
+
+    return prediction_summaries
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import random
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Literal, Optional, Set, TypedDict
@@ -53,21 +54,70 @@ class FileToDownload:
     s3_key: str
 
 
+class MirroredKeyIndex:
+    """
+    In memory index of the keys that have already been mirrored to S3, so the consumer doesn't
+    have to ask S3 whether each announced file exists before downloading it.
+
+    The index is seeded with one listing of the S3 prefix at startup and kept up to date as
+    files are uploaded.
+    """
+
+    def __init__(self):
+        self._keys: Set[str] = set()
+
+    async def seed(self, s3_client: S3Client, prefix: str):
+        """
+        Add all the keys under a prefix to the index
+
+        :param s3_client: S3Client instance
+        :param prefix: S3 prefix to list
+        """
+        async for key in s3_client.iter_keys(prefix):
+            self._keys.add(key)
+        logger.info(f"Indexed {len(self._keys)} existing files under {prefix}")
+
+    def add(self, key: str):
+        self._keys.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
 class GribDownloader:
     """
     Downloads and retries failed downloads using aiohttp
 
     """
 
-    def __init__(self, s3_client: S3Client, max_retries: int = 5):
+    # size of the chunks read from the http response and handed to the S3 upload
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        s3_client: S3Client,
+        max_retries: int = 5,
+        mirrored_keys: Optional[MirroredKeyIndex] = None,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+    ):
         """
         Initialize downloader
 
         :param s3_client: S3Client instance
         :param max_retries: Maximum number of retry attempts per file, defaults to 5
+        :param mirrored_keys: Index of keys already in S3, if None S3 is asked for every file
+        :param base_delay: Delay before the first retry in seconds, doubled for every retry after that
+        :param max_delay: Maximum delay between retries in seconds
         """
         self.s3_client = s3_client
         self.max_retries = max_retries
+        self.mirrored_keys = mirrored_keys
+        self.base_delay = base_delay
+        self.max_delay = max_delay
         self.session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self):
@@ -79,15 +129,30 @@ class GribDownloader:
         if self.session:
             await self.session.close()
 
+    def _retry_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter, so that files that failed together during a burst
+        don't all retry at the same moment.
+
+        :param attempt: The attempt that failed, starting at 1
+        :return: Number of seconds to wait before the next attempt
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def _already_mirrored(self, s3_key: str) -> bool:
+        if self.mirrored_keys is not None:
+            return s3_key in self.mirrored_keys
+        return await self.s3_client.object_exists(s3_key)
+
     async def download_and_upload(self, file: FileToDownload) -> bool:
         """
-        Download file and upload to S3, and handle retry
+        Download file and stream it to S3, and handle retry
 
         :param file: FileToDownload with URL and S3 key
         :return: True if success, False otherwise
         """
         # skip if already exists
-        if await self.s3_client.object_exists(file.s3_key):
+        if await self._already_mirrored(file.s3_key):
             logger.debug(f"Skipping existing file: {file.s3_key}")
             return True
 
@@ -99,9 +164,13 @@ class GribDownloader:
                     file.url, timeout=aiohttp.ClientTimeout(total=300)
                 ) as response:
                     response.raise_for_status()
-                    data = await response.read()
+                    # stream the response straight into S3, so only a part is held in memory
+                    await self.s3_client.upload_stream(
+                        file.s3_key, response.content.iter_chunked(self.CHUNK_SIZE)
+                    )
 
-                await self.s3_client.put_object(key=file.s3_key, body=data)
+                if self.mirrored_keys is not None:
+                    self.mirrored_keys.add(file.s3_key)
                 logger.info(f"✅ Uploaded {file.s3_key}")
                 return True
 
@@ -109,7 +178,7 @@ class GribDownloader:
                 logger.warning(f"Download attempt {attempt} failed for {file.url}: {e}")
 
                 if attempt < self.max_retries:
-                    await asyncio.sleep(10)  # try every 10 seconds
+                    await asyncio.sleep(self._retry_delay(attempt))
                 else:
                     logger.error(
                         f"Failed permanently after {self.max_retries} attempts: {file.url}"
@@ -192,7 +261,7 @@ class ECCCGribConsumer:
         :param models: List of model names to consume ex, ['RDPS', 'GDPS']
         :param model_configs: Model config which contains routing key, description, and grib variables
         :param run_hours: set of run hours to accept, None will accept all run hours
-        :param num_workers: Number of concurrent download workers, defaults to 5
+        :param num_workers: Number of files downloaded and uploaded at the same time, defaults to 10
         :param health_file_path: Path to health check file for openshift, defaults to "/tmp/health_check"
         """
         self.s3_client = s3_client
@@ -202,6 +271,7 @@ class ECCCGribConsumer:
         self.run_hours = run_hours
         self.num_workers = num_workers
         self.health_file = Path(health_file_path)
+        self.mirrored_keys = MirroredKeyIndex()
 
         # messages go here, workers consume
         self.work_queue: asyncio.Queue[tuple[FileToDownload, IncomingMessage]] = asyncio.Queue()
@@ -302,7 +372,7 @@ class ECCCGribConsumer:
         """
         logger.debug(f"Worker {worker_id} started")
 
-        async with GribDownloader(self.s3_client) as downloader:
+        async with GribDownloader(self.s3_client, mirrored_keys=self.mirrored_keys) as downloader:
             while self._running:
                 try:
                     # Get work with timeout so we can check _running flag
@@ -401,6 +471,9 @@ class ECCCGribConsumer:
         self._running = True
         self.stats["start_time"] = get_utc_now()
 
+        # Index what has already been mirrored before any messages arrive
+        await self.mirrored_keys.seed(self.s3_client, f"{self.s3_prefix}/")
+
         # Connect to AMQP
         await self._setup_amqp()
 
@@ -6,6 +6,7 @@ from wps_weather.eccc_grib_consumer import (
     ECCCGribConsumer,
     FileToDownload,
     MessageFilter,
+    MirroredKeyIndex,
     GribDownloader,
 )
 
@@ -29,6 +30,29 @@ class MockS3Client:
         self.put_count += 1
         self.objects[key] = body
 
+    async def upload_stream(self, key: str, chunks):
+        """Store streamed object in mock storage"""
+        body = b"".join([chunk async for chunk in chunks])
+        await self.put_object(key, body)
+        return len(body)
+
+    async def iter_keys(self, prefix: str):
+        """Yield the keys in mock storage under a prefix"""
+        for key in list(self.objects):
+            if key.startswith(prefix):
+                yield key
+
+
+class MockContent:
+    """Mock aiohttp response content stream"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def iter_chunked(self, n: int):
+        for i in range(0, len(self.data), n):
+            yield self.data[i : i + n]
+
 
 class MockResponse:
     """Mock HTTP response"""
@@ -37,6 +61,7 @@ class MockResponse:
         self.should_fail = should_fail
         self.status = 500 if should_fail else 200
         self.data = data
+        self.content = MockContent(data)
 
     async def __aenter__(self):
         return self
@@ -187,7 +212,7 @@ class TestSimpleDownloader:
         mock_response = AsyncMock()
         mock_response.status = 200
         mock_response.raise_for_status = Mock()
-        mock_response.read = AsyncMock(return_value=b"test data")
+        mock_response.content = MockContent(b"test data")
 
         with patch("aiohttp.ClientSession") as mock_session_class:
             mock_session = AsyncMock()
@@ -272,6 +297,51 @@ class TestSimpleDownloader:
         assert s3_client.put_count == 0
 
 
+    @pytest.mark.anyio
+    async def test_download_skips_indexed_files(self):
+        """Downloader should use the index of mirrored keys instead of asking S3"""
+        s3_client = MockS3Client()
+        s3_client.objects["prefix/test.grib2"] = b"existing data"
+        s3_client.objects["other/test.grib2"] = b"existing data"
+        mirrored_keys = MirroredKeyIndex()
+        await mirrored_keys.seed(s3_client, "prefix/")
+
+        file = FileToDownload(url="https://example.com/test.grib2", s3_key="prefix/test.grib2")
+
+        async with GribDownloader(s3_client, mirrored_keys=mirrored_keys) as downloader:
+            result = await downloader.download_and_upload(file)
+
+        assert result is True
+        assert len(mirrored_keys) == 1
+        assert s3_client.put_count == 0
+        assert s3_client.exists_count == 0
+
+    @pytest.mark.anyio
+    async def test_download_adds_uploaded_file_to_index(self):
+        """Uploaded files should be added to the index, so they aren't downloaded again"""
+        s3_client = MockS3Client()
+        mirrored_keys = MirroredKeyIndex()
+        file = FileToDownload(url="https://example.com/test.grib2", s3_key="prefix/test.grib2")
+
+        with patch("aiohttp.ClientSession", return_value=MockSession(lambda *_, **__: MockGetResult(False))):
+            async with GribDownloader(s3_client, mirrored_keys=mirrored_keys) as downloader:
+                assert await downloader.download_and_upload(file) is True
+                assert await downloader.download_and_upload(file) is True
+
+        assert "prefix/test.grib2" in mirrored_keys
+        assert s3_client.put_count == 1
+        assert s3_client.objects["prefix/test.grib2"] == b"test data"
+
+    def test_retry_delay_backs_off_exponentially_with_jitter(self):
+        """Retry delays should grow exponentially up to the maximum, with jitter below the cap"""
+        downloader = GribDownloader(MockS3Client(), base_delay=2.0, max_delay=10.0)
+
+        with patch("wps_weather.eccc_grib_consumer.random.uniform", side_effect=lambda low, high: high):
+            assert [downloader._retry_delay(attempt) for attempt in range(1, 5)] == [2.0, 4.0, 8.0, 10.0]
+
+        assert all(0 <= downloader._retry_delay(3) <= 8.0 for _ in range(100))
+
+
 # Tests for ECCCGribConsumer
 class TestECCCGribConsumer:
     """Test the ECCCGribConsumer class"""
@@ -6,6 +6,7 @@ wx_4panel_charts plotting sub-modules) are patched in sys.modules before the mod
 test is imported, so that GDAL / native libraries are never needed during the test run.
 """
 
+import os
 import sys
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
@@ -93,6 +94,8 @@ with patch.dict("sys.modules", _patches):
     sys.modules.pop("wps_weather.wx_4panel_charts.wx_4panel_charts", None)
     from wps_weather.wx_4panel_charts.wx_4panel_charts import (  # noqa: E402
         FourPanelChartRunner,
+        LocalGribCache,
+        _dataset,
         get_init_datetime,
         main,
         parse_args,
@@ -162,53 +165,84 @@ def new_session_scope():
 
 
 # ---------------------------------------------------------------------------
-# _open_dataset_s3
+# LocalGribCache
 # ---------------------------------------------------------------------------
 
 
-class TestOpenDatasetS3:
+def make_grib_cache(s3_client, cache_dir="/tmp/gribs"):
+    return LocalGribCache(s3_client, cache_dir)
+
+
+class TestLocalGribCache:
     @pytest.mark.anyio
     async def test_raises_runtime_error_on_404_status(self):
         s3_client = MagicMock()
         response = {"ResponseMetadata": {"HTTPStatusCode": 404}, "Body": AsyncMock()}
         s3_client.get_object = AsyncMock(return_value=response)
-        runner = make_runner(s3_client)
+        grib_cache = make_grib_cache(s3_client)
 
         with pytest.raises(RuntimeError, match="HTTP status code was: 404"):
-            await runner._open_dataset_s3("some/key")
+            await grib_cache.get("some/key")
 
     @pytest.mark.anyio
     async def test_raises_runtime_error_on_500_status(self):
         s3_client = MagicMock()
         response = {"ResponseMetadata": {"HTTPStatusCode": 500}, "Body": AsyncMock()}
         s3_client.get_object = AsyncMock(return_value=response)
-        runner = make_runner(s3_client)
+        grib_cache = make_grib_cache(s3_client)
 
         with pytest.raises(RuntimeError, match="HTTP status code was: 500"):
-            await runner._open_dataset_s3("some/key")
+            await grib_cache.get("some/key")
 
     @pytest.mark.anyio
     async def test_error_message_includes_key(self):
         s3_client = MagicMock()
         response = {"ResponseMetadata": {"HTTPStatusCode": 403}, "Body": AsyncMock()}
         s3_client.get_object = AsyncMock(return_value=response)
-        runner = make_runner(s3_client)
+        grib_cache = make_grib_cache(s3_client)
 
         with pytest.raises(RuntimeError, match="some/specific/key"):
-            await runner._open_dataset_s3("some/specific/key")
+            await grib_cache.get("some/specific/key")
 
     @pytest.mark.anyio
     async def test_calls_get_object_with_key(self):
         s3_client = MagicMock()
         response = {"ResponseMetadata": {"HTTPStatusCode": 404}, "Body": AsyncMock()}
         s3_client.get_object = AsyncMock(return_value=response)
-        runner = make_runner(s3_client)
+        grib_cache = make_grib_cache(s3_client)
 
         with pytest.raises(RuntimeError):
-            await runner._open_dataset_s3("weather/data/file.grib2")
+            await grib_cache.get("weather/data/file.grib2")
 
         s3_client.get_object.assert_called_once_with("weather/data/file.grib2")
 
+    @pytest.mark.anyio
+    async def test_downloads_each_key_once(self):
+        grib_cache = make_grib_cache(MagicMock())
+        grib_cache._download = AsyncMock(return_value="/tmp/gribs/file.grib2")
+
+        paths = [await grib_cache.get("weather/data/file.grib2") for _ in range(3)]
+
+        assert paths == ["/tmp/gribs/file.grib2"] * 3
+        grib_cache._download.assert_called_once_with("weather/data/file.grib2")
+
+    @pytest.mark.anyio
+    async def test_evict_removes_local_file(self, tmp_path):
+        grib_cache = make_grib_cache(MagicMock(), str(tmp_path))
+        key = "weather/data/file.grib2"
+        local_path = grib_cache._local_path(key)
+        grib_cache._download = AsyncMock(return_value=local_path)
+        await grib_cache.get(key)
+        with open(local_path, "wb") as f:
+            f.write(b"grib")
+
+        grib_cache.evict([key])
+
+        assert not os.path.exists(local_path)
+        # Evicted keys are downloaded again if they're needed later.
+        await grib_cache.get(key)
+        assert grib_cache._download.call_count == 2
+
 
 # ---------------------------------------------------------------------------
 # _dataset
@@ -219,31 +253,119 @@ _FakeDataset = type("Dataset", (), {})
 
 
 class TestDataset:
+    def test_logs_error_and_raises_type_error_when_open_dataset_returns_non_dataset(self):
+        with (
+            patch("wps_weather.wx_4panel_charts.wx_4panel_charts.xr") as mock_xr,
+            patch(
+                "wps_weather.wx_4panel_charts.wx_4panel_charts._open_dataset",
+                return_value="not_a_dataset",
+            ),
+            patch("wps_weather.wx_4panel_charts.wx_4panel_charts.logger") as mock_logger,
+        ):
+            mock_xr.Dataset = _FakeDataset
+            with pytest.raises(TypeError):
+                with _dataset("some/path"):
+                    pass
+
+            mock_logger.error.assert_called_once()
+            assert "some/path" in mock_logger.error.call_args[0][0]
+
+    def test_error_message_includes_actual_type(self):
+        with (
+            patch("wps_weather.wx_4panel_charts.wx_4panel_charts.xr") as mock_xr,
+            patch("wps_weather.wx_4panel_charts.wx_4panel_charts._open_dataset", return_value=42),
+        ):
+            mock_xr.Dataset = _FakeDataset
+            with pytest.raises(TypeError, match="int"):
+                with _dataset("some/path"):
+                    pass
+
+    def test_closes_dataset(self):
+        ds = _FakeDataset()
+        ds.close = MagicMock()
+        with (
+            patch("wps_weather.wx_4panel_charts.wx_4panel_charts.xr") as mock_xr,
+            patch("wps_weather.wx_4panel_charts.wx_4panel_charts._open_dataset", return_value=ds),
+        ):
+            mock_xr.Dataset = _FakeDataset
+            with _dataset("some/path") as opened:
+                assert opened is ds
+
+        ds.close.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# _make_4panel_chart
+# ---------------------------------------------------------------------------
+
+
+class TestMake4PanelChart:
+    def _make_grib_cache(self):
+        grib_cache = MagicMock()
+        grib_cache.get = AsyncMock(side_effect=lambda key: f"/tmp/gribs/{key}")
+        return grib_cache
+
+    async def _make_chart(self, runner, grib_cache, render_result):
+        with patch(
+            "wps_weather.wx_4panel_charts.wx_4panel_charts.render_4panel_chart",
+            return_value=render_result,
+        ) as mock_render:
+            await runner._make_4panel_chart(
+                grib_cache, *make_mock_configs(), (1, 1), 10, "4panel/output.png", ECCCModel.GDPS, 3
+            )
+        return mock_render
+
     @pytest.mark.anyio
-    async def test_logs_error_and_raises_type_error_when_open_dataset_returns_non_dataset(self):
+    async def test_renders_from_local_gribs_and_saves_chart(self):
         runner = make_runner()
-        runner._open_dataset_s3 = AsyncMock(return_value="not_a_dataset")
+        grib_cache = self._make_grib_cache()
 
-        with patch("wps_weather.wx_4panel_charts.wx_4panel_charts.xr") as mock_xr:
-            mock_xr.Dataset = _FakeDataset
-            with patch("wps_weather.wx_4panel_charts.wx_4panel_charts.logger") as mock_logger:
-                with pytest.raises(TypeError):
-                    async with runner._dataset("some/key"):
-                        pass
+        mock_render = await self._make_chart(runner, grib_cache, b"png")
 
-                mock_logger.error.assert_called_once()
-                assert "some/key" in mock_logger.error.call_args[0][0]
+        cfg500, cfgmslp, cfg700, cfgpcpn = mock_render.call_args[0][1:5]
+        assert cfg500["z500_grib"] == "/tmp/gribs/k/z500.grib2"
+        assert cfgmslp["thk_grib"] == "/tmp/gribs/k/thk.grib2"
+        assert cfg700["rh850_grib"] == "/tmp/gribs/k/rh850.grib2"
+        assert cfgpcpn["jet_spd_grib"] == "/tmp/gribs/k/jet.grib2"
+        assert grib_cache.get.call_count == 10
+        runner._s3_client.put_object.assert_called_once_with("4panel/output.png", b"png")
 
     @pytest.mark.anyio
-    async def test_error_message_includes_actual_type(self):
+    async def test_does_not_save_chart_when_render_fails(self):
         runner = make_runner()
-        runner._open_dataset_s3 = AsyncMock(return_value=42)
+        grib_cache = self._make_grib_cache()
 
-        with patch("wps_weather.wx_4panel_charts.wx_4panel_charts.xr") as mock_xr:
-            mock_xr.Dataset = _FakeDataset
-            with pytest.raises(TypeError, match="int"):
-                async with runner._dataset("some/key"):
-                    pass
+        await self._make_chart(runner, grib_cache, None)
+
+        runner._s3_client.put_object.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_evicts_gribs_after_chart(self):
+        runner = make_runner()
+        grib_cache = self._make_grib_cache()
+
+        await self._make_chart(runner, grib_cache, b"png")
+
+        evicted = grib_cache.evict.call_args[0][0]
+        assert len(evicted) == 10
+        assert "k/z500.grib2" in evicted
+
+    @pytest.mark.anyio
+    async def test_skips_precip_grib_when_precip_not_shown(self):
+        runner = make_runner()
+        grib_cache = self._make_grib_cache()
+        cfg500, cfgmslp, cfg700, cfgpcpn = make_mock_configs()
+        cfgpcpn["show_precip"] = False
+
+        with patch(
+            "wps_weather.wx_4panel_charts.wx_4panel_charts.render_4panel_chart", return_value=b"png"
+        ):
+            await runner._make_4panel_chart(
+                grib_cache, cfg500, cfgmslp, cfg700, cfgpcpn, (1, 1), 10, "out.png", ECCCModel.GDPS, 0
+            )
+
+        grib_cache.get.assert_has_calls([call("k/jet.grib2")])
+        assert call("k/pcpn.grib2") not in grib_cache.get.call_args_list
 
 
 # ---------------------------------------------------------------------------
@@ -365,6 +487,37 @@ class TestMake4PanelCharts:
         assert result is True
         assert runner._make_4panel_chart.call_count == 2
 
+    @pytest.mark.anyio
+    async def test_finishes_scheduled_charts_before_returning_on_missing_files(self):
+        runner, s3_client = self._make_runner(object_exists=False, all_objects_exist=True)
+        # Inputs for the first two hours exist, the third hour's are missing.
+        s3_client.all_objects_exist = AsyncMock(side_effect=[True, True, False])
+
+        result = await runner._make_4panel_charts(ECCCModel.GDPS, "20260318", "00", 0, 9, 3)
+
+        assert result is False
+        assert runner._make_4panel_chart.call_count == 2
+        assert runner._make_4panel_chart.await_count == 2
+
+    @pytest.mark.anyio
+    async def test_raises_errors_other_than_type_error(self):
+        runner, _ = self._make_runner(object_exists=False, all_objects_exist=True)
+        runner._make_4panel_chart = AsyncMock(side_effect=RuntimeError("s3 is down"))
+
+        with pytest.raises(RuntimeError, match="s3 is down"):
+            await runner._make_4panel_charts(ECCCModel.GDPS, "20260318", "00", 3, 3, 3)
+
+    @pytest.mark.anyio
+    async def test_stops_scheduling_charts_after_an_error(self):
+        runner, _ = self._make_runner(object_exists=False, all_objects_exist=True)
+        runner._make_4panel_chart = AsyncMock(side_effect=RuntimeError("s3 is down"))
+
+        with pytest.raises(RuntimeError):
+            await runner._make_4panel_charts(ECCCModel.GDPS, "20260318", "00", 0, 9, 3)
+
+        # Only one chart is in flight at a time, so the failure is seen before the next is scheduled.
+        runner._make_4panel_chart.assert_called_once()
+
 
 # ---------------------------------------------------------------------------
 # run
@@ -582,6 +735,11 @@ class TestParseArgs:
             args = parse_args()
         assert args.model == "RDPS"
 
+    def test_default_workers(self):
+        with patch("sys.argv", ["prog", "--init_ymd", "20260318"]):
+            args = parse_args()
+        assert args.workers == 2
+
     def test_explicit_model_runs_00_and_12_accepted(self):
         with patch("sys.argv", ["prog", "--init_ymd", "20260318", "--model_runs", "00", "12"]):
             args = parse_args()
@@ -815,6 +973,7 @@ def _make_main_patches(now, start_datetime):
     mock_args.start_hour = 0
     mock_args.end_hour = 84
     mock_args.step = 3
+    mock_args.workers = 1
 
     mock_s3_cls = MagicMock()
     mock_s3_cls.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
@@ -833,6 +992,7 @@ def _make_main_patches(now, start_datetime):
         patch("wps_weather.wx_4panel_charts.wx_4panel_charts.S3Client", mock_s3_cls),
         patch("wps_weather.wx_4panel_charts.wx_4panel_charts.FourPanelChartRunner", mock_runner_cls),
         patch("wps_weather.wx_4panel_charts.wx_4panel_charts.sys.exit"),
+        patch("wps_weather.wx_4panel_charts.wx_4panel_charts.ProcessPoolExecutor"),
     )
     return patches, mock_runner
 
@@ -849,7 +1009,7 @@ class TestMain:
         start = datetime(2026, 3, 31, 12, 0, 0, tzinfo=timezone.utc)
 
         patches, mock_runner = _make_main_patches(now, start)
-        with patches[0], patches[1], patches[2], patches[3], patches[4], patches[5]:
+        with patches[0], patches[1], patches[2], patches[3], patches[4], patches[5], patches[6]:
             await main()
 
         mock_runner.run.assert_called_once()
@@ -862,7 +1022,7 @@ class TestMain:
         start = datetime(2026, 3, 31, 12, 0, 0, tzinfo=timezone.utc)
 
         patches, mock_runner = _make_main_patches(now, start)
-        with patches[0], patches[1], patches[2], patches[3], patches[4], patches[5]:
+        with patches[0], patches[1], patches[2], patches[3], patches[4], patches[5], patches[6]:
             await main()
 
         mock_runner.run.assert_not_called()
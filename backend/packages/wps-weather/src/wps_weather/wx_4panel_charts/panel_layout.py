@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
+from functools import lru_cache
 from pathlib import Path
 import os
+import cartopy.crs as ccrs
+import geopandas as gpd
 import matplotlib.patheffects as PathEffects
+from cartopy.feature import NaturalEarthFeature, ShapelyFeature
 from matplotlib.patches import Rectangle
 
 def get_project_root():
@@ -28,6 +32,24 @@ def get_project_root():
     return cwd
 
 
+@lru_cache(maxsize=None)
+def provinces_feature():
+    """
+    Province/state boundary lines shared by every panel. Cached so the shapefile is only read
+    (and its geometries projected) once per process rather than once per panel.
+    """
+    return NaturalEarthFeature("cultural", "admin_1_states_provinces_lines", "50m", facecolor="none")
+
+
+@lru_cache(maxsize=None)
+def fire_outline_feature(path):
+    """
+    Fire centre outline shared by every panel, read from disk once per process.
+    """
+    fire_gdf = gpd.read_file(path)
+    return ShapelyFeature(fire_gdf.geometry, crs=ccrs.PlateCarree())
+
+
 def add_panel_title(ax, text, loc="bl", fontsize=10):
     anchors = {
         "tl": (0.012, 0.988, "left",  "top"),
@@ -11,17 +11,17 @@ from pathlib import Path
 
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
-import geopandas as gpd
 import matplotlib.patches as mpatches
 import matplotlib.patheffects as PathEffects
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import numpy as np
 import xarray as xr
-from cartopy.feature import NaturalEarthFeature, ShapelyFeature
 from cartopy.util import add_cyclic_point
 from scipy.ndimage import maximum_filter, minimum_filter
 
+from wps_weather.wx_4panel_charts.panel_layout import fire_outline_feature, provinces_feature
+
 # --------------------------------------------------
 # FINAL "decided" feature values live here
 # --------------------------------------------------
@@ -358,13 +358,12 @@ def plot_500hpa(cfg=None, ax=None, ds_z500=None, ds_vort=None):
     ax.add_feature(cfeature.COASTLINE, linewidth=cfg["coastline_lw"], zorder=12)
     ax.add_feature(cfeature.BORDERS, linewidth=cfg["borders_lw"], zorder=12)
 
-    provinces = NaturalEarthFeature("cultural", "admin_1_states_provinces_lines", "50m", facecolor="none")
+    provinces = provinces_feature()
     ax.add_feature(provinces, edgecolor="black", linewidth=cfg["province_lw"], zorder=13)
 
     if cfg["show_fire_boundary"]:
         try:
-            fire_gdf = gpd.read_file(ROOT / cfg["fire_outline"])
-            fire_feature = ShapelyFeature(fire_gdf.geometry, crs=pc)
+            fire_feature = fire_outline_feature(ROOT / cfg["fire_outline"])
             ax.add_feature(fire_feature, facecolor=cfg["fire_facecolor"], edgecolor=cfg["fire_edgecolor"],
                            linewidth=cfg["fire_linewidth"], zorder=7)
         except Exception as e:
@@ -16,16 +16,16 @@ from pathlib import Path
 
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
-import geopandas as gpd
 import matplotlib.patheffects as PathEffects
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import matplotlib.tri as mtri
 import numpy as np
 import xarray as xr
-from cartopy.feature import NaturalEarthFeature, ShapelyFeature
 from scipy.ndimage import gaussian_filter, label, maximum_filter, minimum_filter
 
+from wps_weather.wx_4panel_charts.panel_layout import fire_outline_feature, provinces_feature
+
 # --------------------------------------------------
 # CONFIG (RDPS)
 # --------------------------------------------------
@@ -427,13 +427,12 @@ def plot_500hpa(cfg=None, ax=None, ds_z500=None, ds_vort=None):
     ax.add_feature(cfeature.COASTLINE, linewidth=cfg["coastline_lw"], zorder=12)
     ax.add_feature(cfeature.BORDERS, linewidth=cfg["borders_lw"], zorder=12)
 
-    provinces = NaturalEarthFeature("cultural", "admin_1_states_provinces_lines", "50m", facecolor="none")
+    provinces = provinces_feature()
     ax.add_feature(provinces, edgecolor="black", linewidth=cfg["province_lw"], zorder=13)
 
     if cfg.get("show_fire_boundary", False):
         try:
-            fire_gdf = gpd.read_file(ROOT / cfg["fire_outline"])
-            fire_feature = ShapelyFeature(fire_gdf.geometry, crs=pc)
+            fire_feature = fire_outline_feature(ROOT / cfg["fire_outline"])
             ax.add_feature(
                 fire_feature,
                 facecolor=cfg.get("fire_facecolor", "none"),
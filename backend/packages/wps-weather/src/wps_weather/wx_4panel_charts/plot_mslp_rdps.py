@@ -17,7 +17,6 @@ from pathlib import Path
 
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
-import geopandas as gpd
 import matplotlib as mpl
 import matplotlib.patches as mpatches
 import matplotlib.patheffects as PathEffects
@@ -26,9 +25,10 @@ import matplotlib.ticker as mticker
 import matplotlib.tri as mtri
 import numpy as np
 import xarray as xr
-from cartopy.feature import NaturalEarthFeature, ShapelyFeature
 from scipy.ndimage import gaussian_filter, maximum_filter, minimum_filter
 
+from wps_weather.wx_4panel_charts.panel_layout import fire_outline_feature, provinces_feature
+
 # --------------------------------------------------
 # CONFIG (RDPS)
 # --------------------------------------------------
@@ -447,13 +447,12 @@ def plot_mslp_thickness_rdps(cfg=None, ax=None, ds_msl=None, ds_thk=None):
     ax.add_feature(cfeature.COASTLINE, linewidth=cfg["coastline_lw"], zorder=12)
     ax.add_feature(cfeature.BORDERS, linewidth=cfg["borders_lw"], zorder=12)
 
-    provinces = NaturalEarthFeature("cultural", "admin_1_states_provinces_lines", "50m", facecolor="none")
+    provinces = provinces_feature()
     ax.add_feature(provinces, edgecolor="black", linewidth=cfg["province_lw"], zorder=12)
 
     if cfg.get("show_fire_boundary", False):
         try:
-            fire_gdf = gpd.read_file(ROOT / cfg["fire_outline"])
-            fire_feature = ShapelyFeature(fire_gdf.geometry, crs=pc)
+            fire_feature = fire_outline_feature(ROOT / cfg["fire_outline"])
             ax.add_feature(
                 fire_feature,
                 edgecolor=cfg["fire_edgecolor"],
@@ -9,7 +9,6 @@ from pathlib import Path
 
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
-import geopandas as gpd
 import matplotlib as mpl
 import matplotlib.patches as mpatches
 import matplotlib.patheffects as PathEffects
@@ -17,10 +16,11 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import numpy as np
 import xarray as xr
-from cartopy.feature import NaturalEarthFeature, ShapelyFeature
 from cartopy.util import add_cyclic_point
 from scipy.ndimage import maximum_filter
 
+from wps_weather.wx_4panel_charts.panel_layout import fire_outline_feature, provinces_feature
+
 t0 = time.perf_counter()
 # --------------------------------------------------
 # DEFAULT CONFIG (all feature values are here)
@@ -348,14 +348,11 @@ def plot_pcpn12(cfg: dict, ax=None, ds_p=None, ds_js=None):
     ax.add_feature(cfeature.COASTLINE, linewidth=0.5, zorder=20)
     ax.add_feature(cfeature.BORDERS, linewidth=0.4, zorder=20)
 
-    provinces = NaturalEarthFeature(
-        "cultural", "admin_1_states_provinces_lines", "50m", facecolor="none"
-    )
+    provinces = provinces_feature()
     ax.add_feature(provinces, edgecolor="black", linewidth=0.5, zorder=20)
 
     if cfg.get("show_fire_boundary", False):
-        fire_gdf = gpd.read_file(ROOT / cfg["fire_outline"])
-        fire_feature = ShapelyFeature(fire_gdf.geometry, crs=pc)
+        fire_feature = fire_outline_feature(ROOT / cfg["fire_outline"])
         ax.add_feature(
             fire_feature,
             facecolor=cfg.get("fire_facecolor", "none"),
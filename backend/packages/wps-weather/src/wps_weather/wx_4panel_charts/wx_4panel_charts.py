@@ -1,16 +1,22 @@
 import argparse
 import asyncio
+import functools
 import gc
+import io
 import logging
+import multiprocessing
 import os
 import sys
-from contextlib import asynccontextmanager
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, time, timedelta, timezone
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import aiofiles
 import cartopy
 import cartopy.crs as ccrs
+import matplotlib
 import matplotlib.pyplot as plt
 import xarray as xr
 from wps_shared import config
@@ -47,23 +53,48 @@ from wps_weather.wx_4panel_charts.wx_4panel_chart_addresser import WX4PanelChart
 
 DEFAULT_FIG_SIZE = (11.8, 10)
 DEFAULT_DPI = 300
+# A chart holds ~400MB while it is being rendered at DEFAULT_DPI, so the default number of
+# render worker processes is kept small enough to fit within the job's memory limit.
+DEFAULT_RENDER_WORKERS = 2
+# Size of the chunks grib files are streamed to local disk in.
+GRIB_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
 
-class FourPanelChartRunner:
-    def __init__(self, s3_client: S3Client):
+def _grib_fields(cfgpcpn) -> Tuple[Tuple[str, ...], ...]:
+    """
+    The config fields holding grib keys for each panel, in cfg500, cfgmslp, cfg700, cfgpcpn order.
+    """
+    pcpn_fields = []
+    if cfgpcpn.get("show_precip", True):
+        pcpn_fields.append("pcpn_grib")
+    if cfgpcpn.get("show_jet_core", True):
+        pcpn_fields.append("jet_spd_grib")
+    return (
+        ("z500_grib", "vort_grib"),
+        ("mslp_grib", "thk_grib"),
+        ("z700_grib", "rh500_grib", "rh700_grib", "rh850_grib"),
+        tuple(pcpn_fields),
+    )
+
+
+class LocalGribCache:
+    """
+    Downloads grib files from object storage to a local directory, at most once per key, so
+    that they can be opened by path in the render worker processes.
+    """
+
+    def __init__(self, s3_client: S3Client, cache_dir: str):
         self._s3_client = s3_client
+        self._cache_dir = cache_dir
+        self._downloads: Dict[str, asyncio.Task] = {}
 
-    async def _open_dataset_s3(self, key):
-        """
-        Creates a xarray.Dataset from the grib file located at the provided S3 key.
+    def _local_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key.replace("/", "_"))
 
-        :param key: The key to the grib file in object storage.
-        :return: An xarray.Dataset object.
-        """
-        # Get the grib file and read the bytes.
+    async def _download(self, key: str) -> str:
         response = await self._s3_client.get_object(key)
 
         status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
@@ -72,40 +103,211 @@ class FourPanelChartRunner:
                 f"Error when fetching key {key} from S3. HTTP status code was: {status}"
             )
 
-        async with (
-            aiofiles.tempfile.NamedTemporaryFile(suffix=".grib2", mode="w+b") as f,
-            response["Body"] as stream,
+        path = self._local_path(key)
+        async with aiofiles.open(path, mode="wb") as f, response["Body"] as stream:
+            while chunk := await stream.read(GRIB_DOWNLOAD_CHUNK_SIZE):
+                await f.write(chunk)
+        return path
+
+    async def get(self, key: str) -> str:
+        """
+        Return the local path of the grib file at the provided S3 key, downloading it if needed.
+
+        :param key: The key to the grib file in object storage.
+        :return: Path to the local copy of the grib file.
+        """
+        if key not in self._downloads:
+            self._downloads[key] = asyncio.ensure_future(self._download(key))
+        return await self._downloads[key]
+
+    def evict(self, keys: List[str]):
+        """Remove the local copies of grib files that are no longer needed."""
+        for key in keys:
+            download = self._downloads.pop(key, None)
+            if download is None:
+                continue
+            if not download.done():
+                download.cancel()
+            path = self._local_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def init_render_worker(cartopy_data_dir: Optional[str]):
+    """Prepare a render worker process before it renders any charts."""
+    # Charts are only ever written to file.
+    matplotlib.use("Agg")
+    # cartopy downloads some geographic data that needs to be stored locally
+    if cartopy_data_dir:
+        cartopy.config["data_dir"] = cartopy_data_dir
+
+
+def _open_dataset(path: str):
+    """
+    Creates a xarray.Dataset from the grib file located at the provided local path.
+
+    :param path: The path to the local grib file.
+    :return: An xarray.Dataset object.
+    """
+    return xr.open_dataset(path, engine="cfgrib", backend_kwargs={"indexpath": ""})
+
+
+@contextmanager
+def _dataset(path: str):
+    # Small helper to ensure datasets get closed in the event of an error.
+    ds = _open_dataset(path)
+    if not isinstance(ds, xr.Dataset):
+        logger.error(
+            f"Expected xr.Dataset for '{path}', got {type(ds).__name__}. Skipping chart."
+        )
+        raise TypeError(f"Expected xr.Dataset for '{path}', got {type(ds).__name__}.")
+    try:
+        yield ds
+    finally:
+        ds.close()
+
+
+def render_4panel_chart(
+    model: ECCCModel,
+    cfg500,
+    cfgmslp,
+    cfg700,
+    cfgpcpn,
+    figsize: Tuple[float, float],
+    dpi: int,
+    output_key: str,
+    step: int,
+) -> Optional[bytes]:
+    """
+    Render a 4 panel chart from local grib files. matplotlib and cartopy aren't thread safe, so
+    this runs in a render worker process.
+
+    :return: The chart as png bytes, or None if the precip panel could not be drawn.
+    """
+    plotter_factory = PlotterFactory(model=model)
+    proj = ccrs.LambertConformal(
+        central_longitude=cfg500.get("central_longitude", -130.0),
+        central_latitude=cfg500.get("central_latitude", 50.0),
+    )
+
+    fig, axes = plt.subplots(
+        2,
+        2,
+        figsize=figsize,
+        dpi=dpi,
+        subplot_kw={"projection": proj},
+    )
+
+    ax500, axmslp = axes[0, 0], axes[0, 1]
+    ax700, axpcpn = axes[1, 0], axes[1, 1]
+
+    try:
+        with (
+            _dataset(cfg500["z500_grib"]) as ds_z500,
+            _dataset(cfg500["vort_grib"]) as ds_vort,
+        ):
+            logger.info(f"Creating 500hpa panel for {output_key}")
+            plotter_500hpa = plotter_factory.get_500hpa_plotter()
+            plotter_500hpa(cfg500, ax=ax500, ds_z500=ds_z500, ds_vort=ds_vort)
+            add_panel_title(ax500, "500 hPa Height + Abs Vorticity", loc="bl")
+
+        with (
+            _dataset(cfgmslp["mslp_grib"]) as ds_msl,
+            _dataset(cfgmslp["thk_grib"]) as ds_thk,
+        ):
+            logger.info(f"Creating mslp panel for {output_key}")
+            plotter_mslp_thickness = plotter_factory.get_mslp_thickness_plotter()
+            plotter_mslp_thickness(cfgmslp, ax=axmslp, ds_msl=ds_msl, ds_thk=ds_thk)
+            add_panel_title(axmslp, "MSLP + 1000–500 Thickness", loc="bl")
+
+        with (
+            _dataset(cfg700["z700_grib"]) as ds_z700,
+            _dataset(cfg700["rh850_grib"]) as ds_rh850,
+            _dataset(cfg700["rh700_grib"]) as ds_rh700,
+            _dataset(cfg700["rh500_grib"]) as ds_rh500,
         ):
-            content = await stream.read()
-            await f.write(content)
-            await f.seek(0)
-
-            # Create the xarray.Dataset and load it. load() must be called before unlinking the tmp file.
-            ds = xr.open_dataset(
-                f.name,
-                engine="cfgrib",
-                backend_kwargs={"indexpath": ""},
+            logger.info(f"Creating 700hpa panel for {output_key}")
+            plotter_700hpa = plotter_factory.get_700hpa_plotter()
+            plotter_700hpa(
+                cfg700,
+                ax=ax700,
+                ds_z700=ds_z700,
+                ds_rh850=ds_rh850,
+                ds_rh700=ds_rh700,
+                ds_rh500=ds_rh500,
             )
-            ds = ds.load()
+            add_panel_title(ax700, "700 hPa Height + 850-500 Relative Humidity", loc="bl")
 
-            return ds
+        ds_p: Optional[xr.Dataset] = None
+        ds_js: Optional[xr.Dataset] = None
 
-    @asynccontextmanager
-    async def _dataset(self, key):
-        # Small helper to ensure datasets get closed in the event of an error.
-        ds = await self._open_dataset_s3(key)
-        if not isinstance(ds, xr.Dataset):
-            logger.error(
-                f"Expected xr.Dataset for key '{key}', got {type(ds).__name__}. Skipping chart."
-            )
-            raise TypeError(f"Expected xr.Dataset for key '{key}', got {type(ds).__name__}.")
         try:
-            yield ds
+            logger.info(f"Creating precip panel for {output_key}")
+            if cfgpcpn["show_precip"]:
+                ds_p = _open_dataset(cfgpcpn["pcpn_grib"])
+
+            if cfgpcpn.get("show_jet_core", True):
+                ds_js = _open_dataset(cfgpcpn["jet_spd_grib"])
+
+            plotter_pcpn = plotter_factory.get_pcpn_plotter()
+            plotter_pcpn(cfgpcpn, ax=axpcpn, ds_p=ds_p, ds_js=ds_js)
+
+            add_panel_title(
+                axpcpn,
+                f"{step}H PCPN" if cfgpcpn.get("show_precip", True) else "No PCPN at 00H",
+                loc="bl",
+            )
+        except Exception as e:
+            logger.error(f"Unable to generate 4-panel chart for: {output_key}")
+            logger.error(e)
+            return None
         finally:
-            ds.close()
+            if ds_p is not None:
+                ds_p.close()
+            if ds_js is not None:
+                ds_js.close()
+
+        apply_4panel_frames(fig, axes, add_outer_border=True)
+
+        valid_text = cfg500.get("valid_time_str", "")
+        if valid_text:
+            add_valid_time_stamp(fig, valid_text, height=0.04, fontsize=14)
+
+        with io.BytesIO() as buffer:
+            fig.savefig(
+                buffer, format="png", dpi=dpi, bbox_inches=None, pad_inches=0.0, facecolor="white"
+            )
+            return buffer.getvalue()
+    finally:
+        plt.close(fig)
+        # matplotlib Figure/Axes/Artist objects form reference cycles that plain
+        # refcounting can't break and only the cyclic GC can. Confirmed via profiling.
+        # without this, RSS climbs ~365-420MB per panel across a run (gc.collect() finds
+        # 20,000+ collectable objects per panel); with it, RSS is flat after the first panel.
+        gc.collect()
+
+
+class FourPanelChartRunner:
+    def __init__(
+        self,
+        s3_client: S3Client,
+        executor: Optional[Executor] = None,
+        max_concurrent_charts: int = 1,
+    ):
+        """
+        :param s3_client: Client for the object store holding the grib files and charts.
+        :param executor: Process pool that charts are rendered in. Charts are rendered in the
+        event loop's default executor if not provided, in which case max_concurrent_charts must
+        stay at 1 as matplotlib isn't thread safe.
+        :param max_concurrent_charts: Number of charts downloading, rendering or uploading at once.
+        """
+        self._s3_client = s3_client
+        self._executor = executor
+        self._max_concurrent_charts = max_concurrent_charts
 
     async def _make_4panel_chart(
         self,
+        grib_cache: LocalGribCache,
         cfg500,
         cfgmslp,
         cfg700,
@@ -113,111 +315,35 @@ class FourPanelChartRunner:
         figsize: Tuple[float, float],
         dpi: int,
         output_key: str,
-        plotter_factory: PlotterFactory,
+        model: ECCCModel,
         step: int,
     ):
-        proj = ccrs.LambertConformal(
-            central_longitude=cfg500.get("central_longitude", -130.0),
-            central_latitude=cfg500.get("central_latitude", 50.0),
-        )
-
-        fig, axes = plt.subplots(
-            2,
-            2,
-            figsize=figsize,
-            dpi=dpi,
-            subplot_kw={"projection": proj},
-        )
-
-        ax500, axmslp = axes[0, 0], axes[0, 1]
-        ax700, axpcpn = axes[1, 0], axes[1, 1]
-
+        cfgs = (cfg500, cfgmslp, cfg700, cfgpcpn)
+        grib_fields = _grib_fields(cfgpcpn)
+        keys = [cfg[field] for cfg, fields in zip(cfgs, grib_fields) for field in fields]
         try:
-            async with (
-                self._dataset(cfg500["z500_grib"]) as ds_z500,
-                self._dataset(cfg500["vort_grib"]) as ds_vort,
-            ):
-                logger.info(f"Creating 500hpa panel for {output_key}")
-                plotter_500hpa = plotter_factory.get_500hpa_plotter()
-                plotter_500hpa(cfg500, ax=ax500, ds_z500=ds_z500, ds_vort=ds_vort)
-                add_panel_title(ax500, "500 hPa Height + Abs Vorticity", loc="bl")
-
-            async with (
-                self._dataset(cfgmslp["mslp_grib"]) as ds_msl,
-                self._dataset(cfgmslp["thk_grib"]) as ds_thk,
-            ):
-                logger.info(f"Creating mslp panel for {output_key}")
-                plotter_mslp_thickness = plotter_factory.get_mslp_thickness_plotter()
-                plotter_mslp_thickness(cfgmslp, ax=axmslp, ds_msl=ds_msl, ds_thk=ds_thk)
-                add_panel_title(axmslp, "MSLP + 1000–500 Thickness", loc="bl")
-
-            async with (
-                self._dataset(cfg700["z700_grib"]) as ds_z700,
-                self._dataset(cfg700["rh850_grib"]) as ds_rh850,
-                self._dataset(cfg700["rh700_grib"]) as ds_rh700,
-                self._dataset(cfg700["rh500_grib"]) as ds_rh500,
-            ):
-                logger.info(f"Creating 700hpa panel for {output_key}")
-                plotter_700hpa = plotter_factory.get_700hpa_plotter()
-                plotter_700hpa(
-                    cfg700,
-                    ax=ax700,
-                    ds_z700=ds_z700,
-                    ds_rh850=ds_rh850,
-                    ds_rh700=ds_rh700,
-                    ds_rh500=ds_rh500,
-                )
-                add_panel_title(ax700, "700 hPa Height + 850-500 Relative Humidity", loc="bl")
-
-            ds_p: Optional[xr.Dataset] = None
-            ds_js: Optional[xr.Dataset] = None
-
-            try:
-                logger.info(f"Creating precip panel for {output_key}")
-                if cfgpcpn["show_precip"]:
-                    ds_p = await self._open_dataset_s3(cfgpcpn["pcpn_grib"])
-
-                if cfgpcpn.get("show_jet_core", True):
-                    ds_js = await self._open_dataset_s3(cfgpcpn["jet_spd_grib"])
-
-                plotter_pcpn = plotter_factory.get_pcpn_plotter()
-                plotter_pcpn(cfgpcpn, ax=axpcpn, ds_p=ds_p, ds_js=ds_js)
-
-                add_panel_title(
-                    axpcpn,
-                    f"{step}H PCPN" if cfgpcpn.get("show_precip", True) else "No PCPN at 00H",
-                    loc="bl",
-                )
-            except Exception as e:
-                logger.error(f"Unable to generate 4-panel chart for: {output_key}")
-                logger.error(e)
+            # The render worker reads the gribs from local disk, so swap the keys for local paths.
+            local_cfgs = []
+            for cfg, fields in zip(cfgs, grib_fields):
+                local_cfg = cfg.copy()
+                for field in fields:
+                    local_cfg[field] = await grib_cache.get(cfg[field])
+                local_cfgs.append(local_cfg)
+
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(
+                self._executor,
+                functools.partial(
+                    render_4panel_chart, model, *local_cfgs, figsize, dpi, output_key, step
+                ),
+            )
+            if body is None:
                 return
-            finally:
-                if ds_p is not None:
-                    ds_p.close()
-                if ds_js is not None:
-                    ds_js.close()
-
-            apply_4panel_frames(fig, axes, add_outer_border=True)
-
-            valid_text = cfg500.get("valid_time_str", "")
-            if valid_text:
-                add_valid_time_stamp(fig, valid_text, height=0.04, fontsize=14)
-
-            # Save the 4panel chart to S3. First save to a local temp file then write to S3.
-            async with aiofiles.tempfile.NamedTemporaryFile(suffix=".png", mode="w+b") as f:
-                fig.savefig(f.name, dpi=dpi, bbox_inches=None, pad_inches=0.0, facecolor="white")
-                await f.seek(0)
-                body = await f.read()
-                await self._s3_client.put_object(output_key, body)
-                logger.info(f"Saved: {output_key}")
+
+            await self._s3_client.put_object(output_key, body)
+            logger.info(f"Saved: {output_key}")
         finally:
-            plt.close(fig)
-            # matplotlib Figure/Axes/Artist objects form reference cycles that plain
-            # refcounting can't break and only the cyclic GC can. Confirmed via profiling.
-            # without this, RSS climbs ~365-420MB per panel across a run (gc.collect() finds
-            # 20,000+ collectable objects per panel); with it, RSS is flat after the first panel.
-            gc.collect()
+            grib_cache.evict(keys)
 
     async def _make_4panel_charts(
         self,
@@ -245,63 +371,81 @@ class FourPanelChartRunner:
             file_name_builder=fname_builder,
             model=model,
         )
-        plotter_factory = PlotterFactory(model=model)
-        for fh in range(start_hour, end_hour + 1, step):
-            logger.info(
-                f"Start {model} 4 panel chart generation for hour {fh} of model run {init_ymd}T{init_hh}Z."
-            )
-            output_name = f"{model}_{init_ymd}T{init_hh}Z_F{fh:03d}_4panel.png"
-            output_key = raster_addresser.get_4panel_key(fh, output_name)
-
-            # If a 4panel chart already exists don't re-create it.
-            if await self._s3_client.object_exists(output_key):
-                logger.info(f"Skipping: 4 panel chart already exists: {output_name}")
-                continue
-
-            cfg500, cfgmslp, cfg700, cfgpcpn = config_builder.build_config_for_hour(fh)
-
-            required_keys = [
-                cfg500["z500_grib"],
-                cfg500["vort_grib"],
-                cfgmslp["mslp_grib"],
-                cfgmslp["thk_grib"],
-                cfg700["z700_grib"],
-                cfg700["rh500_grib"],
-                cfg700["rh700_grib"],
-                cfg700["rh850_grib"],
-            ]
-            if cfgpcpn.get("show_precip", True):
-                required_keys.append(cfgpcpn["pcpn_grib"])
-            if cfgpcpn.get("show_jet_core", True):
-                required_keys.append(cfgpcpn["jet_spd_grib"])
-
-            all_keys_exist = await self._s3_client.all_objects_exist(*required_keys)
-            if not all_keys_exist:
-                logger.info(
-                    f"Unable to create 4 panel chart {output_name} due to missing input files."
-                )
-                return False
+        semaphore = asyncio.Semaphore(self._max_concurrent_charts)
+        charts: Set[asyncio.Task] = set()
 
+        async def make_chart(fh: int, output_key: str, cfgs):
             try:
                 await self._make_4panel_chart(
-                    cfg500,
-                    cfgmslp,
-                    cfg700,
-                    cfgpcpn,
+                    grib_cache,
+                    *cfgs,
                     DEFAULT_FIG_SIZE,
                     DEFAULT_DPI,
                     output_key,
-                    plotter_factory,
+                    model,
                     step,
                 )
             except TypeError:
                 # Error was logged when thrown. Continue processing of remaining 4panel charts.
-                continue
+                return
+            finally:
+                semaphore.release()
             logger.info(
                 f"End {model} 4 panel chart generation for hour {fh} of model run {init_ymd}T{init_hh}Z."
             )
+
+        def chart_failed() -> bool:
+            return any(
+                chart.done() and not chart.cancelled() and chart.exception() is not None
+                for chart in charts
+            )
+
+        complete = True
+        with tempfile.TemporaryDirectory(prefix="wx_4panel_gribs_") as cache_dir:
+            grib_cache = LocalGribCache(self._s3_client, cache_dir)
+            try:
+                for fh in range(start_hour, end_hour + 1, step):
+                    logger.info(
+                        f"Start {model} 4 panel chart generation for hour {fh} of model run {init_ymd}T{init_hh}Z."
+                    )
+                    output_name = f"{model}_{init_ymd}T{init_hh}Z_F{fh:03d}_4panel.png"
+                    output_key = raster_addresser.get_4panel_key(fh, output_name)
+
+                    # If a 4panel chart already exists don't re-create it.
+                    if await self._s3_client.object_exists(output_key):
+                        logger.info(f"Skipping: 4 panel chart already exists: {output_name}")
+                        continue
+
+                    cfgs = config_builder.build_config_for_hour(fh)
+
+                    required_keys = [
+                        cfg[field]
+                        for cfg, fields in zip(cfgs, _grib_fields(cfgs[3]))
+                        for field in fields
+                    ]
+                    all_keys_exist = await self._s3_client.all_objects_exist(*required_keys)
+                    if not all_keys_exist:
+                        logger.info(
+                            f"Unable to create 4 panel chart {output_name} due to missing input files."
+                        )
+                        complete = False
+                        break
+
+                    # Wait for a free slot, so only a bounded number of charts are in flight.
+                    await semaphore.acquire()
+                    if chart_failed():
+                        semaphore.release()
+                        break
+                    charts.add(asyncio.create_task(make_chart(fh, output_key, cfgs)))
+            finally:
+                # Let the charts that are in flight finish before their gribs are cleaned up.
+                results = await asyncio.gather(*charts, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
         # The specified end hour has been reached and the processing is complete.
-        return True
+        return complete
 
     async def run(
         self,
@@ -403,6 +547,12 @@ def parse_args():
     parser.add_argument(
         "--model", choices=["GDPS", "RDPS"], default="RDPS", help="The ECCC NWM (GDPS or RDPS)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_RENDER_WORKERS,
+        help="The number of processes to render charts in.",
+    )
 
     return parser.parse_args()
 
@@ -423,34 +573,44 @@ async def main():
     user_id = config.get("WX_OBJECT_STORE_USER_ID")
     secret_key = config.get("WX_OBJECT_STORE_SECRET")
     bucket = config.get("WX_OBJECT_STORE_BUCKET")
-    # cartopy downloads some geographic data that needs to be stored locally
     cartopy_data_dir = config.get("WX_CARTOPY_DATA_DIR")
-    if cartopy_data_dir:
-        cartopy.config["data_dir"] = cartopy_data_dir
 
-    async with S3Client(user_id=user_id, secret_key=secret_key, bucket=bucket) as s3_client:
-        try:
-            current_datetime = start_datetime
-            while current_datetime <= end_datetime:
-                init_ymd = current_datetime.strftime("%Y%m%d")
-                logger.info(f"Creating {args.model} 4 panel chart for model run {init_ymd}.")
-                logger.info(f"Model run hour(s) {args.model_runs}")
-                logger.info(
-                    f"From hour {args.start_hour} to {args.end_hour} in {args.step} hour increments."
-                )
+    # matplotlib and cartopy aren't thread safe, so charts are rendered in a pool of processes.
+    # Processes are spawned rather than forked so they don't inherit the event loop or S3 client.
+    executor = ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_render_worker,
+        initargs=(cartopy_data_dir,),
+    )
 
-                runner = FourPanelChartRunner(s3_client)
-                await runner.run(
-                    init_ymd, args.model_runs, args.start_hour, args.end_hour, args.step, args.model
-                )
-                current_datetime = current_datetime + timedelta(days=1)
+    with executor:
+        async with S3Client(user_id=user_id, secret_key=secret_key, bucket=bucket) as s3_client:
+            try:
+                current_datetime = start_datetime
+                while current_datetime <= end_datetime:
+                    init_ymd = current_datetime.strftime("%Y%m%d")
+                    logger.info(f"Creating {args.model} 4 panel chart for model run {init_ymd}.")
+                    logger.info(f"Model run hour(s) {args.model_runs}")
+                    logger.info(
+                        f"From hour {args.start_hour} to {args.end_hour} in {args.step} hour increments."
+                    )
 
-            # Exit with 0 - success.
-            logger.info("4-Panel Chart creation is up to date.")
-            sys.exit(os.EX_OK)
-        except Exception as e:
-            logger.error(f"Fatal error: {e}", exc_info=True)
-            sys.exit(1)
+                    # Keep a chart's gribs downloading while the workers are busy rendering.
+                    runner = FourPanelChartRunner(
+                        s3_client, executor=executor, max_concurrent_charts=2 * args.workers
+                    )
+                    await runner.run(
+                        init_ymd, args.model_runs, args.start_hour, args.end_hour, args.step, args.model
+                    )
+                    current_datetime = current_datetime + timedelta(days=1)
+
+                # Exit with 0 - success.
+                logger.info("4-Panel Chart creation is up to date.")
+                sys.exit(os.EX_OK)
+            except Exception as e:
+                logger.error(f"Fatal error: {e}", exc_info=True)
+                sys.exit(1)
 
 
 if __name__ == "__main__":